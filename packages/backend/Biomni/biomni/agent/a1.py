@@ -1,7 +1,8 @@
-import glob
 import inspect
 import os
 import re
+import threading
+import time
 from collections.abc import Generator
 from datetime import datetime
 from pathlib import Path
@@ -9,15 +10,17 @@ from typing import Any, Literal, TypedDict
 
 import pandas as pd
 from dotenv import load_dotenv
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
 
+from biomni.agent.context_compaction import compact_messages, estimate_tokens, restore_compacted
+from biomni.agent.prompt_cache import PromptCache, list_data_lake
 from biomni.config import default_config
-from biomni.llm import SourceType, get_llm
+from biomni.execution import ExecutionBackend, get_execution_backend
+from biomni.llm import SourceType, detect_source, get_llm, get_token_usage, layout_messages_for_caching
 from biomni.model.retriever import ToolRetriever
-from biomni.tool.support_tools import run_python_repl
 from biomni.tool.tool_registry import ToolRegistry
 from biomni.utils import (
     check_and_download_s3_files,
@@ -30,7 +33,6 @@ from biomni.utils import (
     format_observation_as_terminal,
     function_to_api_schema,
     has_execution_results,
-    inject_custom_functions_to_repl,
     parse_tool_calls_from_code,
     parse_tool_calls_with_modules,
     pretty_print,
@@ -39,7 +41,6 @@ from biomni.utils import (
     run_r_code,
     run_with_timeout,
     should_skip_message,
-    textify_api_dict,
 )
 
 if os.path.exists(".env"):
@@ -47,6 +48,70 @@ if os.path.exists(".env"):
     print("Loaded environment variables from .env (override enabled)")
 
 
+_data_lake_checks: dict[str, threading.Thread] = {}
+_data_lake_checks_lock = threading.Lock()
+
+
+def start_data_lake_check(data_lake_dir: str, benchmark_dir: str, expected_files: list, mode: str = "background"):
+    """Download missing data lake files and the benchmark folder.
+
+    The directory listing is compared first, so a complete data lake costs one ``listdir``.
+    In ``"background"`` mode the downloads run on a daemon thread (one per data lake directory
+    per process) and the agent starts immediately; files show up in the prompt once present.
+
+    Args:
+        data_lake_dir: Local data lake directory
+        benchmark_dir: Local benchmark directory
+        expected_files: Data lake file names that should be present
+        mode: ``"sync"``, ``"background"`` or ``"off"``
+
+    Returns:
+        The background thread, or None if nothing was started
+
+    """
+    if mode == "off":
+        return None
+
+    present = set(os.listdir(data_lake_dir)) if os.path.isdir(data_lake_dir) else set()
+    missing = [name for name in expected_files if name not in present]
+    # The benchmark folder is complete once its "hle" subdirectory exists
+    benchmark_ok = os.path.isdir(os.path.join(benchmark_dir, "hle"))
+    if not missing and benchmark_ok:
+        return None
+
+    def check():
+        if missing:
+            print(f"Checking and downloading {len(missing)} missing data lake files...")
+            check_and_download_s3_files(
+                s3_bucket_url="https://biomni-release.s3.amazonaws.com",
+                local_data_lake_path=data_lake_dir,
+                expected_files=missing,
+                folder="data_lake",
+            )
+        if not benchmark_ok:
+            print("Checking and downloading benchmark files...")
+            check_and_download_s3_files(
+                s3_bucket_url="https://biomni-release.s3.amazonaws.com",
+                local_data_lake_path=benchmark_dir,
+                expected_files=[],  # Empty list - will download entire folder
+                folder="benchmark",
+            )
+
+    if mode != "background":
+        check()
+        return None
+
+    with _data_lake_checks_lock:
+        thread = _data_lake_checks.get(data_lake_dir)
+        if thread is not None and thread.is_alive():
+            return thread
+        thread = threading.Thread(target=check, name="biomni-data-lake-check", daemon=True)
+        _data_lake_checks[data_lake_dir] = thread
+        thread.start()
+    print(f"Downloading {len(missing)} missing data lake files in the background")
+    return thread
+
+
 class AgentState(TypedDict):
     messages: list[BaseMessage]
     next_step: str | None
@@ -162,33 +227,11 @@ class A1:
         if expected_data_lake_files is None:
             expected_data_lake_files = list(self.data_lake_dict.keys())
 
-        # Check and download missing data lake files
-        print("Checking and downloading missing data lake files...")
-        check_and_download_s3_files(
-            s3_bucket_url="https://biomni-release.s3.amazonaws.com",
-            local_data_lake_path=data_lake_dir,
-            expected_files=expected_data_lake_files,
-            folder="data_lake",
-        )
-
-        # Check if benchmark directory structure is complete
-        benchmark_ok = False
-        if os.path.isdir(benchmark_dir):
-            patient_gene_detection_dir = os.path.join(benchmark_dir, "hle")
-            if os.path.isdir(patient_gene_detection_dir):
-                benchmark_ok = True
-
-        if not benchmark_ok:
-            print("Checking and downloading benchmark files...")
-            check_and_download_s3_files(
-                s3_bucket_url="https://biomni-release.s3.amazonaws.com",
-                local_data_lake_path=benchmark_dir,
-                expected_files=[],  # Empty list - will download entire folder
-                folder="benchmark",
-            )
+        # Check and download missing data lake and benchmark files (blocking, in the background or not at all)
+        start_data_lake_check(data_lake_dir, benchmark_dir, expected_data_lake_files, default_config.data_lake_check)
 
         self.path = os.path.join(path, "biomni_data")
-        module2api = read_module2api()
+        module2api = read_module2api(os.path.join(self.path, "tool_index.pkl"))
 
         self.llm = get_llm(
             llm,
@@ -198,6 +241,12 @@ class A1:
             api_key=api_key,
             config=default_config,
         )
+        try:
+            self.llm_source = source or detect_source(llm, base_url)
+        except ValueError:
+            self.llm_source = None
+        self.token_usage = []
+        self._observation_archive = {}
         self.module2api = module2api
         self.use_tool_retriever = use_tool_retriever
 
@@ -207,6 +256,8 @@ class A1:
 
         # Add timeout parameter
         self.timeout_seconds = timeout_seconds  # 10 minutes default timeout
+        self.session_id = None
+        self._prompt_cache = PromptCache()
         self.configure()
 
     def add_tool(self, api):
@@ -324,6 +375,7 @@ class A1:
             print(
                 f"Tool '{schema['name']}' successfully added and ready for use in both direct execution and retrieval"
             )
+            self._invalidate_resource_caches()
             self.configure()
             return schema
 
@@ -654,6 +706,7 @@ class A1:
                         break
 
         if removed:
+            self._invalidate_resource_caches()
             print(f"Custom tool '{name}' has been removed")
         else:
             print(f"Custom tool '{name}' was not found")
@@ -696,6 +749,7 @@ class A1:
                 self.data_lake_dict[filename] = description
 
                 print(f"Added data item '{filename}': {description}")
+            self._invalidate_resource_caches()
             self.configure()
             print(f"Successfully added {len(data)} data item(s) to the data lake")
             return True
@@ -755,6 +809,7 @@ class A1:
             removed = True
 
         if removed:
+            self._invalidate_resource_caches()
             print(f"Custom data item '{name}' has been removed")
         else:
             print(f"Custom data item '{name}' was not found")
@@ -796,6 +851,7 @@ class A1:
                 print(f"Added software '{software_name}': {description}")
 
             print(f"Successfully added {len(software)} software item(s) to the library")
+            self._invalidate_resource_caches()
             self.configure()
             return True
 
@@ -854,12 +910,19 @@ class A1:
             removed = True
 
         if removed:
+            self._invalidate_resource_caches()
             print(f"Custom software item '{name}' has been removed")
         else:
             print(f"Custom software item '{name}' was not found")
 
         return removed
 
+    def _invalidate_resource_caches(self):
+        """Drop cached retrieval results and assembled prompts after the catalog changed."""
+        if getattr(self, "retriever", None) is not None:
+            self.retriever.invalidate_cache()
+        self._prompt_cache.clear_prompts()
+
     def _generate_system_prompt(
         self,
         tool_desc,
@@ -888,42 +951,7 @@ class A1:
 
         """
 
-        def format_item_with_description(name, description):
-            """Format an item with its description in a readable way."""
-            # Handle None or empty descriptions
-            if not description:
-                description = f"Data lake item: {name}"
-
-            # Check if the item is already formatted (contains a colon)
-            if isinstance(name, str) and ": " in name:
-                return name
-
-            # Wrap long descriptions to make them more readable
-            max_line_length = 80
-            if len(description) > max_line_length:
-                # Simple wrapping for long descriptions
-                wrapped_desc = []
-                words = description.split()
-                current_line = ""
-
-                for word in words:
-                    if len(current_line) + len(word) + 1 <= max_line_length:
-                        if current_line:
-                            current_line += " " + word
-                        else:
-                            current_line = word
-                    else:
-                        wrapped_desc.append(current_line)
-                        current_line = word
-
-                if current_line:
-                    wrapped_desc.append(current_line)
-
-                # Join with newlines and proper indentation
-                formatted_desc = f"{name}:\n  " + "\n  ".join(wrapped_desc)
-                return formatted_desc
-            else:
-                return f"{name}: {description}"
+        format_item_with_description = self._prompt_cache.format_item
 
         # Separate custom and default resources
         default_data_lake_content = []
@@ -1193,7 +1221,7 @@ Each library is listed with its description to help you understand its functiona
         # Format the prompt with the appropriate values
         format_dict = {
             "function_intro": function_intro,
-            "tool_desc": textify_api_dict(tool_desc) if isinstance(tool_desc, dict) else tool_desc,
+            "tool_desc": self._prompt_cache.format_tools(tool_desc) if isinstance(tool_desc, dict) else tool_desc,
             "import_instruction": import_instruction,
             "data_lake_path": self.path + "/data_lake",
             "data_lake_intro": data_lake_intro,
@@ -1214,23 +1242,36 @@ Each library is listed with its description to help you understand its functiona
 
         return formatted_prompt
 
-    def configure(self, self_critic=False, test_time_scale_round=0):
+    def configure(
+        self,
+        self_critic=False,
+        test_time_scale_round=0,
+        execution_backend: str | ExecutionBackend | None = None,
+    ):
         """Configure the agent with the initial system prompt and workflow.
 
         Args:
             self_critic: Whether to enable self-critic mode
             test_time_scale_round: Number of rounds for test time scaling
+            execution_backend: Backend for Python code execution: "thread" (in-process, shared namespace),
+                "process" (subprocess per session) or an ExecutionBackend instance. If None, keeps the
+                current backend or falls back to default_config.execution_backend
 
         """
         # Store self_critic for later use
         self.self_critic = self_critic
 
-        # Get data lake content
-        data_lake_path = self.path + "/data_lake"
-        data_lake_content = glob.glob(data_lake_path + "/*")
-        data_lake_items = [x.split("/")[-1] for x in data_lake_content]
+        # Select the Python execution backend
+        if execution_backend is not None or getattr(self, "execution_backend", None) is None:
+            self.execution_backend = get_execution_backend(execution_backend)
+
+        # Get data lake content (listing is cached until the directory changes)
+        data_lake_items = list_data_lake(self.path + "/data_lake")
 
         # data_lake_dict and library_content_dict are already set in __init__
+        # Custom resources and tools only change through add_*/remove_custom_*, which clear the prompt cache
+        prompt_key = ("base", self_critic, tuple(data_lake_items))
+        cached_prompt = self._prompt_cache.get_prompt(prompt_key)
 
         # Prepare tool descriptions
         tool_desc = {i: [x for x in j if x["name"] != "run_python_repl"] for i, j in self.module2api.items()}
@@ -1276,21 +1317,44 @@ Each library is listed with its description to help you understand its functiona
             for name, info in self._custom_software.items():
                 custom_software.append({"name": name, "description": info["description"]})
 
-        self.system_prompt = self._generate_system_prompt(
-            tool_desc=tool_desc,
-            data_lake_content=data_lake_with_desc,
-            library_content_list=library_content_list,
-            self_critic=self_critic,
-            is_retrieval=False,
-            custom_tools=custom_tools if custom_tools else None,
-            custom_data=custom_data if custom_data else None,
-            custom_software=custom_software if custom_software else None,
-        )
+        if cached_prompt is not None:
+            self.system_prompt = cached_prompt
+        else:
+            self.system_prompt = self._generate_system_prompt(
+                tool_desc=tool_desc,
+                data_lake_content=data_lake_with_desc,
+                library_content_list=library_content_list,
+                self_critic=self_critic,
+                is_retrieval=False,
+                custom_tools=custom_tools if custom_tools else None,
+                custom_data=custom_data if custom_data else None,
+                custom_software=custom_software if custom_software else None,
+            )
+            self._prompt_cache.set_prompt(prompt_key, self.system_prompt)
 
         # Define the nodes
         def generate(state: AgentState) -> AgentState:
-            messages = [SystemMessage(content=self.system_prompt)] + state["messages"]
+            # Compaction stage: keep the resent context under the token budget on long runs
+            if default_config.context_budget_tokens > 0:
+                compacted = compact_messages(
+                    state["messages"],
+                    self._observation_archive,
+                    budget_tokens=default_config.context_budget_tokens,
+                    fixed_tokens=estimate_tokens(self.system_prompt),
+                    keep_recent=default_config.context_keep_recent,
+                )
+                if compacted:
+                    print(f"Compacted {compacted} old observation(s) to fit the context budget")
+
+            messages = layout_messages_for_caching(
+                self.system_prompt, state["messages"], self.llm_source, default_config.prompt_cache_mode
+            )
+            start_time = time.perf_counter()
             response = self.llm.invoke(messages)
+            usage = get_token_usage(response)
+            usage["step"] = len(self.token_usage) + 1
+            usage["latency_s"] = round(time.perf_counter() - start_time, 3)
+            self.token_usage.append(usage)
 
             # Parse the response
             msg = str(response.content)
@@ -1389,7 +1453,7 @@ Each library is listed with its description to help you understand its functiona
 
                     # Inject custom functions into the Python execution environment
                     self._inject_custom_functions_to_repl()
-                    result = run_with_timeout(run_python_repl, [code], timeout=timeout)
+                    result = self.execution_backend.run_python(code, timeout=timeout, session_id=self.session_id)
 
                     # Plots are now captured directly in the execution entry above
 
@@ -1406,9 +1470,7 @@ Each library is listed with its description to help you understand its functiona
                 # Get any plots that were generated during this execution
                 execution_plots = []
                 try:
-                    from biomni.tool.support_tools import get_captured_plots
-
-                    current_plots = get_captured_plots()
+                    current_plots = self.execution_backend.get_captured_plots(self.session_id)
                     execution_plots = current_plots.copy()
                 except Exception as e:
                     print(f"Warning: Could not capture plots from execution: {e}")
@@ -1535,9 +1597,7 @@ Each library is listed with its description to help you understand its functiona
         all_tools = self.tool_registry.tools if hasattr(self, "tool_registry") else []
 
         # 2. Data lake items with descriptions
-        data_lake_path = self.path + "/data_lake"
-        data_lake_content = glob.glob(data_lake_path + "/*")
-        data_lake_items = [x.split("/")[-1] for x in data_lake_content]
+        data_lake_items = list_data_lake(self.path + "/data_lake")
 
         # Create data lake descriptions for retrieval
         data_lake_descriptions = []
@@ -1569,9 +1629,21 @@ Each library is listed with its description to help you understand its functiona
             "libraries": library_descriptions,
         }
 
-        # Use prompt-based retrieval with the agent's LLM
-        selected_resources = self.retriever.prompt_based_retrieval(prompt, resources, llm=self.llm)
-        print("Using prompt-based retrieval with the agent's LLM")
+        retriever_mode = default_config.retriever_mode
+        if retriever_mode in ("index", "index_rerank"):
+            # Local BM25 shortlist; the LLM only sees the shortlist when reranking
+            selected_resources = self.retriever.retrieve(
+                prompt,
+                resources,
+                mode=retriever_mode,
+                llm=self.llm,
+                index_dir=default_config.retriever_index_dir or os.path.join(self.path, "retrieval_index"),
+            )
+            print(f"Using index-based retrieval (mode={retriever_mode})")
+        else:
+            # Use prompt-based retrieval with the agent's LLM (cached by normalized query)
+            selected_resources = self.retriever.retrieve(prompt, resources, mode="prompt", llm=self.llm)
+            print("Using prompt-based retrieval with the agent's LLM")
 
         # Extract the names from the selected resources for the system prompt
         selected_resources_names = {
@@ -1593,15 +1665,18 @@ Each library is listed with its description to help you understand its functiona
 
         return selected_resources_names
 
-    def go(self, prompt):
+    def go(self, prompt, session_id: str | None = None):
         """Execute the agent with the given prompt.
 
         Args:
             prompt: The user's query
+            session_id: Optional session key. With the "process" execution backend, each session
+                keeps its own Python namespace across calls
 
         """
         self.critic_count = 0
         self.user_task = prompt
+        self.session_id = session_id
 
         if self.use_tool_retriever:
             selected_resources_names = self._prepare_resources_for_retrieval(prompt)
@@ -1610,6 +1685,8 @@ Each library is listed with its description to help you understand its functiona
         inputs = {"messages": [HumanMessage(content=prompt)], "next_step": None}
         config = {"recursion_limit": 500, "configurable": {"thread_id": 42}}
         self.log = []
+        self.token_usage = []
+        self._observation_archive = {}
 
         # Store the final conversation state for markdown generation
         final_state = None
@@ -1625,7 +1702,9 @@ Each library is listed with its description to help you understand its functiona
 
         return self.log, message.content
 
-    def go_stream(self, prompt) -> Generator[dict, None, None]:
+    def go_stream(
+        self, prompt, session_id: str | None = None, stream_tokens: bool = False
+    ) -> Generator[dict, None, None]:
         """Execute the agent with the given prompt and return a generator that yields each step.
 
         This function returns a generator that yields each step of the agent's execution,
@@ -1633,38 +1712,127 @@ Each library is listed with its description to help you understand its functiona
 
         Args:
             prompt: The user's query
+            session_id: Optional session key used by the execution backend
+            stream_tokens: If True, also yield LLM tokens of the generate node as they arrive
 
         Yields:
-            dict: Each step of the agent's execution containing the current message and state
+            dict: Each step of the agent's execution. Every graph step contains ``output`` (the
+                pretty-printed message, as stored in ``self.log``), ``type`` ("user", "execute",
+                "observation", "solution" or "message"), ``content`` and ``step``. Token events
+                have ``type`` "token" and the text chunk in ``content``. A last ``type`` "final"
+                event carries the final message content.
         """
         self.critic_count = 0
         self.user_task = prompt
+        self.session_id = session_id
 
         if self.use_tool_retriever:
+            yield {"type": "retrieval", "content": "Selecting relevant tools, data and libraries..."}
             selected_resources_names = self._prepare_resources_for_retrieval(prompt)
             self.update_system_prompt_with_selected_resources(selected_resources_names)
+            yield {
+                "type": "retrieval",
+                "content": (
+                    f"Selected {len(selected_resources_names['tools'])} tools, "
+                    f"{len(selected_resources_names['data_lake'])} datasets and "
+                    f"{len(selected_resources_names['libraries'])} libraries"
+                ),
+            }
 
         inputs = {"messages": [HumanMessage(content=prompt)], "next_step": None}
         config = {"recursion_limit": 500, "configurable": {"thread_id": 42}}
         self.log = []
+        self.token_usage = []
+        self._observation_archive = {}
 
         # Store the final conversation state for markdown generation
         final_state = None
+        message = None
+        step = 0
+
+        stream_mode = ["values", "messages"] if stream_tokens else ["values"]
+        for mode, chunk in self.app.stream(inputs, stream_mode=stream_mode, config=config):
+            if mode == "messages":
+                token, metadata = chunk
+                text = token.content if isinstance(token.content, str) else ""
+                if text and metadata.get("langgraph_node") == "generate":
+                    yield {"type": "token", "content": text}
+                continue
 
-        for s in self.app.stream(inputs, stream_mode="values", config=config):
-            message = s["messages"][-1]
+            message = chunk["messages"][-1]
             out = pretty_print(message)
             self.log.append(out)
-            final_state = s  # Store the latest state
+            final_state = chunk  # Store the latest state
+            step += 1
 
             # Yield the current step
-            yield {"output": out}
+            step_type, content = self._classify_stream_message(message)
+            yield {"output": out, "type": step_type, "content": content, "step": step}
 
         # Store the conversation state for markdown generation
         self._conversation_state = final_state
 
+        if message is not None:
+            yield {
+                "type": "final",
+                "content": str(message.content),
+                "log": self.log,
+                "usage": self.get_token_usage_summary(),
+            }
+
+    @staticmethod
+    def _classify_stream_message(message) -> tuple[str, str]:
+        """Classify a graph message for streaming consumers.
+
+        Returns:
+            A (type, content) tuple where type is "user", "execute", "observation", "solution" or "message"
+        """
+        content = str(message.content)
+        if isinstance(message, HumanMessage):
+            return "user", content
+        if "<observation>" in content:
+            return "observation", content
+        if "<solution>" in content:
+            return "solution", content
+        if "<execute>" in content:
+            return "execute", content
+        return "message", content
+
+    def get_token_usage_summary(self) -> dict:
+        """Summarize per-step token usage of the last run.
+
+        Returns:
+            dict: Totals of input, cached, cache-creation, uncached and output tokens, the share of
+            input tokens served from the provider's prompt cache, total model latency and the
+            per-step records
+
+        """
+        totals = {
+            key: sum(step[key] for step in self.token_usage)
+            for key in ("input_tokens", "cached_tokens", "cache_creation_tokens", "uncached_tokens", "output_tokens")
+        }
+        totals["cache_hit_ratio"] = totals["cached_tokens"] / totals["input_tokens"] if totals["input_tokens"] else 0.0
+        totals["llm_latency_s"] = round(sum(step["latency_s"] for step in self.token_usage), 3)
+        totals["steps"] = list(self.token_usage)
+        return totals
+
     def update_system_prompt_with_selected_resources(self, selected_resources):
         """Update the system prompt with the selected resources."""
+        prompt_key = (
+            "retrieval",
+            getattr(self, "self_critic", False),
+            tuple(
+                tool.get("name") if isinstance(tool, dict) else getattr(tool, "name", str(tool))
+                for tool in selected_resources["tools"]
+            ),
+            tuple(selected_resources["data_lake"]),
+            tuple(str(lib) for lib in selected_resources["libraries"]),
+        )
+        cached_prompt = self._prompt_cache.get_prompt(prompt_key)
+        if cached_prompt is not None:
+            self.system_prompt = cached_prompt
+            return
+
         # Extract tool descriptions for the selected tools
         tool_desc = {}
         for tool in selected_resources["tools"]:
@@ -1766,6 +1934,7 @@ Each library is listed with its description to help you understand its functiona
             custom_data=custom_data if custom_data else None,
             custom_software=custom_software if custom_software else None,
         )
+        self._prompt_cache.set_prompt(prompt_key, self.system_prompt)
 
         # Print the raw system prompt for debugging
         # print("\n" + "="*20 + " RAW SYSTEM PROMPT FROM AGENT " + "="*20)
@@ -1823,7 +1992,7 @@ Each library is listed with its description to help you understand its functiona
         This makes custom tools available during code execution.
         """
         custom_functions = getattr(self, "_custom_functions", {})
-        inject_custom_functions_to_repl(custom_functions)
+        self.execution_backend.inject_functions(custom_functions, session_id=self.session_id)
 
     def create_mcp_server(self, tool_modules=None):
         """
@@ -2039,7 +2208,8 @@ Each library is listed with its description to help you understand its functiona
         normalized = []
         for message in messages:
             if hasattr(message, "content"):
-                content = str(message.content)
+                # Observations compacted during the run are restored from the archive
+                content = restore_compacted(str(message.content), getattr(self, "_observation_archive", {}))
             else:
                 content = str(message)
 
@@ -2361,13 +2531,11 @@ Each library is listed with its description to help you understand its functiona
         new execution results.
 
         Note:
-            This function calls the clear_captured_plots utility function and handles
+            This function clears the plots held by the active execution backend and handles
             any exceptions gracefully to prevent execution failures.
         """
         try:
-            from biomni.tool.support_tools import clear_captured_plots
-
-            clear_captured_plots()
+            self.execution_backend.clear_captured_plots(self.session_id)
         except Exception as e:
             print(f"Warning: Could not clear execution plots: {e}")
 
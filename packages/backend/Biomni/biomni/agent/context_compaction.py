@@ -0,0 +1,91 @@
+"""Context-window compaction for long A1 trajectories.
+
+Every ``<observation>`` is appended to the agent state and resent on each later step.
+Once the estimated prompt size exceeds a token budget, old observations are replaced
+by a short head/tail excerpt and their full text is kept in an archive, so the prompt
+stays roughly flat while ``save_conversation_history`` can still restore everything.
+
+Compaction runs in batches down to a low-water mark rather than one message per step,
+so the conversation prefix (and any provider prompt cache built on it) changes rarely.
+"""
+
+import re
+
+from langchain_core.messages import AIMessage
+
+_COMPACTED_RE = re.compile(r"^<observation>\[Compacted observation #(\d+):[^\]]*\]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text and code)."""
+    return len(text) // 4
+
+
+def is_observation(message) -> bool:
+    """True for the AIMessages the execute node appends with tool output."""
+    content = getattr(message, "content", None)
+    return isinstance(message, AIMessage) and isinstance(content, str) and content.startswith("<observation>")
+
+
+def compact_messages(
+    messages: list,
+    archive: dict[int, str],
+    budget_tokens: int,
+    fixed_tokens: int = 0,
+    keep_recent: int = 4,
+    excerpt_chars: int = 600,
+    low_water: float = 0.75,
+) -> int:
+    """Elide old observations in place until the estimated prompt fits the budget.
+
+    Args:
+        messages: Conversation messages of the agent state (modified in place)
+        archive: Maps archive ids to the full observation text; new entries are added here
+        budget_tokens: Prompt size that triggers compaction
+        fixed_tokens: Tokens outside ``messages`` that are sent every step (the system prompt)
+        keep_recent: Number of most recent observations that are never compacted
+        excerpt_chars: Characters kept from the start and end of each compacted observation
+        low_water: Fraction of the budget to compact down to once triggered
+
+    Returns:
+        Number of observations compacted
+
+    """
+    total = fixed_tokens + sum(estimate_tokens(str(m.content)) for m in messages)
+    if budget_tokens <= 0 or total <= budget_tokens:
+        return 0
+
+    observation_indices = [i for i, m in enumerate(messages) if is_observation(m)]
+    candidates = observation_indices[:-keep_recent] if keep_recent > 0 else observation_indices
+    target = int(budget_tokens * low_water)
+
+    compacted = 0
+    for i in candidates:
+        if total <= target:
+            break
+        content = messages[i].content
+        if _COMPACTED_RE.match(content):
+            continue
+        body = content[len("<observation>") : -len("</observation>")] if content.endswith("</observation>") else content
+        if len(body) <= 2 * excerpt_chars + 200:
+            continue
+
+        archive_id = len(archive) + 1
+        archive[archive_id] = content
+        head, tail = body[:excerpt_chars].rstrip(), body[-excerpt_chars:].lstrip()
+        replacement = (
+            f"<observation>[Compacted observation #{archive_id}: {len(body):,} chars, middle elided to save context]\n"
+            f"{head}\n...\n{tail}</observation>"
+        )
+        messages[i] = AIMessage(content=replacement, id=messages[i].id)
+        total -= estimate_tokens(content) - estimate_tokens(replacement)
+        compacted += 1
+    return compacted
+
+
+def restore_compacted(content: str, archive: dict[int, str]) -> str:
+    """Full observation text for a compacted message (unchanged if it was not compacted)."""
+    match = _COMPACTED_RE.match(content)
+    if match is None:
+        return content
+    return archive.get(int(match.group(1)), content)
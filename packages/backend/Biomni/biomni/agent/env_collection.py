@@ -7,6 +7,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from biomni.agent.base_agent import base_agent
+from biomni.llm import batch_invoke
 
 
 class PaperTaskExtractor(base_agent):
@@ -21,6 +22,8 @@ class PaperTaskExtractor(base_agent):
         tools=None,
         chunk_size=4000,
         chunk_overlap=400,
+        max_concurrency=4,
+        max_attempts=3,
     ):
         """Initialize the PaperTaskExtractor agent.
 
@@ -30,11 +33,15 @@ class PaperTaskExtractor(base_agent):
             tools (list, optional): Any tools to use (not needed for this agent)
             chunk_size (int): Size of text chunks for processing
             chunk_overlap (int): Overlap between chunks
+            max_concurrency (int): Maximum number of chunks analyzed by the LLM at the same time
+            max_attempts (int): LLM attempts per chunk before the chunk is skipped
 
         """
         super().__init__(llm, cheap_llm, tools)
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
         self.log = []
         self.configure()
 
@@ -152,31 +159,25 @@ Respond with only a valid JSON object containing the three lists described above
         )
         chunks = text_splitter.split_text(paper_text)
 
-        # Process each chunk to extract tasks
+        # Process the chunks concurrently to extract tasks
+        print(f"Processing {len(chunks)} chunks...")
+        results = batch_invoke(
+            self.llm,
+            [self.chunk_analysis_prompt.format(chunk_text=chunk) for chunk in chunks],
+            max_concurrency=self.max_concurrency,
+            max_attempts=self.max_attempts,
+        )
         chunk_results = []
-        for i, chunk in enumerate(chunks):
-            print(f"Processing chunk {i + 1}/{len(chunks)}...")
-            chunk_tasks = self._process_chunk(chunk)
+        for i, (chunk_tasks, error) in enumerate(results):
+            if chunk_tasks is None:
+                print(f"Skipping chunk {i + 1}/{len(chunks)}: {error}")
+                continue
             chunk_results.append(chunk_tasks)
 
         # Consolidate tasks from all chunks
         consolidated_results = self._consolidate_tasks(chunk_results)
         return consolidated_results
 
-    def _process_chunk(self, chunk_text: str) -> str:
-        """Process a single chunk of the paper to extract tasks.
-
-        Args:
-            chunk_text (str): The chunk text to process
-
-        Returns:
-            str: Extracted tasks from this chunk
-
-        """
-        prompt = self.chunk_analysis_prompt.format(chunk_text=chunk_text)
-        message = self.llm.invoke(prompt)
-        return message.content
-
     def _consolidate_tasks(self, chunk_results: list[str]) -> dict[str, list[dict[str, Any]]]:
         """Consolidate tasks, databases, and software extracted from different chunks into a unified structure.
 
@@ -0,0 +1,146 @@
+"""Caches used to assemble A1 system prompts.
+
+Rebuilding the system prompt used to re-render every tool description, re-wrap every
+dataset description and glob the data lake on each ``go()``. Here each fragment is
+rendered once and kept, the data lake listing is reused until the directory mtime
+changes, and fully assembled prompts are kept per selected resource set.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from biomni.utils import textify_api_method
+
+_listing_cache: dict[str, tuple[float, list[str]]] = {}
+_listing_lock = threading.Lock()
+
+
+def list_data_lake(data_lake_path: str) -> list[str]:
+    """Sorted file names in the data lake directory, cached until the directory mtime changes."""
+    try:
+        mtime = os.stat(data_lake_path).st_mtime
+    except OSError:
+        return []
+    with _listing_lock:
+        cached = _listing_cache.get(data_lake_path)
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
+    # Hidden files (converted Arrow caches) and in-progress downloads are not data lake items
+    items = sorted(
+        name for name in os.listdir(data_lake_path) if not name.startswith(".") and not name.endswith(".part")
+    )
+    with _listing_lock:
+        _listing_cache[data_lake_path] = (mtime, items)
+    return list(items)
+
+
+def format_item_with_description(name, description):
+    """Format an item with its description in a readable way."""
+    # Handle None or empty descriptions
+    if not description:
+        description = f"Data lake item: {name}"
+
+    # Check if the item is already formatted (contains a colon)
+    if isinstance(name, str) and ": " in name:
+        return name
+
+    # Wrap long descriptions to make them more readable
+    max_line_length = 80
+    if len(description) > max_line_length:
+        # Simple wrapping for long descriptions
+        wrapped_desc = []
+        words = description.split()
+        current_line = ""
+
+        for word in words:
+            if len(current_line) + len(word) + 1 <= max_line_length:
+                if current_line:
+                    current_line += " " + word
+                else:
+                    current_line = word
+            else:
+                wrapped_desc.append(current_line)
+                current_line = word
+
+        if current_line:
+            wrapped_desc.append(current_line)
+
+        # Join with newlines and proper indentation
+        formatted_desc = f"{name}:\n  " + "\n  ".join(wrapped_desc)
+        return formatted_desc
+    else:
+        return f"{name}: {description}"
+
+
+class PromptCache:
+    """Per-agent cache of rendered prompt fragments and assembled system prompts."""
+
+    def __init__(self, max_prompts: int = 64):
+        """Create the cache.
+
+        Args:
+            max_prompts: Maximum number of assembled system prompts to keep
+
+        """
+        self.max_prompts = max_prompts
+        self._tool_fragments: dict[tuple, tuple[dict, str]] = {}
+        self._item_fragments: dict[tuple, str] = {}
+        self._prompts: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def format_item(self, name, description) -> str:
+        """Cached :func:`format_item_with_description`."""
+        key = (name, description)
+        fragment = self._item_fragments.get(key)
+        if fragment is None:
+            fragment = format_item_with_description(name, description)
+            self._item_fragments[key] = fragment
+        return fragment
+
+    def format_tools(self, api_dict: dict) -> str:
+        """Equivalent of ``textify_api_dict`` built from cached per-tool fragments."""
+        parts = []
+        for category, methods in api_dict.items():
+            parts.append(f"Import file: {category}")
+            parts.append("=" * (len("Import file: ") + len(category)))
+            for method in methods:
+                parts.append(self._tool_fragment(category, method))
+            parts.append("")
+        return "\n".join(parts)
+
+    def get_prompt(self, key: tuple) -> str | None:
+        """Return a previously assembled system prompt for ``key``."""
+        with self._lock:
+            prompt = self._prompts.get(key)
+            if prompt is None:
+                self.misses += 1
+                return None
+            self._prompts.move_to_end(key)
+            self.hits += 1
+            return prompt
+
+    def set_prompt(self, key: tuple, prompt: str) -> None:
+        """Store an assembled system prompt, evicting the least recently used ones."""
+        with self._lock:
+            self._prompts[key] = prompt
+            self._prompts.move_to_end(key)
+            while len(self._prompts) > self.max_prompts:
+                self._prompts.popitem(last=False)
+
+    def clear_prompts(self) -> None:
+        """Drop assembled prompts; fragments stay valid because they are keyed by content or identity."""
+        with self._lock:
+            self._prompts.clear()
+
+    def _tool_fragment(self, category: str, method: dict) -> str:
+        # Tool schemas are registered once and not edited afterwards, so identity is a sufficient key;
+        # the method itself is kept alongside the fragment so its id cannot be reused by another dict
+        key = (category, id(method))
+        entry = self._tool_fragments.get(key)
+        if entry is None or entry[0] is not method:
+            entry = (method, textify_api_method(method))
+            self._tool_fragments[key] = entry
+        return entry[1]
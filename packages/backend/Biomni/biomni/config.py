@@ -38,6 +38,45 @@ class BiomniConfig:
 
     # Tool settings
     use_tool_retriever: bool = True
+    # Retrieval strategy: "prompt" (LLM over full catalog), "index" (local BM25), "index_rerank" (BM25 + LLM)
+    retriever_mode: str = "prompt"
+    retriever_top_k: int = 20
+    retriever_index_dir: str | None = None  # Defaults to <path>/biomni_data/retrieval_index
+    # Retrieval result cache (size 0 disables; path enables a shared SQLite backing)
+    retrieval_cache_size: int = 256
+    retrieval_cache_ttl: int = 3600
+    retrieval_cache_path: str | None = None
+
+    # Data lake download check at agent start: "sync" (block until done), "background" or "off"
+    data_lake_check: str = "background"
+    download_workers: int = 8  # Concurrent data lake downloads
+
+    # Columnar data lake cache shared by all agents in the process
+    data_lake_cache_mb: int = 1024
+    # Defaults to .arrow_cache next to each converted file, or ~/.cache/biomni/arrow for read-only data lakes
+    data_lake_arrow_dir: str | None = None
+
+    # Shared HTTP client for database/literature tools
+    http_timeout: float = 30  # Seconds, per request
+    http_max_retries: int = 3  # Retries on connection errors, 429 and 5xx
+
+    # Response cache for query_* database tools
+    response_cache_mb: int = 256  # In-memory budget (0 disables the cache)
+    response_cache_ttl: int = 86400  # Seconds, for hosts without a per-database TTL
+    response_cache_ttls: dict[str, float] | None = None  # Per-host TTL overrides
+    response_cache_path: str | None = None  # SQLite file shared across processes
+    response_cache_disk_mb: int = 1024
+
+    # Cache of natural language -> API call translations in query_* tools
+    translation_cache_size: int = 1024  # 0 disables the cache
+    translation_cache_ttl: int = 86400
+
+    # Protein language model embeddings (generate_gene_embeddings_with_ESM_models)
+    embedding_cache_dir: str | None = None  # Defaults to <path>/biomni_data/embedding_cache ("" disables)
+    embedding_max_tokens: int | None = None  # Padded tokens per forward pass (default: 512 on CPU, 8192 on GPU)
+
+    # JASPAR matrices (query_jaspar and the transcription factor binding site tools)
+    jaspar_cache_dir: str | None = None  # Defaults to <path>/biomni_data/jaspar ("" disables)
 
     # Data licensing settings
     commercial_mode: bool = False  # If True, excludes non-commercial datasets
@@ -49,6 +88,19 @@ class BiomniConfig:
     # LLM source (auto-detected if None)
     source: str | None = None
 
+    # Provider prompt caching for the agent loop: "auto" (cache markers where supported) or "off"
+    prompt_cache_mode: str = "auto"
+
+    # Context compaction: elide old observations once the prompt exceeds this many tokens (0 disables)
+    context_budget_tokens: int = 0
+    context_keep_recent: int = 4
+
+    # Python code execution backend: "thread" (in-process) or "process" (subprocess per session)
+    execution_backend: str = "thread"
+    repl_max_workers: int = 8
+    repl_memory_limit_mb: int | None = None
+    repl_cpu_limit_seconds: int | None = None
+
     def __post_init__(self):
         """Load any environment variable overrides if they exist."""
         # Check for environment variable overrides (optional)
@@ -61,6 +113,54 @@ class BiomniConfig:
             self.llm = os.getenv("BIOMNI_LLM") or os.getenv("BIOMNI_LLM_MODEL")
         if os.getenv("BIOMNI_USE_TOOL_RETRIEVER"):
             self.use_tool_retriever = os.getenv("BIOMNI_USE_TOOL_RETRIEVER").lower() == "true"
+        if os.getenv("BIOMNI_RETRIEVER_MODE"):
+            self.retriever_mode = os.getenv("BIOMNI_RETRIEVER_MODE").lower()
+        if os.getenv("BIOMNI_RETRIEVER_TOP_K"):
+            self.retriever_top_k = int(os.getenv("BIOMNI_RETRIEVER_TOP_K"))
+        if os.getenv("BIOMNI_RETRIEVER_INDEX_DIR"):
+            self.retriever_index_dir = os.getenv("BIOMNI_RETRIEVER_INDEX_DIR")
+        if os.getenv("BIOMNI_RETRIEVAL_CACHE_SIZE"):
+            self.retrieval_cache_size = int(os.getenv("BIOMNI_RETRIEVAL_CACHE_SIZE"))
+        if os.getenv("BIOMNI_RETRIEVAL_CACHE_TTL"):
+            self.retrieval_cache_ttl = int(os.getenv("BIOMNI_RETRIEVAL_CACHE_TTL"))
+        if os.getenv("BIOMNI_RETRIEVAL_CACHE_PATH"):
+            self.retrieval_cache_path = os.getenv("BIOMNI_RETRIEVAL_CACHE_PATH")
+        if os.getenv("BIOMNI_DATA_LAKE_CHECK"):
+            self.data_lake_check = os.getenv("BIOMNI_DATA_LAKE_CHECK").lower()
+        if os.getenv("BIOMNI_DOWNLOAD_WORKERS"):
+            self.download_workers = int(os.getenv("BIOMNI_DOWNLOAD_WORKERS"))
+        if os.getenv("BIOMNI_DATA_LAKE_CACHE_MB"):
+            self.data_lake_cache_mb = int(os.getenv("BIOMNI_DATA_LAKE_CACHE_MB"))
+        if os.getenv("BIOMNI_DATA_LAKE_ARROW_DIR"):
+            self.data_lake_arrow_dir = os.getenv("BIOMNI_DATA_LAKE_ARROW_DIR")
+        if os.getenv("BIOMNI_HTTP_TIMEOUT"):
+            self.http_timeout = float(os.getenv("BIOMNI_HTTP_TIMEOUT"))
+        if os.getenv("BIOMNI_HTTP_MAX_RETRIES"):
+            self.http_max_retries = int(os.getenv("BIOMNI_HTTP_MAX_RETRIES"))
+        if os.getenv("BIOMNI_RESPONSE_CACHE_MB"):
+            self.response_cache_mb = int(os.getenv("BIOMNI_RESPONSE_CACHE_MB"))
+        if os.getenv("BIOMNI_RESPONSE_CACHE_TTL"):
+            self.response_cache_ttl = int(os.getenv("BIOMNI_RESPONSE_CACHE_TTL"))
+        if os.getenv("BIOMNI_RESPONSE_CACHE_TTLS"):
+            # "host=seconds,host=seconds"
+            self.response_cache_ttls = {
+                host.strip(): float(seconds)
+                for host, seconds in (item.split("=", 1) for item in os.getenv("BIOMNI_RESPONSE_CACHE_TTLS").split(","))
+            }
+        if os.getenv("BIOMNI_RESPONSE_CACHE_PATH"):
+            self.response_cache_path = os.getenv("BIOMNI_RESPONSE_CACHE_PATH")
+        if os.getenv("BIOMNI_RESPONSE_CACHE_DISK_MB"):
+            self.response_cache_disk_mb = int(os.getenv("BIOMNI_RESPONSE_CACHE_DISK_MB"))
+        if os.getenv("BIOMNI_TRANSLATION_CACHE_SIZE"):
+            self.translation_cache_size = int(os.getenv("BIOMNI_TRANSLATION_CACHE_SIZE"))
+        if os.getenv("BIOMNI_TRANSLATION_CACHE_TTL"):
+            self.translation_cache_ttl = int(os.getenv("BIOMNI_TRANSLATION_CACHE_TTL"))
+        if os.getenv("BIOMNI_EMBEDDING_CACHE_DIR") is not None:
+            self.embedding_cache_dir = os.getenv("BIOMNI_EMBEDDING_CACHE_DIR")
+        if os.getenv("BIOMNI_EMBEDDING_MAX_TOKENS"):
+            self.embedding_max_tokens = int(os.getenv("BIOMNI_EMBEDDING_MAX_TOKENS"))
+        if os.getenv("BIOMNI_JASPAR_CACHE_DIR") is not None:
+            self.jaspar_cache_dir = os.getenv("BIOMNI_JASPAR_CACHE_DIR")
         if os.getenv("BIOMNI_COMMERCIAL_MODE"):
             self.commercial_mode = os.getenv("BIOMNI_COMMERCIAL_MODE").lower() == "true"
         if os.getenv("BIOMNI_TEMPERATURE"):
@@ -71,6 +171,20 @@ class BiomniConfig:
             self.api_key = os.getenv("BIOMNI_CUSTOM_API_KEY")
         if os.getenv("BIOMNI_SOURCE"):
             self.source = os.getenv("BIOMNI_SOURCE")
+        if os.getenv("BIOMNI_PROMPT_CACHE_MODE"):
+            self.prompt_cache_mode = os.getenv("BIOMNI_PROMPT_CACHE_MODE").lower()
+        if os.getenv("BIOMNI_CONTEXT_BUDGET_TOKENS"):
+            self.context_budget_tokens = int(os.getenv("BIOMNI_CONTEXT_BUDGET_TOKENS"))
+        if os.getenv("BIOMNI_CONTEXT_KEEP_RECENT"):
+            self.context_keep_recent = int(os.getenv("BIOMNI_CONTEXT_KEEP_RECENT"))
+        if os.getenv("BIOMNI_EXECUTION_BACKEND"):
+            self.execution_backend = os.getenv("BIOMNI_EXECUTION_BACKEND").lower()
+        if os.getenv("BIOMNI_REPL_MAX_WORKERS"):
+            self.repl_max_workers = int(os.getenv("BIOMNI_REPL_MAX_WORKERS"))
+        if os.getenv("BIOMNI_REPL_MEMORY_LIMIT_MB"):
+            self.repl_memory_limit_mb = int(os.getenv("BIOMNI_REPL_MEMORY_LIMIT_MB"))
+        if os.getenv("BIOMNI_REPL_CPU_LIMIT_SECONDS"):
+            self.repl_cpu_limit_seconds = int(os.getenv("BIOMNI_REPL_CPU_LIMIT_SECONDS"))
 
     def to_dict(self) -> dict:
         """Convert config to dictionary for easy access."""
@@ -80,10 +194,39 @@ class BiomniConfig:
             "llm": self.llm,
             "temperature": self.temperature,
             "use_tool_retriever": self.use_tool_retriever,
+            "retriever_mode": self.retriever_mode,
+            "retriever_top_k": self.retriever_top_k,
+            "retriever_index_dir": self.retriever_index_dir,
+            "retrieval_cache_size": self.retrieval_cache_size,
+            "retrieval_cache_ttl": self.retrieval_cache_ttl,
+            "retrieval_cache_path": self.retrieval_cache_path,
+            "data_lake_check": self.data_lake_check,
+            "download_workers": self.download_workers,
+            "data_lake_cache_mb": self.data_lake_cache_mb,
+            "data_lake_arrow_dir": self.data_lake_arrow_dir,
+            "http_timeout": self.http_timeout,
+            "http_max_retries": self.http_max_retries,
+            "response_cache_mb": self.response_cache_mb,
+            "response_cache_ttl": self.response_cache_ttl,
+            "response_cache_ttls": self.response_cache_ttls,
+            "response_cache_path": self.response_cache_path,
+            "response_cache_disk_mb": self.response_cache_disk_mb,
+            "translation_cache_size": self.translation_cache_size,
+            "translation_cache_ttl": self.translation_cache_ttl,
+            "embedding_cache_dir": self.embedding_cache_dir,
+            "embedding_max_tokens": self.embedding_max_tokens,
+            "jaspar_cache_dir": self.jaspar_cache_dir,
             "commercial_mode": self.commercial_mode,
             "base_url": self.base_url,
             "api_key": self.api_key,
             "source": self.source,
+            "prompt_cache_mode": self.prompt_cache_mode,
+            "context_budget_tokens": self.context_budget_tokens,
+            "context_keep_recent": self.context_keep_recent,
+            "execution_backend": self.execution_backend,
+            "repl_max_workers": self.repl_max_workers,
+            "repl_memory_limit_mb": self.repl_memory_limit_mb,
+            "repl_cpu_limit_seconds": self.repl_cpu_limit_seconds,
         }
 
 
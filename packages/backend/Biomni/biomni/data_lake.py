@@ -0,0 +1,360 @@
+"""Columnar, memory-mapped access to data lake files shared by all agents in a process.
+
+Tools used to re-read whole data lake files with pandas on every call. :class:`DataLakeStore`
+keeps them columnar instead:
+
+- Parquet and Arrow IPC files are opened memory-mapped; only the requested columns are decoded.
+- CSV/TSV/TXT and pickled DataFrames are converted once into an uncompressed Arrow IPC file next to
+  the source (``.arrow_cache/``), which is memory-mapped on later reads (and shared between processes
+  through the OS page cache). Read-only data lakes use the user cache directory instead.
+- Decoded tables live in a process-wide LRU bounded by bytes, keyed by file, modification time and
+  column projection, so every session reuses them.
+- Filters are applied with Arrow compute. Files larger than the cache are never held in memory;
+  they are scanned with the filter pushed down to the reader (row-group statistics for Parquet).
+
+Filters are a list of ``(column, op, value)`` tuples combined with AND. Supported ops: ``==``, ``!=``,
+``<``, ``<=``, ``>``, ``>=``, ``in``, ``not in``, ``iequals`` and ``icontains`` (case-insensitive).
+
+    store = get_data_lake()
+    df = store.query(
+        data_lake_path + "/sgRNA_KO_SP_human.txt",
+        columns=["sgRNA Sequence", "Combined Rank"],
+        filters=[("Target Gene Symbol", "iequals", "EGFR")],
+    )
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+COLUMNAR_EXTENSIONS = {".parquet": "parquet", ".arrow": "ipc", ".feather": "ipc", ".ipc": "ipc"}
+CONVERTIBLE_EXTENSIONS = (".csv", ".tsv", ".txt", ".pkl", ".pickle")
+CACHE_DIR_NAME = ".arrow_cache"
+
+
+def default_user_cache_dir() -> str:
+    """Per-user directory for converted Arrow files of read-only data lakes (``$XDG_CACHE_HOME/biomni/arrow``)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "biomni", "arrow")
+
+
+def _delimiter_for(path: str) -> str:
+    if path.endswith(".csv"):
+        return ","
+    if path.endswith(".tsv"):
+        return "\t"
+    # .txt files in the data lake are tab-separated tables; fall back to sniffing the header
+    with open(path, encoding="utf-8", errors="replace") as f:
+        header = f.readline()
+    return "\t" if "\t" in header or "," not in header else ","
+
+
+def build_filter_expression(filters: list[tuple[str, str, Any]] | None):
+    """Arrow compute expression for a list of ``(column, op, value)`` filters (None if empty)."""
+    if not filters:
+        return None
+    import pyarrow.compute as pc
+
+    expression = None
+    for column, op, value in filters:
+        field = pc.field(column)
+        if op == "==":
+            term = field == value
+        elif op == "!=":
+            term = field != value
+        elif op == "<":
+            term = field < value
+        elif op == "<=":
+            term = field <= value
+        elif op == ">":
+            term = field > value
+        elif op == ">=":
+            term = field >= value
+        elif op == "in":
+            term = field.isin(list(value))
+        elif op == "not in":
+            term = ~field.isin(list(value))
+        elif op == "iequals":
+            term = pc.utf8_upper(field) == str(value).upper()
+        elif op == "icontains":
+            term = pc.match_substring(field, str(value), ignore_case=True)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        expression = term if expression is None else expression & term
+    return expression
+
+
+class DataLakeStore:
+    """Process-wide cache of columnar data lake tables."""
+
+    def __init__(self, max_bytes: int = 1 << 30, cache_dir: str | None = None):
+        """Create the store.
+
+        Args:
+            max_bytes: Upper bound on the bytes of decoded tables (and parsed objects) kept in memory
+            cache_dir: Directory for converted Arrow files (default: ``.arrow_cache`` next to each source,
+                or :func:`default_user_cache_dir` where the source directory is not writable)
+
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._cache_dirs: dict[str, str] = {}
+        self._entries: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._convert_locks: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.conversions = 0
+        self.scans = 0
+
+    def columnar_path(self, path: str) -> tuple[str, str]:
+        """Memory-mappable file for ``path`` and its format (``"parquet"`` or ``"ipc"``), converting once if needed."""
+        path = os.path.abspath(path)
+        ext = os.path.splitext(path)[1].lower()
+        if ext in COLUMNAR_EXTENSIONS:
+            return path, COLUMNAR_EXTENSIONS[ext]
+        if ext not in CONVERTIBLE_EXTENSIONS:
+            raise ValueError(f"Unsupported data lake file type: {path}")
+
+        stat = os.stat(path)
+        tag = hashlib.sha256(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:12]
+        name = f"{os.path.basename(path)}.{tag}.arrow"
+        source_dir = os.path.dirname(path)
+        target = os.path.join(self._cache_dir_for(source_dir), name)
+        if os.path.exists(target):
+            return target, "ipc"
+        if not self.cache_dir:
+            # Converted before the data lake was made read-only
+            prebuilt = os.path.join(source_dir, CACHE_DIR_NAME, name)
+            if os.path.exists(prebuilt):
+                return prebuilt, "ipc"
+
+        with self._lock:
+            convert_lock = self._convert_locks.setdefault(target, threading.Lock())
+        with convert_lock:
+            if not os.path.exists(target):
+                self._convert(path, target)
+        return target, "ipc"
+
+    def read_table(self, path: str, columns: list[str] | None = None):
+        """Projected table for ``path`` as a ``pyarrow.Table``, cached by bytes."""
+        source, fmt = self.columnar_path(path)
+        key = ("table", source, os.stat(source).st_mtime_ns, tuple(columns) if columns else None)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        table = self._read(source, fmt, columns)
+        self._put(key, table, table.nbytes)
+        return table
+
+    def query(
+        self,
+        path: str,
+        columns: list[str] | None = None,
+        filters: list[tuple[str, str, Any]] | None = None,
+        to_pandas: bool = True,
+    ):
+        """Rows of ``path`` matching ``filters``, restricted to ``columns``.
+
+        Args:
+            path: Data lake file (Parquet, Arrow, CSV/TSV/TXT or pickled DataFrame)
+            columns: Columns to return (all if None)
+            filters: ``(column, op, value)`` tuples combined with AND
+            to_pandas: Return a DataFrame (default) instead of a ``pyarrow.Table``
+
+        Returns:
+            DataFrame or ``pyarrow.Table`` with the matching rows
+
+        """
+        source, fmt = self.columnar_path(path)
+        expression = build_filter_expression(filters)
+        needed = None
+        if columns is not None:
+            needed = list(dict.fromkeys(list(columns) + [column for column, _, _ in filters or []]))
+
+        if os.path.getsize(source) > self.max_bytes and expression is not None:
+            # Too large to keep in memory: scan with the predicate pushed down to the reader
+            import pyarrow.dataset as ds
+
+            self.scans += 1
+            table = ds.dataset(source, format=fmt).to_table(columns=needed, filter=expression)
+        else:
+            table = self.read_table(source, needed)
+            if expression is not None:
+                table = table.filter(expression)
+
+        if columns is not None and list(columns) != table.column_names:
+            table = table.select(list(columns))
+        return table.to_pandas() if to_pandas else table
+
+    def get_object(
+        self,
+        path: str,
+        loader: Callable[[str], Any],
+        nbytes: int | None = None,
+        key: str | None = None,
+        deps: Sequence[str] = (),
+    ):
+        """Result of ``loader(path)`` cached until the file changes (for non-tabular files such as OBO).
+
+        Args:
+            path: Source file
+            loader: Function parsing the file
+            nbytes: Size charged against the cache budget (default: estimated from the parsed value)
+            key: Name of what ``loader`` builds from the file (default: the loader's qualified name)
+            deps: Other files the value is built from; changing, adding or removing one also reloads it
+
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        versions = tuple(
+            (dep, os.stat(dep).st_mtime_ns if os.path.exists(dep) else None) for dep in map(os.path.abspath, deps)
+        )
+        name = key if key is not None else getattr(loader, "__qualname__", repr(loader))
+        key = ("object", path, stat.st_mtime_ns, name, versions)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        value = loader(path)
+        self._put(key, value, nbytes if nbytes is not None else _estimate_size(value))
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached table and object (converted Arrow files stay on disk)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters and memory use."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "conversions": self.conversions,
+            "pushdown_scans": self.scans,
+        }
+
+    def _read(self, source: str, fmt: str, columns: list[str] | None):
+        import pyarrow as pa
+
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.read_table(source, columns=columns, memory_map=True)
+
+        # Uncompressed IPC: the table's buffers point into the memory map (zero copy)
+        with pa.memory_map(source, "r") as source_file:
+            table = pa.ipc.open_file(source_file).read_all()
+        return table.select(columns) if columns else table
+
+    def _cache_dir_for(self, source_dir: str) -> str:
+        """Directory for Arrow files converted from files in ``source_dir``."""
+        cache_dir = self._cache_dirs.get(source_dir)
+        if cache_dir is None:
+            # Shared directories get one subdirectory per source directory, so that files with the same
+            # name in two directories do not remove each other's conversions as stale
+            source_tag = hashlib.sha256(source_dir.encode()).hexdigest()[:12]
+            sibling = os.path.join(source_dir, CACHE_DIR_NAME)
+            if self.cache_dir:
+                cache_dir = os.path.join(self.cache_dir, source_tag)
+            elif os.access(sibling if os.path.isdir(sibling) else source_dir, os.W_OK):
+                cache_dir = sibling
+            else:
+                cache_dir = os.path.join(default_user_cache_dir(), source_tag)
+            self._cache_dirs[source_dir] = cache_dir
+        return cache_dir
+
+    def _convert(self, path: str, target: str) -> None:
+        import pandas as pd
+        import pyarrow as pa
+
+        if path.endswith((".pkl", ".pickle")):
+            df = pd.read_pickle(path)
+            if not isinstance(df, pd.DataFrame):
+                raise ValueError(f"{path} does not contain a DataFrame")
+            table = pa.Table.from_pandas(df)
+        else:
+            table = pa.Table.from_pandas(pd.read_csv(path, sep=_delimiter_for(path)), preserve_index=False)
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.conversions += 1
+
+        # Remove Arrow files converted from older versions of the same source
+        prefix = os.path.basename(path) + "."
+        for name in os.listdir(os.path.dirname(target)):
+            stale = os.path.join(os.path.dirname(target), name)
+            if name.startswith(prefix) and name.endswith(".arrow") and stale != target:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    def _get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _put(self, key: tuple, value: Any, nbytes: int) -> None:
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+
+
+_shared_store: DataLakeStore | None = None
+_shared_lock = threading.Lock()
+
+
+def get_data_lake(config=None) -> DataLakeStore:
+    """Process-wide data lake store configured from ``config`` (or the default config)."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            if config is None:
+                from biomni.config import default_config as config
+            _shared_store = DataLakeStore(
+                max_bytes=config.data_lake_cache_mb * 1024 * 1024,
+                cache_dir=config.data_lake_arrow_dir,
+            )
+        return _shared_store
+
+
+def _estimate_size(value: Any) -> int:
+    """Rough deep size of dicts/lists of strings, for objects cached with :meth:`DataLakeStore.get_object`."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    if isinstance(value, list | tuple | set | frozenset):
+        return sys.getsizeof(value) + sum(_estimate_size(v) for v in value)
+    return sys.getsizeof(value)
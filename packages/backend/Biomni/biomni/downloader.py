@@ -0,0 +1,226 @@
+"""Parallel, resumable and verified downloads for the data lake.
+
+Files are fetched by a bounded pool of worker threads. Each download writes to ``<file>.part``;
+an interrupted download resumes from the partial file with an HTTP ``Range`` request (servers
+that ignore ``Range`` simply restart it). A finished file is checked against the expected size
+and SHA-256 and only then atomically renamed into place, so readers never see a truncated file.
+
+Expected sizes and hashes come from a manifest, a JSON document of the form::
+
+    {"files": {"hp.obo": {"size": 9876543, "sha256": "ab12..."}, ...}}
+
+The data lake manifest is looked up next to the files (``<bucket>/<folder>/manifest.json``). Without
+a manifest, the ``Content-Length`` of the response is used as the expected size. A local stand-in for
+the bucket (any HTTP server, e.g. ``python -m http.server`` in a directory containing ``data_lake/``)
+works the same way; use :func:`build_manifest` to write a manifest for a directory.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import requests
+import tqdm
+
+MANIFEST_NAME = "manifest.json"
+CHUNK_SIZE = 1 << 20
+
+_thread_local = threading.local()
+
+
+@dataclass
+class DownloadTask:
+    """One file to download."""
+
+    url: str
+    path: str
+    size: int | None = None
+    sha256: str | None = None
+
+
+class DownloadError(Exception):
+    """A download failed or did not match its manifest entry."""
+
+
+def _session() -> requests.Session:
+    # requests.Session is not guaranteed to be thread-safe; keep one per worker thread
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+    return session
+
+
+def file_sha256(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(directory: str, output_path: str | None = None) -> dict:
+    """Write a manifest with the size and SHA-256 of every file in ``directory``.
+
+    Args:
+        directory: Directory whose files are listed (not recursive; hidden and ``.part`` files are skipped)
+        output_path: Where to write the manifest (default: ``<directory>/manifest.json``)
+
+    Returns:
+        The manifest
+
+    """
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.startswith(".") or name.endswith(".part") or name == MANIFEST_NAME or not os.path.isfile(path):
+            continue
+        files[name] = {"size": os.path.getsize(path), "sha256": file_sha256(path)}
+    manifest = {"files": files}
+    with open(output_path or os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def fetch_manifest(base_url: str, timeout: float = 30) -> dict[str, dict]:
+    """Manifest entries published at ``<base_url>/manifest.json`` (empty if there is none)."""
+    try:
+        response = _session().get(f"{base_url.rstrip('/')}/{MANIFEST_NAME}", timeout=timeout)
+        if response.status_code != 200:
+            return {}
+        return response.json().get("files", {})
+    except (requests.RequestException, ValueError):
+        return {}
+
+
+def _fetch(task: DownloadTask, part_path: str, offset: int, timeout: float, progress) -> int | None:
+    """Write the bytes of ``task.url`` from ``offset`` on to the partial file; returns the expected size if known."""
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with _session().get(task.url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 416 and offset:
+            if offset == task.size:
+                # Nothing left to fetch: the partial file is already complete
+                return task.size
+            restart = True
+        else:
+            restart = False
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # The server ignored Range and sent the whole file
+                offset = 0
+            length = response.headers.get("Content-Length")
+            expected_size = task.size
+            if expected_size is None and length is not None:
+                expected_size = offset + int(length)
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    if progress is not None:
+                        progress.update(len(chunk))
+    if restart:
+        # The server has no bytes past the partial file, so it is stale or corrupt (or its size is
+        # unknown and cannot be checked): discard it and download the whole file
+        os.remove(part_path)
+        return _fetch(task, part_path, 0, timeout, progress)
+    return expected_size
+
+
+def download_file(task: DownloadTask, retries: int = 3, timeout: float = 60, progress=None) -> str:
+    """Download ``task.url`` to ``task.path`` through a resumable ``.part`` file.
+
+    Args:
+        task: URL, destination and optional expected size/hash
+        retries: Attempts after a network error; each retry resumes from the partial file
+        timeout: Connect/read timeout in seconds
+        progress: Optional tqdm bar updated with the number of bytes received
+
+    Returns:
+        The destination path
+
+    Raises:
+        DownloadError: If the file cannot be fetched or fails verification
+
+    """
+    part_path = task.path + ".part"
+    os.makedirs(os.path.dirname(os.path.abspath(task.path)) or ".", exist_ok=True)
+    last_error = None
+
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(min(2**attempt, 30))
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if task.size is not None and offset > task.size:
+            os.remove(part_path)
+            offset = 0
+
+        try:
+            expected_size = task.size
+            if task.size is None or offset < task.size:
+                expected_size = _fetch(task, part_path, offset, timeout, progress)
+
+            _verify(part_path, expected_size, task.sha256)
+            os.replace(part_path, task.path)
+            return task.path
+        except DownloadError as e:
+            # Corrupt or oversized data cannot be resumed; start over on the next attempt
+            last_error = e
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        except requests.HTTPError as e:
+            last_error = e
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and 400 <= status < 500 and status not in (408, 429):
+                break
+        except (requests.RequestException, OSError) as e:
+            last_error = e
+
+    raise DownloadError(f"Failed to download {task.url}: {last_error}")
+
+
+def download_files(tasks: list[DownloadTask], max_workers: int = 8, retries: int = 3, desc: str = "Downloading"):
+    """Download several files concurrently.
+
+    Args:
+        tasks: Files to download
+        max_workers: Maximum concurrent downloads
+        retries: Retries per file
+        desc: Progress bar label
+
+    Returns:
+        Dictionary mapping each destination path to True on success, False on failure
+
+    """
+    results = {}
+    if not tasks:
+        return results
+
+    known_sizes = [task.size for task in tasks if task.size is not None]
+    total = sum(known_sizes) if len(known_sizes) == len(tasks) else None
+    with (
+        tqdm.tqdm(total=total, unit="B", unit_scale=True, desc=desc, ncols=80) as progress,
+        ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="biomni-download") as pool,
+    ):
+        futures = {pool.submit(download_file, task, retries, 60, progress): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                future.result()
+                results[task.path] = True
+            except DownloadError as e:
+                print(f"✗ {e}")
+                results[task.path] = False
+    return results
+
+
+def _verify(path: str, size: int | None, sha256: str | None) -> None:
+    actual_size = os.path.getsize(path)
+    if size is not None and actual_size != size:
+        if actual_size < size:
+            raise OSError(f"incomplete download ({actual_size} of {size} bytes)")
+        raise DownloadError(f"size mismatch for {os.path.basename(path)}: {actual_size} != {size}")
+    if sha256 is not None and file_sha256(path) != sha256.lower():
+        raise DownloadError(f"checksum mismatch for {os.path.basename(path)}")
@@ -0,0 +1,464 @@
+"""Execution backends for Python code emitted by the agent.
+
+Two backends are available:
+
+- ``"thread"`` (default): runs code in-process through ``run_python_repl`` on a helper
+  thread. All agents share one namespace and a timed-out call cannot be stopped.
+- ``"process"``: runs code in a long-lived subprocess per session. Each session keeps its
+  own namespace, workers are forked from a forkserver that has the heavy scientific
+  libraries pre-imported, timeouts send a real SIGKILL, and memory/CPU rlimits can be set.
+
+This module only uses the standard library at import time so that it is cheap to load
+into the forkserver. Workers use the stock forkserver, so like in any multiprocessing
+program each worker imports the parent's main module once as ``__mp_main__``. The main
+module must therefore be safe to import: the server's ``main.py`` creates its services in a
+startup hook, and scripts keep their work under ``if __name__ == "__main__":``.
+"""
+
+import multiprocessing
+import pickle
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from io import StringIO
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Modules imported once in the forkserver so that every worker starts warm
+DEFAULT_PRELOAD_MODULES = ["numpy", "pandas", "scanpy", "matplotlib", "biomni.tool.support_tools"]
+
+TIMEOUT_MESSAGE = (
+    "ERROR: Code execution timed out after {timeout} seconds. "
+    "Please try with simpler inputs or break your task into smaller steps."
+)
+
+
+class ExecutionBackend(ABC):
+    """Interface used by the A1 ``execute`` node to run Python code."""
+
+    name = "base"
+
+    @abstractmethod
+    def run_python(self, code: str, timeout: int = 600, session_id: str | None = None) -> str:
+        """Execute ``code`` and return its captured stdout."""
+
+    @abstractmethod
+    def inject_functions(self, functions: dict, session_id: str | None = None) -> None:
+        """Make custom tool functions callable from executed code."""
+
+    @abstractmethod
+    def get_captured_plots(self, session_id: str | None = None) -> list[str]:
+        """Plots captured during the last execution."""
+
+    @abstractmethod
+    def clear_captured_plots(self, session_id: str | None = None) -> None:
+        """Forget the captured plots."""
+
+    # Optional hooks; backends without per-session or global state keep the no-op
+    def release_session(self, session_id: str) -> None:  # noqa: B027
+        """Drop any state held for a session."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release all resources held by the backend."""
+
+
+class ThreadExecutionBackend(ExecutionBackend):
+    """In-process execution using the shared ``run_python_repl`` namespace."""
+
+    name = "thread"
+
+    def run_python(self, code: str, timeout: int = 600, session_id: str | None = None) -> str:
+        from biomni.tool.support_tools import run_python_repl
+        from biomni.utils import run_with_timeout
+
+        return run_with_timeout(run_python_repl, [code], timeout=timeout)
+
+    def inject_functions(self, functions: dict, session_id: str | None = None) -> None:
+        from biomni.utils import inject_custom_functions_to_repl
+
+        inject_custom_functions_to_repl(functions)
+
+    def get_captured_plots(self, session_id: str | None = None) -> list[str]:
+        from biomni.tool.support_tools import get_captured_plots
+
+        return get_captured_plots()
+
+    def clear_captured_plots(self, session_id: str | None = None) -> None:
+        from biomni.tool.support_tools import clear_captured_plots
+
+        clear_captured_plots()
+
+
+def _apply_rlimits(memory_limit_mb: int | None) -> None:
+    """Apply the address-space limit inside a worker process."""
+    if resource is None or not memory_limit_mb:
+        return
+    limit = int(memory_limit_mb) * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        print(f"Warning: Could not set memory limit: {e}", file=sys.stderr)
+
+
+def _set_cpu_budget(cpu_limit_seconds: int | None) -> None:
+    """Allow the next execution to use at most ``cpu_limit_seconds`` of additional CPU time.
+
+    RLIMIT_CPU counts CPU time over the whole process lifetime, so the soft limit is moved
+    forward before every execution. Exceeding it delivers SIGXCPU, which terminates the worker.
+    """
+    if resource is None or not cpu_limit_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + int(cpu_limit_seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError) as e:
+        print(f"Warning: Could not set CPU limit: {e}", file=sys.stderr)
+
+
+def _worker_main(conn, memory_limit_mb: int | None, cpu_limit_seconds: int | None) -> None:
+    """Entry point of a REPL worker process.
+
+    Receives ``(command, payload)`` tuples over ``conn`` and answers with
+    ``(status, output, plots)`` tuples. The namespace lives for the lifetime of the process.
+    """
+    from biomni.tool.support_tools import (
+        _apply_matplotlib_patches,
+        clear_captured_plots,
+        get_captured_plots,
+    )
+
+    _apply_rlimits(memory_limit_mb)
+    namespace = {"__name__": "__main__", "__builtins__": __builtins__}
+
+    while True:
+        try:
+            command, payload = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        if command == "close":
+            break
+
+        if command == "inject":
+            namespace.update(payload)
+            conn.send(("ok", "", []))
+            continue
+
+        if command == "exec":
+            clear_captured_plots()
+            _set_cpu_budget(cpu_limit_seconds)
+            old_stdout = sys.stdout
+            sys.stdout = mystdout = StringIO()
+            try:
+                _apply_matplotlib_patches()
+                exec(payload, namespace)
+                output = mystdout.getvalue()
+            except MemoryError:
+                output = mystdout.getvalue() + "\nError: Out of memory (worker memory limit reached)"
+            except Exception as e:
+                output = f"Error: {str(e)}"
+            finally:
+                sys.stdout = old_stdout
+            conn.send(("ok", output, get_captured_plots()))
+            continue
+
+        conn.send(("error", f"Unknown command: {command}", []))
+
+
+def get_worker_context(preload_modules: list[str] | None = None):
+    """Return a multiprocessing context, preferring a preloaded forkserver.
+
+    The forkserver imports ``preload_modules`` once, so processes forked from it start warm; ``"__main__"``
+    stays in the list as in multiprocessing's default. The forkserver is shared by the whole process, so
+    ``preload_modules`` only applies if it has not been started yet.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        modules = ["__main__"] + list(preload_modules if preload_modules is not None else DEFAULT_PRELOAD_MODULES)
+        if "biomni.execution" not in modules:
+            modules.append("biomni.execution")
+        ctx.set_forkserver_preload(list(dict.fromkeys(modules)))
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class ProcessReplWorker:
+    """A single long-lived Python worker process with its own namespace."""
+
+    def __init__(
+        self,
+        context,
+        memory_limit_mb: int | None = None,
+        cpu_limit_seconds: int | None = None,
+    ):
+        self._ctx = context
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit_seconds = cpu_limit_seconds
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._functions: dict = {}
+        self._plots: list[str] = []
+        self.restarts = 0
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def _start(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.memory_limit_mb, self.cpu_limit_seconds),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        if self._functions:
+            self._send_functions(self._functions)
+
+    def _ensure_started(self) -> None:
+        if not self.is_alive():
+            if self._process is not None:
+                self.restarts += 1
+            self._cleanup()
+            self._start()
+
+    def _cleanup(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+        self._conn = None
+        self._process = None
+
+    def kill(self) -> None:
+        """Terminate the worker with SIGKILL. Its namespace is lost."""
+        if self._process is not None and self._process.is_alive():
+            self._process.kill()
+            self._process.join(timeout=5)
+        self._cleanup()
+
+    def close(self) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                try:
+                    self._conn.send(("close", None))
+                    self._process.join(timeout=2)
+                except (OSError, BrokenPipeError):
+                    pass
+            self.kill()
+
+    def _send_functions(self, functions: dict) -> None:
+        picklable = {}
+        for name, func in functions.items():
+            try:
+                pickle.dumps(func)
+                picklable[name] = func
+            except Exception:
+                print(f"Warning: Custom function '{name}' cannot be sent to the execution worker (not picklable)")
+        if not picklable:
+            return
+        try:
+            self._conn.send(("inject", picklable))
+            self._conn.recv()
+        except (EOFError, OSError):
+            # The worker died; run() reports the failure and restarts it
+            pass
+
+    def inject_functions(self, functions: dict) -> None:
+        new_functions = {k: v for k, v in functions.items() if self._functions.get(k) is not v}
+        if not new_functions:
+            return
+        with self._lock:
+            self._functions.update(new_functions)
+            if self.is_alive():
+                self._send_functions(new_functions)
+
+    def run(self, code: str, timeout: int = 600) -> str:
+        """Execute ``code`` in the worker and return its captured stdout."""
+        code = code.strip("```").strip()
+        with self._lock:
+            self._ensure_started()
+            self._plots = []
+            try:
+                self._conn.send(("exec", code))
+            except OSError:
+                # The worker exited between calls (e.g. killed externally); start a fresh one
+                self.kill()
+                self._ensure_started()
+                self._conn.send(("exec", code))
+
+            if not self._conn.poll(timeout):
+                print(f"TIMEOUT: Code execution timed out after {timeout} seconds, killing worker {self.pid}")
+                self.kill()
+                return (
+                    TIMEOUT_MESSAGE.format(timeout=timeout)
+                    + " The Python session was restarted and previously defined variables were lost."
+                )
+
+            try:
+                _, output, plots = self._conn.recv()
+            except (EOFError, OSError):
+                self._process.join(timeout=1)
+                exitcode = self._process.exitcode
+                self.kill()
+                return (
+                    f"Error: The execution worker exited unexpectedly (exit code {exitcode}), "
+                    "possibly because it exceeded its memory or CPU limit. "
+                    "The Python session was restarted and previously defined variables were lost."
+                )
+            self._plots = plots
+            return output
+
+    def get_captured_plots(self) -> list[str]:
+        return list(self._plots)
+
+    def clear_captured_plots(self) -> None:
+        self._plots = []
+
+
+class ProcessExecutionBackend(ExecutionBackend):
+    """Per-session subprocess execution with a bounded number of live workers.
+
+    Args:
+        max_workers: Maximum number of live session workers. The least recently used
+            worker is shut down when the limit is exceeded.
+        memory_limit_mb: Address-space limit (RLIMIT_AS) for each worker, in MB
+        cpu_limit_seconds: CPU time allowed per execution (RLIMIT_CPU)
+        preload_modules: Modules imported once in the forkserver template
+
+    """
+
+    name = "process"
+    DEFAULT_SESSION = "default"
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        memory_limit_mb: int | None = None,
+        cpu_limit_seconds: int | None = None,
+        preload_modules: list[str] | None = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit_seconds = cpu_limit_seconds
+        self._ctx = get_worker_context(preload_modules)
+        self._workers: OrderedDict[str, ProcessReplWorker] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_worker(self, session_id: str | None) -> ProcessReplWorker:
+        key = session_id or self.DEFAULT_SESSION
+        evicted = []
+        with self._lock:
+            worker = self._workers.get(key)
+            if worker is None:
+                worker = ProcessReplWorker(self._ctx, self.memory_limit_mb, self.cpu_limit_seconds)
+                self._workers[key] = worker
+            self._workers.move_to_end(key)
+            while len(self._workers) > self.max_workers:
+                _, old = self._workers.popitem(last=False)
+                evicted.append(old)
+        for old in evicted:
+            old.close()
+        return worker
+
+    def run_python(self, code: str, timeout: int = 600, session_id: str | None = None) -> str:
+        return self._get_worker(session_id).run(code, timeout=timeout)
+
+    def inject_functions(self, functions: dict, session_id: str | None = None) -> None:
+        if functions:
+            self._get_worker(session_id).inject_functions(functions)
+
+    def get_captured_plots(self, session_id: str | None = None) -> list[str]:
+        worker = self._workers.get(session_id or self.DEFAULT_SESSION)
+        return worker.get_captured_plots() if worker is not None else []
+
+    def clear_captured_plots(self, session_id: str | None = None) -> None:
+        worker = self._workers.get(session_id or self.DEFAULT_SESSION)
+        if worker is not None:
+            worker.clear_captured_plots()
+
+    def release_session(self, session_id: str) -> None:
+        with self._lock:
+            worker = self._workers.pop(session_id, None)
+        if worker is not None:
+            worker.close()
+
+    def close(self) -> None:
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": len(self._workers),
+            "max_workers": self.max_workers,
+            "alive": sum(1 for w in self._workers.values() if w.is_alive()),
+            "restarts": sum(w.restarts for w in self._workers.values()),
+        }
+
+
+_shared_backends: dict[str, ExecutionBackend] = {}
+_shared_lock = threading.Lock()
+
+
+def get_execution_backend(backend: str | ExecutionBackend | None = None, config=None) -> ExecutionBackend:
+    """Resolve an execution backend by name.
+
+    Named backends are process-wide singletons so that several agents (e.g. a server-side
+    agent pool) share one bounded set of workers.
+
+    Args:
+        backend: "thread", "process", an ExecutionBackend instance, or None for the configured default
+        config: BiomniConfig to read defaults from (defaults to ``default_config``)
+
+    Returns:
+        The execution backend instance
+
+    """
+    if isinstance(backend, ExecutionBackend):
+        return backend
+
+    if config is None:
+        from biomni.config import default_config
+
+        config = default_config
+
+    name = (backend or config.execution_backend or "thread").lower()
+    with _shared_lock:
+        if name not in _shared_backends:
+            if name == "thread":
+                _shared_backends[name] = ThreadExecutionBackend()
+            elif name == "process":
+                _shared_backends[name] = ProcessExecutionBackend(
+                    max_workers=config.repl_max_workers,
+                    memory_limit_mb=config.repl_memory_limit_mb,
+                    cpu_limit_seconds=config.repl_cpu_limit_seconds,
+                )
+            else:
+                raise ValueError(f"Invalid execution backend: {name}. Valid options are 'thread' or 'process'")
+        return _shared_backends[name]
+
+
+def release_session(session_id: str) -> None:
+    """Shut down the execution state held for ``session_id`` in every shared backend."""
+    for backend in list(_shared_backends.values()):
+        backend.release_session(session_id)
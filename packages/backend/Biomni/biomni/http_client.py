@@ -0,0 +1,253 @@
+"""Shared HTTP client for the database and literature tools.
+
+All tool requests go through one client per process. Each thread gets its own ``requests.Session``
+(sessions are not guaranteed to be thread-safe, see :mod:`biomni.downloader`), so connections to each
+host are kept alive and reused per thread, and every request gets a default timeout. On top of that
+the client adds:
+
+- retries with exponential backoff (and jitter) on connection errors, timeouts, 429 and 5xx,
+  honouring ``Retry-After``;
+- a token-bucket rate limit per host (NCBI E-utilities: 3 req/s, or 10 req/s with
+  ``NCBI_API_KEY``; Ensembl REST: 15 req/s), shared by all threads of the process;
+- per-host counters for requests, retries, errors and latency (:meth:`HttpClient.get_stats`), kept
+  for the :data:`MAX_TRACKED_HOSTS` most recently contacted hosts.
+
+    from biomni.http_client import get_http_client
+
+    response = get_http_client().get("https://rest.ensembl.org/lookup/symbol/homo_sapiens/BRCA1")
+"""
+
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_TRACKED_HOSTS = 256  # hosts with request counters; the least recently contacted are dropped first
+
+
+def default_rate_limits() -> dict[str, float]:
+    """Requests per second allowed per host, following each provider's published limits."""
+    return {
+        "eutils.ncbi.nlm.nih.gov": 10.0 if os.getenv("NCBI_API_KEY") else 3.0,
+        "rest.ensembl.org": 15.0,
+        "grch37.rest.ensembl.org": 15.0,
+    }
+
+
+class TokenBucket:
+    """Thread-safe token bucket; :meth:`acquire` blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """Create a bucket refilled at ``rate`` tokens per second, holding at most ``capacity`` (default: ``rate``)."""
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if necessary. Returns the time waited in seconds."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class _HostStats:
+    __slots__ = ("requests", "retries", "errors", "throttled_s", "latency_total_s", "latency_max_s")
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.throttled_s = 0.0
+        self.latency_total_s = 0.0
+        self.latency_max_s = 0.0
+
+
+class HttpClient:
+    """Pooled HTTP client with retries, per-host rate limits and per-host metrics."""
+
+    def __init__(
+        self,
+        timeout: float = 30,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        rate_limits: dict[str, float] | None = None,
+        pool_maxsize: int = 16,
+    ):
+        """Create the client.
+
+        Args:
+            timeout: Default connect/read timeout in seconds (overridable per request)
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_factor: Base delay; retry ``n`` waits ``backoff_factor * 2**n`` seconds plus jitter
+            max_backoff: Upper bound on a single backoff delay
+            rate_limits: Requests per second per host (default: :func:`default_rate_limits`)
+            pool_maxsize: Keep-alive connections kept per host (in each thread's session)
+
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.pool_maxsize = pool_maxsize
+        self._local = threading.local()
+
+        # Only hosts given a limit (by default_rate_limits or set_rate_limit) have a bucket
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats: OrderedDict[str, _HostStats] = OrderedDict()
+        self._lock = threading.Lock()
+        for host, rate in (rate_limits if rate_limits is not None else default_rate_limits()).items():
+            self.set_rate_limit(host, rate)
+
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session (created on first use)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=self.pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+        return session
+
+    def set_rate_limit(self, host: str, rate: float | None) -> None:
+        """Limit requests to ``host`` to ``rate`` per second (None removes the limit)."""
+        with self._lock:
+            if rate:
+                self._buckets[host] = TokenBucket(rate)
+            else:
+                self._buckets.pop(host, None)
+
+    def request(self, method: str, url: str, retries: int | None = None, **kwargs) -> requests.Response:
+        """Send a request with rate limiting and retries; arguments are those of ``requests.request``.
+
+        Returns:
+            The final response (which may still be a 429/5xx after the last retry)
+
+        Raises:
+            requests.RequestException: If the last attempt failed without a response
+
+        """
+        host = urlsplit(url).hostname or ""
+        kwargs.setdefault("timeout", self.timeout)
+        retries = self.max_retries if retries is None else retries
+        stats = self._host_stats(host)
+        bucket = self._buckets.get(host)
+
+        attempt = 0
+        while True:
+            if bucket is not None:
+                waited = bucket.acquire()
+                if waited:
+                    with self._lock:
+                        stats.throttled_s += waited
+
+            start = time.perf_counter()
+            response = None
+            error = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                stats.requests += 1
+                stats.latency_total_s += elapsed
+                stats.latency_max_s = max(stats.latency_max_s, elapsed)
+                if error is not None or response.status_code >= 400:
+                    stats.errors += 1
+
+            retryable = error is not None or response.status_code in RETRY_STATUSES
+            if not retryable or attempt >= retries:
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self._retry_delay(attempt, response)
+            if response is not None:
+                response.close()
+            with self._lock:
+                stats.retries += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """``GET`` through :meth:`request`."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """``POST`` through :meth:`request`."""
+        return self.request("POST", url, **kwargs)
+
+    def get_stats(self) -> dict[str, dict]:
+        """Per-host request, retry and error counts, average/max latency and time spent rate limited."""
+        with self._lock:
+            return {
+                host: {
+                    "requests": s.requests,
+                    "retries": s.retries,
+                    "errors": s.errors,
+                    "avg_latency_ms": round(1000 * s.latency_total_s / s.requests, 1) if s.requests else 0.0,
+                    "max_latency_ms": round(1000 * s.latency_max_s, 1),
+                    "throttled_s": round(s.throttled_s, 3),
+                    "rate_limit": self._buckets[host].rate if host in self._buckets else None,
+                }
+                for host, s in self._stats.items()
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _host_stats(self, host: str) -> _HostStats:
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = _HostStats()
+                while len(self._stats) > MAX_TRACKED_HOSTS:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(host)
+            return stats
+
+    def _retry_delay(self, attempt: int, response: requests.Response | None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        delay = self.backoff_factor * (2**attempt)
+        return min(delay + random.uniform(0, delay / 2), self.max_backoff)
+
+
+_shared_client: HttpClient | None = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client(config=None) -> HttpClient:
+    """Process-wide HTTP client configured from ``config`` (or the default config)."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            if config is None:
+                from biomni.config import default_config as config
+            _shared_client = HttpClient(timeout=config.http_timeout, max_retries=config.http_max_retries)
+        return _shared_client
@@ -0,0 +1,76 @@
+"""Deferred imports for heavy optional dependencies of the tool modules.
+
+Tool modules such as ``biomni.tool.genomics`` need ``torch``, ``esm`` or ``scanpy`` for a
+few functions only. Binding them with :func:`lazy_import` keeps ``import biomni.tool.genomics``
+cheap; the real import happens on first attribute access, i.e. when the agent's code first
+calls a function that uses the library.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Stand-in for module ``__name__`` that imports it on first attribute access.
+
+    ``importlib.util.LazyLoader`` is not thread-safe before Python 3.12: two threads touching the
+    module at once can both start executing it, or one can see it half-initialized. The tool
+    functions run concurrently in the agent pool's threads, so the import is done here under a
+    lock with :func:`importlib.import_module` and attribute access is forwarded to the result.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _materialize(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._materialize(), attr)
+
+    def __setattr__(self, attr: str, value) -> None:
+        setattr(self._materialize(), attr, value)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._materialize())
+
+    def __repr__(self) -> str:
+        if self.__dict__["_lazy_module"] is None:
+            return f"<lazy module '{self.__name__}'>"
+        return repr(self.__dict__["_lazy_module"])
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return module ``name`` without executing it until one of its attributes is used.
+
+    Safe to use from several threads: the first attribute access imports the module exactly once.
+
+    Args:
+        name: Absolute module name, e.g. ``"torch"``
+
+    Returns:
+        The module if it is already imported, otherwise a proxy that imports it on first use
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found (checked eagerly, like a normal import)
+
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
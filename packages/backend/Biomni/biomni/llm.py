@@ -1,7 +1,13 @@
+import hashlib
 import os
-from typing import TYPE_CHECKING, Literal, Optional
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any, Literal, Optional
 
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.runnables import Runnable, RunnableLambda
 
 if TYPE_CHECKING:
     from biomni.config import BiomniConfig
@@ -9,6 +15,68 @@ if TYPE_CHECKING:
 SourceType = Literal["OpenAI", "AzureOpenAI", "Anthropic", "Ollama", "Gemini", "Bedrock", "Groq", "Custom"]
 ALLOWED_SOURCES: set[str] = set(SourceType.__args__)
 
+# Environment variables read while building a client; part of the pool key so a changed key builds a new client
+_CREDENTIAL_ENV_VARS = (
+    "OPENAI_API_KEY",
+    "OPENAI_ENDPOINT",
+    "ANTHROPIC_API_KEY",
+    "GEMINI_API_KEY",
+    "GOOGLE_API_KEY",
+    "GROQ_API_KEY",
+    "AWS_REGION",
+)
+
+_llm_pool: dict[tuple, BaseChatModel] = {}
+_llm_pool_lock = threading.Lock()
+_llm_pool_stats = {"hits": 0, "misses": 0}
+
+
+def detect_source(model: str, base_url: str | None = None) -> SourceType:
+    """Detect the provider for a model name (LLM_SOURCE overrides the name-based guess).
+
+    Args:
+        model (str): The model name
+        base_url (str): The base URL for custom model serving, if any
+
+    Raises:
+        ValueError: If the source cannot be determined
+    """
+    env_source = os.getenv("LLM_SOURCE")
+    if env_source in ALLOWED_SOURCES:
+        return env_source
+    if model[:7] == "claude-":
+        return "Anthropic"
+    if model[:7] == "gpt-oss":
+        return "Ollama"
+    if model[:4] == "gpt-":
+        return "OpenAI"
+    if model.startswith("azure-"):
+        return "AzureOpenAI"
+    if model[:7] == "gemini-":
+        return "Gemini"
+    if "groq" in model.lower():
+        return "Groq"
+    if base_url is not None:
+        return "Custom"
+    if "/" in model or any(
+        name in model.lower()
+        for name in [
+            "llama",
+            "mistral",
+            "qwen",
+            "gemma",
+            "phi",
+            "dolphin",
+            "orca",
+            "vicuna",
+            "deepseek",
+        ]
+    ):
+        return "Ollama"
+    if model.startswith(("anthropic.claude-", "amazon.titan-", "meta.llama-", "mistral.", "cohere.", "ai21.", "us.")):
+        return "Bedrock"
+    raise ValueError("Unable to determine model source. Please specify 'source' parameter.")
+
 
 def get_llm(
     model: str | None = None,
@@ -18,10 +86,16 @@ def get_llm(
     base_url: str | None = None,
     api_key: str | None = None,
     config: Optional["BiomniConfig"] = None,
+    reuse: bool = True,
 ) -> BaseChatModel:
     """
     Get a language model instance based on the specified model name and source.
     This function supports models from OpenAI, Azure OpenAI, Anthropic, Ollama, Gemini, Bedrock, and custom model serving.
+
+    Clients are pooled per process: calls with the same model, source, base_url, temperature, stop sequences and
+    credentials return the same instance, which keeps its HTTP connections alive. LangChain chat models are
+    stateless between calls and safe to invoke from several threads; use ``bind``/``with_structured_output``
+    rather than modifying a pooled instance.
     Args:
         model (str): The model name to use
         temperature (float): Temperature setting for generation
@@ -31,6 +105,7 @@ def get_llm(
         base_url (str): The base URL for custom model serving (e.g., "http://localhost:8000/v1"), default is None
         api_key (str): The API key for the custom llm
         config (BiomniConfig): Optional configuration object. If provided, unspecified parameters will use config values
+        reuse (bool): Return a pooled client (default); False always builds a new one
     """
     # Use config values for any unspecified parameters
     if config is not None:
@@ -54,46 +129,59 @@ def get_llm(
         api_key = "EMPTY"
     # Auto-detect source from model name if not specified
     if source is None:
-        env_source = os.getenv("LLM_SOURCE")
-        if env_source in ALLOWED_SOURCES:
-            source = env_source
-        else:
-            if model[:7] == "claude-":
-                source = "Anthropic"
-            elif model[:7] == "gpt-oss":
-                source = "Ollama"
-            elif model[:4] == "gpt-":
-                source = "OpenAI"
-            elif model.startswith("azure-"):
-                source = "AzureOpenAI"
-            elif model[:7] == "gemini-":
-                source = "Gemini"
-            elif "groq" in model.lower():
-                source = "Groq"
-            elif base_url is not None:
-                source = "Custom"
-            elif "/" in model or any(
-                name in model.lower()
-                for name in [
-                    "llama",
-                    "mistral",
-                    "qwen",
-                    "gemma",
-                    "phi",
-                    "dolphin",
-                    "orca",
-                    "vicuna",
-                    "deepseek",
-                ]
-            ):
-                source = "Ollama"
-            elif model.startswith(
-                ("anthropic.claude-", "amazon.titan-", "meta.llama-", "mistral.", "cohere.", "ai21.", "us.")
-            ):
-                source = "Bedrock"
-            else:
-                raise ValueError("Unable to determine model source. Please specify 'source' parameter.")
+        source = detect_source(model, base_url)
+
+    if not reuse:
+        return _build_llm(model, temperature, stop_sequences, source, base_url, api_key)
+
+    credentials = "\0".join([api_key] + [os.getenv(name, "") for name in _CREDENTIAL_ENV_VARS])
+    key = (
+        source,
+        model,
+        base_url,
+        temperature,
+        tuple(stop_sequences or ()),
+        hashlib.sha256(credentials.encode()).hexdigest(),
+    )
+    with _llm_pool_lock:
+        llm = _llm_pool.get(key)
+        if llm is not None:
+            _llm_pool_stats["hits"] += 1
+            return llm
 
+    # Built outside the lock so a slow first import does not block other models; a concurrent
+    # build of the same key is discarded in favour of the instance stored first
+    llm = _build_llm(model, temperature, stop_sequences, source, base_url, api_key)
+    with _llm_pool_lock:
+        _llm_pool_stats["misses"] += 1
+        return _llm_pool.setdefault(key, llm)
+
+
+def get_llm_pool_stats() -> dict:
+    """Number of pooled clients and how often get_llm reused one."""
+    with _llm_pool_lock:
+        total = _llm_pool_stats["hits"] + _llm_pool_stats["misses"]
+        return {
+            "clients": len(_llm_pool),
+            **_llm_pool_stats,
+            "hit_rate": _llm_pool_stats["hits"] / total if total else 0.0,
+        }
+
+
+def clear_llm_pool() -> None:
+    """Drop every pooled client (e.g. after rotating API keys)."""
+    with _llm_pool_lock:
+        _llm_pool.clear()
+
+
+def _build_llm(
+    model: str,
+    temperature: float,
+    stop_sequences: list[str] | None,
+    source: SourceType,
+    base_url: str | None,
+    api_key: str,
+) -> BaseChatModel:
     # Create appropriate model based on source
     if source == "OpenAI":
         try:
@@ -235,3 +323,117 @@ def get_llm(
         raise ValueError(
             f"Invalid source: {source}. Valid options are 'OpenAI', 'AzureOpenAI', 'Anthropic', 'Gemini', 'Groq', 'Bedrock', or 'Ollama'"
         )
+
+
+def message_text(response) -> str:
+    """Text of a model or chain response (AIMessage, ``{"text": ...}`` dict or plain string)."""
+    if hasattr(response, "content"):
+        return response.content if isinstance(response.content, str) else str(response.content)
+    if isinstance(response, dict) and "text" in response:
+        return response["text"]
+    return response if isinstance(response, str) else str(response)
+
+
+def batch_invoke(
+    runnable: Runnable,
+    inputs: Sequence[Any],
+    validate: Callable[[str], Any] | None = None,
+    revise: Callable[[Any, ValueError], Any] | None = None,
+    max_concurrency: int = 8,
+    max_attempts: int = 3,
+) -> list[tuple[Any, str | None]]:
+    """Invoke ``runnable`` on every input concurrently, retrying each item independently.
+
+    Items run through ``Runnable.batch`` with at most ``max_concurrency`` in flight, and each item
+    retries on its own, so wall time follows the slowest item instead of the sum of all items.
+
+    Args:
+        runnable: Chat model or chain to invoke
+        inputs: One input per item
+        validate: Parses the response text of an item and returns its value; raises ValueError
+            (whose message explains the problem) if the response is not acceptable
+        revise: Returns the input for the next attempt after a ValueError from ``validate``
+            (e.g. with a correction appended); by default the same input is retried
+        max_concurrency: Maximum items in flight
+        max_attempts: Attempts per item, counting model errors and rejected responses
+
+    Returns:
+        One ``(value, error)`` per input, in order: the validated value (or response text without
+        ``validate``) and None, or None and the last error once the attempts are exhausted
+    """
+
+    def run_item(item):
+        current = item
+        error = None
+        for attempt in range(max_attempts):
+            try:
+                text = message_text(runnable.invoke(current))
+            except Exception as e:
+                # Provider errors (rate limits, timeouts): back off and retry the same input
+                error = f"{type(e).__name__}: {e}"
+                if attempt + 1 < max_attempts:
+                    time.sleep(min(2**attempt, 10))
+                continue
+            if validate is None:
+                return text, None
+            try:
+                return validate(text), None
+            except ValueError as e:
+                error = f"{e} (response: {text[:200]})"
+                if revise is not None:
+                    current = revise(current, e)
+        return None, error
+
+    if not inputs:
+        return []
+    return RunnableLambda(run_item).batch(list(inputs), config={"max_concurrency": max(1, max_concurrency)})
+
+
+def layout_messages_for_caching(
+    system_prompt: str, messages: list, source: str | None, mode: str = "auto"
+) -> list[BaseMessage]:
+    """Build the message list for a model call with the stable prefix marked for prompt caching.
+
+    The system prompt always comes first and the conversation is append-only, so every step
+    shares the previous step's prefix. For Anthropic, cache breakpoints (``cache_control``) are
+    placed on the system prompt and on the newest message so each step reads the prefix written
+    by the step before. OpenAI-compatible providers cache identical prefixes automatically and
+    only need the stable ordering.
+
+    Args:
+        system_prompt (str): The system prompt
+        messages (list): Conversation messages, oldest first (not modified)
+        source (str): Provider of the model, as returned by detect_source
+        mode (str): "auto" to add cache markers where supported, "off" for plain messages
+    """
+    if mode == "off" or source != "Anthropic":
+        return [SystemMessage(content=system_prompt)] + list(messages)
+
+    cache_control = {"type": "ephemeral"}
+    system = SystemMessage(content=[{"type": "text", "text": system_prompt, "cache_control": cache_control}])
+    history = list(messages)
+    if history and isinstance(history[-1].content, str) and history[-1].content:
+        last = history[-1]
+        history[-1] = last.model_copy(
+            update={"content": [{"type": "text", "text": last.content, "cache_control": cache_control}]}
+        )
+    return [system] + history
+
+
+def get_token_usage(response) -> dict:
+    """Input/output token counts of a model response, split into cached and uncached input tokens.
+
+    Uses the provider-independent ``usage_metadata`` of LangChain messages; counts are 0 when
+    the provider does not report usage.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    input_tokens = usage.get("input_tokens") or 0
+    cached_tokens = details.get("cache_read") or 0
+    return {
+        "input_tokens": input_tokens,
+        "cached_tokens": cached_tokens,
+        "cache_creation_tokens": details.get("cache_creation") or 0,
+        "uncached_tokens": max(input_tokens - cached_tokens, 0),
+        "output_tokens": usage.get("output_tokens") or 0,
+    }
@@ -0,0 +1,265 @@
+"""Local BM25 index over tools, data lake items and software libraries.
+
+The index is built once per catalog (keyed by a fingerprint of every document) and stored
+on disk as an inverted index in CSR layout:
+
+    meta.json     vocabulary, document keys and BM25 parameters
+    indptr.npy    int64 offsets into postings/weights, one slot per term (+1)
+    postings.npy  int32 document ids, sorted by term
+    weights.npy   float32 precomputed BM25 term weights
+
+The arrays are opened with ``np.load(mmap_mode="r")`` so several agents (or processes)
+share the same pages and a query only touches the postings of its own terms.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import Counter
+
+import numpy as np
+
+INDEX_VERSION = 1
+CATEGORIES = ("tools", "data_lake", "libraries")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_CAMEL_RE = re.compile(r"(?<=[a-z])(?=[A-Z])")
+_STOPWORDS = frozenset(
+    """a an and are as at be by can do does for from has have how i in into is it its me my of on or our
+    please should that the their them then there these this to use used using was we what when where which
+    who why will with you your""".split()
+)
+
+# Loaded indexes shared by every retriever in the process, keyed by (index_dir, fingerprint)
+_LOADED: dict[tuple[str, str], "ResourceIndex"] = {}
+_LOADED_LOCK = threading.Lock()
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with snake_case/camelCase names split and a light plural strip."""
+    text = _CAMEL_RE.sub(" ", str(text)).replace("_", " ").lower()
+    tokens = []
+    for token in _TOKEN_RE.findall(text):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def resource_name(resource) -> str:
+    """Name of a resource given as a dict, a plain string or a tool-like object."""
+    if isinstance(resource, dict):
+        return str(resource.get("name", ""))
+    if isinstance(resource, str):
+        return resource.split(": ")[0]
+    return str(getattr(resource, "name", resource))
+
+
+def resource_text(resource) -> str:
+    """Searchable text for a resource: name, description and parameter descriptions."""
+    if isinstance(resource, str):
+        return resource
+    if not isinstance(resource, dict):
+        return f"{getattr(resource, 'name', resource)} {getattr(resource, 'description', '')}"
+
+    parts = [str(resource.get("name", "")), str(resource.get("description", ""))]
+    for key in ("required_parameters", "optional_parameters"):
+        for param in resource.get(key) or []:
+            if isinstance(param, dict):
+                parts.append(str(param.get("name", "")))
+                parts.append(str(param.get("description", "")))
+    return " ".join(parts)
+
+
+def catalog_fingerprint(resources: dict) -> str:
+    """Stable hash of every document in the catalog, used as the on-disk index key."""
+    digest = hashlib.sha256(f"v{INDEX_VERSION}".encode())
+    for category in CATEGORIES:
+        for resource in resources.get(category, []):
+            digest.update(category.encode())
+            digest.update(b"\0")
+            digest.update(resource_text(resource).encode("utf-8", "replace"))
+            digest.update(b"\1")
+    return digest.hexdigest()[:16]
+
+
+class ResourceIndex:
+    """Memory-mapped BM25 inverted index over a resource catalog."""
+
+    def __init__(self, path: str):
+        """Open an index previously written by :meth:`build`.
+
+        Args:
+            path: Directory containing meta.json and the .npy arrays
+
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.path = path
+        self.fingerprint = meta["fingerprint"]
+        self.vocab: dict[str, int] = meta["vocab"]
+        self.doc_categories: list[str] = meta["doc_categories"]
+        self.doc_positions: list[int] = meta["doc_positions"]
+        self.indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode="r")
+        self.postings = np.load(os.path.join(path, "postings.npy"), mmap_mode="r")
+        self.weights = np.load(os.path.join(path, "weights.npy"), mmap_mode="r")
+
+        categories = np.array(self.doc_categories)
+        self._category_docs = {category: np.flatnonzero(categories == category) for category in CATEGORIES}
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.doc_categories)
+
+    @classmethod
+    def build(cls, resources: dict, path: str, k1: float = 1.2, b: float = 0.75) -> "ResourceIndex":
+        """Build the BM25 index for ``resources`` and write it atomically to ``path``.
+
+        Args:
+            resources: Dict with 'tools', 'data_lake' and 'libraries' lists
+            path: Target directory (replaced if it already exists)
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalisation
+
+        Returns:
+            The loaded index
+
+        """
+        doc_categories, doc_positions, doc_terms = [], [], []
+        for category in CATEGORIES:
+            for position, resource in enumerate(resources.get(category, [])):
+                doc_categories.append(category)
+                doc_positions.append(position)
+                # Names carry most of the signal for short catalog entries, so count them twice
+                doc_terms.append(Counter(tokenize(resource_text(resource)) + tokenize(resource_name(resource))))
+
+        num_docs = len(doc_terms)
+        lengths = np.array([sum(terms.values()) for terms in doc_terms], dtype=np.float64)
+        avg_length = float(lengths.mean()) if num_docs else 0.0
+
+        postings_by_term: dict[str, list[tuple[int, int]]] = {}
+        for doc_id, terms in enumerate(doc_terms):
+            for term, tf in terms.items():
+                postings_by_term.setdefault(term, []).append((doc_id, tf))
+
+        vocab = {term: i for i, term in enumerate(sorted(postings_by_term))}
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        postings = np.empty(sum(len(p) for p in postings_by_term.values()), dtype=np.int32)
+        weights = np.empty(len(postings), dtype=np.float32)
+
+        offset = 0
+        for term, term_id in vocab.items():
+            entries = postings_by_term[term]
+            idf = math.log(1.0 + (num_docs - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc_id, tf in entries:
+                norm = k1 * (1.0 - b + b * lengths[doc_id] / avg_length) if avg_length else k1
+                postings[offset] = doc_id
+                weights[offset] = idf * tf * (k1 + 1.0) / (tf + norm)
+                offset += 1
+            indptr[term_id + 1] = offset
+
+        meta = {
+            "version": INDEX_VERSION,
+            "fingerprint": catalog_fingerprint(resources),
+            "k1": k1,
+            "b": b,
+            "vocab": vocab,
+            "doc_categories": doc_categories,
+            "doc_positions": doc_positions,
+        }
+
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".building-", dir=parent)
+        try:
+            np.save(os.path.join(tmp_dir, "indptr.npy"), indptr)
+            np.save(os.path.join(tmp_dir, "postings.npy"), postings)
+            np.save(os.path.join(tmp_dir, "weights.npy"), weights)
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            os.replace(tmp_dir, path)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return cls(path)
+
+    def search(self, query: str, category: str, top_k: int) -> list[tuple[int, float]]:
+        """Return up to ``top_k`` (position, score) pairs for one category, best first.
+
+        Positions refer to the order of the resource list the index was built from.
+        Documents that share no term with the query are never returned.
+        """
+        docs = self._category_docs.get(category)
+        if docs is None or len(docs) == 0 or top_k <= 0:
+            return []
+
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            # Each document appears at most once per term, so plain fancy-index accumulation is safe
+            scores[self.postings[start:end]] += self.weights[start:end]
+
+        category_scores = scores[docs]
+        k = min(top_k, int(np.count_nonzero(category_scores)))
+        if k == 0:
+            return []
+        best = np.argpartition(-category_scores, k - 1)[:k]
+        best = best[np.argsort(-category_scores[best], kind="stable")]
+        return [(self.doc_positions[docs[i]], float(category_scores[i])) for i in best]
+
+
+def load_or_build_index(resources: dict, index_dir: str, keep: int = 3) -> ResourceIndex:
+    """Return the index for ``resources``, building it under ``index_dir`` on first use.
+
+    Indexes are stored in ``index_dir/<fingerprint>``; adding a tool, dataset or library
+    changes the fingerprint, so a stale index is never reused. Only the ``keep`` most
+    recently built indexes are kept on disk.
+    """
+    fingerprint = catalog_fingerprint(resources)
+    key = (os.path.abspath(index_dir), fingerprint)
+    with _LOADED_LOCK:
+        index = _LOADED.get(key)
+        if index is not None:
+            return index
+
+        path = os.path.join(index_dir, fingerprint)
+        index = None
+        if os.path.exists(os.path.join(path, "meta.json")):
+            try:
+                index = ResourceIndex(path)
+            except (OSError, ValueError, KeyError):
+                index = None
+        if index is None:
+            index = ResourceIndex.build(resources, path)
+            _prune_old_indexes(index_dir, keep)
+        _LOADED[key] = index
+        return index
+
+
+def _prune_old_indexes(index_dir: str, keep: int) -> None:
+    """Remove all but the ``keep`` most recently modified index directories."""
+    try:
+        entries = [
+            os.path.join(index_dir, name)
+            for name in os.listdir(index_dir)
+            if not name.startswith(".") and os.path.isdir(os.path.join(index_dir, name))
+        ]
+    except OSError:
+        return
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for stale in entries[keep:]:
+        if any(key[0] == os.path.abspath(index_dir) and stale.endswith(key[1]) for key in _LOADED):
+            continue
+        shutil.rmtree(stale, ignore_errors=True)
@@ -0,0 +1,186 @@
+"""Cache of resource-retrieval results keyed by normalized query and catalog hash.
+
+Entries live in an in-process LRU with a TTL and can optionally be backed by a SQLite
+file so that several processes (or restarts) share results. Values are the selected
+positions per category, which are only meaningful for the catalog they were computed
+from; the catalog hash is therefore part of every key.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    """a an and are as at be by can could do does for from has have how i in into is it its me my of on or
+    our please should that the their them then there these this to what when where which who why will with
+    would you your""".split()
+)
+# British -> American spellings common in biomedical queries
+_SPELLING_RE = [
+    (
+        re.compile(r"^(analy|characteri|normali|visuali|summari|optimi|organi|catalog)s(e|ed|es|ing|ation|ations)$"),
+        r"\1z\2",
+    ),
+    (re.compile(r"^(tumo|colo|behavio|favo)ur(s?)$"), r"\1r\2"),
+]
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query: lowercase words, stopwords dropped, spelling and plurals folded.
+
+    ``"Analyse BRCA1 variants"`` and ``"analyze the BRCA1 variant"`` map to the same string.
+    """
+    text = unicodedata.normalize("NFKC", str(query)).lower()
+    words = []
+    for word in _WORD_RE.findall(text):
+        if word in _STOPWORDS:
+            continue
+        for pattern, replacement in _SPELLING_RE:
+            word = pattern.sub(replacement, word)
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+class RetrievalCache:
+    """LRU + TTL cache of retrieval selections with optional SQLite persistence."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, db_path: str | None = None):
+        """Create the cache.
+
+        Args:
+            max_entries: Maximum number of in-memory entries (0 disables the cache)
+            ttl_seconds: Lifetime of an entry in seconds
+            db_path: Optional SQLite file shared across processes
+
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._entries: OrderedDict[str, tuple[float, str, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+
+        if db_path and max_entries > 0:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS retrieval_cache ("
+                "key TEXT PRIMARY KEY, catalog_hash TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_retrieval_catalog ON retrieval_cache (catalog_hash)")
+            self._db.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(query: str, catalog_hash: str, mode: str = "") -> str:
+        """Cache key for a query against a given catalog and retrieval mode."""
+        raw = f"{catalog_hash}\0{mode}\0{normalize_query(query)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached selection for ``key`` or None if absent or expired."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT catalog_hash, value, expires_at FROM retrieval_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[2] > now:
+                    value = json.loads(row[1])
+                    self._store_locked(key, row[0], value, row[2])
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, catalog_hash: str, value: dict) -> None:
+        """Store a selection (a JSON-serializable dict) for ``key``."""
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store_locked(key, catalog_hash, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO retrieval_cache (key, catalog_hash, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, catalog_hash, json.dumps(value), expires_at),
+                )
+                self._db.execute("DELETE FROM retrieval_cache WHERE expires_at <= ?", (time.time(),))
+                self._db.commit()
+
+    def invalidate(self, catalog_hash: str | None = None) -> None:
+        """Drop entries computed for ``catalog_hash`` (or every entry if None)."""
+        with self._lock:
+            if catalog_hash is None:
+                self._entries.clear()
+            else:
+                for key in [k for k, entry in self._entries.items() if entry[1] == catalog_hash]:
+                    del self._entries[key]
+            if self._db is not None:
+                if catalog_hash is None:
+                    self._db.execute("DELETE FROM retrieval_cache")
+                else:
+                    self._db.execute("DELETE FROM retrieval_cache WHERE catalog_hash = ?", (catalog_hash,))
+                self._db.commit()
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "persistent": self._db is not None,
+        }
+
+    def _store_locked(self, key: str, catalog_hash: str, value: dict, expires_at: float) -> None:
+        self._entries[key] = (expires_at, catalog_hash, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_shared_cache: RetrievalCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_retrieval_cache(config=None) -> RetrievalCache:
+    """Process-wide retrieval cache configured from ``config`` (or the default config)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            if config is None:
+                from biomni.config import default_config as config
+            _shared_cache = RetrievalCache(
+                max_entries=config.retrieval_cache_size,
+                ttl_seconds=config.retrieval_cache_ttl,
+                db_path=config.retrieval_cache_path,
+            )
+        return _shared_cache
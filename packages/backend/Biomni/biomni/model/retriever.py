@@ -1,4 +1,5 @@
 import contextlib
+import os
 import re
 
 from langchain_core.messages import HumanMessage
@@ -9,8 +10,67 @@ from biomni.config import default_config
 class ToolRetriever:
     """Retrieve tools from the tool registry."""
 
-    def __init__(self):
-        pass
+    def __init__(self, cache=None):
+        """Create the retriever.
+
+        Args:
+            cache: Optional RetrievalCache; defaults to the process-wide cache from the config
+
+        """
+        if cache is None:
+            from biomni.model.retrieval_cache import get_retrieval_cache
+
+            cache = get_retrieval_cache()
+        self.cache = cache
+        self.last_catalog_hash = None
+
+    def retrieve(self, query: str, resources: dict, mode: str = "prompt", llm=None, **kwargs) -> dict:
+        """Retrieve resources with the given strategy, reusing cached selections.
+
+        Results are cached by normalized query, retrieval mode and a hash of the catalog,
+        so near-identical questions against an unchanged catalog skip retrieval entirely.
+
+        Args:
+            query: The user's query
+            resources: A dictionary with keys 'tools', 'data_lake', and 'libraries'
+            mode: "prompt", "index" or "index_rerank"
+            llm: Optional LLM instance used by the prompt-based strategies
+            **kwargs: Extra arguments for :meth:`index_based_retrieval`
+
+        Returns:
+            A dictionary with the same keys, containing only the selected resources
+
+        """
+        from biomni.model.resource_index import CATEGORIES, catalog_fingerprint
+
+        catalog_hash = catalog_fingerprint(resources)
+        self.last_catalog_hash = catalog_hash
+        key = self.cache.make_key(query, catalog_hash, mode)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return {
+                category: [resources[category][i] for i in cached.get(category, []) if i < len(resources[category])]
+                for category in CATEGORIES
+            }
+
+        if mode in ("index", "index_rerank"):
+            selected = self.index_based_retrieval(query, resources, llm=llm, rerank=mode == "index_rerank", **kwargs)
+        else:
+            selected = self.prompt_based_retrieval(query, resources, llm=llm)
+
+        # Store positions rather than the resources themselves; the catalog hash pins their meaning
+        positions = {}
+        for category in CATEGORIES:
+            lookup = {id(item): i for i, item in enumerate(resources.get(category, []))}
+            positions[category] = [lookup[id(item)] for item in selected.get(category, []) if id(item) in lookup]
+        self.cache.set(key, catalog_hash, positions)
+        return selected
+
+    def invalidate_cache(self) -> None:
+        """Drop cached selections for the catalog seen by the last :meth:`retrieve` call."""
+        if self.last_catalog_hash is not None:
+            self.cache.invalidate(self.last_catalog_hash)
 
     def prompt_based_retrieval(self, query: str, resources: dict, llm=None) -> dict:
         """Use a prompt-based approach to retrieve the most relevant resources for a query.
@@ -102,6 +162,53 @@ IMPORTANT GUIDELINES:
 
         return selected_resources
 
+    def index_based_retrieval(
+        self,
+        query: str,
+        resources: dict,
+        top_k: int | dict | None = None,
+        index_dir: str | None = None,
+        llm=None,
+        rerank: bool = False,
+    ) -> dict:
+        """Retrieve resources with a local BM25 index, optionally reranked by the LLM.
+
+        The index is built once per catalog and memory-mapped from ``index_dir``, so
+        retrieval costs no LLM tokens unless ``rerank`` is set. With ``rerank``, only the
+        shortlist is sent to :meth:`prompt_based_retrieval` instead of the full catalog.
+
+        Args:
+            query: The user's query
+            resources: A dictionary with keys 'tools', 'data_lake', and 'libraries'
+            top_k: Shortlist size per category, as an int or a dict keyed by category
+            index_dir: Directory holding the on-disk index (defaults to ``<path>/biomni_data/retrieval_index``)
+            llm: Optional LLM instance used for reranking
+            rerank: If True, let the LLM select from the shortlist
+
+        Returns:
+            A dictionary with the same keys, containing the selected resources in rank order
+
+        """
+        from biomni.model.resource_index import CATEGORIES, load_or_build_index
+
+        if top_k is None:
+            top_k = default_config.retriever_top_k
+        if index_dir is None:
+            index_dir = default_config.retriever_index_dir or os.path.join(
+                default_config.path, "biomni_data", "retrieval_index"
+            )
+
+        index = load_or_build_index(resources, index_dir)
+        shortlist = {}
+        for category in CATEGORIES:
+            k = top_k.get(category, 0) if isinstance(top_k, dict) else top_k
+            items = resources.get(category, [])
+            shortlist[category] = [items[position] for position, _ in index.search(query, category, k)]
+
+        if rerank and any(shortlist.values()):
+            return self.prompt_based_retrieval(query, shortlist, llm=llm)
+        return shortlist
+
     def _format_resources_for_prompt(self, resources: list) -> str:
         """Format resources for inclusion in the prompt."""
         formatted = []
@@ -0,0 +1,335 @@
+"""Content-addressed cache of database API responses shared by all agents.
+
+``_query_rest_api`` (and with it the NCBI helpers and every ``query_*`` tool built on it) looks up
+successful responses here before going to the network. Keys are a SHA-256 of the method, URL, query
+parameters, JSON body and ``Accept`` header, so identical lookups from different sessions hit the
+same entry. Requests carrying credentials (``Authorization`` header) are never cached.
+
+- Entries expire after a per-database TTL (:data:`DEFAULT_TTLS`, keyed by host), falling back to a
+  default TTL for other hosts.
+- The in-memory LRU is bounded by bytes of serialized response.
+- An optional SQLite file (WAL mode) is shared by worker processes and survives restarts; it is
+  bounded by bytes as well, evicting the least recently used rows. Its size is tracked as a running
+  total and trimmed only when over budget (or every :data:`DISK_SWEEP_SECONDS` for expired rows), and
+  access times of disk hits are written in batches.
+- :func:`response_cache_mode` bypasses or refreshes the cache for the calls made inside it::
+
+    with response_cache_mode("refresh"):
+        query_uniprot("Fetch P53_HUMAN")  # goes to the network and stores the new response
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from urllib.parse import urlsplit
+
+# Seconds a response stays valid, per API host. Release-based resources change rarely;
+# NCBI history keys (WebEnv) and trial/adverse event records go stale quickly.
+DEFAULT_TTLS: dict[str, float] = {
+    "eutils.ncbi.nlm.nih.gov": 3600,
+    "clinicaltrials.gov": 3600,
+    "api.fda.gov": 6 * 3600,
+    "rest.ensembl.org": 7 * 86400,
+    "grch37.rest.ensembl.org": 7 * 86400,
+    "rest.uniprot.org": 7 * 86400,
+    "alphafold.ebi.ac.uk": 7 * 86400,
+    "data.rcsb.org": 7 * 86400,
+    "search.rcsb.org": 86400,
+    "rest.kegg.jp": 7 * 86400,
+    "reactome.org": 7 * 86400,
+    "gnomad.broadinstitute.org": 7 * 86400,
+    "jaspar.elixir.no": 7 * 86400,
+    "www.guidetopharmacology.org": 7 * 86400,
+}
+
+CACHE_MODES = ("use", "bypass", "refresh")
+
+# Disk maintenance: expired rows are swept at most this often; a trim deletes least recently used rows
+# down to this fraction of the budget; access times of disk hits are flushed in batches of this size
+DISK_SWEEP_SECONDS = 300
+DISK_TRIM_TARGET = 0.9
+ACCESS_FLUSH_BATCH = 64
+
+_mode: contextvars.ContextVar[str] = contextvars.ContextVar("biomni_response_cache_mode", default="use")
+
+
+@contextlib.contextmanager
+def response_cache_mode(mode: str) -> Iterator[None]:
+    """Set how database queries in this context use the cache.
+
+    Args:
+        mode: ``"use"`` (default: return cached responses), ``"bypass"`` (neither read nor write the cache)
+            or ``"refresh"`` (always query the API and overwrite the cached response)
+
+    """
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown response cache mode: {mode} (expected one of {CACHE_MODES})")
+    token = _mode.set(mode)
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+def current_mode(mode: str | None = None) -> str:
+    """Effective cache mode: ``mode`` if given, otherwise the one set by :func:`response_cache_mode`."""
+    return mode or _mode.get()
+
+
+def make_key(method: str, url: str, params: dict | None = None, json_data=None, headers: dict | None = None) -> str:
+    """Cache key for a request (independent of parameter order and of ``api_key`` parameters)."""
+    accept = ""
+    for name, value in (headers or {}).items():
+        if name.lower() == "accept":
+            accept = str(value)
+    query = sorted((str(k), str(v)) for k, v in (params or {}).items() if k != "api_key")
+    raw = json.dumps([method.upper(), url, query, json_data, accept], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(headers: dict | None) -> bool:
+    """Whether a request may be cached (requests with credentials are not)."""
+    return not any(name.lower() in ("authorization", "cookie") for name in (headers or {}))
+
+
+class ResponseCache:
+    """Byte-bounded LRU + TTL cache of API responses with optional SQLite persistence."""
+
+    def __init__(
+        self,
+        max_bytes: int = 256 << 20,
+        default_ttl: float = 86400,
+        ttls: dict[str, float] | None = None,
+        db_path: str | None = None,
+        max_disk_bytes: int = 1 << 30,
+    ):
+        """Create the cache.
+
+        Args:
+            max_bytes: Upper bound on serialized responses kept in memory (0 disables the cache)
+            default_ttl: Lifetime in seconds for hosts without an entry in ``ttls``
+            ttls: Lifetime per host, merged over :data:`DEFAULT_TTLS`
+            db_path: Optional SQLite file shared across processes
+            max_disk_bytes: Upper bound on serialized responses kept in the SQLite file
+
+        """
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.db_path = db_path
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._disk_bytes = 0  # Running estimate; other processes' writes are picked up at each trim
+        self._next_sweep = 0.0
+        self._pending_access: dict[str, float] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._host_counts: dict[str, list[int]] = {}
+
+        if db_path and max_bytes > 0:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, host TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_response_accessed ON response_cache (accessed_at)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_response_expires ON response_cache (expires_at)")
+            self._db.commit()
+            (self._disk_bytes,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def ttl_for(self, url: str) -> float:
+        """Lifetime in seconds of responses from the host of ``url``."""
+        return self.ttls.get(urlsplit(url).hostname or "", self.default_ttl)
+
+    def get(self, key: str, url: str):
+        """Cached response body for ``key`` (a fresh copy) or None if absent or expired."""
+        if not self.enabled:
+            return None
+        host = urlsplit(url).hostname or ""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, text = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    self._count(host, hit=True)
+                    return json.loads(text)
+                self._discard_locked(key)
+
+        row = None
+        if self._db is not None:
+            with self._db_lock:
+                row = self._db.execute("SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[1] > now:
+                    self._pending_access[key] = now
+                    if len(self._pending_access) >= ACCESS_FLUSH_BATCH:
+                        self._flush_access_locked()
+                        self._db.commit()
+
+        with self._lock:
+            if row is not None and row[1] > now:
+                self._store_locked(key, host, row[0], row[1])
+                self.disk_hits += 1
+                self._count(host, hit=True)
+                return json.loads(row[0])
+            self.misses += 1
+            self._count(host, hit=False)
+            return None
+
+    def set(self, key: str, url: str, value) -> None:
+        """Store a JSON-serializable response body for ``key``."""
+        if not self.enabled:
+            return
+        ttl = self.ttl_for(url)
+        if ttl <= 0:
+            return
+        host = urlsplit(url).hostname or ""
+        text = json.dumps(value)
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._store_locked(key, host, text, expires_at)
+            self.stores += 1
+        if self._db is not None:
+            with self._db_lock:
+                previous = self._db.execute("SELECT size FROM response_cache WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, host, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, host, text, len(text), expires_at, now),
+                )
+                self._pending_access.pop(key, None)
+                self._disk_bytes += len(text) - (previous[0] if previous else 0)
+                if self._disk_bytes > self.max_disk_bytes or now >= self._next_sweep:
+                    self._trim_disk_locked(now)
+                self._db.commit()
+
+    def invalidate(self, host: str | None = None) -> None:
+        """Drop cached responses from ``host`` (or every response if None)."""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if host is None or entry[1] == host]:
+                self._discard_locked(key)
+        if self._db is not None:
+            with self._db_lock:
+                if host is None:
+                    self._db.execute("DELETE FROM response_cache")
+                else:
+                    self._db.execute("DELETE FROM response_cache WHERE host = ?", (host,))
+                self._pending_access.clear()
+                (self._disk_bytes,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()
+                self._db.commit()
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters (overall and per host) and memory use."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            stats = {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "persistent": self._db is not None,
+                "hosts": {host: {"hits": h, "misses": m} for host, (h, m) in self._host_counts.items()},
+            }
+        if self._db is not None:
+            with self._db_lock:
+                row = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache").fetchone()
+            stats["disk_entries"], stats["disk_bytes"] = row
+        return stats
+
+    def _count(self, host: str, hit: bool) -> None:
+        counts = self._host_counts.setdefault(host, [0, 0])
+        counts[0 if hit else 1] += 1
+
+    def _store_locked(self, key: str, host: str, text: str, expires_at: float) -> None:
+        if len(text) > self.max_bytes:
+            return
+        self._discard_locked(key)
+        self._entries[key] = (expires_at, host, text)
+        self._bytes += len(text)
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._discard_locked(oldest)
+            self.evictions += 1
+
+    def _discard_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[2])
+
+    def _flush_access_locked(self) -> None:
+        """Write buffered access times of disk hits (caller holds ``_db_lock`` and commits)."""
+        if self._pending_access:
+            self._db.executemany(
+                "UPDATE response_cache SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+
+    def _trim_disk_locked(self, now: float) -> None:
+        """Drop expired rows, then least recently used rows down to the trim target (caller holds ``_db_lock``)."""
+        self._next_sweep = now + DISK_SWEEP_SECONDS
+        self._flush_access_locked()
+        self._db.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()
+        if total > self.max_disk_bytes:
+            excess = total - int(self.max_disk_bytes * DISK_TRIM_TARGET)
+            victims = []
+            for key, size in self._db.execute("SELECT key, size FROM response_cache ORDER BY accessed_at"):
+                if excess <= 0:
+                    break
+                victims.append((key,))
+                excess -= size
+                total -= size
+            self._db.executemany("DELETE FROM response_cache WHERE key = ?", victims)
+        self._disk_bytes = total
+
+
+_shared_cache: ResponseCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache(config=None) -> ResponseCache:
+    """Process-wide response cache configured from ``config`` (or the default config)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            if config is None:
+                from biomni.config import default_config as config
+            _shared_cache = ResponseCache(
+                max_bytes=config.response_cache_mb * 1024 * 1024,
+                default_ttl=config.response_cache_ttl,
+                ttls=config.response_cache_ttls,
+                db_path=config.response_cache_path,
+                max_disk_bytes=config.response_cache_disk_mb * 1024 * 1024,
+            )
+        return _shared_cache
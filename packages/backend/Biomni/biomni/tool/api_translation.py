@@ -0,0 +1,172 @@
+"""Caches for the natural language -> API call translation of the database tools.
+
+``query_*`` tools called with a ``prompt`` ask an LLM to turn it into an API call, sending the
+database's API schema (``schema_db/<name>.pkl``) in the system prompt. Two caches avoid
+repeating that work:
+
+- :func:`load_schema` keeps every unpickled schema and its JSON serialization in memory, so the
+  pickle is read and the schema is serialized once per process.
+- :class:`TranslationCache` remembers successful translations, keyed by the prompt with runs of
+  whitespace collapsed and scoped to the model and the system prompt, so tools and schema versions
+  never share entries. Nothing else is folded: operators, conjunctions and letter case change the
+  API call (``"resolution < 2.0"`` vs ``"> 2.0"``, ``"BRCA1 and TP53"`` vs ``"or TP53"``).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "schema_db")
+
+_schemas: dict[str, object] = {}
+_schema_json: dict[int, tuple[object, str]] = {}
+_schema_lock = threading.Lock()
+_schema_stats = {"loads": 0, "hits": 0, "json_hits": 0, "json_misses": 0}
+
+
+def load_schema(name: str, missing_ok: bool = False):
+    """API schema ``schema_db/<name>.pkl``, unpickled once per process.
+
+    The returned object is shared between calls and must not be modified.
+
+    Args:
+        name: Schema name (e.g. ``"uniprot"``)
+        missing_ok: Return None instead of raising if the file does not exist
+
+    """
+    with _schema_lock:
+        if name in _schemas:
+            _schema_stats["hits"] += 1
+            return _schemas[name]
+
+    path = os.path.join(SCHEMA_DIR, f"{name}.pkl")
+    if missing_ok and not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        schema = pickle.load(f)
+
+    with _schema_lock:
+        _schema_stats["loads"] += 1
+        return _schemas.setdefault(name, schema)
+
+
+def schema_json(schema) -> str:
+    """``json.dumps(schema, indent=2)``, computed once for schemas returned by :func:`load_schema`."""
+    with _schema_lock:
+        entry = _schema_json.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            _schema_stats["json_hits"] += 1
+            return entry[1]
+
+    text = json.dumps(schema, indent=2)
+    with _schema_lock:
+        _schema_stats["json_misses"] += 1
+        if any(cached is schema for cached in _schemas.values()):
+            # Keyed by identity; the entry holds a reference so the id cannot be reused
+            _schema_json[id(schema)] = (schema, text)
+    return text
+
+
+def get_schema_stats() -> dict:
+    """Schema pickle loads vs. in-memory hits, and JSON serialization reuse."""
+    with _schema_lock:
+        return {**_schema_stats, "schemas": len(_schemas)}
+
+
+class TranslationCache:
+    """LRU + TTL cache of prompt -> API call translations, keyed by prompt text."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400):
+        """Create the cache.
+
+        Args:
+            max_entries: Maximum number of translations kept (0 disables the cache)
+            ttl_seconds: Lifetime of a translation in seconds
+
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(prompt: str, system_prompt: str, model: str | None) -> str:
+        """Key for a prompt translated with ``system_prompt`` by ``model`` (only whitespace is folded)."""
+        text = " ".join(prompt.split())
+        return hashlib.sha256(f"{model}\0{system_prompt}\0{text}".encode()).hexdigest()
+
+    def get(self, prompt: str, system_prompt: str, model: str | None) -> dict | None:
+        """Cached translation (a fresh copy) or None."""
+        if not self.enabled:
+            return None
+        key = self.make_key(prompt, system_prompt, model)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return json.loads(entry[1])
+
+    def set(self, prompt: str, system_prompt: str, model: str | None, value: dict) -> None:
+        """Store a translation (a JSON-serializable dict)."""
+        if not self.enabled:
+            return
+        text = json.dumps(value)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            key = self.make_key(prompt, system_prompt, model)
+            self._entries[key] = (expires_at, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters; every hit is one LLM call saved."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "llm_calls_saved": self.hits,
+            }
+
+
+_shared_cache: TranslationCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_translation_cache(config=None) -> TranslationCache:
+    """Process-wide translation cache configured from ``config`` (or the default config)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            if config is None:
+                from biomni.config import default_config as config
+            _shared_cache = TranslationCache(
+                max_entries=config.translation_cache_size,
+                ttl_seconds=config.translation_cache_ttl,
+            )
+        return _shared_cache
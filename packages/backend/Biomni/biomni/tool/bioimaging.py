@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import logging
 import os
 import zipfile
@@ -6,21 +8,33 @@ import matplotlib
 import requests
 
 matplotlib.use("Agg")  # Use non-interactive backend
-import nibabel as nib
 import numpy as np
-import SimpleITK as sitk
-import torch
-import torch.serialization
-from nnunet.inference.predict import predict_from_folder
 
-# Apply safe globals for torch serialization
-torch.serialization.add_safe_globals([tuple, list, dict, set, int, float, str, bytes, bytearray])
-torch.serialization.add_safe_globals([complex, slice, range])
-torch.serialization.add_safe_globals([np.core.multiarray.scalar])
+from biomni.lazy import lazy_import
+
+# Heavy dependencies are loaded on first use so importing a single tool stays cheap
+nib = lazy_import("nibabel")
+sitk = lazy_import("SimpleITK")
+torch = lazy_import("torch")
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+_torch_safe_globals_registered = False
+
+
+def _register_torch_safe_globals():
+    """Apply safe globals for torch serialization (once, before loading nnUNet checkpoints)."""
+    global _torch_safe_globals_registered
+    if _torch_safe_globals_registered:
+        return
+    import torch.serialization
+
+    torch.serialization.add_safe_globals([tuple, list, dict, set, int, float, str, bytes, bytearray])
+    torch.serialization.add_safe_globals([complex, slice, range])
+    torch.serialization.add_safe_globals([np.core.multiarray.scalar])
+    _torch_safe_globals_registered = True
+
 
 # ============================================================================
 # SEGMENTATION CLASS
@@ -426,6 +440,10 @@ class SegmentationTool:
 
         logging.info(f"Using model: {model_folder}")
 
+        from nnunet.inference.predict import predict_from_folder
+
+        _register_torch_safe_globals()
+
         # Patch torch.load for compatibility
         original_torch_load = torch.load
 
@@ -0,0 +1,245 @@
+"""Cell ontology vocabulary for cell type annotation, built once per data lake file.
+
+``annotate_celltype_scRNA`` restricts LLM answers to the cell type names of the CZI Cell Census.
+:class:`CellTypeVocabulary` holds those names with:
+
+- case- and plural-insensitive lookup (``"t cells"`` -> ``"T cell"``) and fuzzy nearest-term
+  matching for validating LLM answers;
+- a ranking of candidate terms for a cluster from its marker genes, so prompts list a few dozen
+  relevant names instead of the whole vocabulary.
+
+Candidates are scored from the marker table of the data lake (``marker_celltype.parquet``: marker
+genes per cell type, each gene weighted by how specific it is and by its rank in the cluster),
+from marker genes named in the term itself (``CD14`` -> ``"CD14-positive monocyte"``) and from
+the transferred reference composition; how often a term occurs in the census breaks ties and
+fills the list. Both indexes are cached by the data lake store until their files change.
+"""
+
+import difflib
+import math
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from biomni.data_lake import get_data_lake
+
+CENSUS_FILE = "czi_census_datasets_v4.parquet"
+MARKER_FILE = "marker_celltype.parquet"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Abbreviations common in marker tables and LLM answers
+_ABBREVIATIONS = {
+    "nk": "natural killer",
+    "dc": "dendritic",
+    "pdc": "plasmacytoid dendritic",
+    "cdc": "conventional dendritic",
+    "treg": "regulatory t",
+    "hsc": "hematopoietic stem",
+    "rbc": "erythrocyte",
+    "opc": "oligodendrocyte precursor",
+}
+
+
+def normalize_term(name: str) -> str:
+    """Canonical form of a cell type name: case, whitespace, abbreviations and a trailing plural folded."""
+    words = unicodedata.normalize("NFKC", str(name)).lower().split()
+    if words and len(words[-1]) > 3 and words[-1].endswith("s") and not words[-1].endswith("ss"):
+        words[-1] = words[-1][:-1]
+    return " ".join(_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+class CellTypeVocabulary:
+    """Cell type names with normalized lookup, fuzzy matching and marker-based candidate ranking."""
+
+    def __init__(self, counts: dict[str, int], marker_index: dict[str, dict[str, float]] | None = None):
+        """Create the vocabulary.
+
+        Args:
+            counts: Number of census datasets per cell type name
+            marker_index: Marker gene (upper case) -> {cell type name from the marker table: weight}
+
+        """
+        self.counts = dict(counts)
+        self.terms = sorted(self.counts)
+        # Distinct terms can fold to the same form ("NK cell" and "natural killer cell"); all of them are kept,
+        # most frequent in the census first
+        self._by_normalized: dict[str, list[str]] = defaultdict(list)
+        for term in sorted(self.terms, key=lambda term: -self.counts[term]):
+            self._by_normalized[normalize_term(term)].append(term)
+        self._by_normalized = dict(self._by_normalized)
+        self.collisions = {form: terms for form, terms in self._by_normalized.items() if len(terms) > 1}
+        self._normalized = list(self._by_normalized)
+        self._term_tokens = {term: _tokens(term) for term in self.terms}
+        self._max_count = max(self.counts.values(), default=1)
+        self._gene_terms: dict[str, dict[str, float]] = {}
+        if marker_index:
+            self._gene_terms = self._map_marker_index(marker_index)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    def lookup(self, name: str) -> str | None:
+        """Vocabulary term equal to ``name`` up to case, whitespace, abbreviations and plural, or None.
+
+        Among terms that fold to the same form, ``name`` itself wins, then a term equal to it up to case,
+        then the one most frequent in the census (see :meth:`lookup_all`).
+        """
+        if name in self.counts:
+            return name
+        return self._pick(name, self._by_normalized.get(normalize_term(name), []))
+
+    def lookup_all(self, name: str) -> list[str]:
+        """Every vocabulary term equal to ``name`` up to case, whitespace, abbreviations and plural."""
+        return list(self._by_normalized.get(normalize_term(name), []))
+
+    def match(self, name: str, cutoff: float = 0.85) -> str | None:
+        """Vocabulary term for ``name``: exact lookup, else the closest term with similarity >= ``cutoff``."""
+        term = self.lookup(name)
+        if term is not None:
+            return term
+        close = difflib.get_close_matches(normalize_term(name), self._normalized, n=1, cutoff=cutoff)
+        return self._pick(name, self._by_normalized[close[0]]) if close else None
+
+    def suggest(self, name: str, n: int = 3, cutoff: float = 0.5) -> list[str]:
+        """Up to ``n`` vocabulary terms closest to ``name`` (for correcting an invalid answer)."""
+        close = difflib.get_close_matches(normalize_term(name), self._normalized, n=n, cutoff=cutoff)
+        return [term for form in close for term in self._by_normalized[form]][:n]
+
+    def candidates(
+        self,
+        marker_genes: list[str],
+        composition: dict[str, float] | None = None,
+        limit: int = 60,
+    ) -> list[str]:
+        """Vocabulary terms most relevant to a cluster, best first.
+
+        Args:
+            marker_genes: Cluster marker genes, strongest first
+            composition: Transferred reference cell type proportions for the cluster
+            limit: Number of terms returned (0 or more than the vocabulary returns every term)
+
+        """
+        if limit <= 0 or limit >= len(self.terms):
+            return list(self.terms)
+
+        scores: dict[str, float] = defaultdict(float)
+        for rank, gene in enumerate(marker_genes):
+            rank_weight = 1.0 / math.sqrt(rank + 1)
+            for term, weight in self._gene_terms.get(str(gene).upper(), {}).items():
+                scores[term] += rank_weight * weight
+            gene_token = str(gene).lower()
+            for term, tokens in self._term_tokens.items():
+                if gene_token in tokens:
+                    scores[term] += 2 * rank_weight
+        for name, proportion in (composition or {}).items():
+            term = self.match(name)
+            if term is not None and proportion > 0:
+                scores[term] += 5 * proportion
+
+        # Census frequency breaks ties and fills the list when the markers are uninformative
+        def prior(term):
+            return 0.01 * math.log1p(self.counts[term]) / math.log1p(self._max_count)
+
+        return sorted(self.terms, key=lambda term: -(scores.get(term, 0.0) + prior(term)))[:limit]
+
+    @staticmethod
+    def _pick(name: str, terms: list[str]) -> str | None:
+        folded = str(name).strip().casefold()
+        for term in terms:
+            if term.casefold() == folded:
+                return term
+        return terms[0] if terms else None
+
+    def _map_marker_index(self, marker_index: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+        """Re-key the marker index by vocabulary term (see :meth:`_targets`)."""
+        targets: dict[str, dict[str, float]] = {}
+        gene_terms: dict[str, dict[str, float]] = {}
+        for gene, cell_types in marker_index.items():
+            mapped: dict[str, float] = defaultdict(float)
+            for name, weight in cell_types.items():
+                if name not in targets:
+                    targets[name] = self._targets(name)
+                for term, share in targets[name].items():
+                    mapped[term] += weight * share
+            if mapped:
+                gene_terms[gene] = dict(mapped)
+        return gene_terms
+
+    def _targets(self, name: str, max_subtypes: int = 20) -> dict[str, float]:
+        """Vocabulary terms a marker table cell type stands for, with the share of its weight.
+
+        The matching term gets the full weight and its subtypes (terms containing all of its words,
+        e.g. "CD4-positive, alpha-beta T cell" for "T cell") share half of it. Without a matching
+        term the subtypes share the full weight ("monocytes" -> "classical monocyte", ...).
+        """
+        term = self.match(name, cutoff=0.8)
+        tokens = _tokens(normalize_term(name)) - {"cell"}
+        subtypes = []
+        if tokens:
+            subtypes = [t for t, t_tokens in self._term_tokens.items() if t != term and tokens <= t_tokens]
+        if len(subtypes) > max_subtypes:
+            subtypes = []
+        targets = {term: 1.0} if term is not None else {}
+        for subtype in subtypes:
+            targets[subtype] = (0.5 if term is not None else 1.0) / len(subtypes)
+        return targets
+
+
+def load_census_counts(path: str) -> dict[str, int]:
+    """Number of census datasets per cell type (``cell_type`` holds ``;``-separated names)."""
+    df = get_data_lake().query(path, columns=["cell_type"])
+    counts: Counter = Counter()
+    for cell_types in df["cell_type"].dropna():
+        counts.update({name.strip() for name in str(cell_types).split(";") if name.strip()})
+    return dict(counts)
+
+
+def load_marker_index(path: str) -> dict[str, dict[str, float]]:
+    """Marker gene -> {cell type: specificity weight} from a marker table.
+
+    The cell type column is the first whose name contains "cell" and the gene column the first
+    containing "symbol", "gene" or "marker"; gene cells may hold comma/semicolon separated lists.
+    A gene marking ``n`` cell types contributes ``1 / n`` to each.
+    """
+    df = get_data_lake().query(path)
+    columns = {column.lower(): column for column in df.columns}
+    cell_column = next((columns[c] for c in columns if "cell" in c and "id" not in c), None)
+    gene_column = next(
+        (columns[c] for key in ("symbol", "gene", "marker") for c in columns if key in c and columns[c] != cell_column),
+        None,
+    )
+    if cell_column is None or gene_column is None:
+        return {}
+
+    cell_types_by_gene: dict[str, set[str]] = defaultdict(set)
+    for cell_type, genes in zip(df[cell_column], df[gene_column], strict=False):
+        if not isinstance(cell_type, str) or not isinstance(genes, str):
+            continue
+        for gene in re.split(r"[,;\s]+", genes):
+            if gene:
+                cell_types_by_gene[gene.upper()].add(cell_type.strip())
+    return {gene: {name: 1.0 / len(names) for name in names} for gene, names in cell_types_by_gene.items()}
+
+
+def get_celltype_vocabulary(data_lake_path: str) -> CellTypeVocabulary:
+    """Vocabulary of the census in ``data_lake_path``, built once and cached until its files change."""
+    store = get_data_lake()
+    census_path = os.path.join(data_lake_path, CENSUS_FILE)
+    marker_path = os.path.join(data_lake_path, MARKER_FILE)
+
+    def build(path: str) -> CellTypeVocabulary:
+        counts = store.get_object(path, load_census_counts)
+        marker_index = store.get_object(marker_path, load_marker_index) if os.path.exists(marker_path) else None
+        return CellTypeVocabulary(counts, marker_index)
+
+    # A new (or removed) marker table rebuilds the vocabulary as well
+    return store.get_object(census_path, build, key="CellTypeVocabulary", deps=[marker_path])
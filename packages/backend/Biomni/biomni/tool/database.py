@@ -1,6 +1,5 @@
 import json
 import os
-import pickle
 import time
 from typing import Any
 
@@ -9,7 +8,15 @@ from Bio.Blast import NCBIWWW, NCBIXML
 from Bio.Seq import Seq
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from biomni.data_lake import get_data_lake
+from biomni.http_client import get_http_client
 from biomni.llm import get_llm
+from biomni.response_cache import current_mode as response_cache_mode_for
+from biomni.response_cache import get_response_cache, is_cacheable
+from biomni.response_cache import make_key as make_cache_key
+from biomni.tool.api_translation import get_translation_cache, load_schema, schema_json
+from biomni.tool.jaspar import get_matrix_store as get_jaspar_matrix_store
+from biomni.tool.jaspar import matrix_id_from_url
 from biomni.utils import parse_hpo_obo
 
 
@@ -24,7 +31,8 @@ def get_hpo_names(hpo_terms: list[str], data_lake_path: str) -> list[str]:
         List[str]: A list of corresponding HPO term names.
 
     """
-    hp_dict = parse_hpo_obo(data_lake_path + "/hp.obo")
+    # Parsed once per process and reused until hp.obo changes
+    hp_dict = get_data_lake().get_object(data_lake_path + "/hp.obo", parse_hpo_obo)
 
     hpo_names = []
     for term in hpo_terms:
@@ -60,13 +68,18 @@ def _query_llm_for_api(prompt, schema, system_template):
         api_key = None
 
     try:
-        # Format the system prompt with schema if provided
+        # Format the system prompt with schema if provided (serialized once per loaded schema)
         if schema is not None:
-            schema_json = json.dumps(schema, indent=2)
-            system_prompt = system_template.format(schema=schema_json)
+            system_prompt = system_template.format(schema=schema_json(schema))
         else:
             system_prompt = system_template
 
+        # The same prompt against the same schema was already translated: skip the LLM call
+        translation_cache = get_translation_cache()
+        cached = translation_cache.get(prompt, system_prompt, model)
+        if cached is not None:
+            return {"success": True, **cached, "cached": True}
+
         # Get LLM instance using the unified interface with config
         try:
             from biomni.config import default_config
@@ -96,6 +109,7 @@ def _query_llm_for_api(prompt, schema, system_template):
             # If no JSON found, try the whole response
             result = json.loads(llm_text)
 
+        translation_cache.set(prompt, system_prompt, model, {"data": result, "raw_response": llm_text})
         return {"success": True, "data": result, "raw_response": llm_text}
 
     except (json.JSONDecodeError, KeyError, IndexError) as e:
@@ -108,7 +122,7 @@ def _query_llm_for_api(prompt, schema, system_template):
         return {"success": False, "error": f"Error querying LLM: {str(e)}"}
 
 
-def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data=None, description=None):
+def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data=None, description=None, cache=None):
     """General helper function to query REST APIs with consistent error handling.
 
     Parameters
@@ -119,6 +133,8 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
     headers (dict, optional): HTTP headers for the request
     json_data (dict, optional): JSON data for POST requests
     description (str, optional): Description of this query for error messages
+    cache (str, optional): "use", "bypass" or "refresh" the response cache for this call
+        (default: the mode set with ``biomni.response_cache.response_cache_mode``, normally "use")
 
     Returns
     -------
@@ -134,13 +150,29 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
         description = f"{method} request to {endpoint}"
 
     url_error = None
+    query_info = {
+        "endpoint": endpoint,
+        "method": method,
+        "description": description,
+    }
+
+    # Identical lookups (across sessions and worker processes) are served from the response cache
+    response_cache = get_response_cache()
+    cache_mode = response_cache_mode_for(cache)
+    cache_key = None
+    if response_cache.enabled and cache_mode != "bypass" and is_cacheable(headers):
+        cache_key = make_cache_key(method, endpoint, params, json_data, headers)
+        if cache_mode == "use":
+            cached = response_cache.get(cache_key, endpoint)
+            if cached is not None:
+                return {"success": True, "query_info": {**query_info, "cached": True}, "result": cached}
 
     try:
         # Make the API request
         if method.upper() == "GET":
-            response = requests.get(endpoint, params=params, headers=headers)
+            response = get_http_client().get(endpoint, params=params, headers=headers)
         elif method.upper() == "POST":
-            response = requests.post(endpoint, params=params, headers=headers, json=json_data)
+            response = get_http_client().post(endpoint, params=params, headers=headers, json=json_data)
         else:
             return {"error": f"Unsupported HTTP method: {method}"}
 
@@ -154,13 +186,12 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
             # Return raw text if not JSON
             result = {"raw_text": response.text}
 
+        if cache_key is not None:
+            response_cache.set(cache_key, endpoint, result)
+
         return {
             "success": True,
-            "query_info": {
-                "endpoint": endpoint,
-                "method": method,
-                "description": description,
-            },
+            "query_info": query_info,
             "result": result,
         }
 
@@ -206,6 +237,12 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
         }
 
 
+def _ncbi_api_key_param() -> dict:
+    """``api_key`` parameter for NCBI E-utilities when NCBI_API_KEY is set (raises the limit to 10 req/s)."""
+    api_key = os.getenv("NCBI_API_KEY")
+    return {"api_key": api_key} if api_key else {}
+
+
 def _query_ncbi_database(
     database: str,
     search_term: str,
@@ -236,6 +273,7 @@ def _query_ncbi_database(
         "retmode": "json",
         "retmax": 100,
         "usehistory": "y",  # Use history server to store results
+        **_ncbi_api_key_param(),
     }
 
     # Get IDs of matching entries
@@ -267,6 +305,7 @@ def _query_ncbi_database(
                 "WebEnv": webenv,
                 "retmode": "json",
                 "retmax": max_results,
+                **_ncbi_api_key_param(),
             }
 
             details_response = _query_rest_api(
@@ -291,6 +330,7 @@ def _query_ncbi_database(
                 "db": database,
                 "id": ",".join(id_list),
                 "retmode": "json",
+                **_ncbi_api_key_param(),
             }
 
             details_response = _query_rest_api(
@@ -489,9 +529,7 @@ def query_uniprot(
     # If using prompt, parse with Claude
     if prompt:
         # Load UniProt schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "uniprot.pkl")
-        with open(schema_path, "rb") as f:
-            uniprot_schema = pickle.load(f)
+        uniprot_schema = load_schema("uniprot")
 
         # Create system prompt template
         system_template = """
@@ -611,7 +649,7 @@ def query_alphafold(
 
     try:
         # Make the API request
-        response = requests.get(url)
+        response = get_http_client().get(url)
         response.raise_for_status()
 
         # Parse the response as JSON
@@ -634,7 +672,7 @@ def query_alphafold(
             download_url = f"https://alphafold.ebi.ac.uk/files/{filename}"
 
             # Download the file
-            download_response = requests.get(download_url)
+            download_response = get_http_client().get(download_url)
             if download_response.status_code == 200:
                 with open(file_path, "wb") as f:
                     f.write(download_response.content)
@@ -737,9 +775,7 @@ def query_interpro(
     # If using prompt, parse with Claude
     if prompt:
         # Load InterPro schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "interpro.pkl")
-        with open(schema_path, "rb") as f:
-            interpro_schema = pickle.load(f)
+        interpro_schema = load_schema("interpro")
 
         # Create system prompt template
         system_template = """
@@ -838,10 +874,7 @@ def query_pdb(
     # Generate search query from natural language if prompt is provided and query is not
     if prompt and not query:
         # Load schema from pickle file
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pdb.pkl")
-
-        with open(schema_path, "rb") as f:
-            schema = pickle.load(f)
+        schema = load_schema("pdb")
 
         # Create system prompt template
         system_template = """
@@ -971,7 +1004,7 @@ def query_pdb_identifiers(identifiers, return_type="entry", download=False, attr
                     data_url = f"https://data.rcsb.org/rest/v1/core/chem_comp/{identifier}"
 
                 # Fetch data
-                data_response = requests.get(data_url)
+                data_response = get_http_client().get(data_url)
                 data_response.raise_for_status()
                 entity_data = data_response.json()
 
@@ -1010,7 +1043,7 @@ def query_pdb_identifiers(identifiers, return_type="entry", download=False, attr
                 try:
                     # Download PDB file
                     pdb_url = f"https://files.rcsb.org/download/{pdb_id}.pdb"
-                    pdb_response = requests.get(pdb_url)
+                    pdb_response = get_http_client().get(pdb_url)
 
                     if pdb_response.status_code == 200:
                         # Create data directory if it doesn't exist
@@ -1058,9 +1091,7 @@ def query_kegg(prompt, endpoint=None, verbose=True):
 
     if prompt:
         # Load schema from pickle file
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "kegg.pkl")
-        with open(schema_path, "rb") as f:
-            kegg_schema = pickle.load(f)
+        kegg_schema = load_schema("kegg")
 
         # Create system prompt template
         system_template = """
@@ -1162,9 +1193,7 @@ def query_stringdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load STRING schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "stringdb.pkl")
-        with open(schema_path, "rb") as f:
-            stringdb_schema = pickle.load(f)
+        stringdb_schema = load_schema("stringdb")
 
         # Create system prompt template
         system_template = """
@@ -1230,7 +1259,7 @@ def query_stringdb(
         if download_image:
             # For images, we need to handle the download manually
             try:
-                response = requests.get(endpoint, stream=True)
+                response = get_http_client().get(endpoint, stream=True)
                 response.raise_for_status()
 
                 # Create output directory if needed
@@ -1332,9 +1361,7 @@ def query_iucn(
     # If using prompt, parse with Claude
     if prompt:
         # Load IUCN schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "iucn.pkl")
-        with open(schema_path, "rb") as f:
-            iucn_schema = pickle.load(f)
+        iucn_schema = load_schema("iucn")
 
         # Create system prompt template
         system_template = """
@@ -1433,9 +1460,7 @@ def query_paleobiology(
     # If using prompt, parse with Claude
     if prompt:
         # Load PBDB schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pbdb.pkl")
-        with open(schema_path, "rb") as f:
-            pbdb_schema = pickle.load(f)
+        pbdb_schema = load_schema("pbdb")
 
         # Create system prompt template
         system_template = """
@@ -1495,7 +1520,7 @@ def query_paleobiology(
     if is_image:
         # For image queries, we need special handling
         try:
-            response = requests.get(endpoint)
+            response = get_http_client().get(endpoint)
             response.raise_for_status()
 
             # Return image metadata without the binary data
@@ -1561,9 +1586,7 @@ def query_jaspar(
     # If using prompt, parse with Claude
     if prompt:
         # Load JASPAR schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "jaspar.pkl")
-        with open(schema_path, "rb") as f:
-            jaspar_schema = pickle.load(f)
+        jaspar_schema = load_schema("jaspar")
 
         # Create system prompt template
         system_template = """
@@ -1623,8 +1646,20 @@ def query_jaspar(
 
         description = "Direct query to JASPAR API"
 
-    # Execute the JASPAR API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    # Versioned matrices never change: they are kept in the matrix store shared with the TFBS tools
+    # (subject to the response cache mode, like every other cached lookup)
+    cache_mode = response_cache_mode_for()
+    matrix_id = matrix_id_from_url(endpoint)
+    matrix_store = get_jaspar_matrix_store() if matrix_id is not None and cache_mode != "bypass" else None
+    record = matrix_store.get(matrix_id) if matrix_store is not None and cache_mode == "use" else None
+    if record is not None:
+        query_info = {"endpoint": endpoint, "method": "GET", "description": description, "cached": True}
+        api_result = {"success": True, "query_info": query_info, "result": record}
+    else:
+        # Execute the JASPAR API request using the helper function
+        api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+        if matrix_store is not None and api_result.get("success") and "pfm" in api_result["result"]:
+            matrix_store.put(api_result["result"])
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
         return _format_query_results(api_result["result"])
@@ -1665,9 +1700,7 @@ def query_worms(
     # If using prompt, parse with Claude
     if prompt:
         # Load WoRMS schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "worms.pkl")
-        with open(schema_path, "rb") as f:
-            worms_schema = pickle.load(f)
+        worms_schema = load_schema("worms")
 
         # Create system prompt template
         system_template = """
@@ -1762,9 +1795,7 @@ def query_cbioportal(
     # If using prompt, parse with Claude
     if prompt:
         # Load cBioPortal schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "cbioportal.pkl")
-        with open(schema_path, "rb") as f:
-            cbioportal_schema = pickle.load(f)
+        cbioportal_schema = load_schema("cbioportal")
 
         # Create system prompt template
         system_template = """
@@ -1854,9 +1885,7 @@ def query_clinvar(
 
     if prompt:
         # Load ClinVar schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "clinvar.pkl")
-        with open(schema_path, "rb") as f:
-            clinvar_schema = pickle.load(f)
+        clinvar_schema = load_schema("clinvar")
 
         # ClinVar system prompt template
         system_prompt_template = """
@@ -1944,9 +1973,7 @@ def query_geo(
 
     if prompt:
         # Load GEO schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "geo.pkl")
-        with open(schema_path, "rb") as f:
-            geo_schema = pickle.load(f)
+        geo_schema = load_schema("geo")
 
         # Create system prompt template
         system_template = """
@@ -2040,9 +2067,7 @@ def query_dbsnp(
 
     if prompt:
         # Load dbSNP schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "dbsnp.pkl")
-        with open(schema_path, "rb") as f:
-            dbsnp_schema = pickle.load(f)
+        dbsnp_schema = load_schema("dbsnp")
 
         # Create system prompt template
         system_template = """
@@ -2133,9 +2158,7 @@ def query_ucsc(
     # If using prompt, parse with Claude
     if prompt:
         # Load UCSC schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "ucsc.pkl")
-        with open(schema_path, "rb") as f:
-            ucsc_schema = pickle.load(f)
+        ucsc_schema = load_schema("ucsc")
 
         # Create system prompt template
         system_template = """
@@ -2235,9 +2258,7 @@ def query_ensembl(
     # If using prompt, parse with Claude
     if prompt:
         # Load Ensembl schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "ensembl.pkl")
-        with open(schema_path, "rb") as f:
-            ensembl_schema = pickle.load(f)
+        ensembl_schema = load_schema("ensembl")
 
         # Create system prompt template
         system_template = """
@@ -2358,9 +2379,7 @@ def query_opentarget(
     # If using prompt, parse with Claude
     if prompt:
         # Load OpenTargets schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "opentarget.pkl")
-        with open(schema_path, "rb") as f:
-            opentarget_schema = pickle.load(f)
+        opentarget_schema = load_schema("opentarget")
 
         # Create system prompt template
         system_template = """
@@ -2455,12 +2474,7 @@ def query_monarch(
 
     # If using prompt, use Claude to generate the endpoint
     if prompt:
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "monarch.pkl")
-        if os.path.exists(schema_path):
-            with open(schema_path, "rb") as f:
-                monarch_schema = pickle.load(f)
-        else:
-            monarch_schema = None
+        monarch_schema = load_schema("monarch", missing_ok=True)
 
         system_template = """
         You are an expert in translating natural language requests into REST API calls for the Monarch Initiative Platform API.
@@ -2567,12 +2581,7 @@ def query_openfda(
 
     # If using prompt, use Claude or Gemini to generate the endpoint
     if prompt:
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "openfda.pkl")
-        if os.path.exists(schema_path):
-            with open(schema_path, "rb") as f:
-                openfda_schema = pickle.load(f)
-        else:
-            openfda_schema = None
+        openfda_schema = load_schema("openfda", missing_ok=True)
 
         system_template = """
         You are a biomedical informatics expert specialized in using the OpenFDA API.\n\nBased on the user's natural language request, determine the appropriate OpenFDA API endpoint and parameters.\n\nOPENFDA API SCHEMA:\n{schema}\n\nYour response should be a JSON object with the following fields:\n1. \"full_url\": The complete URL to query (including the base URL \"https://api.fda.gov\" and any parameters)\n2. \"description\": A brief description of what the query is doing\n\nSPECIAL NOTES:\n- For drug event queries, use /drug/event.json?search=...\n- For drug label queries, use /drug/label.json?search=...\n- For recall queries, use /drug/enforcement.json?search=...\n- Use max_results to limit the number of returned items if supported (limit=)\n- Always URL-encode search terms\n- Return ONLY the JSON object with no additional text.\n        """
@@ -2788,9 +2797,7 @@ def query_gwas_catalog(
     # If using prompt, parse with Claude
     if prompt:
         # Load GWAS Catalog schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gwas_catalog.pkl")
-        with open(schema_path, "rb") as f:
-            gwas_schema = pickle.load(f)
+        gwas_schema = load_schema("gwas_catalog")
 
         # Create system prompt template
         system_template = """
@@ -2889,9 +2896,7 @@ def query_gnomad(
     # If using prompt, parse with Claude
     if prompt and not gene_symbol:
         # Load gnomAD schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gnomad.pkl")
-        with open(schema_path, "rb") as f:
-            gnomad_schema = pickle.load(f)
+        gnomad_schema = load_schema("gnomad")
 
         # Create system prompt template
         system_template = """
@@ -3099,9 +3104,7 @@ def query_reactome(
     # If using prompt, parse with Claude
     if prompt:
         # Load Reactome schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "reactome.pkl")
-        with open(schema_path, "rb") as f:
-            reactome_schema = pickle.load(f)
+        reactome_schema = load_schema("reactome")
 
         # Create system prompt template
         system_template = """
@@ -3198,7 +3201,7 @@ def query_reactome(
         if pathway_id and output_dir:
             diagram_url = f"{content_base_url}/data/pathway/{pathway_id}/diagram"
             try:
-                diagram_response = requests.get(diagram_url)
+                diagram_response = get_http_client().get(diagram_url)
                 diagram_response.raise_for_status()
 
                 # Save diagram file
@@ -3337,9 +3340,7 @@ def query_pride(
     # If using prompt, parse with Claude
     if prompt:
         # Load PRIDE schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pride.pkl")
-        with open(schema_path, "rb") as f:
-            pride_schema = pickle.load(f)
+        pride_schema = load_schema("pride")
 
         # Create system prompt template
         system_template = """
@@ -3436,9 +3437,7 @@ def query_gtopdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load GtoPdb schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gtopdb.pkl")
-        with open(schema_path, "rb") as f:
-            gtopdb_schema = pickle.load(f)
+        gtopdb_schema = load_schema("gtopdb")
 
         # Create system prompt template
         system_template = r"""
@@ -3537,7 +3536,7 @@ def region_to_ccre_screen(coord_chrom: str, coord_start: int, coord_end: int, as
         steps.append(str(data))
 
         # Make the request
-        response = requests.post(url, json=data)
+        response = get_http_client().post(url, json=data)
 
         # Check if the response is successful
         if not response.ok:
@@ -3636,7 +3635,7 @@ def get_genes_near_ccre(accession: str, assembly: str, chromosome: str, k: int =
     data = {"accession": accession, "assembly": assembly, "coord_chrom": chromosome}
 
     steps_log += "Sending POST request to API with given data.\n"
-    response = requests.post(url, json=data)
+    response = get_http_client().post(url, json=data)
 
     if not response.ok:
         steps_log += f"API request failed with response: {response.text}\n"
@@ -3704,9 +3703,7 @@ def query_remap(
     # If using prompt, parse with Claude
     if prompt:
         # Load ReMap schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "remap.pkl")
-        with open(schema_path, "rb") as f:
-            remap_schema = pickle.load(f)
+        remap_schema = load_schema("remap")
 
         # Create system prompt template
         system_template = """
@@ -3805,9 +3802,7 @@ def query_mpd(
     # If using prompt, parse with Claude
     if prompt:
         # Load MPD schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "mpd.pkl")
-        with open(schema_path, "rb") as f:
-            mpd_schema = pickle.load(f)
+        mpd_schema = load_schema("mpd")
 
         # Create system prompt template
         system_template = """
@@ -3906,9 +3901,7 @@ def query_emdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load EMDB schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "emdb.pkl")
-        with open(schema_path, "rb") as f:
-            emdb_schema = pickle.load(f)
+        emdb_schema = load_schema("emdb")
 
         # Create system prompt template
         system_template = """
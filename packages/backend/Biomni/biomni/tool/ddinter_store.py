@@ -0,0 +1,365 @@
+"""Precompiled DDInter 2.0 interaction store shared by the drug-drug interaction tools.
+
+The DDInter CSV files (one per ATC category) are compiled once into ``schema_db/ddinter_store.npz``
+and rebuilt when a CSV is newer than it or when it was compiled from another data lake. The compiled
+store holds integer IDs only:
+
+- drugs (DDInter IDs, in order of first appearance) with their category bitmask and the number of
+  distinct interaction partners
+- nodes, the standardized drug names interactions are keyed by (salt forms such as "X sodium"
+  share the node of "X")
+- a CSR adjacency over nodes: the interactions of node ``i`` are ``indptr[i]:indptr[i + 1]``,
+  sorted by partner and then by CSV row, with each interaction's severity and category code. The
+  interactions of a pair are found by binary search in the smaller of the two rows
+- a trigram index over the lowercase names and standardized names drugs are looked up by
+
+:func:`get_ddinter_store` loads the store once per process. Name lookups are exact first; fuzzy
+lookups score only the names sharing the most trigrams with the query, with the
+``difflib.get_close_matches`` cutoff and tie-breaking.
+
+    store = get_ddinter_store(data_lake_path)
+    a, b = store.resolve("Warfarin"), store.resolve("asprin")
+    store.interactions(a, b, severity_levels=["Major"])  # [{"level": "Major", "category": ...}, ...]
+"""
+
+import os
+import tempfile
+import threading
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+CSV_FILES = [
+    "ddinter_alimentary_tract_metabolism.csv",
+    "ddinter_antineoplastic.csv",
+    "ddinter_antiparasitic.csv",
+    "ddinter_blood_organs.csv",
+    "ddinter_dermatological.csv",
+    "ddinter_hormonal.csv",
+    "ddinter_respiratory.csv",
+    "ddinter_various.csv",
+]
+CATEGORIES = [csv_file.replace("ddinter_", "").replace(".csv", "") for csv_file in CSV_FILES]
+SALT_SUFFIXES = [" hydrochloride", " sulfate", " sodium", " potassium", " calcium", " magnesium"]
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "schema_db")
+STORE_FILE = "ddinter_store.npz"
+STORE_VERSION = 1  # bump when the compiled layout changes; older files are rebuilt
+
+FUZZY_CUTOFF = 0.8
+FUZZY_CANDIDATES = 64  # names sharing the most trigrams with the query that are scored exactly
+
+
+def standardize_name(drug_name) -> str:
+    """Lowercase, stripped name without common salt suffixes (``""`` for a missing name)."""
+    if pd.isna(drug_name):
+        return ""
+    standardized = str(drug_name).strip().lower()
+    for suffix in SALT_SUFFIXES:
+        standardized = standardized.replace(suffix, "")
+    return standardized
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _bits(codes: np.ndarray) -> np.ndarray:
+    return np.left_shift(1, codes.astype(np.int64))
+
+
+def _names(values: np.ndarray) -> np.ndarray:
+    return np.array(["" if pd.isna(value) else str(value) for value in values], dtype=str)
+
+
+def compile_store(data_lake_path: str) -> dict[str, np.ndarray]:
+    """Arrays of the compiled store, built from the DDInter CSV files in ``data_lake_path``."""
+    frames = []
+    for category, csv_file in enumerate(CSV_FILES):
+        file_path = os.path.join(data_lake_path, csv_file)
+        if os.path.exists(file_path):
+            df = pd.read_csv(file_path, usecols=["DDInterID_A", "Drug_A", "DDInterID_B", "Drug_B", "Level"])
+            df["category"] = category
+            frames.append(df)
+    if not frames:
+        raise FileNotFoundError("No DDInter CSV files found in data lake")
+    rows = pd.concat(frames, ignore_index=True)
+    n_rows = len(rows)
+
+    # Both drugs of every row, interleaved (A0, B0, A1, B1, ...) so that factorizing keeps the order
+    # in which drugs first appear
+    ids = np.empty(2 * n_rows, dtype=object)
+    ids[0::2], ids[1::2] = rows["DDInterID_A"].to_numpy(), rows["DDInterID_B"].to_numpy()
+    names = np.empty(2 * n_rows, dtype=object)
+    names[0::2], names[1::2] = rows["Drug_A"].to_numpy(), rows["Drug_B"].to_numpy()
+    drug_codes, drug_ids = pd.factorize(ids, use_na_sentinel=False)
+    name_codes, name_values = pd.factorize(names, use_na_sentinel=False)
+    node_of_name, node_names = pd.factorize(np.array([standardize_name(name) for name in name_values], dtype=object))
+    position_node = node_of_name[name_codes]
+    n_drugs, n_nodes = len(drug_ids), len(node_names)
+
+    first_position = np.unique(drug_codes, return_index=True)[1]
+    drug_names = _names(name_values[name_codes[first_position]])
+    categories = np.repeat(rows["category"].to_numpy(), 2)
+    drug_categories = np.zeros(n_drugs, dtype=np.int64)
+    np.bitwise_or.at(drug_categories, drug_codes, _bits(categories))
+    # Distinct partners per drug ID, both directions
+    drug_a, drug_b = drug_codes[0::2].astype(np.int64), drug_codes[1::2].astype(np.int64)
+    pairs = np.unique(np.concatenate([drug_a * n_drugs + drug_b, drug_b * n_drugs + drug_a]))
+    drug_degrees = np.bincount(pairs // n_drugs, minlength=n_drugs)
+
+    level_codes, levels = pd.factorize(rows["Level"].fillna("Unknown").astype(str))
+
+    # Every row is an interaction in both directions (twice in the row of a drug with itself)
+    node_a, node_b = position_node[0::2], position_node[1::2]
+    source = np.concatenate([node_a, node_b])
+    partner = np.concatenate([node_b, node_a])
+    edge_rows = np.tile(np.arange(n_rows), 2)
+    order = np.lexsort((edge_rows, partner, source))
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(source, minlength=n_nodes), out=indptr[1:])
+    edge_rows = edge_rows[order]
+
+    # Lookup names: lowercase original and standardized name of each drug; a later drug wins a name
+    name_index = {}
+    for drug, (name, node) in enumerate(zip(drug_names, node_of_name[name_codes[first_position]], strict=True)):
+        name_index[name.lower()] = drug
+        name_index[node_names[node]] = drug
+    lookup_names = np.array(list(name_index), dtype=str)
+    trigram_postings: dict[str, list[int]] = {}
+    for index, name in enumerate(lookup_names):
+        for trigram in _trigrams(name):
+            trigram_postings.setdefault(trigram, []).append(index)
+    trigrams = sorted(trigram_postings)
+
+    return {
+        "version": np.array(STORE_VERSION),
+        "source": np.array(os.path.realpath(data_lake_path)),
+        "levels": np.array(levels, dtype=str),
+        "drug_ids": _names(drug_ids),
+        "drug_names": drug_names,
+        "drug_nodes": node_of_name[name_codes[first_position]].astype(np.int32),
+        "drug_categories": drug_categories.astype(np.int32),
+        "drug_degrees": drug_degrees.astype(np.int32),
+        "node_names": np.array(node_names, dtype=str),
+        "row_drugs": drug_codes.reshape(n_rows, 2).astype(np.int32),
+        "indptr": indptr,
+        "partners": partner[order].astype(np.int32),
+        "edge_rows": edge_rows.astype(np.int32),
+        "edge_levels": level_codes[edge_rows].astype(np.uint8),
+        "edge_categories": rows["category"].to_numpy()[edge_rows].astype(np.uint8),
+        "lookup_names": lookup_names,
+        "lookup_drugs": np.array(list(name_index.values()), dtype=np.int32),
+        "trigrams": np.array(trigrams, dtype=str),
+        "trigram_indptr": np.cumsum([0] + [len(trigram_postings[t]) for t in trigrams], dtype=np.int64),
+        "trigram_postings": np.array([i for t in trigrams for i in trigram_postings[t]], dtype=np.int32),
+    }
+
+
+class DDInterStore:
+    """Compiled DDInter interactions; see the module docstring for the layout."""
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        self.levels = self.levels.tolist()
+        self.drug_ids = self.drug_ids.tolist()
+        self.drug_names = self.drug_names.tolist()
+        self.name_index = dict(zip(self.lookup_names.tolist(), self.lookup_drugs.tolist(), strict=True))
+        self._lookup_lengths = np.char.str_len(self.lookup_names)
+        self._trigram_index = {trigram: i for i, trigram in enumerate(self.trigrams.tolist())}
+        self._major = self.levels.index("Major") if "Major" in self.levels else -1
+
+    def __len__(self) -> int:
+        return len(self.drug_ids)
+
+    def resolve(self, drug_name: str) -> str | None:
+        """Lookup name of ``drug_name``: its lowercase form if known, else the closest name scoring at
+        least ``FUZZY_CUTOFF`` (``difflib`` ratio), else None."""
+        query = drug_name.lower()
+        if query in self.name_index:
+            return query
+        shared = self._shared_trigrams(query)
+        if shared is None:
+            return None
+        # A ratio of 0.8 is impossible if one name is more than 1.5 times as long as the other
+        lengths = self._lookup_lengths
+        shared[(lengths * 3 < len(query) * 2) | (lengths * 2 > len(query) * 3)] = 0
+        candidates = np.flatnonzero(shared)
+        if len(candidates) > FUZZY_CANDIDATES:
+            candidates = candidates[np.argpartition(-shared[candidates], FUZZY_CANDIDATES)[:FUZZY_CANDIDATES]]
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        scored = []
+        for candidate in self.lookup_names[candidates].tolist():
+            matcher.set_seq1(candidate)
+            if (
+                matcher.real_quick_ratio() >= FUZZY_CUTOFF
+                and matcher.quick_ratio() >= FUZZY_CUTOFF
+                and matcher.ratio() >= FUZZY_CUTOFF
+            ):
+                scored.append((matcher.ratio(), candidate))
+        return max(scored)[1] if scored else None
+
+    def _shared_trigrams(self, query: str) -> np.ndarray | None:
+        """Number of trigrams each lookup name shares with ``query`` (None if it shares none)."""
+        postings = []
+        for trigram in _trigrams(query):
+            index = self._trigram_index.get(trigram)
+            if index is not None:
+                postings.append(self.trigram_postings[self.trigram_indptr[index] : self.trigram_indptr[index + 1]])
+        if not postings:
+            return None
+        return np.bincount(np.concatenate(postings), minlength=len(self.lookup_names))
+
+    def drug(self, name: str) -> int:
+        """Drug index of a lookup name returned by :meth:`resolve`."""
+        return self.name_index[name]
+
+    def node(self, name: str) -> int:
+        return int(self.drug_nodes[self.name_index[name]])
+
+    def categories(self, drug: int) -> list[str]:
+        """Categories (CSV files) a drug appears in."""
+        return [category for bit, category in enumerate(CATEGORIES) if self.drug_categories[drug] >> bit & 1]
+
+    def severity_mask(self, levels: list[str]) -> int:
+        return sum(1 << self.levels.index(level) for level in set(levels) if level in self.levels)
+
+    def category_mask(self, categories: list[str]) -> int:
+        return sum(1 << CATEGORIES.index(category) for category in set(categories) if category in CATEGORIES)
+
+    def _edges(self, node_a: int, node_b: int) -> np.ndarray:
+        """Edge positions of the interactions of two nodes, in CSV row order."""
+        if self.indptr[node_a + 1] - self.indptr[node_a] > self.indptr[node_b + 1] - self.indptr[node_b]:
+            node_a, node_b = node_b, node_a
+        start, stop = self.indptr[node_a], self.indptr[node_a + 1]
+        row = self.partners[start:stop]
+        return np.arange(start + np.searchsorted(row, node_b), start + np.searchsorted(row, node_b, side="right"))
+
+    def interactions(
+        self,
+        name_a: str,
+        name_b: str,
+        severity_levels: list[str] | None = None,
+        interaction_types: list[str] | None = None,
+    ) -> list[dict]:
+        """Interactions between two lookup names, optionally only those with the given severity levels
+        and categories.
+
+        Returns:
+            One dict per interaction: level, category, drug_a_id, drug_b_id, drug_a_name, drug_b_name
+
+        """
+        edges = self._edges(self.node(name_a), self.node(name_b))
+        if severity_levels:
+            edges = edges[(_bits(self.edge_levels[edges]) & self.severity_mask(severity_levels)) != 0]
+        if interaction_types:
+            edges = edges[(_bits(self.edge_categories[edges]) & self.category_mask(interaction_types)) != 0]
+        interactions = []
+        for edge in edges.tolist():
+            drug_a, drug_b = self.row_drugs[self.edge_rows[edge]].tolist()
+            interactions.append(
+                {
+                    "level": self.levels[self.edge_levels[edge]],
+                    "category": CATEGORIES[self.edge_categories[edge]],
+                    "drug_a_id": self.drug_ids[drug_a],
+                    "drug_b_id": self.drug_ids[drug_b],
+                    "drug_a_name": self.drug_names[drug_a],
+                    "drug_b_name": self.drug_names[drug_b],
+                }
+            )
+        return interactions
+
+    def alternatives(self, target: str, contraindicated: list[str], therapeutic_class: str | None = None) -> list[dict]:
+        """Drugs sharing a category with ``target`` (or in a category containing ``therapeutic_class``)
+        without a Major interaction with any of the ``contraindicated`` lookup names.
+
+        Returns:
+            In drug order, one dict per drug: name, categories, interaction_count (interactions with
+            the contraindicated drugs) and total_interactions (distinct interaction partners)
+
+        """
+        target_drug = self.drug(target)
+        if therapeutic_class:
+            mask = sum(1 << bit for bit, category in enumerate(CATEGORIES) if therapeutic_class.lower() in category)
+        else:
+            mask = int(self.drug_categories[target_drug])
+        candidates = (self.drug_categories & mask) != 0
+        candidates[target_drug] = False
+
+        counts = np.zeros(len(self.node_names), dtype=np.int64)
+        major = np.zeros(len(self.node_names), dtype=np.int64)
+        for name in contraindicated:
+            node = self.node(name)
+            start, stop = self.indptr[node], self.indptr[node + 1]
+            counts += np.bincount(self.partners[start:stop], minlength=len(counts))
+            major += np.bincount(
+                self.partners[start:stop][self.edge_levels[start:stop] == self._major], minlength=len(major)
+            )
+        candidates &= major[self.drug_nodes] == 0
+
+        return [
+            {
+                "name": self.drug_names[drug],
+                "categories": self.categories(drug),
+                "interaction_count": int(counts[self.drug_nodes[drug]]),
+                "total_interactions": int(self.drug_degrees[drug]),
+            }
+            for drug in np.flatnonzero(candidates).tolist()
+        ]
+
+
+def _save(arrays: dict[str, np.ndarray], path: str) -> None:
+    """Write the compiled store atomically; a read-only schema directory only costs a rebuild per process."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _load(path: str, source: str) -> dict[str, np.ndarray] | None:
+    """Compiled store at ``path`` if it has the current layout and was compiled from data lake ``source``."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+    except (OSError, ValueError):
+        return None
+    if int(arrays.get("version", -1)) != STORE_VERSION or str(arrays.get("source", "")) != source:
+        return None
+    return arrays
+
+
+# Keyed by (data lake, store file): data lakes sharing a store directory never share a store
+_shared_stores: dict[tuple[str, str], DDInterStore] = {}
+_shared_lock = threading.Lock()
+
+
+def get_ddinter_store(data_lake_path: str, store_dir: str = SCHEMA_DIR) -> DDInterStore:
+    """Process-wide store compiled into ``store_dir``, built from ``data_lake_path`` if missing or stale."""
+    path = os.path.realpath(os.path.join(store_dir, STORE_FILE))
+    source = os.path.realpath(data_lake_path)
+    with _shared_lock:
+        store = _shared_stores.get((source, path))
+        if store is None:
+            sources = [os.path.join(data_lake_path, csv_file) for csv_file in CSV_FILES]
+            newest = max((os.path.getmtime(source) for source in sources if os.path.exists(source)), default=0)
+            arrays = None
+            if os.path.exists(path) and os.path.getmtime(path) >= newest:
+                arrays = _load(path, source)
+            if arrays is None:
+                arrays = compile_store(data_lake_path)
+                _save(arrays, path)
+            store = _shared_stores[(source, path)] = DDInterStore(arrays)
+        return store
@@ -0,0 +1,361 @@
+"""ESM protein embeddings with a model kept loaded and a persistent on-disk cache.
+
+``generate_gene_embeddings_with_ESM_models`` used to load the model on every call and embed one
+sequence at a time. :class:`ESMEmbeddingService` instead:
+
+- loads each (model, layer) once per process (:func:`get_esm_service`) and only when a sequence
+  actually has to be computed;
+- sorts the sequences to compute by length and packs them into batches bounded by a token budget,
+  so a batch pads to nearly equal lengths. On CPU, attention over large batches is bound by memory
+  traffic, so the default budget there is small (short sequences are grouped, long ones run alone);
+- stores every mean-pooled embedding in an :class:`EmbeddingStore` keyed by the SHA-256 of the
+  sequence, one store per model and layer, so repeated genes (and isoforms shared between genes)
+  are read back instead of recomputed.
+
+The store is an append-only float32 matrix read through ``np.memmap`` plus a SQLite index
+(sequence hash -> row). Writers append inside a SQLite write transaction, so several processes can
+share one cache directory.
+
+    service = get_esm_service("esm2_t6_8M_UR50D", layer=6)
+    embeddings = service.embed(["MKTAYIAKQR...", ...])
+    service.get_stats()  # computed, cache hits, sequences/s
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from biomni.lazy import lazy_import
+
+esm = lazy_import("esm")
+torch = lazy_import("torch")
+
+# Default padded tokens per forward pass. On a CPU core (esm2_t6_8M, 8192 tokens) batching long
+# sequences was ~2x slower than one at a time, while grouping sequences under ~250 residues helped.
+DEFAULT_MAX_TOKENS = {"cpu": 512, "cuda": 8192}
+
+
+def sequence_key(sequence: str) -> str:
+    """Cache key of a protein sequence (SHA-256 of the upper-case sequence)."""
+    return hashlib.sha256(sequence.strip().upper().encode("ascii", "replace")).hexdigest()
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped matrix of float32 embeddings indexed by sequence hash."""
+
+    def __init__(self, directory: str):
+        """Open (or create) the store in ``directory``.
+
+        Args:
+            directory: Directory holding ``vectors.f32`` and ``index.db``; one per model and layer
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self._db = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._mmap: np.memmap | None = None
+        self.dim = self._read_dim()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Stored embeddings (copies) for those of ``keys`` present in the store."""
+        if not keys:
+            return {}
+        with self._lock:
+            rows: dict[str, int] = {}
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows.update(self._db.execute(f"SELECT key, row FROM embeddings WHERE key IN ({placeholders})", chunk))
+            if not rows:
+                return {}
+            matrix = self._matrix_locked(max(rows.values()) + 1)
+            return {key: np.array(matrix[row]) for key, row in rows.items()}
+
+    def put(self, embeddings: dict[str, np.ndarray]) -> None:
+        """Append embeddings not yet in the store (all must have the same dimension)."""
+        if not embeddings:
+            return
+        with self._lock:
+            # BEGIN IMMEDIATE takes the database write lock: one appender at a time across processes
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                if self.dim is None:
+                    self.dim = self._read_dim()
+                dim = self.dim or len(next(iter(embeddings.values())))
+                placeholders = ",".join("?" * len(embeddings))
+                present = {
+                    key
+                    for (key,) in self._db.execute(
+                        f"SELECT key FROM embeddings WHERE key IN ({placeholders})", list(embeddings)
+                    )
+                }
+                new = {key: value for key, value in embeddings.items() if key not in present}
+                if new:
+                    matrix = np.stack([np.asarray(v, dtype=np.float32).reshape(-1) for v in new.values()])
+                    if matrix.shape[1] != dim:
+                        raise ValueError(f"Embedding dimension {matrix.shape[1]} does not match the store ({dim})")
+                    next_row = self._db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM embeddings").fetchone()[0]
+                    # Rows beyond the index (left by an interrupted writer) are overwritten
+                    with open(self.vectors_path, "r+b" if os.path.exists(self.vectors_path) else "wb") as f:
+                        f.seek(next_row * dim * 4)
+                        f.write(matrix.tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._db.executemany(
+                        "INSERT INTO embeddings (key, row) VALUES (?, ?)",
+                        [(key, next_row + i) for i, key in enumerate(new)],
+                    )
+                    self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('dim', ?)", (str(dim),))
+                    self.dim = dim
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+
+    def _read_dim(self) -> int | None:
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    def _matrix_locked(self, min_rows: int) -> np.memmap:
+        """Memory map covering at least ``min_rows`` rows, remapped when another writer appended."""
+        if self.dim is None:
+            self.dim = self._read_dim()
+        if self._mmap is None or self._mmap.shape[0] < min_rows:
+            rows = os.path.getsize(self.vectors_path) // (self.dim * 4)
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._mmap
+
+
+class ESMEmbeddingService:
+    """Mean-pooled ESM embeddings of protein sequences, batched by length and cached on disk."""
+
+    def __init__(
+        self,
+        model_name: str = "esm2_t6_8M_UR50D",
+        layer: int = 6,
+        device: str | None = None,
+        cache_dir: str | None = None,
+        max_tokens_per_batch: int | None = None,
+    ):
+        """Create the service; the model is loaded on the first sequence not found in the cache.
+
+        Args:
+            model_name: Name accepted by ``esm.pretrained.load_model_and_alphabet``
+            layer: Layer whose representations are averaged over the residues
+            device: Torch device (default: CUDA if available, else CPU)
+            cache_dir: Root of the embedding cache; None disables caching
+            max_tokens_per_batch: Upper bound on padded tokens per forward pass
+                (default: :data:`DEFAULT_MAX_TOKENS` for the device)
+
+        """
+        self.model_name = model_name
+        self.layer = layer
+        self.device = device
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.store = None
+        if cache_dir:
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+            self.store = EmbeddingStore(os.path.join(cache_dir, f"{safe_name}_layer{layer}"))
+        self._model = None
+        self._alphabet = None
+        self._batch_converter = None
+        self._load_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.load_seconds = 0.0
+        self.cache_hits = 0
+        self.computed = 0
+        self.failed = 0
+        self.batches = 0
+        self.compute_seconds = 0.0
+
+    def load(self):
+        """Load the model and alphabet once and move the model to the device."""
+        with self._load_lock:
+            if self._model is None:
+                start = time.perf_counter()
+                model, alphabet = esm.pretrained.load_model_and_alphabet(self.model_name)
+                if self.layer > model.num_layers:
+                    raise ValueError(f"{self.model_name} has {model.num_layers} layers, layer {self.layer} requested")
+                if self.device is None:
+                    self.device = "cuda" if torch.cuda.is_available() else "cpu"
+                self._alphabet = alphabet
+                self._batch_converter = alphabet.get_batch_converter()
+                self._model = model.eval().to(self.device)
+                if self.max_tokens_per_batch is None:
+                    self.max_tokens_per_batch = DEFAULT_MAX_TOKENS.get(torch.device(self.device).type, 8192)
+                self.load_seconds = time.perf_counter() - start
+        return self._model
+
+    def embed(
+        self,
+        sequences: list[str],
+        errors: list[str] | None = None,
+        max_tokens_per_batch: int | None = None,
+        max_batch_size: int | None = None,
+    ) -> list[np.ndarray | None]:
+        """Embedding of each sequence (mean over residues of the layer's representations).
+
+        Cached embeddings are read from the store; the others are computed, longest first, in
+        batches of at most ``max_tokens_per_batch`` padded tokens and then stored.
+
+        Args:
+            sequences: Protein sequences
+            errors: Optional list receiving a message for each batch that could not be embedded
+            max_tokens_per_batch: Token budget for this call (default: the service's)
+            max_batch_size: Optional cap on sequences per batch
+
+        Returns:
+            One float32 vector per sequence, or None where embedding failed
+
+        """
+        keys = [sequence_key(seq) for seq in sequences]
+        unique = dict(zip(keys, sequences, strict=True))
+        found = self.store.get(list(unique)) if self.store is not None else {}
+        missing = [(key, seq) for key, seq in unique.items() if key not in found]
+        with self._stats_lock:
+            self.cache_hits += len(unique) - len(missing)
+
+        if missing:
+            computed = self._compute(missing, errors, max_tokens_per_batch, max_batch_size)
+            found.update(computed)
+            if self.store is not None:
+                self.store.put(computed)
+        return [found.get(key) for key in keys]
+
+    def get_stats(self) -> dict:
+        """Cache hits, sequences computed and compute throughput."""
+        with self._stats_lock:
+            return {
+                "model": self.model_name,
+                "layer": self.layer,
+                "device": self.device,
+                "loaded": self._model is not None,
+                "load_seconds": round(self.load_seconds, 2),
+                "cache_hits": self.cache_hits,
+                "computed": self.computed,
+                "failed": self.failed,
+                "batches": self.batches,
+                "compute_seconds": round(self.compute_seconds, 3),
+                "sequences_per_second": self.computed / self.compute_seconds if self.compute_seconds else 0.0,
+                "stored": len(self.store) if self.store is not None else 0,
+            }
+
+    @staticmethod
+    def _batches(
+        items: list[tuple[str, str]], max_tokens: int, max_batch_size: int | None = None
+    ) -> list[list[tuple[str, str]]]:
+        """Split ``items`` (sorted longest first) so that batch size x longest length fits the budget."""
+        batches: list[list[tuple[str, str]]] = []
+        current: list[tuple[str, str]] = []
+        for item in items:
+            # The first (longest) sequence of a batch sets its padded length; +2 for BOS/EOS
+            padded = len(current[0][1]) + 2 if current else len(item[1]) + 2
+            full = max_batch_size is not None and len(current) >= max_batch_size
+            if current and (full or padded * (len(current) + 1) > max_tokens):
+                batches.append(current)
+                current = []
+            current.append(item)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _compute(
+        self,
+        items: list[tuple[str, str]],
+        errors: list[str] | None,
+        max_tokens: int | None,
+        max_batch_size: int | None,
+    ) -> dict[str, np.ndarray]:
+        self.load()
+        max_tokens = max_tokens or self.max_tokens_per_batch
+        ordered = sorted(items, key=lambda item: len(item[1]), reverse=True)
+        results: dict[str, np.ndarray] = {}
+        start = time.perf_counter()
+        pending = self._batches(ordered, max_tokens, max_batch_size)
+        while pending:
+            batch = pending.pop(0)
+            try:
+                results.update(self._forward(batch))
+            except RuntimeError as e:
+                out_of_memory = "out of memory" in str(e).lower()
+                if out_of_memory and self.device != "cpu":
+                    torch.cuda.empty_cache()
+                if out_of_memory and len(batch) > 1:
+                    # Retry the two halves separately
+                    half = len(batch) // 2
+                    pending[:0] = [batch[:half], batch[half:]]
+                    continue
+                with self._stats_lock:
+                    self.failed += len(batch)
+                if errors is not None:
+                    lengths = ", ".join(str(len(seq)) for _, seq in batch)
+                    errors.append(f"Failed to embed sequences of {lengths} residues: {e}")
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.computed += len(results)
+            self.compute_seconds += elapsed
+        return results
+
+    def _forward(self, batch: list[tuple[str, str]]) -> dict[str, np.ndarray]:
+        with self._model_lock:
+            labels, _, tokens = self._batch_converter(batch)
+            tokens = tokens.to(self.device)
+            lengths = (tokens != self._alphabet.padding_idx).sum(1)
+            with torch.no_grad():
+                representations = self._model(tokens, repr_layers=[self.layer], return_contacts=False)[
+                    "representations"
+                ][self.layer]
+            embeddings = {
+                label: representations[i, 1 : lengths[i] - 1].mean(0).float().cpu().numpy()
+                for i, label in enumerate(labels)
+            }
+            with self._stats_lock:
+                self.batches += 1
+            return embeddings
+
+
+_shared_services: dict[tuple[str, int], ESMEmbeddingService] = {}
+_shared_lock = threading.Lock()
+
+
+def get_esm_service(model_name: str = "esm2_t6_8M_UR50D", layer: int = 6, config=None) -> ESMEmbeddingService:
+    """Process-wide service for ``model_name`` and ``layer``, cached under ``config.embedding_cache_dir``."""
+    with _shared_lock:
+        service = _shared_services.get((model_name, layer))
+        if service is None:
+            if config is None:
+                from biomni.config import default_config as config
+            cache_dir = config.embedding_cache_dir
+            if cache_dir is None:
+                cache_dir = os.path.join(config.path, "biomni_data", "embedding_cache")
+            service = ESMEmbeddingService(
+                model_name=model_name,
+                layer=layer,
+                cache_dir=cache_dir or None,
+                max_tokens_per_batch=config.embedding_max_tokens,
+            )
+            _shared_services[(model_name, layer)] = service
+        return service
+
+
+def get_esm_stats() -> list[dict]:
+    """Statistics of every service created by :func:`get_esm_service`."""
+    with _shared_lock:
+        services = list(_shared_services.values())
+    return [service.get_stats() for service in services]
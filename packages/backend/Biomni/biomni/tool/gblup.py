@@ -0,0 +1,209 @@
+"""REML/GBLUP on one eigendecomposition of the genomic relationship matrix (FaST-LMM style).
+
+``fit_genomic_prediction_model`` used to invert ``V = var_g * G + var_e * I`` on every iteration of
+its variance component updates and to form ``P @ G @ P`` explicitly, which is O(n^3) per iteration
+with several n x n temporaries. :class:`EigenLMM` instead decomposes ``G = U diag(S) U'`` once:
+
+- In the rotated space (``U' y``, ``U' X``) the covariance is diagonal, ``var_g * (S + delta)`` with
+  ``delta = var_e / var_g``, so the REML likelihood of a given ``delta`` costs O(n p^2) for ``p``
+  fixed effects. ``delta`` is found by a grid over ``log(delta)`` refined with Brent's method.
+- The rotation is shared by every trait: all traits are rotated with one matrix product, searched
+  on the grid together, and back-rotated together for the breeding values.
+
+:func:`genomic_relationship_matrix` builds ``G`` from blocks of markers, so the centered genotype
+matrix never exists in memory. Genotypes can be a NumPy array or an int8 ``.npy`` file, which is
+memory-mapped and read one block at a time. :class:`PeakMemory` reports the largest traced
+allocation total (NumPy arrays included) of a fit; it is for benchmarks only, since tracing is
+process-wide and slows the allocations of every thread.
+
+    engine = EigenLMM(genomic_relationship_matrix("genotypes.npy"))
+    fits = engine.fit(phenotypes)  # one REMLFit per trait column
+"""
+
+import os
+import time
+import tracemalloc
+from typing import NamedTuple
+
+import numpy as np
+from scipy import linalg, optimize
+from scipy.linalg import blas
+
+DEFAULT_CHUNK_MARKERS = 4096  # markers per block when building G
+LOG_DELTA_GRID = np.linspace(-10, 10, 101)  # initial search grid of log(var_e / var_g)
+SYMMETRIZE_BLOCK = 2048
+
+
+def open_genotypes(genotypes) -> np.ndarray:
+    """Genotype matrix (individuals x markers); ``.npy`` paths are memory-mapped, not read."""
+    if isinstance(genotypes, (str, os.PathLike)):
+        return np.load(genotypes, mmap_mode="r")
+    return np.asarray(genotypes)
+
+
+def genomic_relationship_matrix(
+    genotypes, dominance: bool = False, chunk_markers: int = DEFAULT_CHUNK_MARKERS
+) -> np.ndarray:
+    """Genomic relationship matrix ``Zc Zc' / m`` of column-centered genotypes, built block by block.
+
+    Args:
+        genotypes: Individuals x markers matrix coded 0, 1, 2 (array, memory map or ``.npy`` path)
+        dominance: Use heterozygosity indicators (genotype == 1) instead of allele counts
+        chunk_markers: Markers converted to float64 and centered at a time
+
+    Returns:
+        The n x n relationship matrix (float64)
+
+    """
+    genotypes = open_genotypes(genotypes)
+    n, m = genotypes.shape
+    # Only the upper triangle is accumulated (syrk does half the work of a general product)
+    G = np.zeros((n, n), order="F")
+    for start in range(0, m, chunk_markers):
+        block = np.asarray(genotypes[:, start : start + chunk_markers])
+        block = (block == 1).astype(np.float64) if dominance else block.astype(np.float64)
+        block -= block.mean(axis=0)
+        G = blas.dsyrk(1.0, block.T, beta=1.0, c=G, trans=1, lower=0, overwrite_c=1)
+    G /= m
+    for start in range(0, n, SYMMETRIZE_BLOCK):
+        stop = min(start + SYMMETRIZE_BLOCK, n)
+        G[stop:, start:stop] = G[start:stop, stop:].T
+        block = G[start:stop, start:stop]
+        block[np.tril_indices(stop - start, -1)] = block.T[np.tril_indices(stop - start, -1)]
+    return G.T  # C-ordered view of the symmetric matrix
+
+
+class REMLFit(NamedTuple):
+    """Variance components, fixed effects and breeding values of one trait."""
+
+    var_g: float
+    var_e: float
+    heritability: float
+    beta: np.ndarray  # fixed effect estimates (intercept first unless the covariates contain one)
+    fixed_values: np.ndarray  # X @ beta, the fixed part of each individual's prediction
+    breeding_values: np.ndarray
+    log_likelihood: float  # restricted log-likelihood at the estimate
+
+
+def _full_rank(X: np.ndarray) -> np.ndarray:
+    """Columns of ``X`` with linearly dependent ones dropped (e.g. a second intercept)."""
+    _, R, pivots = linalg.qr(X, mode="economic", pivoting=True)
+    diagonal = np.abs(np.diag(R))
+    rank = int((diagonal > diagonal[0] * max(X.shape) * np.finfo(float).eps).sum()) if len(diagonal) else 0
+    return X[:, np.sort(pivots[:rank])]
+
+
+class EigenLMM:
+    """Linear mixed model ``y = X b + g + e``, ``g ~ N(0, var_g G)``, on one eigendecomposition of ``G``."""
+
+    def __init__(self, G: np.ndarray):
+        """Decompose ``G`` (overwritten to save memory; pass a copy to keep it)."""
+        start = time.perf_counter()
+        S, self.U = linalg.eigh(G, overwrite_a=True, check_finite=False)
+        self.S = np.maximum(S, 0.0)  # G is positive semidefinite; clip rounding below zero
+        self.decomposition_seconds = time.perf_counter() - start
+
+    def __len__(self) -> int:
+        return len(self.S)
+
+    def fit(self, phenotypes: np.ndarray, fixed_effects: np.ndarray | None = None) -> list[REMLFit]:
+        """REML variance components and BLUP breeding values of each trait.
+
+        Args:
+            phenotypes: Vector or individuals x traits matrix
+            fixed_effects: Individuals x covariates matrix; an intercept is added unless the columns
+                already span one
+
+        Returns:
+            One :class:`REMLFit` per trait column
+
+        Raises:
+            ValueError: If the fixed effects have as many independent columns as there are individuals
+                (REML has no residual degrees of freedom left)
+
+        """
+        Y = np.asarray(phenotypes, dtype=np.float64).reshape(len(self), -1)
+        X = np.ones((len(self), 1))
+        if fixed_effects is not None:
+            X = _full_rank(np.column_stack([X, np.asarray(fixed_effects, dtype=np.float64)]))
+        n, p = X.shape
+        if n <= p:
+            raise ValueError(
+                f"{p} independent fixed effects (with the intercept) leave no degrees of freedom for {n} individuals"
+            )
+
+        Yr = self.U.T @ Y
+        Xr = self.U.T @ X
+        logdet_xx = np.linalg.slogdet(X.T @ X)[1]
+
+        def profile(delta: float, yr: np.ndarray) -> tuple[np.ndarray, ...]:
+            """(log-likelihood, var_g, beta, rotated residuals) for each column of ``yr``."""
+            w = 1.0 / (self.S + delta)
+            xwx = Xr.T @ (Xr * w[:, None])
+            beta = np.linalg.solve(xwx, Xr.T @ (yr * w[:, None]))
+            residuals = yr - Xr @ beta
+            var_g = (residuals**2 * w[:, None]).sum(axis=0) / (n - p)
+            log_likelihood = -0.5 * (
+                (n - p) * np.log(2 * np.pi * var_g) - np.log(w).sum() + np.linalg.slogdet(xwx)[1] - logdet_xx + (n - p)
+            )
+            return log_likelihood, var_g, beta, residuals
+
+        # All traits are scored on the grid together; each is then refined between its grid neighbours
+        grid = np.array([profile(np.exp(log_delta), Yr)[0] for log_delta in LOG_DELTA_GRID])
+        fits = []
+        shrunk = np.empty_like(Yr)
+        for t in range(Y.shape[1]):
+            best = int(np.argmax(grid[:, t]))
+            bounds = LOG_DELTA_GRID[max(best - 1, 0)], LOG_DELTA_GRID[min(best + 1, len(LOG_DELTA_GRID) - 1)]
+            result = optimize.minimize_scalar(
+                lambda log_delta, t=t: -profile(np.exp(log_delta), Yr[:, t : t + 1])[0][0],
+                bounds=bounds,
+                method="bounded",
+            )
+            log_delta = result.x if -result.fun >= grid[best, t] else LOG_DELTA_GRID[best]
+            delta = float(np.exp(log_delta))
+            log_likelihood, var_g, beta, residuals = profile(delta, Yr[:, t : t + 1])
+            # BLUP: var_g G V^-1 (y - X b) = U diag(S / (S + delta)) U' (y - X b)
+            shrunk[:, t] = self.S / (self.S + delta) * residuals[:, 0]
+            fits.append((float(var_g[0]), delta, beta[:, 0], float(log_likelihood[0])))
+
+        breeding_values = self.U @ shrunk
+        return [
+            REMLFit(
+                var_g=var_g,
+                var_e=delta * var_g,
+                heritability=1.0 / (1.0 + delta),
+                beta=beta,
+                fixed_values=X @ beta,
+                breeding_values=breeding_values[:, t],
+                log_likelihood=log_likelihood,
+            )
+            for t, (var_g, delta, beta, log_likelihood) in enumerate(fits)
+        ]
+
+
+class PeakMemory:
+    """Context manager measuring the peak of traced Python and NumPy allocations inside it.
+
+    Memory-mapped genotype pages are file cache, not allocations, and are not counted. Tracing and
+    the peak are process-wide: allocations of other threads are counted too, and two measurements
+    running at once reset each other's peak. Use it in benchmarks, not in concurrent tool calls.
+    """
+
+    def __enter__(self) -> "PeakMemory":
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        self.peak_bytes = 0
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.peak_bytes = max(tracemalloc.get_traced_memory()[1] - self._baseline, 0)
+        if self._started:
+            tracemalloc.stop()
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak_bytes / 2**20
@@ -869,12 +869,12 @@ def identify_transcription_factor_binding_sites(sequence, tf_name, threshold=0.8
 
     """
     import datetime
-    import io
 
-    import requests
     from Bio import motifs
     from Bio.Seq import Seq
 
+    from biomni.tool.jaspar import fetch_matrix, resolve_matrix_id
+
     log = f"# Transcription Factor Binding Site Analysis: {tf_name}\n"
     log += f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
 
@@ -882,26 +882,15 @@ def identify_transcription_factor_binding_sites(sequence, tf_name, threshold=0.8
     log += "## Step 1: Retrieving transcription factor PWM\n"
 
     try:
-        # Search for the TF in JASPAR database
-        jaspar_url = f"https://jaspar.genereg.net/api/v1/matrix/?name={tf_name}"
-        response = requests.get(jaspar_url)
-        tf_data = response.json()
-
-        if not tf_data["results"] or len(tf_data["results"]) == 0:
+        # Search for the TF in JASPAR database (the first match; name lookups and matrices are cached)
+        matrix_id = resolve_matrix_id(tf_name)
+        if matrix_id is None:
             log += f"No PWM found for {tf_name} in JASPAR database.\n"
             return log
-
-        # Get the first match's ID
-        matrix_id = tf_data["results"][0]["matrix_id"]
         log += f"Found PWM with ID: {matrix_id}\n"
 
         # Retrieve the PWM
-        pwm_url = f"https://jaspar.genereg.net/api/v1/matrix/{matrix_id}.pfm"
-        pwm_response = requests.get(pwm_url)
-
-        # Parse the PWM
-        handle = io.StringIO(pwm_response.text)
-        motif = motifs.read(handle, "jaspar")
+        motif = motifs.Motif(alphabet="ACGT", counts=fetch_matrix(matrix_id)["pfm"])
         log += f"Successfully retrieved PWM for {tf_name}\n"
 
         # Calculate position-specific scoring matrix (PSSM)
@@ -972,21 +961,93 @@ def identify_transcription_factor_binding_sites(sequence, tf_name, threshold=0.8
     return log
 
 
+def identify_transcription_factor_binding_sites_batch(
+    sequences, tf_names, threshold=0.8, genome_fasta=None, output_file=None, workers=None
+):
+    """Identifies binding sites of many transcription factors in many sequences or genomic regions.
+
+    Every sequence is scanned with the JASPAR matrix of every transcription factor, on both strands,
+    in one vectorized pass (see ``biomni.tool.tfbs_scanner``). Matrices are cached on disk.
+
+    Parameters
+    ----------
+    sequences : str, list or dict
+        A DNA sequence, a list of sequences, a dict of sequences by ID, or the path of a FASTA file
+        or of a BED file of regions (with ``genome_fasta``)
+    tf_names : str or list of str
+        Transcription factor names (e.g., 'GATA1', the first JASPAR match is used) or JASPAR matrix
+        IDs (e.g., 'MA0035.4')
+    threshold : float, optional
+        Minimum relative score, (score - min) / (max - min) of the matrix, of reported sites (0.0-1.0, default: 0.8)
+    genome_fasta : str, optional
+        FASTA file of the genome, required when ``sequences`` is a BED file
+    output_file : str, optional
+        Path to save the table (.csv, .parquet, otherwise tab-separated)
+    workers : int, optional
+        Processes used for large batches (default: the number of CPUs)
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per binding site: sequence_id, tf_name, matrix_id, start, end (0-based, end exclusive,
+        forward strand; chromosome coordinates and a ``chrom`` column for BED regions), strand, score
+        (log2 odds), relative_score and site (read on the site's strand)
+
+    """
+    from biomni.tool.jaspar import fetch_matrix, resolve_matrix_id
+    from biomni.tool.tfbs_scanner import load_sequences, motif_from_counts, scan_sequences
+
+    if isinstance(tf_names, str):
+        tf_names = [tf_names]
+    motifs_by_id = {}
+    not_found = []
+    for tf_name in tf_names:
+        matrix_id = resolve_matrix_id(tf_name)
+        if matrix_id is None:
+            not_found.append(tf_name)
+        elif matrix_id not in motifs_by_id:
+            record = fetch_matrix(matrix_id)
+            motifs_by_id[matrix_id] = motif_from_counts(matrix_id, record.get("name", tf_name), record["pfm"])
+    if not motifs_by_id:
+        raise ValueError(f"No JASPAR matrix found for {', '.join(not_found)}")
+    if not_found:
+        print(f"No JASPAR matrix found for {', '.join(not_found)}; scanning the other transcription factors")
+
+    sequence_map, regions = load_sequences(sequences, genome_fasta)
+    sites = scan_sequences(sequence_map, list(motifs_by_id.values()), threshold=threshold, workers=workers)
+    if regions:
+        region_starts = sites["sequence_id"].map(lambda region_id: regions[region_id][1]).astype("int64")
+        sites.insert(1, "chrom", sites["sequence_id"].map(lambda region_id: regions[region_id][0]))
+        sites["start"] += region_starts
+        sites["end"] += region_starts
+
+    if output_file:
+        if output_file.endswith(".parquet"):
+            sites.to_parquet(output_file, index=False)
+        else:
+            sites.to_csv(output_file, sep="," if output_file.endswith(".csv") else "\t", index=False)
+    return sites
+
+
 def fit_genomic_prediction_model(
     genotypes,
     phenotypes,
     fixed_effects=None,
     model_type="additive",
     output_file="genomic_prediction_results.csv",
+    engine="eigen",
+    chunk_markers=4096,
+    profile_memory=False,
 ):
     """Fit a linear mixed model for genomic prediction using genotype and phenotype data.
 
     Parameters
     ----------
-    genotypes : numpy.ndarray
+    genotypes : numpy.ndarray or str
         Matrix of genotype data, with individuals in rows and markers in columns.
         Values are typically coded as 0, 1, 2 for additive models or with specific
-        encoding for dominance effects.
+        encoding for dominance effects. A path to an int8 ``.npy`` file is memory-mapped
+        and read in blocks of markers.
     phenotypes : numpy.ndarray
         Vector or matrix of phenotype data, with individuals in rows and traits in columns.
     fixed_effects : numpy.ndarray, optional
@@ -996,22 +1057,41 @@ def fit_genomic_prediction_model(
         Type of genetic model to fit: "additive" or "additive_dominance".
     output_file : str, optional
         File name to save the results.
+    engine : str, optional
+        "eigen" (default): REML on one eigendecomposition of G shared by all traits, O(n) per
+        iteration. "dense": the previous iterative updates inverting V on every iteration. The
+        additive-dominance model always uses "dense".
+    chunk_markers : int, optional
+        Markers processed at a time when building the relationship matrices.
+    profile_memory : bool, optional
+        Report the peak traced memory of the fit (for benchmarks). This traces every allocation
+        of the process while the fit runs, so it is off by default.
 
     Returns
     -------
     str
         Research log summarizing the genomic prediction analysis, including model parameters,
-        variance components, breeding values, and prediction accuracy metrics.
+        variance components, breeding values and prediction accuracy metrics (and peak memory if
+        ``profile_memory`` is set).
 
     """
+    from contextlib import nullcontext
+
     import pandas as pd
     from scipy import linalg
 
+    from biomni.tool.gblup import EigenLMM, PeakMemory, genomic_relationship_matrix, open_genotypes
+
+    if engine not in ("eigen", "dense"):
+        raise ValueError(f"Unknown engine: {engine} (expected 'eigen' or 'dense')")
+
     # Initialize research log
     log = "# Multi-trait Genomic Prediction Analysis\n\n"
     log += f"Model type: {model_type}\n"
 
     # Basic validation
+    genotypes = open_genotypes(genotypes)
+    phenotypes = np.asarray(phenotypes)
     n_individuals, n_markers = genotypes.shape
     n_pheno, n_traits = (phenotypes.shape[0], 1) if phenotypes.ndim == 1 else phenotypes.shape
 
@@ -1026,183 +1106,216 @@ def fit_genomic_prediction_model(
     if phenotypes.ndim == 1:
         phenotypes = phenotypes.reshape(-1, 1)
 
-    # Center genotypes (common preprocessing step)
-    genotypes_centered = genotypes - np.mean(genotypes, axis=0)
-
-    # Create genomic relationship matrix (G)
-    if model_type == "additive":
-        # Additive genomic relationship matrix
-        G = np.dot(genotypes_centered, genotypes_centered.T) / n_markers
-        log += "Constructed additive genomic relationship matrix (G)\n\n"
-    elif model_type == "additive_dominance":
-        # For additive-dominance model, we need both A (additive) and D (dominance) matrices
-        # Assuming genotypes are coded as {0,1,2} for {aa,Aa,AA}
-        # Create dominance matrix - simple implementation assuming standard coding
-        dom_genotypes = np.zeros_like(genotypes)
-        # Code heterozygotes (1) as 1, homozygotes (0,2) as 0 for dominance effects
-        dom_genotypes[genotypes == 1] = 1
-        dom_genotypes_centered = dom_genotypes - np.mean(dom_genotypes, axis=0)
-
-        # Additive and dominance matrices
-        G_a = np.dot(genotypes_centered, genotypes_centered.T) / n_markers
-        G_d = np.dot(dom_genotypes_centered, dom_genotypes_centered.T) / n_markers
-        log += "Constructed additive (G_a) and dominance (G_d) genomic relationship matrices\n\n"
-    else:
-        raise ValueError(f"Unknown model type: {model_type}")
+    if model_type == "additive_dominance" and engine == "eigen":
+        # Two relationship matrices cannot be diagonalized by one rotation
+        engine = "dense"
+    log += f"Engine: {engine}\n"
 
     # Initialize results storage
     trait_results = []
 
-    # Fit model for each trait
-    for trait_idx in range(n_traits):
-        trait_phenotypes = phenotypes[:, trait_idx]
-        log += f"## Trait {trait_idx + 1} Analysis\n\n"
-
-        # Handle fixed effects if provided
-        if fixed_effects is not None:
-            # Simple fixed effects adjustment - more complex models would use proper mixed model fitting
-            X = fixed_effects
-            # Fit fixed effects model
-            beta = np.linalg.lstsq(X, trait_phenotypes, rcond=None)[0]
-            # Adjust phenotypes for fixed effects
-            y_adj = trait_phenotypes - X @ beta
-            log += f"Applied adjustment for {X.shape[1]} fixed effects\n"
-        else:
-            y_adj = trait_phenotypes
-            log += "No fixed effects provided\n"
-
-        # Fit mixed model
+    with PeakMemory() if profile_memory else nullcontext() as memory:
+        # Create genomic relationship matrix (G) from blocks of centered markers
         if model_type == "additive":
-            # Simplified REML estimation for variance components
-            # In practice, specialized libraries like pyGWAS, GCTA or R's ASReml would be used
-
-            # Initial variance component estimates
-            var_g_init = np.var(y_adj) * 0.5  # genetic variance
-            var_e_init = np.var(y_adj) * 0.5  # residual variance
-
-            # Simple EM-like algorithm for variance component estimation
-            # (In practice, use dedicated software for proper REML)
-            for _ in range(5):  # Few iterations for demonstration
-                # Construct mixed model equations
-                V = var_g_init * G + var_e_init * np.eye(n_individuals)
-                V_inv = linalg.inv(V)
-
-                # Update variance components
-                P = V_inv - V_inv @ np.ones((n_individuals, 1)) @ np.ones((1, n_individuals)) @ V_inv / (
-                    np.ones((1, n_individuals)) @ V_inv @ np.ones((n_individuals, 1))
-                )
-                var_g_new = (y_adj.T @ P @ G @ P @ y_adj) / np.trace(P @ G)
-                var_e_new = (y_adj.T @ P @ P @ y_adj) / np.trace(P)
-
-                # Update estimates
-                var_g_init = max(0.01, var_g_new)
-                var_e_init = max(0.01, var_e_new)
-
-            # Final variance components
-            var_g = var_g_init
-            var_e = var_e_init
-
-            # Calculate heritability
-            heritability = var_g / (var_g + var_e)
-
-            # BLUP solutions for breeding values
-            V = var_g * G + var_e * np.eye(n_individuals)
-            V_inv = linalg.inv(V)
-            breeding_values = var_g * G @ V_inv @ y_adj
-
-            # Predicted phenotypes
-            predicted_phenotypes = breeding_values
-
-            # Calculate accuracy
-            accuracy = np.corrcoef(trait_phenotypes, predicted_phenotypes)[0, 1]
-
-            # Log results
-            log += f"Estimated additive genetic variance: {var_g:.4f}\n"
-            log += f"Estimated residual variance: {var_e:.4f}\n"
-            log += f"Estimated heritability: {heritability:.4f}\n"
-            log += f"Prediction accuracy (correlation): {accuracy:.4f}\n\n"
-
-            # Store results
-            trait_result = {
-                "trait": trait_idx + 1,
-                "var_g": var_g,
-                "var_e": var_e,
-                "heritability": heritability,
-                "accuracy": accuracy,
-                "breeding_values": breeding_values,
-                "predicted_phenotypes": predicted_phenotypes,
-            }
-            trait_results.append(trait_result)
-
+            # Additive genomic relationship matrix
+            G = genomic_relationship_matrix(genotypes, chunk_markers=chunk_markers)
+            log += "Constructed additive genomic relationship matrix (G)\n\n"
         elif model_type == "additive_dominance":
-            # Similar approach but with both additive and dominance effects
-            # Initial variance component estimates
-            var_a_init = np.var(y_adj) * 0.4  # additive variance
-            var_d_init = np.var(y_adj) * 0.1  # dominance variance
-            var_e_init = np.var(y_adj) * 0.5  # residual variance
-
-            # Simple estimation iterations
-            for _ in range(5):  # Few iterations for demonstration
-                # Construct mixed model equations
-                V = var_a_init * G_a + var_d_init * G_d + var_e_init * np.eye(n_individuals)
-                V_inv = linalg.inv(V)
-
-                # Update variance components (simplified)
-                P = V_inv - V_inv @ np.ones((n_individuals, 1)) @ np.ones((1, n_individuals)) @ V_inv / (
-                    np.ones((1, n_individuals)) @ V_inv @ np.ones((n_individuals, 1))
+            # For additive-dominance model, we need both A (additive) and D (dominance) matrices
+            # Assuming genotypes are coded as {0,1,2} for {aa,Aa,AA}; heterozygotes (1) are coded
+            # as 1 and homozygotes (0,2) as 0 for dominance effects
+            G_a = genomic_relationship_matrix(genotypes, chunk_markers=chunk_markers)
+            G_d = genomic_relationship_matrix(genotypes, dominance=True, chunk_markers=chunk_markers)
+            log += "Constructed additive (G_a) and dominance (G_d) genomic relationship matrices\n\n"
+        else:
+            raise ValueError(f"Unknown model type: {model_type}")
+
+        if engine == "eigen":
+            lmm = EigenLMM(G)
+            del G  # overwritten by the decomposition
+            log += f"Eigendecomposition of G: {lmm.decomposition_seconds:.2f} s (shared by all traits)\n\n"
+            fits = lmm.fit(phenotypes, fixed_effects)
+
+            for trait_idx, fit in enumerate(fits):
+                log += f"## Trait {trait_idx + 1} Analysis\n\n"
+                if fixed_effects is not None:
+                    log += f"Estimated {len(fit.beta)} fixed effects (including the intercept) jointly with REML\n"
+                else:
+                    log += "No fixed effects provided\n"
+
+                predicted_phenotypes = fit.fixed_values + fit.breeding_values
+                accuracy = np.corrcoef(phenotypes[:, trait_idx], predicted_phenotypes)[0, 1]
+
+                log += f"Estimated additive genetic variance: {fit.var_g:.4f}\n"
+                log += f"Estimated residual variance: {fit.var_e:.4f}\n"
+                log += f"Estimated heritability: {fit.heritability:.4f}\n"
+                log += f"Prediction accuracy (correlation): {accuracy:.4f}\n\n"
+
+                trait_results.append(
+                    {
+                        "trait": trait_idx + 1,
+                        "var_g": fit.var_g,
+                        "var_e": fit.var_e,
+                        "heritability": fit.heritability,
+                        "accuracy": accuracy,
+                        "breeding_values": fit.breeding_values,
+                        "predicted_phenotypes": predicted_phenotypes,
+                    }
                 )
-                var_a_new = (y_adj.T @ P @ G_a @ P @ y_adj) / np.trace(P @ G_a)
-                var_d_new = (y_adj.T @ P @ G_d @ P @ y_adj) / np.trace(P @ G_d)
-                var_e_new = (y_adj.T @ P @ P @ y_adj) / np.trace(P)
-
-                # Update estimates
-                var_a_init = max(0.01, var_a_new)
-                var_d_init = max(0.01, var_d_new)
-                var_e_init = max(0.01, var_e_new)
-
-            # Final variance components
-            var_a = var_a_init
-            var_d = var_d_init
-            var_e = var_e_init
-
-            # Calculate heritabilities
-            narrow_heritability = var_a / (var_a + var_d + var_e)
-            broad_heritability = (var_a + var_d) / (var_a + var_d + var_e)
-
-            # BLUP solutions for breeding values and dominance deviations
-            V = var_a * G_a + var_d * G_d + var_e * np.eye(n_individuals)
-            V_inv = linalg.inv(V)
-            breeding_values = var_a * G_a @ V_inv @ y_adj
-            dominance_deviations = var_d * G_d @ V_inv @ y_adj
-
-            # Predicted phenotypes
-            predicted_phenotypes = breeding_values + dominance_deviations
-
-            # Calculate accuracy
-            accuracy = np.corrcoef(trait_phenotypes, predicted_phenotypes)[0, 1]
-
-            # Log results
-            log += f"Estimated additive genetic variance: {var_a:.4f}\n"
-            log += f"Estimated dominance genetic variance: {var_d:.4f}\n"
-            log += f"Estimated residual variance: {var_e:.4f}\n"
-            log += f"Estimated narrow-sense heritability: {narrow_heritability:.4f}\n"
-            log += f"Estimated broad-sense heritability: {broad_heritability:.4f}\n"
-            log += f"Prediction accuracy (correlation): {accuracy:.4f}\n\n"
-
-            # Store results
-            trait_result = {
-                "trait": trait_idx + 1,
-                "var_a": var_a,
-                "var_d": var_d,
-                "var_e": var_e,
-                "narrow_heritability": narrow_heritability,
-                "broad_heritability": broad_heritability,
-                "accuracy": accuracy,
-                "breeding_values": breeding_values,
-                "dominance_deviations": dominance_deviations,
-                "predicted_phenotypes": predicted_phenotypes,
-            }
-            trait_results.append(trait_result)
+        else:
+            # Fit model for each trait
+            for trait_idx in range(n_traits):
+                trait_phenotypes = phenotypes[:, trait_idx]
+                log += f"## Trait {trait_idx + 1} Analysis\n\n"
+
+                # Handle fixed effects if provided
+                if fixed_effects is not None:
+                    # Simple fixed effects adjustment - more complex models would use proper mixed model fitting
+                    X = fixed_effects
+                    # Fit fixed effects model
+                    beta = np.linalg.lstsq(X, trait_phenotypes, rcond=None)[0]
+                    # Adjust phenotypes for fixed effects
+                    y_adj = trait_phenotypes - X @ beta
+                    log += f"Applied adjustment for {X.shape[1]} fixed effects\n"
+                else:
+                    y_adj = trait_phenotypes
+                    log += "No fixed effects provided\n"
+
+                # Fit mixed model
+                if model_type == "additive":
+                    # Simplified REML estimation for variance components
+                    # In practice, specialized libraries like pyGWAS, GCTA or R's ASReml would be used
+
+                    # Initial variance component estimates
+                    var_g_init = np.var(y_adj) * 0.5  # genetic variance
+                    var_e_init = np.var(y_adj) * 0.5  # residual variance
+
+                    # Simple EM-like algorithm for variance component estimation
+                    # (In practice, use dedicated software for proper REML)
+                    for _ in range(5):  # Few iterations for demonstration
+                        # Construct mixed model equations
+                        V = var_g_init * G + var_e_init * np.eye(n_individuals)
+                        V_inv = linalg.inv(V)
+
+                        # Update variance components
+                        P = V_inv - V_inv @ np.ones((n_individuals, 1)) @ np.ones((1, n_individuals)) @ V_inv / (
+                            np.ones((1, n_individuals)) @ V_inv @ np.ones((n_individuals, 1))
+                        )
+                        var_g_new = (y_adj.T @ P @ G @ P @ y_adj) / np.trace(P @ G)
+                        var_e_new = (y_adj.T @ P @ P @ y_adj) / np.trace(P)
+
+                        # Update estimates
+                        var_g_init = max(0.01, var_g_new)
+                        var_e_init = max(0.01, var_e_new)
+
+                    # Final variance components
+                    var_g = var_g_init
+                    var_e = var_e_init
+
+                    # Calculate heritability
+                    heritability = var_g / (var_g + var_e)
+
+                    # BLUP solutions for breeding values
+                    V = var_g * G + var_e * np.eye(n_individuals)
+                    V_inv = linalg.inv(V)
+                    breeding_values = var_g * G @ V_inv @ y_adj
+
+                    # Predicted phenotypes
+                    predicted_phenotypes = breeding_values
+
+                    # Calculate accuracy
+                    accuracy = np.corrcoef(trait_phenotypes, predicted_phenotypes)[0, 1]
+
+                    # Log results
+                    log += f"Estimated additive genetic variance: {var_g:.4f}\n"
+                    log += f"Estimated residual variance: {var_e:.4f}\n"
+                    log += f"Estimated heritability: {heritability:.4f}\n"
+                    log += f"Prediction accuracy (correlation): {accuracy:.4f}\n\n"
+
+                    # Store results
+                    trait_result = {
+                        "trait": trait_idx + 1,
+                        "var_g": var_g,
+                        "var_e": var_e,
+                        "heritability": heritability,
+                        "accuracy": accuracy,
+                        "breeding_values": breeding_values,
+                        "predicted_phenotypes": predicted_phenotypes,
+                    }
+                    trait_results.append(trait_result)
+
+                elif model_type == "additive_dominance":
+                    # Similar approach but with both additive and dominance effects
+                    # Initial variance component estimates
+                    var_a_init = np.var(y_adj) * 0.4  # additive variance
+                    var_d_init = np.var(y_adj) * 0.1  # dominance variance
+                    var_e_init = np.var(y_adj) * 0.5  # residual variance
+
+                    # Simple estimation iterations
+                    for _ in range(5):  # Few iterations for demonstration
+                        # Construct mixed model equations
+                        V = var_a_init * G_a + var_d_init * G_d + var_e_init * np.eye(n_individuals)
+                        V_inv = linalg.inv(V)
+
+                        # Update variance components (simplified)
+                        P = V_inv - V_inv @ np.ones((n_individuals, 1)) @ np.ones((1, n_individuals)) @ V_inv / (
+                            np.ones((1, n_individuals)) @ V_inv @ np.ones((n_individuals, 1))
+                        )
+                        var_a_new = (y_adj.T @ P @ G_a @ P @ y_adj) / np.trace(P @ G_a)
+                        var_d_new = (y_adj.T @ P @ G_d @ P @ y_adj) / np.trace(P @ G_d)
+                        var_e_new = (y_adj.T @ P @ P @ y_adj) / np.trace(P)
+
+                        # Update estimates
+                        var_a_init = max(0.01, var_a_new)
+                        var_d_init = max(0.01, var_d_new)
+                        var_e_init = max(0.01, var_e_new)
+
+                    # Final variance components
+                    var_a = var_a_init
+                    var_d = var_d_init
+                    var_e = var_e_init
+
+                    # Calculate heritabilities
+                    narrow_heritability = var_a / (var_a + var_d + var_e)
+                    broad_heritability = (var_a + var_d) / (var_a + var_d + var_e)
+
+                    # BLUP solutions for breeding values and dominance deviations
+                    V = var_a * G_a + var_d * G_d + var_e * np.eye(n_individuals)
+                    V_inv = linalg.inv(V)
+                    breeding_values = var_a * G_a @ V_inv @ y_adj
+                    dominance_deviations = var_d * G_d @ V_inv @ y_adj
+
+                    # Predicted phenotypes
+                    predicted_phenotypes = breeding_values + dominance_deviations
+
+                    # Calculate accuracy
+                    accuracy = np.corrcoef(trait_phenotypes, predicted_phenotypes)[0, 1]
+
+                    # Log results
+                    log += f"Estimated additive genetic variance: {var_a:.4f}\n"
+                    log += f"Estimated dominance genetic variance: {var_d:.4f}\n"
+                    log += f"Estimated residual variance: {var_e:.4f}\n"
+                    log += f"Estimated narrow-sense heritability: {narrow_heritability:.4f}\n"
+                    log += f"Estimated broad-sense heritability: {broad_heritability:.4f}\n"
+                    log += f"Prediction accuracy (correlation): {accuracy:.4f}\n\n"
+
+                    # Store results
+                    trait_result = {
+                        "trait": trait_idx + 1,
+                        "var_a": var_a,
+                        "var_d": var_d,
+                        "var_e": var_e,
+                        "narrow_heritability": narrow_heritability,
+                        "broad_heritability": broad_heritability,
+                        "accuracy": accuracy,
+                        "breeding_values": breeding_values,
+                        "dominance_deviations": dominance_deviations,
+                        "predicted_phenotypes": predicted_phenotypes,
+                    }
+                    trait_results.append(trait_result)
+
+    if memory is not None:
+        log += f"Peak memory: {memory.peak_mb:.1f} MB (traced allocations; memory-mapped genotypes excluded)\n\n"
 
     # Save results to file
     results_df = pd.DataFrame()
@@ -1,18 +1,22 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import esm
-import gget
-import gseapy
 import numpy as np
 import pandas as pd
-import requests
-import scanpy as sc
-import torch
-from pybiomart import Dataset
 from tqdm import tqdm
 
-from biomni.llm import get_llm
+from biomni.http_client import get_http_client
+from biomni.lazy import lazy_import
+from biomni.llm import batch_invoke, get_llm
+from biomni.tool.celltype_vocabulary import get_celltype_vocabulary
+
+# Heavy dependencies are loaded on first use so importing a single tool stays cheap
+gget = lazy_import("gget")
+gseapy = lazy_import("gseapy")
+pybiomart = lazy_import("pybiomart")
+sc = lazy_import("scanpy")
+torch = lazy_import("torch")
 
 
 def unsupervised_celltype_transfer_between_scRNA_datasets(
@@ -206,7 +210,7 @@ def interspecies_gene_conversion(
     homolog_attribute = homolog_mapping[target_species]
 
     try:
-        source_dataset = Dataset(name=source_dataset_name, host="http://www.ensembl.org")
+        source_dataset = pybiomart.Dataset(name=source_dataset_name, host="http://www.ensembl.org")
 
         mapping = source_dataset.query(
             attributes=["ensembl_gene_id", homolog_attribute], filters={"link_ensembl_gene_id": gene_list}
@@ -238,7 +242,7 @@ def interspecies_gene_conversion(
     except Exception as e:
         steps.append(f"Error during gene conversion from {source_species} to {target_species}: {e}")
         try:
-            source_dataset = Dataset(name=source_dataset_name, host="http://www.ensembl.org")
+            source_dataset = pybiomart.Dataset(name=source_dataset_name, host="http://www.ensembl.org")
 
             all_mapping = source_dataset.query(attributes=["ensembl_gene_id", homolog_attribute])
 
@@ -296,7 +300,7 @@ def _fetch_isoform_sequences(ensembl_gene_id: str) -> list[str]:
     """
     url = f"https://rest.ensembl.org/sequence/id/{ensembl_gene_id}?type=protein;multiple_sequences=1"
     headers = {"Content-Type": "text/x-fasta"}
-    response = requests.get(url, headers=headers)
+    response = get_http_client().get(url, headers=headers)
     if not response.ok or not response.text.startswith(">"):
         return []
     sequences = []
@@ -316,12 +320,15 @@ def generate_gene_embeddings_with_ESM_models(
     model_name: str = "esm2_t6_8M_UR50D",
     layer: int = 6,
     save_path: str | None = None,
-    batch_size: int = 1,
+    batch_size: int | None = None,
     max_sequence_length: int = 1024,
+    max_tokens_per_batch: int | None = None,
+    fetch_workers: int = 8,
 ) -> str:
     """
     Generate average protein embeddings for a list of Ensembl gene IDs.
-    Memory-friendly implementation with rolling averages and small batch processing.
+    The model stays loaded between calls and every isoform embedding is cached on disk
+    (see biomni.tool.esm_service), so genes embedded before are read back instead of recomputed.
     Embeddings are automatically saved to disk with a default filename if no save_path is provided.
 
     Args:
@@ -330,29 +337,30 @@ def generate_gene_embeddings_with_ESM_models(
         layer: Which layer to extract embeddings from (default: 6)
         save_path: Optional path to save embeddings as PyTorch dict. If None, uses default filename
                   format: "esm_embeddings_{model_name}_{gene_list}.pt" (default: None)
-        batch_size: Number of sequences to process at once (default: 1)
+        batch_size: Maximum number of sequences per batch; None packs batches by token budget only (default: None)
         max_sequence_length: Maximum sequence length to process (default: 1024)
+        max_tokens_per_batch: Padded tokens per batch; None uses the configured default (default: None)
+        fetch_workers: Number of concurrent isoform sequence requests to Ensembl (default: 8)
 
     Returns:
         String containing the steps performed during the embedding generation process
     """
+    from biomni.tool.esm_service import get_esm_service
+
     steps = []
-    steps.append(f"Loading ESM model: {model_name}")
     # model loading take a while, once loaded for smaller models generation is relatively fast
     # running bilion model ESM models require FSDP or GPUs with 80 GB of memory
-    model, alphabet = esm.pretrained.load_model_and_alphabet(model_name)
-    batch_converter = alphabet.get_batch_converter()
-    model.eval()
-
-    # Move model to GPU if available
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model = model.to(device)
-    steps.append(f"Using device: {device}")
+    service = get_esm_service(model_name, layer)
+    steps.append(f"Using ESM model {model_name} (layer {layer}), embedding cache: {service.store is not None}")
 
     steps.append("Fetching protein isoform sequences...")
+    gene_ids = list(dict.fromkeys(ensembl_gene_ids))
+    with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as pool:
+        fetched = list(
+            tqdm(pool.map(_fetch_isoform_sequences, gene_ids), total=len(gene_ids), desc="Fetching sequences")
+        )
     ensembl_gene_isoforms_map: dict[str, list[str]] = {}
-    for ensembl_id in tqdm(ensembl_gene_ids, desc="Fetching sequences"):
-        isoform_sequences = _fetch_isoform_sequences(ensembl_id)
+    for ensembl_id, isoform_sequences in zip(gene_ids, fetched, strict=True):
         # Filter sequences by length to avoid memory issues
         filtered_sequences = [seq for seq in isoform_sequences if len(seq) <= max_sequence_length]
         if filtered_sequences:
@@ -360,84 +368,36 @@ def generate_gene_embeddings_with_ESM_models(
         else:
             steps.append(f"  No sequences under {max_sequence_length} residues found for gene {ensembl_id}")
 
-    # Prepare all data for processing
-    all_data: list[tuple[str, str]] = []
-    for gene, isoform_seqs in ensembl_gene_isoforms_map.items():
-        for i, seq in enumerate(isoform_seqs):
-            all_data.append((f"{gene}_isoform_{i}", seq))
-
-    steps.append(f"Processing {len(all_data)} sequences in batches of {batch_size}")
+    all_sequences = [seq for isoform_seqs in ensembl_gene_isoforms_map.values() for seq in isoform_seqs]
+    steps.append(f"Embedding {len(all_sequences)} sequences from {len(ensembl_gene_isoforms_map)} genes")
 
-    # Rolling average tracking
-    gene_embeddings: dict[str, list[torch.Tensor]] = {}
-    gene_avg_embedding: dict[str, np.ndarray] = {}
-
-    # Process in small batches to avoid memory issues
-    for i in tqdm(range(0, len(all_data), batch_size), desc="Processing ESM embeddings"):
-        batch_data = all_data[i : i + batch_size]
-
-        try:
-            batch_labels, batch_strs, batch_tokens = batch_converter(batch_data)
-            batch_tokens = batch_tokens.to(device)
-            batch_lens: torch.Tensor = (batch_tokens != alphabet.padding_idx).sum(1)
-
-            steps.append(f"  Running ESM model on batch {i // batch_size + 1}...")
-            with torch.no_grad():
-                results = model(batch_tokens, repr_layers=[layer], return_contacts=False)
-            token_representations: torch.Tensor = results["representations"][layer]
-
-            # Process each sequence in the batch
-            for j, tokens_len in enumerate(batch_lens):
-                # Extract gene name from label (remove _isoform_X suffix)
-                gene_name = batch_labels[j].split("_isoform_")[0]
-
-                # Get sequence embedding (excluding BOS/EOS tokens)
-                sequence_embedding = token_representations[j, 1 : tokens_len - 1].mean(0).detach().cpu()
-
-                # Store embedding for this gene
-                if gene_name not in gene_embeddings:
-                    gene_embeddings[gene_name] = []
-                gene_embeddings[gene_name].append(sequence_embedding)
-
-        except RuntimeError as e:
-            if "out of memory" in str(e).lower():
-                steps.append(f"  Memory error on batch {i // batch_size + 1}, reducing batch size...")
-                # Clear cache and try with smaller batch
-                torch.cuda.empty_cache() if torch.cuda.is_available() else None
-                # Process this batch one by one
-                for single_item in batch_data:
-                    try:
-                        single_batch_labels, single_batch_strs, single_batch_tokens = batch_converter([single_item])
-                        single_batch_tokens = single_batch_tokens.to(device)
-                        single_batch_lens: torch.Tensor = (single_batch_tokens != alphabet.padding_idx).sum(1)
-
-                        with torch.no_grad():
-                            single_results = model(single_batch_tokens, repr_layers=[layer], return_contacts=False)
-                        single_token_representations: torch.Tensor = single_results["representations"][layer]
-
-                        gene_name = single_item[0].split("_isoform_")[0]
-                        sequence_embedding = (
-                            single_token_representations[0, 1 : single_batch_lens[0] - 1].mean(0).detach().cpu()
-                        )
-
-                        if gene_name not in gene_embeddings:
-                            gene_embeddings[gene_name] = []
-                        gene_embeddings[gene_name].append(sequence_embedding)
-
-                    except Exception as single_e:
-                        steps.append(f"    Failed to process {single_item[0]}: {str(single_e)}")
-            else:
-                steps.append(f"  Error processing batch {i // batch_size + 1}: {str(e)}")
+    before = service.get_stats()
+    errors: list[str] = []
+    embeddings = service.embed(
+        all_sequences, errors=errors, max_tokens_per_batch=max_tokens_per_batch, max_batch_size=batch_size
+    )
+    after = service.get_stats()
+    steps.extend(f"  {error}" for error in errors)
+
+    computed = after["computed"] - before["computed"]
+    seconds = after["compute_seconds"] - before["compute_seconds"]
+    steps.append(f"  {after['cache_hits'] - before['cache_hits']} unique sequences read from the embedding cache")
+    if computed:
+        steps.append(
+            f"  {computed} sequences computed in {after['batches'] - before['batches']} batches on "
+            f"{after['device']}: {computed / seconds:.1f} sequences/sec ({seconds:.2f} s)"
+        )
 
-    # Compute final averages for each gene
+    # Average isoform embeddings per gene
     steps.append("Computing final gene embeddings...")
-    for gene, embeddings in gene_embeddings.items():
-        if embeddings:
-            # Stack all embeddings for this gene and compute mean
-            stacked_embeddings = torch.stack(embeddings, dim=0)
-            avg_embedding = stacked_embeddings.mean(dim=0).numpy()
-            gene_avg_embedding[gene] = avg_embedding
-            steps.append(f"  Gene {gene}: averaged {len(embeddings)} isoform embeddings")
+    gene_avg_embedding: dict[str, np.ndarray] = {}
+    position = 0
+    for gene, isoform_seqs in ensembl_gene_isoforms_map.items():
+        vectors = [v for v in embeddings[position : position + len(isoform_seqs)] if v is not None]
+        position += len(isoform_seqs)
+        if vectors:
+            gene_avg_embedding[gene] = np.mean(np.stack(vectors), axis=0)
+            steps.append(f"  Gene {gene}: averaged {len(vectors)} isoform embeddings")
         else:
             steps.append(f"  Gene {gene}: no valid embeddings found")
 
@@ -468,6 +428,9 @@ def annotate_celltype_scRNA(
     cluster="leiden",
     llm="claude-3-5-sonnet-20241022",
     composition=None,
+    max_concurrency=8,
+    max_attempts=5,
+    max_candidates=60,
 ):
     """Annotate cell types based on gene markers and transferred labels using LLM.
     After leiden clustering, annotate clusters using differentially expressed genes
@@ -481,6 +444,10 @@ def annotate_celltype_scRNA(
     - data_lake_path (str): Path to the data lake
     - llm (str): Language model instance for cell type prediction, such as 'claude-3-haiku-20240307'
     - composition (pd.DataFrame, optional): Transferred cell type composition for each cluster
+    - max_concurrency (int): Maximum number of clusters annotated by the LLM at the same time
+    - max_attempts (int): LLM attempts per cluster before it is labelled "Unknown"
+    - max_candidates (int): Cell ontology terms listed in each cluster's prompt, ranked by marker gene
+      relevance (0 lists the whole vocabulary)
     Returns:
     - str: Steps performed and file paths where results were saved
 
@@ -522,11 +489,10 @@ def annotate_celltype_scRNA(
         gene_scores = scores.iloc[:, i].tolist()
         markers[i] = list(np.array(gene_names)[np.array(gene_scores) > 0])
 
-    # TODO: this can be optimized
-    czi_celltype_path = data_lake_path + "/czi_census_datasets_v4.parquet"
-    df = pd.read_parquet(czi_celltype_path)
-    czi_celltype_set = {cell_type.strip() for cell_types in df["cell_type"] for cell_type in str(cell_types).split(";")}
-    czi_celltype = ", ".join(sorted(czi_celltype_set))
+    # Cell ontology names of the census, indexed once per data lake file
+    vocabulary = get_celltype_vocabulary(data_lake_path)
+    shown = max_candidates if 0 < max_candidates < len(vocabulary) else len(vocabulary)
+    steps.append(f"Loaded {len(vocabulary)} cell ontology terms; each prompt lists the {shown} most relevant.")
 
     prompt_template = f"""
 Please think carefully, and identify the cell type in {data_info} based on the gene markers.
@@ -534,7 +500,7 @@ Optionally refer to the transferred cell type information but do not trust it wh
 
 {{cluster_info}}
 
-The cell type names should come from cell ontology: {czi_celltype}.
+The cell type names should come from cell ontology: {{candidates}}.
 Only provide the cell type name, confidence score (0-1), and detailed reason.
 Output format: "name; score; reason".
 No numbers before name or spaces before number.
@@ -542,42 +508,64 @@ No numbers before name or spaces before number.
     # Some can be a mixture of multiple cell types.
 
     llm = get_llm(llm)
-    prompt = PromptTemplate(input_variables=["cluster_info"], template=prompt_template)
+    prompt = PromptTemplate(input_variables=["cluster_info", "candidates"], template=prompt_template)
     chain = prompt | llm
 
     steps.append("Annotating cell types of each cluster based on gene markers and transferred labels.")
-    # valid_celltypes = set(czi_celltype.split(";"))
     cluster_annotations = {}
     annotation_reasons = []
 
+    def _cluster_inputs(cluster_id):
+        cluster_composition = None
+        if composition is not None:
+            cluster_composition = composition.loc[str(cluster_id)].to_dict()
+        candidates = vocabulary.candidates(markers[cluster_id], cluster_composition, limit=max_candidates)
+        return {
+            "cluster_info": _cluster_info(str(cluster_id), markers[cluster_id], composition),
+            "candidates": ", ".join(candidates),
+        }
+
+    def _parse_annotation(response):
+        try:
+            predicted_celltype, confidence, reason = [x.strip() for x in response.split(";", 2)]
+        except ValueError:
+            raise ValueError("Please follow the format: name; score; reason") from None
+        # Case, plural and small spelling differences are mapped to the ontology term
+        term = vocabulary.match(predicted_celltype)
+        if term is None:
+            closest = vocabulary.suggest(predicted_celltype)
+            hint = f" Closest terms: {', '.join(closest)}." if closest else ""
+            raise ValueError(f"Assigned cell type name must be in cell ontology!{hint}")
+        return term, reason
+
+    def _add_correction(inputs, error):
+        return {**inputs, "cluster_info": inputs["cluster_info"] + f"\n{error}"}
+
+    # Clusters are annotated concurrently; each one retries with the correction appended to its prompt
     print(f"Annotate each cluster of {cluster}")
-    for _idx in range(len(adata.obs[cluster].unique())):
-        cluster_info = _cluster_info(str(_idx), markers[_idx], composition)
-
-        while True:
-            response = chain.invoke({"cluster_info": cluster_info})
-
-            # Handle different response types
-            if hasattr(response, "content"):  # For AIMessage
-                response = response.content
-            elif isinstance(response, dict) and "text" in response:
-                response = response["text"]
-            elif isinstance(response, str):
-                response = response
-            else:
-                response = str(response)
-
-            try:
-                predicted_celltype, confidence, reason = [x.strip() for x in response.split(";", 2)]
-                if predicted_celltype in czi_celltype_set or predicted_celltype.lower() in czi_celltype_set:
-                    cluster_annotations[str(_idx)] = predicted_celltype
-                    annotation_reasons.append((predicted_celltype, reason))
-                    break
-                else:
-                    cluster_info += "\nAssigned cell type name must be in cell ontology!"
-            except ValueError:
-                cluster_info += "\nPlease follow the format: name; score; reason"
-        print(f"Cluster {_idx}: {response}")
+    cluster_ids = list(range(len(adata.obs[cluster].unique())))
+    results = batch_invoke(
+        chain,
+        [_cluster_inputs(_idx) for _idx in cluster_ids],
+        validate=_parse_annotation,
+        revise=_add_correction,
+        max_concurrency=max_concurrency,
+        max_attempts=max_attempts,
+    )
+    unannotated = []
+    for _idx, (annotation, error) in zip(cluster_ids, results, strict=True):
+        if annotation is None:
+            unannotated.append(str(_idx))
+            cluster_annotations[str(_idx)] = "Unknown"
+            annotation_reasons.append(("Unknown", f"No valid annotation after {max_attempts} attempts: {error}"))
+            print(f"Cluster {_idx}: failed ({error})")
+            continue
+        predicted_celltype, reason = annotation
+        cluster_annotations[str(_idx)] = predicted_celltype
+        annotation_reasons.append((predicted_celltype, reason))
+        print(f"Cluster {_idx}: {predicted_celltype}; {reason}")
+    if unannotated:
+        steps.append(f"Clusters without a valid annotation (labelled 'Unknown'): {', '.join(unannotated)}")
 
     # create reason dictionary
     reason_dict = {}
@@ -0,0 +1,130 @@
+"""JASPAR matrix lookups shared by ``query_jaspar`` and the transcription factor binding site tools.
+
+A JASPAR matrix ID carries its version (``MA0139.2``), so a matrix never changes once published.
+Matrix records (the JSON returned by ``/matrix/<ID>/``, including the ``pfm`` counts) are kept in a
+:class:`MatrixStore`, one JSON file per matrix under ``config.jaspar_cache_dir``, and survive
+restarts. The store follows the response cache mode: "bypass" neither reads nor writes it and
+"refresh" refetches and overwrites. Other JASPAR requests, such as resolving a TF name to a matrix
+ID, go through ``_query_rest_api`` like ``query_jaspar``, so either side reuses the other's lookups.
+
+    record = fetch_matrix(resolve_matrix_id("GATA1"))
+    record["pfm"]  # {"A": [...], "C": [...], "G": [...], "T": [...]}
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+from urllib.parse import urlencode
+
+from biomni.response_cache import current_mode
+
+JASPAR_API = "https://jaspar.elixir.no/api/v1"
+
+MATRIX_ID = re.compile(r"^[A-Z]{2}\d{4}\.\d+$")
+_MATRIX_URL = re.compile(r"^https?://jaspar\.(?:elixir\.no|genereg\.net)/api/v1/matrix/([A-Z]{2}\d{4}\.\d+)/?$")
+
+
+def matrix_id_from_url(url: str) -> str | None:
+    """Matrix ID of a JASPAR matrix detail URL (``.../api/v1/matrix/MA0002.2/``), else None."""
+    match = _MATRIX_URL.match(url)
+    return match.group(1) if match else None
+
+
+class MatrixStore:
+    """Directory of JASPAR matrix records, one ``<matrix ID>.json`` file each."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, matrix_id: str) -> str:
+        if not MATRIX_ID.match(matrix_id):
+            raise ValueError(f"Not a JASPAR matrix ID: {matrix_id!r}")
+        return os.path.join(self.directory, f"{matrix_id}.json")
+
+    def get(self, matrix_id: str) -> dict | None:
+        """Stored record of ``matrix_id`` or None."""
+        try:
+            with open(self._path(matrix_id)) as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return record
+
+    def put(self, record: dict) -> None:
+        """Store a matrix record (must have ``matrix_id`` and ``pfm``); written atomically."""
+        path = self._path(record["matrix_id"])
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"directory": self.directory, "hits": self.hits, "misses": self.misses}
+
+
+_shared_store: MatrixStore | None = None
+_shared_lock = threading.Lock()
+
+
+def get_matrix_store(config=None) -> MatrixStore | None:
+    """Process-wide store under ``config.jaspar_cache_dir``, or None if that is set to ``""``."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            if config is None:
+                from biomni.config import default_config as config
+            directory = config.jaspar_cache_dir
+            if directory is None:
+                directory = os.path.join(config.path, "biomni_data", "jaspar")
+            if not directory:
+                return None
+            _shared_store = MatrixStore(directory)
+        return _shared_store
+
+
+def _get_json(url: str) -> dict:
+    """GET a JASPAR JSON document with ``query_jaspar``'s request helper (and its response cache)."""
+    from biomni.tool.database import _query_rest_api  # database imports this module
+
+    api_result = _query_rest_api(url, description="JASPAR lookup")
+    if not api_result.get("success"):
+        raise RuntimeError(f"JASPAR request failed: {api_result.get('error')}")
+    return api_result["result"]
+
+
+def resolve_matrix_id(tf_name: str) -> str | None:
+    """Matrix ID for a TF name (the first JASPAR search result) or ``tf_name`` itself if it is an ID."""
+    if MATRIX_ID.match(tf_name):
+        return tf_name
+    results = _get_json(f"{JASPAR_API}/matrix/?{urlencode({'name': tf_name})}").get("results") or []
+    return results[0]["matrix_id"] if results else None
+
+
+def fetch_matrix(matrix_id: str) -> dict:
+    """Record of ``matrix_id`` (with ``name`` and ``pfm`` counts), from the matrix store if present."""
+    cache_mode = current_mode()
+    store = get_matrix_store() if cache_mode != "bypass" else None
+    record = store.get(matrix_id) if store is not None and cache_mode == "use" else None
+    if record is None:
+        record = _get_json(f"{JASPAR_API}/matrix/{matrix_id}/")
+        if "pfm" not in record:
+            raise ValueError(f"JASPAR returned no count matrix for {matrix_id}")
+        if store is not None:
+            store.put(record)
+    return record
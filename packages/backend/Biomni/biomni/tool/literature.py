@@ -9,6 +9,7 @@ import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
 
+from biomni.http_client import get_http_client
 from biomni.llm import get_llm
 from biomni.config import default_config
 
@@ -35,7 +36,7 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     # CrossRef API to resolve DOI to a publisher page
     crossref_url = f"https://doi.org/{doi}"
     headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(crossref_url, headers=headers)
+    response = get_http_client().get(crossref_url, headers=headers)
 
     if response.status_code != 200:
         log_message = f"Failed to resolve DOI: {doi}. Status Code: {response.status_code}"
@@ -46,7 +47,7 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     research_log.append(f"Resolved DOI to publisher page: {publisher_url}")
 
     # Fetch publisher page
-    response = requests.get(publisher_url, headers=headers)
+    response = get_http_client().get(publisher_url, headers=headers)
     if response.status_code != 200:
         log_message = f"Failed to access publisher page for DOI {doi}."
         research_log.append(log_message)
@@ -78,7 +79,7 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     downloaded_files = []
     for link in supplementary_links:
         file_name = os.path.join(output_dir, link.split("/")[-1])
-        file_response = requests.get(link, headers=headers)
+        file_response = get_http_client().get(link, headers=headers)
         if file_response.status_code == 200:
             with open(file_name, "wb") as f:
                 f.write(file_response.content)
@@ -246,7 +247,7 @@ def extract_url_content(url: str) -> str:
         Text content of the webpage
 
     """
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+    response = get_http_client().get(url, headers={"User-Agent": "Mozilla/5.0"})
 
     # Check if the response is in text format
     if "text/plain" in response.headers.get("Content-Type", "") or "application/json" in response.headers.get(
@@ -358,7 +359,7 @@ def extract_pdf_content(url: str) -> str:
         # Check if the URL ends with .pdf
         if not url.lower().endswith(".pdf"):
             # If not, try to find a PDF link on the page
-            response = requests.get(url, timeout=30)
+            response = get_http_client().get(url, timeout=30)
             if response.status_code == 200:
                 # Look for PDF links in the HTML content
                 pdf_links = re.findall(r'href=[\'"]([^\'"]+\.pdf)[\'"]', response.text)
@@ -374,7 +375,7 @@ def extract_pdf_content(url: str) -> str:
                     return f"No PDF file found at {url}. Please provide a direct link to a PDF file."
 
         # Download the PDF
-        response = requests.get(url, timeout=30)
+        response = get_http_client().get(url, timeout=30)
 
         # Check if we actually got a PDF file (by checking content type or magic bytes)
         content_type = response.headers.get("Content-Type", "").lower()
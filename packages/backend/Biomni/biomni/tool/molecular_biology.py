@@ -1,7 +1,7 @@
+import csv
 import os
 import subprocess
 import tempfile
-from collections import namedtuple
 from typing import Any
 
 import pandas as pd
@@ -11,16 +11,22 @@ from Bio.Seq import Seq
 from Bio.SeqUtils import MeltingTemp as mt
 from bs4 import BeautifulSoup
 
+from biomni.data_lake import get_data_lake
+from biomni.tool.orf_scanner import find_orfs, iter_fasta_orfs
+from biomni.tool.primer_index import get_sequence_index
 
-def annotate_open_reading_frames(sequence, min_length, search_reverse=False, filter_subsets=False):
-    """Find all Open Reading Frames (ORFs) in a DNA sequence using Biopython.
+
+def annotate_open_reading_frames(sequence, min_length, search_reverse=False, filter_subsets=False, output_file=None):
+    """Find all Open Reading Frames (ORFs) in a DNA sequence or a multi-record FASTA file.
     Searches both forward and reverse complement strands.
 
     Args:
-        sequence (str): DNA sequence
+        sequence (str): DNA sequence, or path to a (multi-record) FASTA file
         min_length (int): Minimum length of ORF in nucleotides
         search_reverse (bool): Whether to search the reverse complement strand (default: False unless you want to search for reverse ORFs)
         filter_nested (bool): Whether to filter out ORFs with same end but later start (default: False unless you want to remove nested ORFs)
+        output_file (str): For FASTA input, TSV file receiving the ORFs of every record
+            (default: "<fasta name>_orfs.tsv" next to the input)
 
     Returns:
         dict: Dictionary containing:
@@ -33,101 +39,16 @@ def annotate_open_reading_frames(sequence, min_length, search_reverse=False, fil
                 - end: End position in original sequence
                 - strand: '+' for forward strand, '-' for reverse complement
                 - frame: Reading frame (1,2,3 for forward; -1,-2,-3 for reverse)
+            For FASTA input, records are streamed one at a time and the ORFs are written to
+            output_file instead; summary_stats then also counts records and orfs is empty.
 
     """
-    ORF = namedtuple("ORF", ["sequence", "aa_sequence", "start", "end", "strand", "frame"])
-
-    def find_orfs_in_frame(seq_str, frame, strand):
-        """Helper function to find ORFs in a specific frame."""
-        orfs = []
-        seq_length = len(seq_str)
-
-        # Adjust sequence based on frame
-        offset = frame - 1  # Convert 1-based frame to 0-based index
-        frame_seq = seq_str[offset:]
-
-        # Find all start codons
-        start_positions = []
-        stop_positions = []
+    if isinstance(sequence, str) and len(sequence) < 4096 and os.path.isfile(sequence):
+        return _annotate_fasta_open_reading_frames(sequence, min_length, search_reverse, filter_subsets, output_file)
 
-        for i in range(0, len(frame_seq) - 2, 3):
-            codon = frame_seq[i : i + 3]
-            if len(codon) != 3:  # Skip incomplete codons
-                continue
-
-            # Record positions of start and stop codons
-            if codon == "ATG":
-                start_positions.append(i)
-            elif codon in ["TAA", "TAG", "TGA"]:
-                stop_positions.append(i)
-
-                # Process any active ORFs that end at this stop codon
-                while start_positions and start_positions[0] < i:
-                    start_pos = start_positions.pop(0)
-                    orf_seq = frame_seq[start_pos : i + 3]
-
-                    # Check if ORF meets minimum length requirement
-                    if len(orf_seq) >= min_length:
-                        # Convert positions to original sequence coordinates
-                        orig_start = start_pos + offset
-                        orig_end = i + offset + 3
-
-                        # For reverse strand, convert positions
-                        if strand == "-":
-                            orig_start = seq_length - orig_end
-                            orig_end = seq_length - (start_pos + offset)
-
-                        # Create Seq object for translation
-                        orf_bio_seq = Seq(orf_seq)
-                        aa_seq = str(orf_bio_seq.translate(to_stop=True))
-
-                        orfs.append(
-                            ORF(
-                                sequence=orf_seq,
-                                aa_sequence=aa_seq,
-                                start=orig_start,
-                                end=orig_end,
-                                strand=strand,
-                                frame=frame if strand == "+" else -frame,
-                            )
-                        )
-
-        return orfs
-
-    # Convert input to string and uppercase
+    # Convert input to string and uppercase; frames are scanned with vectorized codon masks
     sequence = str(sequence).upper()
-    seq_obj = Seq(sequence)
-
-    all_orfs = []
-
-    # Search forward strand
-    for frame in range(1, 4):
-        all_orfs.extend(find_orfs_in_frame(sequence, frame, "+"))
-
-    # Search reverse complement strand
-    if search_reverse:
-        rev_comp = str(seq_obj.reverse_complement())
-        for frame in range(1, 4):
-            all_orfs.extend(find_orfs_in_frame(rev_comp, frame, "-"))
-
-    if filter_subsets:
-        # Sort ORFs by length first (longest first)
-        all_orfs.sort(key=lambda x: len(x.sequence), reverse=True)
-
-        # Filter out ORFs that are contained within other ORFs on the same strand
-        filtered_orfs = []
-        for _i, orf in enumerate(all_orfs):
-            is_subset = False
-            for larger_orf in filtered_orfs:
-                if orf.strand == larger_orf.strand and orf.start >= larger_orf.start and orf.end <= larger_orf.end:
-                    is_subset = True
-                    break
-            if not is_subset:
-                filtered_orfs.append(orf)
-        all_orfs = filtered_orfs
-
-    # Sort ORFs by length (longest first)
-    all_orfs.sort(key=lambda x: len(x.sequence), reverse=True)
+    all_orfs = find_orfs(sequence, min_length, search_reverse=search_reverse, filter_subsets=filter_subsets)
 
     # Calculate summary statistics
     forward_orfs = len([orf for orf in all_orfs if orf.strand == "+"])
@@ -164,6 +85,54 @@ def annotate_open_reading_frames(sequence, min_length, search_reverse=False, fil
     }
 
 
+def _annotate_fasta_open_reading_frames(fasta_path, min_length, search_reverse, filter_subsets, output_file):
+    """Streaming variant of annotate_open_reading_frames for FASTA files: ORFs go to a TSV file."""
+    if output_file is None:
+        output_file = os.path.splitext(fasta_path)[0] + "_orfs.tsv"
+    records = forward_orfs = reverse_orfs = total_length = 0
+    with open(output_file, "w", newline="") as out:
+        writer = csv.writer(out, delimiter="\t")
+        writer.writerow(["record_id", "start", "end", "strand", "frame", "length", "aa_sequence"])
+        for record_id, _, orfs in iter_fasta_orfs(fasta_path, min_length, search_reverse, filter_subsets):
+            records += 1
+            for orf in orfs:
+                writer.writerow(
+                    [record_id, orf.start, orf.end, orf.strand, orf.frame, orf.end - orf.start, orf.aa_sequence]
+                )
+                total_length += orf.end - orf.start
+                if orf.strand == "+":
+                    forward_orfs += 1
+                else:
+                    reverse_orfs += 1
+
+    total_orfs = forward_orfs + reverse_orfs
+    summary_stats = {
+        "records": records,
+        "total_orfs": total_orfs,
+        "forward_orfs": forward_orfs,
+        "reverse_orfs": reverse_orfs,
+        "avg_length": round(total_length / total_orfs, 1) if total_orfs else 0,
+    }
+    explanation = (
+        "Output fields:\n"
+        "- summary_stats: Statistical overview of found ORFs\n"
+        "  * records: Number of FASTA records scanned\n"
+        "  * total_orfs: Total number of ORFs found\n"
+        "  * forward_orfs: Number of ORFs on forward strand\n"
+        "  * reverse_orfs: Number of ORFs on reverse strand\n"
+        "  * avg_length: Average length of all ORFs in base pairs\n"
+        "- output_file: TSV with one ORF per row, longest first within each record: record_id, start (0-based), "
+        "end, strand, frame (1,2,3 forward; -1,-2,-3 reverse), length and aa_sequence\n"
+        "- orfs: Empty for FASTA input (see output_file)"
+    )
+    return {
+        "explanation": explanation,
+        "summary_stats": summary_stats,
+        "output_file": os.path.abspath(output_file),
+        "orfs": [],
+    }
+
+
 def annotate_plasmid(sequence: str, is_circular: bool = True) -> dict[str, Any]:
     """Annotate a DNA sequence using pLannotate's command-line interface.
 
@@ -421,7 +390,8 @@ def get_plasmid_sequence(identifier: str, is_addgene: bool = None) -> dict[str,
 
 def align_sequences(long_seq: str, short_seqs: str | list[str]) -> list[dict]:
     """Align short sequences (primers) to a longer sequence, allowing for one mismatch.
-    Checks both forward and reverse complement strands.
+    Checks both forward and reverse complement strands. All primers are matched in one pass
+    through a seed index of the target (see biomni.tool.primer_index).
 
     Args:
         long_seq (str): Target DNA sequence
@@ -442,39 +412,14 @@ def align_sequences(long_seq: str, short_seqs: str | list[str]) -> list[dict]:
     long_seq = long_seq.upper()
     short_seqs = [short_seqs.upper()] if isinstance(short_seqs, str) else [seq.upper() for seq in short_seqs]
 
-    def reverse_complement(seq):
-        """Helper function to get reverse complement of a sequence."""
-        complement = {"A": "T", "T": "A", "C": "G", "G": "C"}
-        return "".join(complement.get(base, base) for base in reversed(seq))
-
-    results = []
-
-    for short_seq in short_seqs:
-        alignments = []
-        seq_len = len(short_seq)
-
-        # Check both forward and reverse complement orientations
-        sequences_to_check = [
-            (short_seq, "+"),  # Forward strand
-            (reverse_complement(short_seq), "-"),  # Reverse complement
-        ]
-
-        for seq_to_align, strand in sequences_to_check:
-            # Check each possible position in the long sequence
-            for i in range(len(long_seq) - seq_len + 1):
-                window = long_seq[i : i + seq_len]
-                mismatches = []
-
-                # Compare sequences base by base
-                for j in range(seq_len):
-                    if window[j] != seq_to_align[j]:
-                        mismatches.append((j, seq_to_align[j], window[j]))
-
-                # If we have 0 or 1 mismatches, record the alignment
-                if len(mismatches) <= 1:
-                    alignments.append({"position": i, "strand": strand, "mismatches": mismatches})
-
-        results.append({"sequence": short_seq, "alignments": alignments})
+    # Seed index of the target, built once per sequence and reused across calls; all primers
+    # are matched in one pass instead of comparing each primer with every window
+    index = get_sequence_index(long_seq)
+    hits = index.find(short_seqs, max_mismatches=1)
+    results = [
+        {"sequence": short_seq, "alignments": alignments}
+        for short_seq, alignments in zip(short_seqs, hits, strict=True)
+    ]
 
     return {
         "explanation": (
@@ -907,20 +852,21 @@ def design_knockout_sgrna(
     if not os.path.exists(library_path):
         raise FileNotFoundError(f"Library file for {species} not found at path: {library_path}")
 
-    # Load sgRNA library from S3
+    # Filter for target gene (the library is converted to Arrow once and shared across calls)
+    gene_name = gene_name.upper()  # Ensure consistent capitalization
+    columns = ["Target Gene Symbol", "Combined Rank", "sgRNA Sequence"]
+    store = get_data_lake()
     try:
-        df = pd.read_csv(library_path, delimiter="\t")
+        gene_df = store.query(library_path, columns=columns, filters=[("Target Gene Symbol", "iequals", gene_name)])
+
+        if gene_df.empty:
+            # Try partial matching if exact match fails
+            gene_df = store.query(
+                library_path, columns=columns, filters=[("Target Gene Symbol", "icontains", gene_name)]
+            )
     except Exception as e:
         raise RuntimeError(f"Failed to load sgRNA library: {str(e)}") from None
 
-    # Filter for target gene
-    gene_name = gene_name.upper()  # Ensure consistent capitalization
-    gene_df = df[df["Target Gene Symbol"].str.upper() == gene_name]
-
-    if gene_df.empty:
-        # Try partial matching if exact match fails
-        gene_df = df[df["Target Gene Symbol"].str.upper().str.contains(gene_name)]
-
     if gene_df.empty:
         return {
             "explanation": "Output contains target gene name, species, and list of sgRNA sequences",
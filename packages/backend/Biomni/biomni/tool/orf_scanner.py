@@ -0,0 +1,169 @@
+"""Vectorized open reading frame scanner used by ``annotate_open_reading_frames``.
+
+The sequence is encoded once as a NumPy array of codon indices (one per position, so every frame is
+a strided view). For each of the six frames:
+
+- start (``ATG``) and stop (``TAA``, ``TAG``, ``TGA``) codons are found with boolean masks;
+- every start is paired with the next in-frame stop by ``searchsorted``, so each start yields one ORF
+  (nested ORFs sharing a stop are all reported, as before);
+- proteins are sliced from a translation of the whole frame, computed once with a codon table
+  lookup; ORFs with ambiguous bases are translated by Biopython as before.
+
+``filter_nested`` drops ORFs contained in another ORF on the same strand with a sorted sweep
+(start ascending, end descending, running maximum of ends) instead of pairwise checks.
+:func:`iter_fasta_orfs` streams a multi-record FASTA file one record at a time.
+"""
+
+import itertools
+from collections import namedtuple
+from collections.abc import Iterator
+
+import numpy as np
+from Bio import SeqIO
+from Bio.Data.CodonTable import standard_dna_table
+from Bio.Seq import Seq
+
+ORF = namedtuple("ORF", ["sequence", "aa_sequence", "start", "end", "strand", "frame"])
+
+_BASE_CODES = np.full(256, 4, dtype=np.uint8)
+for _code, _base in enumerate(b"ACGT"):
+    _BASE_CODES[_base] = _code
+
+INVALID_CODON = 64
+START_CODON = 0 * 16 + 3 * 4 + 2  # ATG
+STOP_CODONS = np.array([3 * 16 + 0 * 4 + 0, 3 * 16 + 0 * 4 + 2, 3 * 16 + 2 * 4 + 0])  # TAA, TAG, TGA
+
+# Amino acid per codon index (standard table, "*" for stops); "\0" marks codons with other characters
+_TRANSLATION = np.frombuffer(
+    (
+        "".join(
+            standard_dna_table.forward_table.get("".join(codon), "*") for codon in itertools.product("ACGT", repeat=3)
+        )
+        + "\0"
+    ).encode("ascii"),
+    dtype=np.uint8,
+)
+
+
+def encode_codons(sequence: str) -> np.ndarray:
+    """Codon index (0-63, or :data:`INVALID_CODON`) of the triplet starting at each position."""
+    bases = _BASE_CODES[np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)]
+    if len(bases) < 3:
+        return np.empty(0, dtype=np.uint8)
+    codons = (bases[:-2] << 4) | (bases[1:-1] << 2) | bases[2:]
+    codons[(bases[:-2] > 3) | (bases[1:-1] > 3) | (bases[2:] > 3)] = INVALID_CODON
+    return codons
+
+
+def _orfs_in_strand(seq_str: str, strand: str, min_length: int, seq_length: int, with_sequences: bool) -> Iterator[ORF]:
+    """ORFs of the three frames of ``seq_str`` (the forward sequence or its reverse complement)."""
+    codons = encode_codons(seq_str)
+    for frame in range(1, 4):
+        offset = frame - 1
+        frame_codons = codons[offset::3]
+        starts = np.flatnonzero(frame_codons == START_CODON)
+        stops = np.flatnonzero(np.isin(frame_codons, STOP_CODONS))
+        next_stop = np.searchsorted(stops, starts)
+        paired = next_stop < len(stops)
+        starts, ends = starts[paired], stops[next_stop[paired]] + 1  # in codons, end exclusive
+        keep = (ends - starts) * 3 >= min_length
+        starts, ends = starts[keep], ends[keep]
+        if len(starts) == 0:
+            continue
+
+        proteins = _TRANSLATION[frame_codons].tobytes().decode("ascii")
+        # Starts are ascending and each pairs with the next stop, so ORFs come out ordered by stop, then start
+        for start, end in zip(starts.tolist(), ends.tolist(), strict=True):
+            nt_start, nt_end = offset + 3 * start, offset + 3 * end
+            orf_seq = seq_str[nt_start:nt_end]
+            aa_seq = proteins[start : end - 1]
+            if "\0" in aa_seq:
+                aa_seq = str(Seq(orf_seq).translate(to_stop=True))
+            else:
+                aa_seq = aa_seq.partition("*")[0]
+            if strand == "-":
+                nt_start, nt_end = seq_length - nt_end, seq_length - nt_start
+            yield ORF(
+                sequence=orf_seq if with_sequences else "",
+                aa_sequence=aa_seq,
+                start=nt_start,
+                end=nt_end,
+                strand=strand,
+                frame=frame if strand == "+" else -frame,
+            )
+
+
+def find_orfs(
+    sequence: str,
+    min_length: int,
+    search_reverse: bool = False,
+    filter_subsets: bool = False,
+    with_sequences: bool = True,
+) -> list[ORF]:
+    """ORFs of an upper-case DNA sequence, longest first.
+
+    Args:
+        sequence: Upper-case DNA sequence
+        min_length: Minimum ORF length in nucleotides (including the stop codon)
+        search_reverse: Also scan the three frames of the reverse complement
+        filter_subsets: Drop ORFs contained in another ORF on the same strand
+        with_sequences: Keep the nucleotide sequence of each ORF (``""`` otherwise, to save memory)
+
+    Returns:
+        ORFs sorted by length, longest first; equal lengths keep the order forward frames 1-3,
+        reverse frames 1-3, then stop and start position within a frame
+
+    """
+    orfs = list(_orfs_in_strand(sequence, "+", min_length, len(sequence), with_sequences))
+    if search_reverse:
+        rev_comp = str(Seq(sequence).reverse_complement())
+        orfs.extend(_orfs_in_strand(rev_comp, "-", min_length, len(sequence), with_sequences))
+    if filter_subsets:
+        orfs = filter_nested(orfs)
+    orfs.sort(key=lambda orf: orf.end - orf.start, reverse=True)
+    return orfs
+
+
+def filter_nested(orfs: list[ORF]) -> list[ORF]:
+    """ORFs not contained in another ORF on the same strand, in their original order.
+
+    An ORF inside another is also inside the outermost ORF containing it, so this equals keeping
+    ORFs longest first unless an already kept ORF contains them.
+    """
+    if not orfs:
+        return []
+    strands = np.array([orf.strand == "-" for orf in orfs])
+    starts = np.array([orf.start for orf in orfs], dtype=np.int64)
+    ends = np.array([orf.end for orf in orfs], dtype=np.int64)
+    order = np.lexsort((-ends, starts, strands))
+    contained = np.zeros(len(orfs), dtype=bool)
+    for strand in (False, True):
+        group = order[strands[order] == strand]
+        if len(group) < 2:
+            continue
+        # Every earlier ORF of the sweep starts at or before this one; it is contained if one ends at or after it
+        max_end_before = np.maximum.accumulate(ends[group])[:-1]
+        contained[group[1:]] = max_end_before >= ends[group[1:]]
+    return [orf for orf, nested in zip(orfs, contained, strict=True) if not nested]
+
+
+def iter_fasta_orfs(
+    fasta_path: str,
+    min_length: int,
+    search_reverse: bool = False,
+    filter_subsets: bool = False,
+    with_sequences: bool = False,
+) -> Iterator[tuple[str, int, list[ORF]]]:
+    """Stream ``(record id, record length, ORFs)`` for each record of a (multi-record) FASTA file.
+
+    Only one record is held in memory at a time; nucleotide sequences of the ORFs are dropped
+    unless ``with_sequences`` is set.
+    """
+    with open(fasta_path) as handle:
+        for record in SeqIO.parse(handle, "fasta"):
+            sequence = str(record.seq).upper()
+            yield (
+                record.id,
+                len(sequence),
+                find_orfs(sequence, min_length, search_reverse, filter_subsets, with_sequences),
+            )
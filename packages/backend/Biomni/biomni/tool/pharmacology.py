@@ -1969,307 +1969,28 @@ def analyze_western_blot(
 
 def _load_ddinter_data(data_lake_path):
     """
-    Load DDInter datasets from pickle files, processing if needed.
+    Load the compiled DDInter interaction store, compiling it from the CSV files if needed.
+
+    The store is loaded once per process (see ``biomni.tool.ddinter_store``).
 
     Parameters
     ----------
     data_lake_path : str
-        Path to data lake directory containing DDInter pickle files
+        Path to data lake directory containing the DDInter CSV files
 
     Returns
     -------
-    tuple
-        (drug_info, interaction_matrix, name_mapping) dictionaries
+    DDInterStore
+        Drug registry, interaction adjacency and name index
     """
-    import os
-    import pickle
-
-    # Define schema directory (following established pattern)
-    schema_dir = os.path.join(os.path.dirname(__file__), "schema_db")
-
-    # Define paths to DDInter pickle files
-    drug_info_path = os.path.join(schema_dir, "ddinter_drugs.pkl")
-    interaction_path = os.path.join(schema_dir, "ddinter_interactions.pkl")
-    mapping_path = os.path.join(schema_dir, "ddinter_name_mapping.pkl")
+    from biomni.tool.ddinter_store import get_ddinter_store
 
-    # Check if processing is needed (lazy loading pattern)
-    pkl_files = [drug_info_path, interaction_path, mapping_path]
-    if not all(os.path.exists(f) for f in pkl_files):
-        _process_ddinter_data_inline(data_lake_path, schema_dir)
-
-    # Load data
     try:
-        with open(drug_info_path, "rb") as f:
-            drug_info = pickle.load(f)
-
-        with open(interaction_path, "rb") as f:
-            interaction_matrix = pickle.load(f)
-
-        with open(mapping_path, "rb") as f:
-            name_mapping = pickle.load(f)
-
-        return drug_info, interaction_matrix, name_mapping
-
+        return get_ddinter_store(data_lake_path)
     except Exception as e:
         raise FileNotFoundError(f"Error loading DDInter data: {e}") from e
 
 
-def _process_ddinter_data_inline(data_lake_path, output_dir):
-    """
-    Process DDInter CSV files into standardized pickle files.
-
-    This function processes raw DDInter 2.0 CSV files and creates standardized
-    data structures for use in Biomni drug-drug interaction analysis.
-
-    Parameters
-    ----------
-    data_lake_path : str
-        Path to data lake directory containing raw DDInter CSV files
-    output_dir : str
-        Directory to save processed pickle files
-    """
-    import os
-    import pickle
-    from pathlib import Path
-
-    import pandas as pd
-
-    # Create output directory
-    Path(output_dir).mkdir(exist_ok=True)
-
-    # Define CSV files to process
-    csv_files = [
-        "ddinter_alimentary_tract_metabolism.csv",
-        "ddinter_antineoplastic.csv",
-        "ddinter_antiparasitic.csv",
-        "ddinter_blood_organs.csv",
-        "ddinter_dermatological.csv",
-        "ddinter_hormonal.csv",
-        "ddinter_respiratory.csv",
-        "ddinter_various.csv",
-    ]
-
-    # Load and combine all CSV files
-    dataframes = []
-    for csv_file in csv_files:
-        file_path = os.path.join(data_lake_path, csv_file)
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-            # Add source category
-            category = csv_file.replace("ddinter_", "").replace(".csv", "")
-            df["category"] = category
-            dataframes.append(df)
-
-    if not dataframes:
-        raise FileNotFoundError("No DDInter CSV files found in data lake")
-
-    # Process data
-    drug_info = _build_drug_registry_inline(dataframes)
-    interaction_matrix = _create_interaction_matrix_inline(dataframes)
-    name_mapping = _create_name_mapping_inline(drug_info)
-
-    # Save processed data
-    with open(os.path.join(output_dir, "ddinter_drugs.pkl"), "wb") as f:
-        pickle.dump(drug_info, f)
-
-    with open(os.path.join(output_dir, "ddinter_interactions.pkl"), "wb") as f:
-        pickle.dump(interaction_matrix, f)
-
-    with open(os.path.join(output_dir, "ddinter_name_mapping.pkl"), "wb") as f:
-        pickle.dump(name_mapping, f)
-
-    # Generate and save statistics
-    stats = _generate_ddinter_statistics_inline(drug_info, interaction_matrix)
-    with open(os.path.join(output_dir, "ddinter_statistics.pkl"), "wb") as f:
-        pickle.dump(stats, f)
-
-
-def _standardize_drug_name_processing(drug_name):
-    """Standardize drug names for consistent matching during processing."""
-    import pandas as pd
-
-    if pd.isna(drug_name):
-        return ""
-
-    # Convert to lowercase and strip whitespace
-    standardized = str(drug_name).strip().lower()
-
-    # Remove common suffixes and prefixes
-    standardized = standardized.replace(" hydrochloride", "")
-    standardized = standardized.replace(" sulfate", "")
-    standardized = standardized.replace(" sodium", "")
-    standardized = standardized.replace(" potassium", "")
-    standardized = standardized.replace(" calcium", "")
-    standardized = standardized.replace(" magnesium", "")
-
-    return standardized
-
-
-def _build_drug_registry_inline(dataframes):
-    """Build comprehensive drug registry from all interactions."""
-
-    drug_registry = {}
-
-    for df in dataframes:
-        for _, row in df.iterrows():
-            drug_a_id = row["DDInterID_A"]
-            drug_a_name = row["Drug_A"]
-            drug_b_id = row["DDInterID_B"]
-            drug_b_name = row["Drug_B"]
-
-            # Add Drug A
-            if drug_a_id not in drug_registry:
-                drug_registry[drug_a_id] = {
-                    "name": drug_a_name,
-                    "standardized_name": _standardize_drug_name_processing(drug_a_name),
-                    "categories": set(),
-                    "interactions": set(),
-                }
-            drug_registry[drug_a_id]["categories"].add(row["category"])
-
-            # Add Drug B
-            if drug_b_id not in drug_registry:
-                drug_registry[drug_b_id] = {
-                    "name": drug_b_name,
-                    "standardized_name": _standardize_drug_name_processing(drug_b_name),
-                    "categories": set(),
-                    "interactions": set(),
-                }
-            drug_registry[drug_b_id]["categories"].add(row["category"])
-
-            # Record interactions
-            drug_registry[drug_a_id]["interactions"].add(drug_b_id)
-            drug_registry[drug_b_id]["interactions"].add(drug_a_id)
-
-    # Convert sets to lists for pickle serialization
-    for drug_id in drug_registry:
-        drug_registry[drug_id]["categories"] = list(drug_registry[drug_id]["categories"])
-        drug_registry[drug_id]["interactions"] = list(drug_registry[drug_id]["interactions"])
-
-    return drug_registry
-
-
-def _create_interaction_matrix_inline(dataframes):
-    """Create interaction matrix for fast lookups using standardized drug names."""
-    from collections import defaultdict
-
-    import pandas as pd
-
-    combined_df = pd.concat(dataframes, ignore_index=True)
-    interaction_matrix = defaultdict(lambda: defaultdict(list))
-
-    # Create bidirectional interaction matrix using standardized names
-    for _, row in combined_df.iterrows():
-        drug_a_std = _standardize_drug_name_processing(row["Drug_A"])
-        drug_b_std = _standardize_drug_name_processing(row["Drug_B"])
-        level = row["Level"]
-        category = row["category"]
-
-        interaction_data = {
-            "level": level,
-            "category": category,
-            "drug_a_id": row["DDInterID_A"],
-            "drug_b_id": row["DDInterID_B"],
-            "drug_a_name": row["Drug_A"],
-            "drug_b_name": row["Drug_B"],
-        }
-
-        # Add both directions using standardized names as keys
-        interaction_matrix[drug_a_std][drug_b_std].append(interaction_data)
-        interaction_matrix[drug_b_std][drug_a_std].append(interaction_data)
-
-    # Convert to regular dict for pickle
-    interaction_matrix = dict(interaction_matrix)
-    for drug in interaction_matrix:
-        interaction_matrix[drug] = dict(interaction_matrix[drug])
-
-    return interaction_matrix
-
-
-def _create_name_mapping_inline(drug_info):
-    """Create drug name to ID mapping for fuzzy matching."""
-    name_mapping = {}
-
-    for drug_id, drug_data in drug_info.items():
-        original_name = drug_data["name"]
-        standardized_name = drug_data["standardized_name"]
-
-        # Map both original and standardized names
-        name_mapping[original_name.lower()] = drug_id
-        name_mapping[standardized_name] = drug_id
-
-    return name_mapping
-
-
-def _generate_ddinter_statistics_inline(drug_info, interaction_matrix):
-    """Generate statistics about the processed data."""
-    from collections import defaultdict
-
-    stats = {
-        "total_drugs": len(drug_info),
-        "total_interactions": 0,
-        "interaction_levels": defaultdict(int),
-        "drug_categories": defaultdict(int),
-        "most_connected_drugs": [],
-    }
-
-    # Count interactions and levels
-    for drug_a in interaction_matrix:
-        for drug_b in interaction_matrix[drug_a]:
-            interactions = interaction_matrix[drug_a][drug_b]
-            stats["total_interactions"] += len(interactions)
-
-            for interaction in interactions:
-                stats["interaction_levels"][interaction["level"]] += 1
-
-    # Count drug categories
-    for drug_data in drug_info.values():
-        for category in drug_data["categories"]:
-            stats["drug_categories"][category] += 1
-
-    # Find most connected drugs
-    connection_counts = []
-    for drug_id, drug_data in drug_info.items():
-        connection_counts.append(
-            {"drug_id": drug_id, "name": drug_data["name"], "connections": len(drug_data["interactions"])}
-        )
-
-    connection_counts.sort(key=lambda x: x["connections"], reverse=True)
-    stats["most_connected_drugs"] = connection_counts[:10]
-
-    return stats
-
-
-def _standardize_drug_name(drug_name, name_mapping):
-    """
-    Standardize drug names using fuzzy matching against DDInter database.
-
-    Parameters
-    ----------
-    drug_name : str
-        Original drug name
-    name_mapping : dict
-        Drug name to ID mapping dictionary
-
-    Returns
-    -------
-    str or None
-        Standardized drug name or None if not found
-    """
-    from difflib import get_close_matches
-
-    # Direct match
-    if drug_name.lower() in name_mapping:
-        return drug_name.lower()
-
-    # Fuzzy match
-    matches = get_close_matches(drug_name.lower(), name_mapping.keys(), n=1, cutoff=0.8)
-    if matches:
-        return matches[0]
-
-    return None
-
-
 def _format_interaction_result(interaction_data, drug_name_a, drug_name_b, include_mechanisms=True):
     """
     Format interaction results for research log.
@@ -2347,15 +2068,15 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
-        log += f"Successfully loaded DDInter database with {len(drug_info)} drugs\n\n"
+        store = _load_ddinter_data(data_lake_path)
+        log += f"Successfully loaded DDInter database with {len(store)} drugs\n\n"
 
         # Standardize drug names
         standardized_names = []
         missing_drugs = []
 
         for drug_name in drug_names:
-            standardized = _standardize_drug_name(drug_name, name_mapping)
+            standardized = store.resolve(drug_name)
             if standardized:
                 standardized_names.append(standardized)
             else:
@@ -2379,28 +2100,15 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
                 if i >= j:  # Avoid duplicate pairs
                     continue
 
-                if drug_a in interaction_matrix and drug_b in interaction_matrix[drug_a]:
-                    interactions = interaction_matrix[drug_a][drug_b]
-
-                    # Apply filters
-                    filtered_interactions = interactions
-
-                    if severity_levels:
-                        filtered_interactions = [
-                            int_data for int_data in filtered_interactions if int_data.get("level") in severity_levels
-                        ]
-
-                    if interaction_types:
-                        filtered_interactions = [
-                            int_data
-                            for int_data in filtered_interactions
-                            if int_data.get("category") in interaction_types
-                        ]
+                # Severity and category filters are applied as bitmasks inside the store
+                filtered_interactions = store.interactions(
+                    drug_a, drug_b, severity_levels=severity_levels, interaction_types=interaction_types
+                )
 
-                    if filtered_interactions:
-                        interactions_found.append(
-                            {"drug_a": drug_a, "drug_b": drug_b, "interactions": filtered_interactions}
-                        )
+                if filtered_interactions:
+                    interactions_found.append(
+                        {"drug_a": drug_a, "drug_b": drug_b, "interactions": filtered_interactions}
+                    )
 
         # Format results
         log += "Interaction Analysis Results:\n"
@@ -2475,7 +2183,7 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
+        store = _load_ddinter_data(data_lake_path)
         log += "Successfully loaded DDInter database\n\n"
 
         # Standardize drug names
@@ -2483,7 +2191,7 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
         missing_drugs = []
 
         for drug in drug_list:
-            standardized = _standardize_drug_name(drug, name_mapping)
+            standardized = store.resolve(drug)
             if standardized:
                 standardized_drugs.append(standardized)
             else:
@@ -2510,9 +2218,8 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
                 if i >= j:  # Avoid duplicate pairs
                     continue
 
-                if drug_a in interaction_matrix and drug_b in interaction_matrix[drug_a]:
-                    interactions = interaction_matrix[drug_a][drug_b]
-
+                interactions = store.interactions(drug_a, drug_b)
+                if interactions:
                     for interaction in interactions:
                         level = interaction.get("level", "Unknown")
                         if level == "Major":
@@ -2639,12 +2346,12 @@ def analyze_interaction_mechanisms(drug_pair, detailed_analysis=True, data_lake_
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
+        store = _load_ddinter_data(data_lake_path)
         log += "Successfully loaded DDInter database\n\n"
 
         # Standardize drug names
-        std_drug_a = _standardize_drug_name(drug_a, name_mapping)
-        std_drug_b = _standardize_drug_name(drug_b, name_mapping)
+        std_drug_a = store.resolve(drug_a)
+        std_drug_b = store.resolve(drug_b)
 
         if not std_drug_a:
             log += f"Error: Drug '{drug_a}' not found in DDInter database\n"
@@ -2654,29 +2361,25 @@ def analyze_interaction_mechanisms(drug_pair, detailed_analysis=True, data_lake_
             return log
 
         # Query interactions
-        interactions = []
-        if std_drug_a in interaction_matrix and std_drug_b in interaction_matrix[std_drug_a]:
-            interactions = interaction_matrix[std_drug_a][std_drug_b]
+        interactions = store.interactions(std_drug_a, std_drug_b)
 
         if not interactions:
             log += f"No interactions found between {drug_a} and {drug_b}\n"
             return log
 
         # Get drug information
-        drug_a_id = name_mapping[std_drug_a]
-        drug_b_id = name_mapping[std_drug_b]
-        drug_a_info = drug_info.get(drug_a_id, {})
-        drug_b_info = drug_info.get(drug_b_id, {})
+        drug_a_index = store.drug(std_drug_a)
+        drug_b_index = store.drug(std_drug_b)
 
         log += "Drug Profile Analysis:\n"
         log += "-" * 20 + "\n"
         log += f"{drug_a.title()}:\n"
-        log += f"- Categories: {', '.join(drug_a_info.get('categories', ['Unknown']))}\n"
-        log += f"- Total known interactions: {len(drug_a_info.get('interactions', []))}\n\n"
+        log += f"- Categories: {', '.join(store.categories(drug_a_index))}\n"
+        log += f"- Total known interactions: {store.drug_degrees[drug_a_index]}\n\n"
 
         log += f"{drug_b.title()}:\n"
-        log += f"- Categories: {', '.join(drug_b_info.get('categories', ['Unknown']))}\n"
-        log += f"- Total known interactions: {len(drug_b_info.get('interactions', []))}\n\n"
+        log += f"- Categories: {', '.join(store.categories(drug_b_index))}\n"
+        log += f"- Total known interactions: {store.drug_degrees[drug_b_index]}\n\n"
 
         # Analyze interaction mechanisms
         log += "Interaction Mechanism Analysis:\n"
@@ -2796,11 +2499,11 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
-        log += f"Successfully loaded DDInter database with {len(drug_info)} drugs\n\n"
+        store = _load_ddinter_data(data_lake_path)
+        log += f"Successfully loaded DDInter database with {len(store)} drugs\n\n"
 
         # Standardize target drug name
-        std_target = _standardize_drug_name(target_drug, name_mapping)
+        std_target = store.resolve(target_drug)
         if not std_target:
             log += f"Error: Target drug '{target_drug}' not found in DDInter database\n"
             return log
@@ -2810,7 +2513,7 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
         missing_contraindicated = []
 
         for drug in contraindicated_drugs:
-            std_drug = _standardize_drug_name(drug, name_mapping)
+            std_drug = store.resolve(drug)
             if std_drug:
                 std_contraindicated.append(std_drug)
             else:
@@ -2823,67 +2526,17 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
             log += "\n"
 
         # Get target drug information
-        target_id = name_mapping[std_target]
-        target_info = drug_info.get(target_id, {})
-        target_categories = target_info.get("categories", [])
+        target_index = store.drug(std_target)
+        target_categories = store.categories(target_index)
 
         log += "Target Drug Profile:\n"
         log += f"- Drug: {target_drug}\n"
         log += f"- Categories: {', '.join(target_categories)}\n"
-        log += f"- Total interactions: {len(target_info.get('interactions', []))}\n\n"
-
-        # Find alternative drugs
-        alternatives = []
-
-        for drug_id, drug_data in drug_info.items():
-            drug_name = drug_data["name"]
-            drug_categories = drug_data.get("categories", [])
+        log += f"- Total interactions: {store.drug_degrees[target_index]}\n\n"
 
-            # Skip the target drug itself
-            if drug_id == target_id:
-                continue
-
-            # Apply therapeutic class filter
-            if therapeutic_class:
-                if not any(therapeutic_class.lower() in cat.lower() for cat in drug_categories):
-                    continue
-            else:
-                # Look for drugs in similar categories as target
-                if not any(cat in target_categories for cat in drug_categories):
-                    continue
-
-            # Check if this drug interacts with any contraindicated drugs
-            has_contraindicated_interactions = False
-            interaction_count = 0
-            major_interactions = 0
-
-            std_drug_name = drug_data["standardized_name"]
-
-            for contraindicated in std_contraindicated:
-                if std_drug_name in interaction_matrix and contraindicated in interaction_matrix[std_drug_name]:
-                    interactions = interaction_matrix[std_drug_name][contraindicated]
-                    interaction_count += len(interactions)
-
-                    # Check for major interactions
-                    for interaction in interactions:
-                        if interaction.get("level") == "Major":
-                            major_interactions += 1
-                            has_contraindicated_interactions = True
-                            break
-
-                    if has_contraindicated_interactions:
-                        break
-
-            # Add to alternatives if no major contraindicated interactions
-            if not has_contraindicated_interactions:
-                alternatives.append(
-                    {
-                        "name": drug_name,
-                        "categories": drug_categories,
-                        "interaction_count": interaction_count,
-                        "total_interactions": len(drug_data.get("interactions", [])),
-                    }
-                )
+        # Find alternative drugs: same categories as the target (or the therapeutic class) and no
+        # major interaction with any contraindicated drug, selected with category bitmasks
+        alternatives = store.alternatives(std_target, std_contraindicated, therapeutic_class=therapeutic_class)
 
         # Sort alternatives by interaction count (fewer is better)
         alternatives.sort(key=lambda x: x["interaction_count"])
@@ -0,0 +1,199 @@
+"""Seed index of a target sequence for finding primer hits with few mismatches.
+
+``align_sequences`` used to slide every primer, base by base, over every window of the target on both
+strands. :class:`SequenceIndex` finds the same hits without scanning the target per primer:
+
+- A primer with at most ``m`` mismatches to a window matches one of its ``m + 1`` non-overlapping
+  parts exactly (pigeonhole). The start of each part (a multiple of 4 bases, up to :data:`MAX_SEED`) is a seed.
+- The target's k-mers are 2-bit encoded with NumPy and sorted once per seed length; the seeds of
+  all primers (and of their reverse complements) are looked up together with ``searchsorted``.
+- Candidate windows are verified in one vectorized comparison per primer and strand.
+
+Indexes are cached per target sequence (:func:`get_sequence_index`), so repeated calls on the same
+plasmid or genome, e.g. forward and reverse primers in ``pcr_simple``, build the tables once.
+Primers containing non-ACGT characters, or too short to give a selective seed, are matched by a
+vectorized scan of all windows instead.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_SEED = 16  # 2-bit codes of up to 16 bases fit in uint32
+MIN_SEED = 4  # shorter seeds match too many windows to be worth an index lookup
+VERIFY_BLOCK = 1 << 16  # candidate windows compared at once
+
+_CODES = np.full(256, 255, dtype=np.uint8)
+for _code, _base in enumerate(b"ACGT"):
+    _CODES[_base] = _code
+_COMPLEMENT = {"A": "T", "T": "A", "C": "G", "G": "C"}
+
+
+def _encode(seq: str) -> np.ndarray:
+    """Code points of ``seq``, one uint32 per character."""
+    return np.frombuffer(seq.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _base_codes(chars: np.ndarray) -> np.ndarray:
+    """2-bit base codes of code points (A=0, C=1, G=2, T=3; 255 for anything else)."""
+    return _CODES[np.minimum(chars, 255)]
+
+
+def reverse_complement(seq: str) -> str:
+    """Reverse complement; characters other than A, C, G and T are kept as they are."""
+    return "".join(_COMPLEMENT.get(base, base) for base in reversed(seq))
+
+
+class SequenceIndex:
+    """Target sequence with lazily built, sorted k-mer tables for seed lookup."""
+
+    def __init__(self, sequence: str):
+        """Index ``sequence`` (case-sensitive; callers upper-case both target and primers)."""
+        self.sequence = sequence
+        self._chars = _encode(sequence)
+        self._codes = _base_codes(self._chars)
+        self._tables: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.sequence)
+
+    def find(self, primers: list[str], max_mismatches: int = 1) -> list[list[dict]]:
+        """Windows of the target within ``max_mismatches`` of each primer, on both strands.
+
+        Args:
+            primers: Primer sequences (same case as the target)
+            max_mismatches: Maximum number of mismatching bases per hit
+
+        Returns:
+            For each primer, its hits in the format of ``align_sequences``: ``position`` (0-based start in
+            the target), ``strand`` (``"+"`` for the primer, ``"-"`` for its reverse complement) and
+            ``mismatches`` as ``(position in the aligned primer, expected base, found base)`` tuples;
+            forward-strand hits first, each strand by position
+
+        """
+        queries = [(i, strand, seq) for i, primer in enumerate(primers) for strand, seq in self._strands(primer)]
+        starts: dict[tuple[int, str], np.ndarray] = {}
+
+        # Seeds of every query with the same seed length are looked up in one pass over the table
+        by_k: dict[int, list[tuple[int, str, str]]] = {}
+        for query in queries:
+            k = self._seed_length(query[2], max_mismatches)
+            if k is None:
+                starts[query[:2]] = self._scan(query[2], max_mismatches)
+            else:
+                by_k.setdefault(k, []).append(query)
+        for k, group in by_k.items():
+            starts.update(self._seed_candidates(k, group, max_mismatches))
+
+        results: list[list[dict]] = [[] for _ in primers]
+        for i, strand, seq in queries:
+            results[i].extend(self._verify(seq, strand, starts[(i, strand)], max_mismatches))
+        return results
+
+    @staticmethod
+    def _strands(primer: str) -> list[tuple[str, str]]:
+        return [("+", primer), ("-", reverse_complement(primer))]
+
+    def _seed_length(self, seq: str, max_mismatches: int) -> int | None:
+        """Seed length for ``seq``, or None if it has to be matched by a full scan."""
+        # Rounded down to a multiple of 4 so that primers of similar length share one k-mer table
+        k = min(len(seq) // (max_mismatches + 1), MAX_SEED) // 4 * 4
+        if k < MIN_SEED or len(seq) > len(self.sequence) or (_base_codes(_encode(seq)) > 3).any():
+            return None
+        return k
+
+    def _table(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """(sorted 2-bit codes of all ACGT-only k-mers of the target, their start positions)."""
+        with self._lock:
+            table = self._tables.get(k)
+            if table is None:
+                n = len(self._codes) - k + 1
+                kmers = np.zeros(max(n, 0), dtype=np.uint32)
+                valid = np.ones(max(n, 0), dtype=bool)
+                for j in range(k):
+                    window = self._codes[j : j + n]
+                    kmers = (kmers << np.uint32(2)) | (window & 3).astype(np.uint32)
+                    valid &= window <= 3
+                positions = np.flatnonzero(valid).astype(np.int64)
+                order = np.argsort(kmers[positions], kind="stable")
+                table = (kmers[positions][order], positions[order])
+                self._tables[k] = table
+            return table
+
+    def _seed_candidates(
+        self, k: int, queries: list[tuple[int, str, str]], max_mismatches: int
+    ) -> dict[tuple[int, str], np.ndarray]:
+        """Candidate window starts of each query from exact hits of its ``max_mismatches + 1`` seeds."""
+        sorted_kmers, positions = self._table(k)
+        seeds, owners, offsets = [], [], []
+        for q_index, (_, _, seq) in enumerate(queries):
+            part = len(seq) // (max_mismatches + 1)
+            for s in range(max_mismatches + 1):
+                seeds.append(seq[s * part : s * part + k])
+                owners.append(q_index)
+                offsets.append(s * part)
+
+        codes = _base_codes(_encode("".join(seeds))).reshape(len(seeds), k).astype(np.uint32)
+        seed_kmers = np.zeros(len(seeds), dtype=np.uint32)
+        for j in range(k):
+            seed_kmers = (seed_kmers << np.uint32(2)) | codes[:, j]
+        lo = np.searchsorted(sorted_kmers, seed_kmers, side="left")
+        hi = np.searchsorted(sorted_kmers, seed_kmers, side="right")
+
+        hits: list[list[np.ndarray]] = [[] for _ in queries]
+        for s_index in np.flatnonzero(hi > lo):
+            hits[owners[s_index]].append(positions[lo[s_index] : hi[s_index]] - offsets[s_index])
+        candidates = {}
+        for q_index, (i, strand, seq) in enumerate(queries):
+            found = np.unique(np.concatenate(hits[q_index])) if hits[q_index] else np.empty(0, dtype=np.int64)
+            candidates[(i, strand)] = found[(found >= 0) & (found <= len(self.sequence) - len(seq))]
+        return candidates
+
+    def _scan(self, seq: str, max_mismatches: int) -> np.ndarray:
+        """Window starts within ``max_mismatches`` of ``seq`` by comparing every window (short or ambiguous seqs)."""
+        n = len(self.sequence) - len(seq) + 1
+        if n <= 0:
+            return np.empty(0, dtype=np.int64)
+        mismatches = np.zeros(n, dtype=np.int32)
+        for j, char in enumerate(_encode(seq)):
+            mismatches += self._chars[j : j + n] != char
+        return np.flatnonzero(mismatches <= max_mismatches)
+
+    def _verify(self, seq: str, strand: str, starts: np.ndarray, max_mismatches: int) -> list[dict]:
+        """Hits among the candidate ``starts`` (sorted), compared in blocks to bound memory."""
+        primer = _encode(seq)
+        offsets = np.arange(len(seq))
+        hits = []
+        for block in range(0, len(starts), VERIFY_BLOCK):
+            block_starts = starts[block : block + VERIFY_BLOCK]
+            differs = self._chars[block_starts[:, None] + offsets] != primer
+            keep = differs.sum(axis=1) <= max_mismatches
+            for start, row in zip(block_starts[keep].tolist(), differs[keep], strict=True):
+                mismatches = [(j, seq[j], self.sequence[start + j]) for j in np.flatnonzero(row).tolist()]
+                hits.append({"position": start, "strand": strand, "mismatches": mismatches})
+        return hits
+
+
+_indexes: OrderedDict[str, SequenceIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+MAX_CACHED_INDEXES = 8
+
+
+def get_sequence_index(sequence: str) -> SequenceIndex:
+    """Index of ``sequence``, shared by calls on the same sequence (LRU of :data:`MAX_CACHED_INDEXES`)."""
+    key = hashlib.sha1(sequence.encode("utf-8", "replace")).hexdigest()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = SequenceIndex(sequence)
+    with _indexes_lock:
+        index = _indexes.setdefault(key, index)
+        _indexes.move_to_end(key)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
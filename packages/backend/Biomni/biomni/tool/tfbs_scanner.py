@@ -0,0 +1,319 @@
+"""Batch PSSM scanner for transcription factor binding sites (many matrices x many sequences).
+
+``identify_transcription_factor_binding_sites`` scores one sequence with one Biopython PSSM. For
+batches, :func:`scan_sequences` scores every sequence with every matrix at once:
+
+- sequences are one-hot encoded (``N`` and other characters are all-zero rows, and windows containing
+  them are not reported, as Biopython scores them NaN);
+- the log-odds matrices of all motifs of the same length, and their reverse complements, are stacked
+  into one ``(4 * length, 2 * motifs)`` weight matrix, so scoring a block of windows on both strands
+  is a single matrix product (a convolution over the one-hot sequence, computed by BLAS);
+- long sequences are cut into overlapping chunks of :data:`CHUNK_BASES`, and chunks are scored in a
+  process pool when the batch is large enough to be worth the start-up cost.
+
+Scores are log2 odds against a uniform background, with JASPAR's default pseudocounts (the
+background frequency times the square root of the number of sites), so matrices with zero counts
+still give finite scores. Hits are returned as a columnar :class:`pandas.DataFrame`.
+:func:`load_sequences` reads the accepted inputs (sequences, FASTA files, BED regions of a genome).
+"""
+
+import atexit
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from Bio import SeqIO
+
+from biomni.execution import get_worker_context
+
+CHUNK_BASES = 1 << 20  # window starts per work unit
+BLOCK_WINDOWS = 1 << 15  # windows scored per matrix product
+PARALLEL_MIN_WORK = 1 << 24  # window x motif scores below which the pool is not used
+
+_ONE_HOT = np.zeros((256, 4), dtype=np.float32)
+for _code, _base in enumerate(b"ACGT"):
+    _ONE_HOT[_base, _code] = 1
+_VALID = _ONE_HOT.any(axis=1)
+_COMPLEMENT = str.maketrans("ACGTN", "TGCAN")
+
+COLUMNS = ["sequence_id", "tf_name", "matrix_id", "start", "end", "strand", "score", "relative_score", "site"]
+
+
+class Motif(NamedTuple):
+    """Log-odds scoring matrix of one transcription factor profile."""
+
+    matrix_id: str
+    name: str
+    weights: np.ndarray  # (length, 4) log2 odds of A, C, G, T at each position
+    min_score: float
+    max_score: float
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+
+def motif_from_counts(matrix_id: str, name: str, counts: dict, pseudocounts: float | None = None) -> Motif:
+    """Log-odds motif from JASPAR position frequency counts (``{"A": [...], "C": [...], ...}``).
+
+    Args:
+        matrix_id: JASPAR matrix ID
+        name: Transcription factor name
+        counts: Counts of each base at each motif position
+        pseudocounts: Pseudocount added per base (default: 0.25 * sqrt(mean sites per position)); must be
+            positive if any count is zero, since a zero frequency has no finite log-odds weight
+
+    """
+    matrix = np.array([counts[base] for base in "ACGT"], dtype=np.float64).T
+    if pseudocounts is None:
+        pseudocounts = 0.25 * np.sqrt(matrix.sum(axis=1).mean())
+    if pseudocounts < 0 or (pseudocounts == 0 and (matrix == 0).any()):
+        raise ValueError(f"{matrix_id}: pseudocounts must be positive when a base has zero counts, got {pseudocounts}")
+    frequencies = (matrix + pseudocounts) / (matrix.sum(axis=1, keepdims=True) + 4 * pseudocounts)
+    weights = np.log2(frequencies / 0.25)
+    return Motif(matrix_id, name, weights, float(weights.min(axis=1).sum()), float(weights.max(axis=1).sum()))
+
+
+class _MotifGroup(NamedTuple):
+    """Motifs of one length, stacked for scoring both strands with one matrix product."""
+
+    length: int
+    indices: np.ndarray  # (k,) positions in the motif list
+    weights: np.ndarray  # (4 * length, 2 * k): forward matrices, then reverse complements
+    thresholds: np.ndarray  # (2 * k,) absolute score thresholds
+
+
+def _group_motifs(motifs: list[Motif], threshold: float) -> list[_MotifGroup]:
+    groups = []
+    for length in sorted({len(motif) for motif in motifs}):
+        indices = np.array([i for i, motif in enumerate(motifs) if len(motif) == length])
+        # Reversing positions and the A, C, G, T columns gives the reverse complement matrix
+        forward = [motifs[i].weights.reshape(-1) for i in indices]
+        reverse = [motifs[i].weights[::-1, ::-1].reshape(-1) for i in indices]
+        cutoffs = [motifs[i].min_score + threshold * (motifs[i].max_score - motifs[i].min_score) for i in indices]
+        groups.append(
+            _MotifGroup(
+                length=length,
+                indices=indices,
+                weights=np.stack(forward + reverse, axis=1).astype(np.float32),
+                # Sites scoring exactly the cutoff (frequent with integer counts) survive float32 rounding
+                thresholds=np.array(cutoffs + cutoffs, dtype=np.float32) - np.float32(1e-4),
+            )
+        )
+    return groups
+
+
+def _scan_unit(sequence: str, groups: list[_MotifGroup]) -> tuple[np.ndarray, ...]:
+    """Hits starting in the first :data:`CHUNK_BASES` bases of a chunk: (motif index, start, is reverse, score)."""
+    codes = np.frombuffer(sequence.encode("ascii", "replace"), dtype=np.uint8)
+    one_hot = _ONE_HOT[codes]
+    invalid = np.concatenate(([0], np.cumsum(~_VALID[codes])))
+    motif_hits, starts, reverse, scores = [], [], [], []
+    for group in groups:
+        n = min(CHUNK_BASES, len(sequence) - group.length + 1)
+        if n <= 0:
+            continue
+        windows = np.lib.stride_tricks.sliding_window_view(one_hot, (group.length, 4)).reshape(-1, 4 * group.length)
+        clean = invalid[group.length : group.length + n] == invalid[:n]
+        k = len(group.indices)
+        for block in range(0, n, BLOCK_WINDOWS):
+            # A contiguous copy of the (overlapping) windows lets the product run in BLAS
+            block_scores = np.ascontiguousarray(windows[block : min(block + BLOCK_WINDOWS, n)]) @ group.weights
+            # Sites are sparse: a flat nonzero is several times faster than a 2-D one
+            rows, cols = np.divmod(np.flatnonzero(block_scores >= group.thresholds), 2 * k)
+            keep = clean[block + rows]
+            rows, cols = rows[keep], cols[keep]
+            motif_hits.append(group.indices[cols % k])
+            starts.append(rows + block)
+            reverse.append(cols >= k)
+            scores.append(block_scores[rows, cols])
+    if not starts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=bool), np.empty(0)
+    return np.concatenate(motif_hits), np.concatenate(starts), np.concatenate(reverse), np.concatenate(scores)
+
+
+def _scan_units(units: list[tuple[int, int, str]], groups: list[_MotifGroup]) -> list[tuple]:
+    """Score work units ``(sequence index, offset, chunk)``; runs in pool workers."""
+    return [(seq_index, offset, _scan_unit(chunk, groups)) for seq_index, offset, chunk in units]
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by scans (recreated if the requested size changes, shut down at exit).
+
+    Workers are forked from the execution backend's preloaded forkserver
+    (:func:`biomni.execution.get_worker_context`).
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            else:
+                atexit.register(shutdown_pool)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_worker_context())
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes of the shared scan pool (a later scan starts a new one)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
+
+
+def _work_units(sequences: list[str], max_length: int) -> list[tuple[int, int, str]]:
+    """Chunks of :data:`CHUNK_BASES` window starts, overlapping by the longest motif minus one."""
+    return [
+        (seq_index, offset, sequence[offset : offset + CHUNK_BASES + max_length - 1])
+        for seq_index, sequence in enumerate(sequences)
+        for offset in range(0, len(sequence), CHUNK_BASES)
+    ]
+
+
+def scan_sequences(
+    sequences: dict[str, str],
+    motifs: list[Motif],
+    threshold: float = 0.8,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """Binding sites of every motif in every sequence, on both strands.
+
+    Args:
+        sequences: Upper-case DNA sequences by ID
+        motifs: Motifs to scan for
+        threshold: Minimum relative score, ``(score - min) / (max - min)`` of the motif (0.0-1.0)
+        workers: Processes for large batches (default: the number of CPUs; 1 scans in this process)
+
+    Returns:
+        One row per site with the columns of :data:`COLUMNS`: ``start`` and ``end`` (0-based,
+        end exclusive) are forward-strand coordinates, and ``site`` is the bound sequence read on the
+        motif's strand (reverse complemented for ``-``). Rows are ordered by sequence, start, motif
+        and strand.
+
+    """
+    if not motifs or not sequences:
+        return pd.DataFrame(columns=COLUMNS)
+    ids, seqs = list(sequences), list(sequences.values())
+    groups = _group_motifs(motifs, threshold)
+    units = _work_units(seqs, max(len(motif) for motif in motifs))
+    if not units:
+        return pd.DataFrame(columns=COLUMNS)
+
+    workers = workers or os.cpu_count() or 1
+    work = sum(len(chunk) for _, _, chunk in units) * len(motifs)
+    if workers > 1 and len(units) > 1 and work >= PARALLEL_MIN_WORK:
+        # Interleave units so that each task gets a similar share of long and short chunks
+        tasks = [units[i :: workers * 4] for i in range(min(len(units), workers * 4))]
+        results = [hit for part in _get_pool(workers).map(_scan_units, tasks, [groups] * len(tasks)) for hit in part]
+    else:
+        results = _scan_units(units, groups)
+
+    seq_index = np.concatenate([np.full(len(found[1]), i, dtype=np.int64) for i, _, found in results])
+    motif_index = np.concatenate([found[0] for _, _, found in results])
+    start = np.concatenate([found[1] + offset for _, offset, found in results])
+    reverse = np.concatenate([found[2] for _, _, found in results])
+    score = np.concatenate([found[3] for _, _, found in results]).astype(np.float64)
+    order = np.lexsort((reverse, motif_index, start, seq_index))
+    seq_index, motif_index, start, reverse, score = (
+        column[order] for column in (seq_index, motif_index, start, reverse, score)
+    )
+
+    lengths = np.array([len(motif) for motif in motifs])
+    min_scores = np.array([motif.min_score for motif in motifs])
+    max_scores = np.array([motif.max_score for motif in motifs])
+    end = start + lengths[motif_index]
+    sites = [seqs[i][s:e] for i, s, e in zip(seq_index.tolist(), start.tolist(), end.tolist(), strict=True)]
+    sites = [
+        site.translate(_COMPLEMENT)[::-1] if rev else site for site, rev in zip(sites, reverse.tolist(), strict=True)
+    ]
+    return pd.DataFrame(
+        {
+            "sequence_id": np.array(ids, dtype=object)[seq_index],
+            "tf_name": np.array([motif.name for motif in motifs], dtype=object)[motif_index],
+            "matrix_id": np.array([motif.matrix_id for motif in motifs], dtype=object)[motif_index],
+            "start": start,
+            "end": end,
+            "strand": np.where(reverse, "-", "+"),
+            "score": score,
+            "relative_score": (score - min_scores[motif_index]) / (max_scores[motif_index] - min_scores[motif_index]),
+            "site": sites,
+        },
+        columns=COLUMNS,
+    )
+
+
+def load_sequences(sequences, genome_fasta: str | None = None) -> tuple[dict[str, str], dict[str, tuple[str, int]]]:
+    """Upper-case sequences by ID from the inputs accepted by the batch binding site tool.
+
+    Args:
+        sequences: A DNA sequence, a list of sequences (IDs ``seq1``, ``seq2``, ...), a dict of
+            sequences by ID, or the path of a FASTA file or of a BED file of regions
+        genome_fasta: FASTA file of the genome the BED regions refer to
+
+    Returns:
+        The sequences by ID, and for BED regions, ``(chromosome, region start)`` by ID (BED names, or
+        ``chrom:start-end`` for regions without a name; a name given to several regions becomes
+        ``name:chrom:start-end`` for each of them)
+
+    Raises:
+        ValueError: If a BED region is listed twice under the same name
+
+    """
+    regions: dict[str, tuple[str, int]] = {}
+    if isinstance(sequences, dict):
+        return {str(key): str(value).upper() for key, value in sequences.items()}, regions
+    if isinstance(sequences, (list, tuple)):
+        return {f"seq{i + 1}": str(value).upper() for i, value in enumerate(sequences)}, regions
+    if not (len(sequences) < 4096 and os.path.isfile(sequences)):
+        return {"seq1": sequences.upper()}, regions
+
+    if not sequences.lower().endswith(".bed"):
+        with open(sequences) as handle:
+            return {record.id: str(record.seq).upper() for record in SeqIO.parse(handle, "fasta")}, regions
+
+    if genome_fasta is None:
+        raise ValueError("genome_fasta is required to read the sequences of BED regions")
+    bed_regions = []
+    with open(sequences) as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if not line.strip() or line.startswith(("#", "track", "browser")):
+                continue
+            chrom, start, end = fields[0], int(fields[1]), int(fields[2])
+            region_id = fields[3] if len(fields) > 3 and fields[3] not in ("", ".") else f"{chrom}:{start}-{end}"
+            bed_regions.append((region_id, chrom, start, end))
+    name_counts = Counter(region_id for region_id, *_ in bed_regions)
+    by_chrom: dict[str, list[tuple[str, int, int]]] = {}
+    for region_id, chrom, start, end in bed_regions:
+        if name_counts[region_id] > 1:
+            region_id = f"{region_id}:{chrom}:{start}-{end}"
+        if region_id in regions:
+            raise ValueError(f"BED region {region_id} is listed more than once in {sequences}")
+        by_chrom.setdefault(chrom, []).append((region_id, start, end))
+        regions[region_id] = (chrom, start)
+
+    # Each chromosome is read once, then sliced for all of its regions
+    extracted = {}
+    genome = SeqIO.index(genome_fasta, "fasta")
+    try:
+        for chrom, chrom_regions in by_chrom.items():
+            if chrom not in genome:
+                raise ValueError(f"Chromosome {chrom} of the BED file is not in {genome_fasta}")
+            chrom_seq = str(genome[chrom].seq)
+            for region_id, start, end in chrom_regions:
+                extracted[region_id] = chrom_seq[start:end].upper()
+    finally:
+        genome.close()
+    return {region_id: extracted[region_id] for region_id in regions}, regions
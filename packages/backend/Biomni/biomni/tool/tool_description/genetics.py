@@ -257,6 +257,56 @@ description = [
             },
         ],
     },
+    {
+        "description": "Identify binding sites of many transcription factors in many DNA sequences or genomic "
+        "regions at once, using cached JASPAR matrices and vectorized PSSM scanning on both strands. Returns a "
+        "pandas DataFrame with one row per site (sequence_id, tf_name, matrix_id, start, end, strand, score, "
+        "relative_score, site).",
+        "name": "identify_transcription_factor_binding_sites_batch",
+        "optional_parameters": [
+            {
+                "default": 0.8,
+                "description": "Minimum relative score, (score - min) / (max - min) of the matrix, of reported sites "
+                "(0.0-1.0)",
+                "name": "threshold",
+                "type": "float",
+            },
+            {
+                "default": None,
+                "description": "FASTA file of the genome, required when sequences is a BED file",
+                "name": "genome_fasta",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "Path to save the table (.csv, .parquet, otherwise tab-separated)",
+                "name": "output_file",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "Processes used for large batches (default: the number of CPUs)",
+                "name": "workers",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "A DNA sequence, a list of sequences, a dict of sequences by ID, or the path of a "
+                "FASTA file or a BED file of regions",
+                "name": "sequences",
+                "type": "str | list | dict",
+            },
+            {
+                "default": None,
+                "description": "Transcription factor names (e.g., ['GATA1', 'TAL1']) or JASPAR matrix IDs "
+                "(e.g., 'MA0035.4')",
+                "name": "tf_names",
+                "type": "list",
+            },
+        ],
+    },
     {
         "description": "Fit a linear mixed model for genomic prediction using genotype and phenotype data.",
         "name": "fit_genomic_prediction_model",
@@ -282,6 +332,27 @@ description = [
                 "name": "output_file",
                 "type": "str",
             },
+            {
+                "default": "eigen",
+                "description": '"eigen": REML on one eigendecomposition of G shared by all traits (scales to '
+                'thousands of individuals); "dense": iterative updates inverting V on every iteration. The '
+                "additive-dominance model always uses dense.",
+                "name": "engine",
+                "type": "str",
+            },
+            {
+                "default": 4096,
+                "description": "Markers processed at a time when building the relationship matrices.",
+                "name": "chunk_markers",
+                "type": "int",
+            },
+            {
+                "default": False,
+                "description": "Report the peak traced memory of the fit (for benchmarks; slows every allocation "
+                "of the process while it runs).",
+                "name": "profile_memory",
+                "type": "bool",
+            },
         ],
         "required_parameters": [
             {
@@ -291,9 +362,10 @@ description = [
                 "columns. Values are typically coded "
                 "as 0, 1, 2 for additive models or "
                 "with specific encoding for "
-                "dominance effects.",
+                "dominance effects. A path to an int8 .npy "
+                "file is memory-mapped and read in blocks.",
                 "name": "genotypes",
-                "type": "numpy.ndarray",
+                "type": "numpy.ndarray | str",
             },
             {
                 "default": None,
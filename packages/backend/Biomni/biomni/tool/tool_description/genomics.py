@@ -24,6 +24,25 @@ description = [
                 "name": "composition",
                 "type": "pd.DataFrame",
             },
+            {
+                "default": 8,
+                "description": "Maximum number of clusters annotated by the LLM at the same time",
+                "name": "max_concurrency",
+                "type": "int",
+            },
+            {
+                "default": 5,
+                "description": 'LLM attempts per cluster before it is labelled "Unknown"',
+                "name": "max_attempts",
+                "type": "int",
+            },
+            {
+                "default": 60,
+                "description": "Cell ontology terms listed in each cluster's prompt, ranked by marker gene relevance "
+                "(0 lists the whole vocabulary)",
+                "name": "max_candidates",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -609,9 +628,10 @@ description = [
         "computes embeddings for each isoform using the specified ESM model and layer, then averages "
         "the embeddings across all isoforms to create a single representative embedding per gene. "
         "The embeddings are saved as PyTorch tensors for future use. "
-        "Memory-friendly implementation with rolling averages, small batch processing, and automatic memory "
-        "management. Automatically handles GPU/CPU device selection and includes error recovery for out-of-memory "
-        "situations by falling back to single-sequence processing.",
+        "The model stays loaded between calls, isoforms are fetched concurrently, sequences are batched by length "
+        "under a token budget, and every isoform embedding is cached on disk so previously seen genes are not "
+        "recomputed. Reports throughput in sequences/sec. Automatically handles GPU/CPU device selection and "
+        "includes error recovery for out-of-memory situations by splitting batches.",
         "name": "generate_gene_embeddings_with_ESM_models",
         "optional_parameters": [
             {
@@ -633,8 +653,8 @@ description = [
                 "type": "str",
             },
             {
-                "default": 1,
-                "description": "Number of sequences to process at once to manage memory usage",
+                "default": None,
+                "description": "Maximum number of sequences per batch; None packs batches by token budget only",
                 "name": "batch_size",
                 "type": "int",
             },
@@ -644,6 +664,18 @@ description = [
                 "name": "max_sequence_length",
                 "type": "int",
             },
+            {
+                "default": None,
+                "description": "Padded tokens per batch to manage memory usage; None uses the configured default",
+                "name": "max_tokens_per_batch",
+                "type": "int",
+            },
+            {
+                "default": 8,
+                "description": "Number of concurrent isoform sequence requests to Ensembl",
+                "name": "fetch_workers",
+                "type": "int",
+            },
         ],
         "required_parameters": [
             {
@@ -1,8 +1,7 @@
 description = [
     {
-        "description": "Find all Open Reading Frames (ORFs) in a DNA sequence using "
-        "Biopython, searching both forward and reverse complement "
-        "strands.",
+        "description": "Find all Open Reading Frames (ORFs) in a DNA sequence or FASTA file, "
+        "searching both forward and reverse complement strands with a vectorized codon scanner.",
         "name": "annotate_open_reading_frames",
         "optional_parameters": [
             {
@@ -17,11 +16,19 @@ description = [
                 "name": "filter_subsets",
                 "type": "bool",
             },
+            {
+                "default": None,
+                "description": "For FASTA file input, TSV file receiving the ORFs of every record "
+                "(default: '<fasta name>_orfs.tsv' next to the input)",
+                "name": "output_file",
+                "type": "str",
+            },
         ],
         "required_parameters": [
             {
                 "default": None,
-                "description": "DNA sequence to analyze",
+                "description": "DNA sequence to analyze, or path to a (multi-record) FASTA file, "
+                "which is streamed one record at a time for genome-scale inputs",
                 "name": "sequence",
                 "type": "str",
             },
@@ -108,7 +115,8 @@ description = [
     {
         "description": "Align short sequences (primers) to a longer sequence, "
         "allowing for one mismatch. Checks both forward and reverse "
-        "complement strands.",
+        "complement strands. Uses a k-mer seed index of the target that is reused across calls, "
+        "so large primer batches against whole plasmids or bacterial genomes run in seconds.",
         "name": "align_sequences",
         "optional_parameters": [],
         "required_parameters": [
@@ -0,0 +1,116 @@
+"""Precompiled index of the tool schemas in ``biomni.tool.tool_description``.
+
+``read_module2api`` used to import all description modules on every agent construction.
+The schemas are now pickled once into an index file together with a fingerprint of the
+description sources (file sizes and mtimes), and later loads only unpickle that file. A
+changed description file changes the fingerprint and rebuilds the index.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from importlib import import_module
+
+TOOL_MODULES = (
+    "literature",
+    "biochemistry",
+    "bioimaging",
+    "bioengineering",
+    "biophysics",
+    "glycoengineering",
+    "cancer_biology",
+    "cell_biology",
+    "molecular_biology",
+    "genetics",
+    "genomics",
+    "immunology",
+    "microbiology",
+    "pathology",
+    "pharmacology",
+    "physiology",
+    "synthetic_biology",
+    "systems_biology",
+    "support_tools",
+    "database",
+)
+
+_INDEX_FORMAT = 1
+_DESCRIPTION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_description")
+
+# Pickled module2api per index path, so later agents in the same process skip the disk read
+_loaded: dict[str, tuple[str, bytes]] = {}
+_lock = threading.Lock()
+
+
+def description_fingerprint() -> str:
+    """Hash of the description sources' names, sizes and mtimes (no imports needed)."""
+    digest = hashlib.sha256(f"format={_INDEX_FORMAT}".encode())
+    for field in TOOL_MODULES:
+        path = os.path.join(_DESCRIPTION_DIR, f"{field}.py")
+        try:
+            stat = os.stat(path)
+            digest.update(f"{field}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        except OSError:
+            digest.update(f"{field}:missing\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def build_module2api() -> dict[str, list[dict]]:
+    """Import every description module and collect the schemas by tool module name."""
+    module2api = {}
+    for field in TOOL_MODULES:
+        module = import_module(f"biomni.tool.tool_description.{field}")
+        module2api[f"biomni.tool.{field}"] = module.description
+    return module2api
+
+
+def load_module2api(index_path: str | None = None) -> dict[str, list[dict]]:
+    """Tool schemas by module, served from the precompiled index when it is current.
+
+    Args:
+        index_path: Index file to read and (re)write; None keeps the index in memory only
+
+    Returns:
+        A fresh copy of the schemas, safe for the caller to modify
+
+    """
+    fingerprint = description_fingerprint()
+    key = index_path or ""
+    with _lock:
+        cached = _loaded.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return pickle.loads(cached[1])
+
+    data = None
+    if index_path and os.path.exists(index_path):
+        try:
+            with open(index_path, "rb") as f:
+                stored = pickle.load(f)
+            if stored.get("fingerprint") == fingerprint:
+                data = pickle.dumps(stored["module2api"], protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Ignoring unreadable tool index {index_path}: {e}")
+
+    if data is None:
+        module2api = build_module2api()
+        data = pickle.dumps(module2api, protocol=pickle.HIGHEST_PROTOCOL)
+        if index_path:
+            _write_index(index_path, fingerprint, module2api)
+
+    with _lock:
+        _loaded[key] = (fingerprint, data)
+    return pickle.loads(data)
+
+
+def _write_index(index_path: str, fingerprint: str, module2api: dict) -> None:
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"fingerprint": fingerprint, "module2api": module2api}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"Could not write tool index {index_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
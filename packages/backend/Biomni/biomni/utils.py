@@ -804,6 +804,38 @@ def parse_hpo_obo(file_path):
     return hp_dict
 
 
+def textify_api_method(method):
+    """Format a single API method description as it appears in the system prompt."""
+    lines = []
+    lines.append(f"Method: {method.get('name', 'N/A')}")
+    lines.append(f"  Description: {method.get('description', 'No description provided.')}")
+
+    # Process required parameters
+    req_params = method.get("required_parameters", [])
+    if req_params:
+        lines.append("  Required Parameters:")
+        for param in req_params:
+            param_name = param.get("name", "N/A")
+            param_type = param.get("type", "N/A")
+            param_desc = param.get("description", "No description")
+            param_default = param.get("default", "None")
+            lines.append(f"    - {param_name} ({param_type}): {param_desc} [Default: {param_default}]")
+
+    # Process optional parameters
+    opt_params = method.get("optional_parameters", [])
+    if opt_params:
+        lines.append("  Optional Parameters:")
+        for param in opt_params:
+            param_name = param.get("name", "N/A")
+            param_type = param.get("type", "N/A")
+            param_desc = param.get("description", "No description")
+            param_default = param.get("default", "None")
+            lines.append(f"    - {param_name} ({param_type}): {param_desc} [Default: {param_default}]")
+
+    lines.append("")  # Empty line between methods
+    return "\n".join(lines)
+
+
 def textify_api_dict(api_dict):
     """Convert a nested API dictionary to a nicely formatted string."""
     lines = []
@@ -811,67 +843,22 @@ def textify_api_dict(api_dict):
         lines.append(f"Import file: {category}")
         lines.append("=" * (len("Import file: ") + len(category)))
         for method in methods:
-            lines.append(f"Method: {method.get('name', 'N/A')}")
-            lines.append(f"  Description: {method.get('description', 'No description provided.')}")
-
-            # Process required parameters
-            req_params = method.get("required_parameters", [])
-            if req_params:
-                lines.append("  Required Parameters:")
-                for param in req_params:
-                    param_name = param.get("name", "N/A")
-                    param_type = param.get("type", "N/A")
-                    param_desc = param.get("description", "No description")
-                    param_default = param.get("default", "None")
-                    lines.append(f"    - {param_name} ({param_type}): {param_desc} [Default: {param_default}]")
-
-            # Process optional parameters
-            opt_params = method.get("optional_parameters", [])
-            if opt_params:
-                lines.append("  Optional Parameters:")
-                for param in opt_params:
-                    param_name = param.get("name", "N/A")
-                    param_type = param.get("type", "N/A")
-                    param_desc = param.get("description", "No description")
-                    param_default = param.get("default", "None")
-                    lines.append(f"    - {param_name} ({param_type}): {param_desc} [Default: {param_default}]")
-
-            lines.append("")  # Empty line between methods
+            lines.append(textify_api_method(method))
         lines.append("")  # Extra empty line after each category
 
     return "\n".join(lines)
 
 
-def read_module2api():
-    fields = [
-        "literature",
-        "biochemistry",
-        "bioimaging",
-        "bioengineering",
-        "biophysics",
-        "glycoengineering",
-        "cancer_biology",
-        "cell_biology",
-        "molecular_biology",
-        "genetics",
-        "genomics",
-        "immunology",
-        "microbiology",
-        "pathology",
-        "pharmacology",
-        "physiology",
-        "synthetic_biology",
-        "systems_biology",
-        "support_tools",
-        "database",
-    ]
+def read_module2api(index_path: str | None = None):
+    """Tool schemas by module name (``biomni.tool.<field>`` -> list of API dicts).
 
-    module2api = {}
-    for field in fields:
-        module_name = f"biomni.tool.tool_description.{field}"
-        module = importlib.import_module(module_name)
-        module2api[f"biomni.tool.{field}"] = module.description
-    return module2api
+    Args:
+        index_path: Optional precompiled index file; see :mod:`biomni.tool.tool_index`
+
+    """
+    from biomni.tool.tool_index import load_module2api
+
+    return load_module2api(index_path)
 
 
 def download_and_unzip(url: str, dest_dir: str) -> str:
@@ -917,102 +904,91 @@ def download_and_unzip(url: str, dest_dir: str) -> str:
 
 
 def check_and_download_s3_files(
-    s3_bucket_url: str, local_data_lake_path: str, expected_files: list[str], folder: str = "data_lake"
+    s3_bucket_url: str,
+    local_data_lake_path: str,
+    expected_files: list[str],
+    folder: str = "data_lake",
+    max_workers: int | None = None,
 ) -> dict[str, bool]:
     """Check for missing files in the local data lake and download them from S3 bucket.
 
+    Missing files are downloaded concurrently, resumed from ``.part`` files after an interruption,
+    verified against ``<bucket>/<folder>/manifest.json`` when the bucket publishes one (otherwise
+    against ``Content-Length``) and renamed into place only when complete.
+
     Args:
-        s3_bucket_url: Base URL of the S3 bucket (e.g., "https://biomni-release.s3.amazonaws.com")
+        s3_bucket_url: Base URL of the S3 bucket (e.g., "https://biomni-release.s3.amazonaws.com"),
+            or of a local HTTP server laid out the same way
         local_data_lake_path: Local path to the data lake directory
         expected_files: List of expected file names in the data lake
         folder: S3 folder name ("data_lake" or "benchmark")
+        max_workers: Concurrent downloads (default: ``default_config.download_workers``)
 
     Returns:
         Dictionary mapping file names to download success status
     """
+    from biomni.downloader import DownloadError, DownloadTask, download_file, download_files, fetch_manifest
 
     os.makedirs(local_data_lake_path, exist_ok=True)
-    download_results = {}
+    if max_workers is None:
+        from biomni.config import default_config
 
-    def download_with_progress(url: str, file_path: str, desc: str) -> bool:
-        """Download file with progress bar."""
-        try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get("content-length", 0))
-
-            with open(file_path, "wb") as f:
-                if total_size > 0:
-                    with tqdm.tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, ncols=80) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-            return True
-        except Exception as e:
-            print(f"✗ Failed to download {desc}: {e}")
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except OSError:
-                    pass
-            return False
-
-    def cleanup_file(file_path: str):
-        """Clean up file if it exists."""
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except OSError:
-                pass
+        max_workers = default_config.download_workers
 
     # Handle benchmark folder (download as zip)
     if folder == "benchmark":
         print(f"Downloading entire {folder} folder structure...")
         s3_zip_url = urljoin(s3_bucket_url + "/", folder + ".zip")
+        # Keep the zip next to the destination so an interrupted download resumes from its .part file
+        zip_path = os.path.join(local_data_lake_path, f".{folder}.zip")
 
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp_zip:
-            tmp_zip_path = tmp_zip.name
-
-            if download_with_progress(s3_zip_url, tmp_zip_path, f"{folder}.zip"):
-                print(f"Extracting {folder}.zip...")
-                try:
-                    with zipfile.ZipFile(tmp_zip_path, "r") as zip_ref:
-                        zip_ref.extractall(local_data_lake_path)
-                    print(f"✓ Successfully downloaded and extracted {folder} folder")
-                    download_results = dict.fromkeys(expected_files, True)
-                except Exception as e:
-                    print(f"✗ Error extracting {folder}.zip: {e}")
-                    download_results = dict.fromkeys(expected_files, False)
-                finally:
-                    cleanup_file(tmp_zip_path)
-            else:
-                download_results = dict.fromkeys(expected_files, False)
+        try:
+            download_file(DownloadTask(url=s3_zip_url, path=zip_path))
+        except DownloadError as e:
+            print(f"✗ {e}")
+            return dict.fromkeys(expected_files, False)
 
-        return download_results
+        print(f"Extracting {folder}.zip...")
+        try:
+            with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                zip_ref.extractall(local_data_lake_path)
+            print(f"✓ Successfully downloaded and extracted {folder} folder")
+            return dict.fromkeys(expected_files, True)
+        except Exception as e:
+            print(f"✗ Error extracting {folder}.zip: {e}")
+            return dict.fromkeys(expected_files, False)
+        finally:
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
 
     # Handle data_lake folder (download individual files)
+    download_results = {}
+    missing = []
     for filename in expected_files:
-        local_file_path = os.path.join(local_data_lake_path, filename)
-
-        if os.path.exists(local_file_path):
-            download_results[filename] = True
-            continue
-
-        s3_file_url = urljoin(s3_bucket_url + "/" + folder + "/", filename)
-        print(f"Downloading {filename} from {folder}...")
-
-        if download_with_progress(s3_file_url, local_file_path, filename):
-            print(f"✓ Successfully downloaded: {filename}")
+        if os.path.exists(os.path.join(local_data_lake_path, filename)):
             download_results[filename] = True
         else:
-            download_results[filename] = False
+            missing.append(filename)
+    if not missing:
+        return download_results
 
+    folder_url = s3_bucket_url.rstrip("/") + "/" + folder
+    manifest = fetch_manifest(folder_url)
+    tasks = [
+        DownloadTask(
+            url=urljoin(folder_url + "/", filename),
+            path=os.path.join(local_data_lake_path, filename),
+            size=manifest.get(filename, {}).get("size"),
+            sha256=manifest.get(filename, {}).get("sha256"),
+        )
+        for filename in missing
+    ]
+    print(f"Downloading {len(tasks)} files from {folder} ({max_workers} parallel)...")
+    results = download_files(tasks, max_workers=max_workers, desc=folder)
+    for filename, task in zip(missing, tasks, strict=True):
+        download_results[filename] = results.get(task.path, False)
+    succeeded = sum(download_results[filename] for filename in missing)
+    print(f"✓ Downloaded {succeeded}/{len(missing)} files")
     return download_results
 
 
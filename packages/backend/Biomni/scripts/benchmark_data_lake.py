@@ -0,0 +1,146 @@
+"""Benchmark per-call latency of data lake reads: pandas re-reads vs. the columnar DataLakeStore.
+
+Three access patterns from the tools are measured:
+
+- sgRNA library lookup (``design_knockout_sgrna``): TSV, filter on ``Target Gene Symbol``
+- cell type vocabulary (``annotate_celltype_scRNA``): one column of ``czi_census_datasets_v4.parquet``
+- HPO names (``get_hpo_names``): parse ``hp.obo``
+
+"before" repeats what the tools did (read the whole file with pandas / parse on every call); "after"
+goes through a fresh DataLakeStore, so the first call includes the one-time Arrow conversion and is
+reported separately from the warm calls. Without --data-lake, synthetic files of realistic size are
+generated in a temporary directory.
+
+    python scripts/benchmark_data_lake.py
+    python scripts/benchmark_data_lake.py --data-lake ./data/biomni_data/data_lake --calls 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+
+import pandas as pd
+from biomni.data_lake import DataLakeStore
+from biomni.utils import parse_hpo_obo
+
+
+def make_synthetic_data_lake(directory: str, genes: int, guides_per_gene: int, cell_rows: int, hpo_terms: int):
+    rng = random.Random(0)
+    symbols = [f"G{i:05d}" for i in range(genes)]
+    rows = []
+    for symbol in symbols:
+        for rank in range(1, guides_per_gene + 1):
+            sequence = "".join(rng.choice("ACGT") for _ in range(20))
+            rows.append((symbol, sequence, rank, rng.random(), f"chr{rng.randint(1, 22)}"))
+    pd.DataFrame(
+        rows, columns=["Target Gene Symbol", "sgRNA Sequence", "Combined Rank", "On-Target Efficacy", "Chromosome"]
+    ).to_csv(os.path.join(directory, "sgRNA_KO_SP_human.txt"), sep="\t", index=False)
+
+    cell_types = ["".join(rng.choice(string.ascii_lowercase) for _ in range(10)) + " cell" for _ in range(600)]
+    pd.DataFrame(
+        {
+            "dataset_id": [f"ds{i}" for i in range(cell_rows)],
+            "cell_type": [";".join(rng.sample(cell_types, 5)) for _ in range(cell_rows)],
+            "tissue": [rng.choice(["blood", "lung", "brain", "liver"]) for _ in range(cell_rows)],
+            "description": ["x" * 200 for _ in range(cell_rows)],
+        }
+    ).to_parquet(os.path.join(directory, "czi_census_datasets_v4.parquet"))
+
+    with open(os.path.join(directory, "hp.obo"), "w") as f:
+        f.write("format-version: 1.2\n\n")
+        for i in range(hpo_terms):
+            f.write(f'[Term]\nid: HP:{i:07d}\nname: Phenotype {i}\ndef: "Synthetic term" []\nis_a: HP:0000001\n\n')
+    return symbols
+
+
+def timed(fn, calls: int) -> tuple[float, float]:
+    """(first call ms, median of the remaining calls ms)."""
+    durations = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations[0], statistics.median(durations[1:]) if len(durations) > 1 else durations[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data lake reads with pandas vs. DataLakeStore.")
+    parser.add_argument("--data-lake", help="Existing data lake directory (default: synthetic data).")
+    parser.add_argument("--calls", type=int, default=10, help="Calls per pattern.")
+    parser.add_argument("--genes", type=int, default=20000, help="Synthetic sgRNA library genes.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.data_lake:
+            data_lake = args.data_lake
+            library_path = os.path.join(data_lake, "sgRNA_KO_SP_human.txt")
+            symbols = []
+            if os.path.exists(library_path):
+                library = pd.read_csv(library_path, sep="\t", usecols=["Target Gene Symbol"])
+                symbols = library["Target Gene Symbol"].dropna().unique().tolist()
+        else:
+            data_lake = tmp
+            print("Generating synthetic data lake...")
+            symbols = make_synthetic_data_lake(tmp, args.genes, 4, 2000, 18000)
+
+        rng = random.Random(1)
+        sgrna_path = os.path.join(data_lake, "sgRNA_KO_SP_human.txt")
+        czi_path = os.path.join(data_lake, "czi_census_datasets_v4.parquet")
+        hpo_path = os.path.join(data_lake, "hp.obo")
+
+        def sgrna_before():
+            df = pd.read_csv(sgrna_path, delimiter="\t")
+            gene = rng.choice(symbols).upper()
+            return df[df["Target Gene Symbol"].str.upper() == gene].sort_values(by=["Combined Rank"])
+
+        def czi_before():
+            df = pd.read_parquet(czi_path)
+            return {c.strip() for cell_types in df["cell_type"] for c in str(cell_types).split(";")}
+
+        def hpo_before():
+            return parse_hpo_obo(hpo_path)
+
+        store = DataLakeStore(cache_dir=os.path.join(tmp, "arrow_cache"))
+
+        def sgrna_after():
+            gene = rng.choice(symbols).upper()
+            df = store.query(
+                sgrna_path,
+                columns=["Target Gene Symbol", "Combined Rank", "sgRNA Sequence"],
+                filters=[("Target Gene Symbol", "iequals", gene)],
+            )
+            return df.sort_values(by=["Combined Rank"])
+
+        def czi_after():
+            df = store.query(czi_path, columns=["cell_type"])
+            return {c.strip() for cell_types in df["cell_type"] for c in str(cell_types).split(";")}
+
+        def hpo_after():
+            return store.get_object(hpo_path, parse_hpo_obo)
+
+        patterns = [
+            ("sgRNA lookup (TSV + filter)", sgrna_path, sgrna_before, sgrna_after),
+            ("cell types (parquet column)", czi_path, czi_before, czi_after),
+            ("HPO names (obo parse)", hpo_path, hpo_before, hpo_after),
+        ]
+
+        print(f"\n{'pattern':<30} {'before ms':>10} {'after 1st':>10} {'after warm':>11} {'speedup':>8}")
+        print("-" * 74)
+        for name, path, before, after in patterns:
+            if not os.path.exists(path):
+                print(f"{name:<30} skipped (file missing)")
+                continue
+            _, before_ms = timed(before, args.calls)
+            first_ms, warm_ms = timed(after, args.calls)
+            speedup = before_ms / max(warm_ms, 1e-6)
+            print(f"{name:<30} {before_ms:10.2f} {first_ms:10.2f} {warm_ms:11.3f} {speedup:7.0f}x")
+
+        print(f"\nStore: {store.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
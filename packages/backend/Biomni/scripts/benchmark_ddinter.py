@@ -0,0 +1,188 @@
+"""Benchmark pairwise interaction checks of 20-drug regimens: compiled DDInter store against pickled dicts.
+
+Synthetic DDInter-shaped CSV files (``--drugs`` drugs, ``--rows`` interaction rows over the eight
+category files, salt forms such as "X Sodium" sharing a standardized name) are written to a
+temporary data lake. ``--regimens`` regimens of ``--size`` drugs, ``--typos`` of them misspelled,
+are then checked pair by pair with:
+
+- the previous approach: the drug registry, interaction matrix and name mapping unpickled on every
+  call, names resolved with ``difflib.get_close_matches`` over every name, dict lookups per pair
+- the compiled store (``biomni.tool.ddinter_store``): loaded once per process, trigram name
+  resolution, binary search in the CSR adjacency per pair
+
+Severity counts of both are compared for every regimen. No DDInter download is needed.
+
+    python scripts/benchmark_ddinter.py
+    python scripts/benchmark_ddinter.py --drugs 5000 --rows 100000 --regimens 100 --size 30
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from collections import Counter, defaultdict
+from difflib import get_close_matches
+
+import numpy as np
+import pandas as pd
+from biomni.tool.ddinter_store import CSV_FILES, compile_store, get_ddinter_store, standardize_name
+
+LEVELS = ["Major", "Moderate", "Minor", "Unknown"]
+SYLLABLES = ["ba", "co", "de", "fi", "lo", "mu", "pra", "zol", "tin", "vir", "xa", "mab", "nib", "pril", "sar"]
+SALTS = [" Hydrochloride", " Sodium", " Sulfate", " Potassium"]
+
+
+def write_data_lake(directory: str, drugs: int, rows: int, rng: np.random.Generator) -> list[str]:
+    """DDInter-shaped CSV files in ``directory``; returns the drug names."""
+    names = set()
+    while len(names) < drugs:
+        names.add("".join(rng.choice(SYLLABLES, size=rng.integers(3, 7))).capitalize())
+    names = sorted(names)
+    # Every tenth drug is a salt form of the previous one
+    names = [names[i - 1] + SALTS[i % len(SALTS)] if i % 10 == 9 else name for i, name in enumerate(names)]
+    ids = np.array([f"DDInter{i + 1}" for i in range(drugs)])
+    names = np.array(names)
+    for csv_file in CSV_FILES:
+        members = rng.choice(drugs, size=drugs // 3, replace=False)
+        a = rng.choice(members, size=rows // len(CSV_FILES))
+        b = rng.choice(drugs, size=len(a))
+        pd.DataFrame(
+            {
+                "DDInterID_A": ids[a],
+                "Drug_A": names[a],
+                "DDInterID_B": ids[b],
+                "Drug_B": names[b],
+                "Level": rng.choice(LEVELS, size=len(a), p=[0.1, 0.5, 0.3, 0.1]),
+            }
+        ).to_csv(os.path.join(directory, csv_file), index=False)
+    return names.tolist()
+
+
+def write_pickles(data_lake: str, directory: str) -> list[str]:
+    """The previous pickled registry, interaction matrix and name mapping, built from the CSV files."""
+    frames = []
+    for csv_file in CSV_FILES:
+        df = pd.read_csv(os.path.join(data_lake, csv_file))
+        df["category"] = csv_file.replace("ddinter_", "").replace(".csv", "")
+        frames.append(df)
+    rows = pd.concat(frames, ignore_index=True)
+
+    drug_info = {}
+    interaction_matrix = defaultdict(lambda: defaultdict(list))
+    for id_a, name_a, id_b, name_b, level, category in rows[
+        ["DDInterID_A", "Drug_A", "DDInterID_B", "Drug_B", "Level", "category"]
+    ].itertuples(index=False):
+        for drug_id, name, partner in ((id_a, name_a, id_b), (id_b, name_b, id_a)):
+            info = drug_info.setdefault(
+                drug_id,
+                {"name": name, "standardized_name": standardize_name(name), "categories": set(), "interactions": set()},
+            )
+            info["categories"].add(category)
+            info["interactions"].add(partner)
+        interaction = {"level": level, "category": category, "drug_a_id": id_a, "drug_b_id": id_b}
+        std_a, std_b = standardize_name(name_a), standardize_name(name_b)
+        interaction_matrix[std_a][std_b].append(interaction)
+        interaction_matrix[std_b][std_a].append(interaction)
+    name_mapping = {}
+    for drug_id, info in drug_info.items():
+        name_mapping[info["name"].lower()] = drug_id
+        name_mapping[info["standardized_name"]] = drug_id
+
+    interaction_matrix = {drug: dict(partners) for drug, partners in interaction_matrix.items()}
+    paths = [os.path.join(directory, f"ddinter_{name}.pkl") for name in ("drugs", "interactions", "name_mapping")]
+    for path, data in zip(paths, (drug_info, interaction_matrix, name_mapping), strict=True):
+        with open(path, "wb") as f:
+            pickle.dump(data, f)
+    return paths
+
+
+def check_pickled(regimen: list[str], paths: list[str]) -> Counter:
+    """Severity counts of all pairs, as the DDInter tools computed them before the compiled store
+    (with salt forms looked up by their standardized name, as the store does)."""
+    loaded = []
+    for path in paths:
+        with open(path, "rb") as f:
+            loaded.append(pickle.load(f))
+    drug_info, interaction_matrix, name_mapping = loaded
+    resolved = []
+    for drug in regimen:
+        if drug.lower() in name_mapping:
+            resolved.append(drug.lower())
+        else:
+            resolved.extend(get_close_matches(drug.lower(), name_mapping.keys(), n=1, cutoff=0.8))
+    # The matrix is keyed by standardized name ("x", not "x sodium")
+    resolved = [drug_info[name_mapping[name]]["standardized_name"] for name in resolved]
+    counts = Counter()
+    for i, drug_a in enumerate(resolved):
+        for drug_b in resolved[i + 1 :]:
+            for interaction in interaction_matrix.get(drug_a, {}).get(drug_b, []):
+                counts[interaction["level"]] += 1
+    return counts
+
+
+def check_store(regimen: list[str], data_lake: str, store_dir: str) -> Counter:
+    """Severity counts of all pairs through the compiled store."""
+    store = get_ddinter_store(data_lake, store_dir=store_dir)
+    resolved = [name for name in map(store.resolve, regimen) if name]
+    counts = Counter()
+    for i, drug_a in enumerate(resolved):
+        for drug_b in resolved[i + 1 :]:
+            for interaction in store.interactions(drug_a, drug_b):
+                counts[interaction["level"]] += 1
+    return counts
+
+
+def misspell(name: str, rng: np.random.Generator) -> str:
+    position = int(rng.integers(1, len(name) - 1))
+    return name[:position] + name[position + 1 :]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DDInter regimen checks: compiled store vs pickles.")
+    parser.add_argument("--drugs", type=int, default=2300)
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--regimens", type=int, default=20)
+    parser.add_argument("--size", type=int, default=20, help="Drugs per regimen.")
+    parser.add_argument("--typos", type=int, default=2, help="Misspelled drugs per regimen.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        names = write_data_lake(tmp, args.drugs, args.rows, rng)
+        regimens = []
+        for _ in range(args.regimens):
+            regimen = rng.choice(names, size=args.size, replace=False).tolist()
+            for i in range(args.typos):
+                regimen[i] = misspell(regimen[i], rng)
+            regimens.append(regimen)
+
+        start = time.perf_counter()
+        compile_store(tmp)
+        compile_seconds = time.perf_counter() - start
+        paths = write_pickles(tmp, tmp)
+
+        start = time.perf_counter()
+        expected = [check_pickled(regimen, paths) for regimen in regimens]
+        pickled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first = check_store(regimens[0], tmp, tmp)  # compiles and saves ddinter_store.npz
+        first_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        found = [check_store(regimen, tmp, tmp) for regimen in regimens]
+        stored = time.perf_counter() - start
+        assert first == expected[0] and found == expected, "severity counts differ"
+
+    pairs = args.regimens * args.size * (args.size - 1) // 2
+    print(f"{args.drugs} drugs, {args.rows} interaction rows; {args.regimens} regimens of {args.size} drugs")
+    print(f"store compile: {compile_seconds:.2f} s, first call (compile + save): {first_seconds:.2f} s\n")
+    print(f"{'approach':<26} {'seconds':>9} {'ms/regimen':>11} {'pairs/s':>11}")
+    print("-" * 60)
+    for label, seconds in (("pickled dicts per call", pickled), ("compiled store", stored)):
+        print(f"{label:<26} {seconds:9.2f} {1000 * seconds / args.regimens:11.2f} {pairs / seconds:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
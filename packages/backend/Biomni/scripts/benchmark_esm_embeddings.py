@@ -0,0 +1,110 @@
+"""Benchmark ESM embedding throughput (sequences/sec) of the batching and caching in esm_service.
+
+Random protein sequences with a protein-like length distribution (log-normal, median ~350 residues,
+capped at ``--max-length``) are embedded four ways with the same loaded model:
+
+- one sequence per forward pass (the previous ``batch_size=1`` behaviour)
+- fixed batches of ``--batch-size`` sequences in input order (padding to the longest of each batch)
+- ESMEmbeddingService: sorted by length, batches bounded by ``--max-tokens`` padded tokens
+  (default: the service's per-device budget)
+- the same sequences again, answered from the on-disk cache
+
+Pretrained weights are downloaded by fair-esm on first use; ``--random-weights`` builds the same
+architecture with random weights instead, which runs at the same speed (useful offline).
+
+    python scripts/benchmark_esm_embeddings.py
+    python scripts/benchmark_esm_embeddings.py --model esm2_t12_35M_UR50D --layer 12 --max-tokens 4096
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from biomni.tool.esm_service import ESMEmbeddingService
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+# (layers, embedding dim, attention heads) of the ESM-2 checkpoints
+ESM2_ARCHITECTURES = {
+    "esm2_t6_8M_UR50D": (6, 320, 20),
+    "esm2_t12_35M_UR50D": (12, 480, 20),
+    "esm2_t30_150M_UR50D": (30, 640, 20),
+    "esm2_t33_650M_UR50D": (33, 1280, 20),
+}
+
+
+def random_sequences(count: int, max_length: int, seed: int = 0) -> list[str]:
+    rng = np.random.default_rng(seed)
+    lengths = np.clip(rng.lognormal(mean=np.log(350), sigma=0.6, size=count), 30, max_length).astype(int)
+    return ["".join(rng.choice(list(AMINO_ACIDS), size=length)) for length in lengths]
+
+
+def random_weights_loader(model_name: str):
+    import esm
+    from esm.model.esm2 import ESM2
+
+    layers, dim, heads = ESM2_ARCHITECTURES[model_name]
+
+    def load(_name):
+        alphabet = esm.data.Alphabet.from_architecture("ESM-1b")
+        return ESM2(num_layers=layers, embed_dim=dim, attention_heads=heads, alphabet=alphabet), alphabet
+
+    return load
+
+
+def run_case(name: str, sequences: list[str], embed) -> None:
+    start = time.perf_counter()
+    embed()
+    seconds = time.perf_counter() - start
+    print(f"{name:<42} {seconds:9.2f} {len(sequences) / seconds:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ESM embedding throughput with batching and caching.")
+    parser.add_argument("--model", default="esm2_t6_8M_UR50D")
+    parser.add_argument("--layer", type=int, default=6)
+    parser.add_argument("--sequences", type=int, default=256)
+    parser.add_argument("--max-length", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=8, help="Batch size of the fixed-size case.")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Token budget of the sorted case.")
+    parser.add_argument("--random-weights", action="store_true", help="Skip the checkpoint download.")
+    args = parser.parse_args()
+
+    import esm
+    import torch
+
+    if args.random_weights:
+        esm.pretrained.load_model_and_alphabet = random_weights_loader(args.model)
+
+    sequences = random_sequences(args.sequences, args.max_length)
+    items = [(f"seq{i}", seq) for i, seq in enumerate(sequences)]
+    print(
+        f"{args.model} layer {args.layer}, {len(sequences)} sequences "
+        f"(median {int(np.median([len(s) for s in sequences]))} residues), torch threads {torch.get_num_threads()}\n"
+    )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = ESMEmbeddingService(args.model, args.layer, device="cpu", cache_dir=cache_dir)
+        service.load()
+        service._forward(items[:2])  # warm up
+
+        print(f"{'case':<42} {'seconds':>9} {'seq/s':>10}")
+        print("-" * 63)
+        run_case("one sequence per batch", sequences, lambda: [service._forward([item]) for item in items])
+        run_case(
+            f"batches of {args.batch_size} in input order",
+            sequences,
+            lambda: [service._forward(items[i : i + args.batch_size]) for i in range(0, len(items), args.batch_size)],
+        )
+        run_case(
+            f"sorted, {args.max_tokens or service.max_tokens_per_batch} tokens per batch",
+            sequences,
+            lambda: service.embed(sequences, max_tokens_per_batch=args.max_tokens),
+        )
+        run_case("repeat from the embedding cache", sequences, lambda: service.embed(sequences))
+        print(f"\nService: {service.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark fit_genomic_prediction_model: eigendecomposition REML engine against the dense engine.
+
+Simulated genotypes (0/1/2 int8, written to a ``.npy`` file that the tool memory-maps) and
+``--traits`` phenotypes with heritabilities from 0.2 to 0.8 are fitted for increasing numbers
+of individuals. For each size the table shows wall time, peak traced memory (from the tool's log)
+and the estimated heritability of the first trait. The dense engine (inverting V on every update)
+is only run up to ``--dense-max``.
+
+    python scripts/benchmark_gblup.py
+    python scripts/benchmark_gblup.py --sizes 1000 4000 8000 --markers 20000 --traits 5
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+
+import numpy as np
+from biomni.tool.genetics import fit_genomic_prediction_model
+
+
+def simulate(n: int, markers: int, traits: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    frequencies = rng.uniform(0.05, 0.5, size=markers)
+    genotypes = rng.binomial(2, frequencies, size=(n, markers)).astype(np.int8)
+    heritabilities = np.linspace(0.2, 0.8, traits)
+    effects = rng.normal(size=(markers, traits)) / np.sqrt(markers)
+    genetic = np.zeros((n, traits))
+    for start in range(0, markers, 4096):
+        block = genotypes[:, start : start + 4096].astype(np.float64)
+        genetic += (block - block.mean(axis=0)) @ effects[start : start + 4096]
+    # Genetic values have covariance G = Zc Zc' / m (var_g = 1), so the tool's heritability
+    # var_g / (var_g + var_e) estimates the simulated one
+    noise = rng.normal(size=(n, traits)) * np.sqrt((1 - heritabilities) / heritabilities)
+    return genotypes, 10 + genetic + noise
+
+
+def run(genotypes_path: str, phenotypes: np.ndarray, engine: str, output_file: str) -> tuple[float, float, float]:
+    start = time.perf_counter()
+    log = fit_genomic_prediction_model(
+        genotypes_path, phenotypes, engine=engine, output_file=output_file, profile_memory=True
+    )
+    seconds = time.perf_counter() - start
+    peak_mb = float(re.search(r"Peak memory: ([\d.]+) MB", log).group(1))
+    heritability = float(re.search(r"Estimated heritability: ([\d.]+)", log).group(1))
+    return seconds, peak_mb, heritability
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the REML/GBLUP engines of fit_genomic_prediction_model.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    parser.add_argument("--markers", type=int, default=10000)
+    parser.add_argument("--traits", type=int, default=3)
+    parser.add_argument("--dense-max", type=int, default=2000, help="Largest size fitted with the dense engine.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{args.markers} markers, {args.traits} traits (simulated h2 of trait 1: 0.2)\n")
+    print(f"{'individuals':>11} {'engine':>7} {'seconds':>9} {'peak MB':>9} {'h2 trait 1':>11}")
+    print("-" * 51)
+    with tempfile.TemporaryDirectory() as tmp:
+        genotypes_path = os.path.join(tmp, "genotypes.npy")
+        output_file = os.path.join(tmp, "results.csv")
+        for n in args.sizes:
+            genotypes, phenotypes = simulate(n, args.markers, args.traits, rng)
+            np.save(genotypes_path, genotypes)
+            del genotypes
+            engines = ["eigen", "dense"] if n <= args.dense_max else ["eigen"]
+            for engine in engines:
+                seconds, peak_mb, heritability = run(genotypes_path, phenotypes, engine, output_file)
+                print(f"{n:11d} {engine:>7} {seconds:9.2f} {peak_mb:9.1f} {heritability:11.3f}")
+
+
+if __name__ == "__main__":
+    main()
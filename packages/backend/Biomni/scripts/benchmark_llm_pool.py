@@ -0,0 +1,134 @@
+"""Benchmark the per-call overhead removed by the get_llm client pool.
+
+A local OpenAI-compatible server (instant canned replies, HTTP/1.1 keep-alive) stands in for the
+provider so that only client-side costs are measured: building the LangChain model and its HTTP
+client, and opening a new connection. Three cases are compared:
+
+- ``get_llm(..., reuse=False)`` + invoke per call (the previous behaviour)
+- pooled ``get_llm(...)`` + invoke per call
+- the pooled client invoked from several threads at once
+
+For each case the median latency per call, throughput and the number of TCP connections the server
+accepted are reported. Requires langchain-openai (the "Custom" source is used). Recent langchain-openai
+versions already share one httpx client per base URL between instances, so there the saving is the
+model construction (~1 ms per call); SDK clients built per instance (e.g. Anthropic) also reconnect.
+
+    python scripts/benchmark_llm_pool.py
+    python scripts/benchmark_llm_pool.py --calls 200 --threads 16
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from biomni.llm import clear_llm_pool, get_llm, get_llm_pool_stats
+from langchain_core.messages import HumanMessage
+
+MODEL = "bench-model"
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; without this, Nagle + delayed ACK adds ~40 ms per reply
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with FakeOpenAIHandler.lock:
+            FakeOpenAIHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": MODEL,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_case(name: str, call, calls: int, threads: int = 1) -> None:
+    FakeOpenAIHandler.connections = 0
+    durations = []
+
+    def timed_call(_):
+        start = time.perf_counter()
+        call()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    if threads == 1:
+        for i in range(calls):
+            timed_call(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(timed_call, range(calls)))
+    wall = time.perf_counter() - start
+    print(f"{name:<34} {statistics.median(durations):9.2f} {calls / wall:10.1f} {FakeOpenAIHandler.connections:12d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark get_llm construction and invoke overhead with pooling.")
+    parser.add_argument("--calls", type=int, default=100, help="Calls per case.")
+    parser.add_argument("--threads", type=int, default=8, help="Threads for the concurrent case.")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    kwargs = {"model": MODEL, "source": "Custom", "base_url": base_url, "api_key": "bench", "temperature": 0.0}
+    messages = [HumanMessage(content="ping")]
+
+    clear_llm_pool()
+    get_llm(**kwargs, reuse=False).invoke(messages)  # warm up imports
+
+    construct_ms = []
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        get_llm(**kwargs, reuse=False)
+        construct_ms.append((time.perf_counter() - start) * 1000)
+    pooled_ms = []
+    for _ in range(args.calls):
+        start = time.perf_counter()
+        get_llm(**kwargs)
+        pooled_ms.append((time.perf_counter() - start) * 1000)
+    print(
+        f"get_llm construction: new client {statistics.median(construct_ms):.3f} ms, "
+        f"pooled {statistics.median(pooled_ms):.4f} ms\n"
+    )
+
+    print(f"{'case':<34} {'median ms':>9} {'calls/s':>10} {'connections':>12}")
+    print("-" * 68)
+    run_case("new client per call", lambda: get_llm(**kwargs, reuse=False).invoke(messages), args.calls)
+    run_case("pooled client", lambda: get_llm(**kwargs).invoke(messages), args.calls)
+    run_case(
+        f"pooled client, {args.threads} threads",
+        lambda: get_llm(**kwargs).invoke(messages),
+        args.calls,
+        threads=args.threads,
+    )
+    print(f"\nPool: {get_llm_pool_stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark annotate_open_reading_frames (vectorized scanner) against the previous codon walk.
+
+Random DNA (uniform bases, so ORFs are short and numerous, the worst case for nested filtering)
+is scanned on both strands with ``filter_subsets`` on and off. The previous implementation, kept
+below for reference, walks codons in Python, translates each ORF with a new ``Seq`` and filters
+nested ORFs pairwise; it is timed on a shorter sequence. Then a multi-record FASTA file is
+scanned in streaming mode (ORFs written to a TSV file).
+
+    python scripts/benchmark_orf_scanner.py
+    python scripts/benchmark_orf_scanner.py --length 200000 --fasta-mb 20
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import namedtuple
+
+from Bio.Seq import Seq
+from biomni.tool.molecular_biology import annotate_open_reading_frames
+
+ORF = namedtuple("ORF", ["sequence", "aa_sequence", "start", "end", "strand", "frame"])
+
+
+def previous_orfs(sequence: str, min_length: int, search_reverse: bool, filter_subsets: bool) -> list:
+    """ORF search of the previous annotate_open_reading_frames (summary statistics omitted)."""
+
+    def find_orfs_in_frame(seq_str, frame, strand):
+        orfs = []
+        offset = frame - 1
+        frame_seq = seq_str[offset:]
+        start_positions = []
+        for i in range(0, len(frame_seq) - 2, 3):
+            codon = frame_seq[i : i + 3]
+            if codon == "ATG":
+                start_positions.append(i)
+            elif codon in ["TAA", "TAG", "TGA"]:
+                while start_positions and start_positions[0] < i:
+                    start_pos = start_positions.pop(0)
+                    orf_seq = frame_seq[start_pos : i + 3]
+                    if len(orf_seq) >= min_length:
+                        orig_start, orig_end = start_pos + offset, i + offset + 3
+                        if strand == "-":
+                            orig_start, orig_end = len(seq_str) - orig_end, len(seq_str) - (start_pos + offset)
+                        aa_seq = str(Seq(orf_seq).translate(to_stop=True))
+                        orfs.append(
+                            ORF(orf_seq, aa_seq, orig_start, orig_end, strand, frame if strand == "+" else -frame)
+                        )
+        return orfs
+
+    sequence = sequence.upper()
+    all_orfs = []
+    for frame in range(1, 4):
+        all_orfs.extend(find_orfs_in_frame(sequence, frame, "+"))
+    if search_reverse:
+        rev_comp = str(Seq(sequence).reverse_complement())
+        for frame in range(1, 4):
+            all_orfs.extend(find_orfs_in_frame(rev_comp, frame, "-"))
+    if filter_subsets:
+        all_orfs.sort(key=lambda x: len(x.sequence), reverse=True)
+        filtered_orfs = []
+        for orf in all_orfs:
+            if not any(
+                orf.strand == larger.strand and orf.start >= larger.start and orf.end <= larger.end
+                for larger in filtered_orfs
+            ):
+                filtered_orfs.append(orf)
+        all_orfs = filtered_orfs
+    all_orfs.sort(key=lambda x: len(x.sequence), reverse=True)
+    return all_orfs
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized ORF scanner.")
+    parser.add_argument("--length", type=int, default=1_000_000, help="Sequence length for the vectorized scanner.")
+    parser.add_argument("--previous-length", type=int, default=300_000, help="Sequence length for the previous code.")
+    parser.add_argument("--min-length", type=int, default=30)
+    parser.add_argument("--fasta-mb", type=float, default=20.0, help="Size of the streamed multi-record FASTA file.")
+    parser.add_argument("--records", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    sequence = "".join(rng.choices("ACGT", k=args.length))
+    short = sequence[: args.previous_length]
+
+    print(f"{'case':<46} {'bases':>10} {'ORFs':>8} {'seconds':>9} {'Mb/s':>8}")
+    print("-" * 85)
+    for filter_subsets in (False, True):
+        label = "nested filtered" if filter_subsets else "all ORFs"
+        previous, seconds = timed(previous_orfs, short, args.min_length, True, filter_subsets)
+        print(
+            f"{'previous, ' + label:<46} {len(short):10d} {len(previous):8d} {seconds:9.2f} "
+            f"{len(short) / seconds / 1e6:8.3f}"
+        )
+        result, seconds = timed(annotate_open_reading_frames, short, args.min_length, True, filter_subsets)
+        assert [tuple(orf) for orf in result["orfs"]] == [tuple(orf) for orf in previous]
+        print(
+            f"{'vectorized, ' + label:<46} {len(short):10d} {len(result['orfs']):8d} {seconds:9.2f} "
+            f"{len(short) / seconds / 1e6:8.3f}"
+        )
+        result, seconds = timed(annotate_open_reading_frames, sequence, args.min_length, True, filter_subsets)
+        print(
+            f"{'vectorized, ' + label:<46} {len(sequence):10d} {len(result['orfs']):8d} {seconds:9.2f} "
+            f"{len(sequence) / seconds / 1e6:8.3f}"
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fasta_path = os.path.join(tmp, "genome.fa")
+        record_length = int(args.fasta_mb * 1e6 / args.records)
+        with open(fasta_path, "w") as f:
+            for i in range(args.records):
+                f.write(f">chr{i + 1}\n")
+                record = "".join(rng.choices("ACGT", k=record_length))
+                f.writelines(record[j : j + 80] + "\n" for j in range(0, len(record), 80))
+        result, seconds = timed(annotate_open_reading_frames, fasta_path, 300, True, True)
+        stats = result["summary_stats"]
+        print(
+            f"{'streamed FASTA, nested filtered, min 300 nt':<46} {args.records * record_length:10d} "
+            f"{stats['total_orfs']:8d} {seconds:9.2f} {args.records * record_length / seconds / 1e6:8.3f}"
+        )
+        print(f"\n{stats['records']} records, TSV of {os.path.getsize(result['output_file']) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
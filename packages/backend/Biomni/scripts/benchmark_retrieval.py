@@ -0,0 +1,122 @@
+"""Benchmark local index retrieval against the prompt-based (LLM) retriever.
+
+Reports index build/load time, per-query latency of the BM25 index and, with --llm,
+the latency of prompt_based_retrieval and the recall of the index shortlist against
+the LLM's selection (treated as the reference).
+
+    python scripts/benchmark_retrieval.py                 # index latency only
+    python scripts/benchmark_retrieval.py --llm --top-k 20
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+from biomni.config import default_config
+from biomni.env_desc import data_lake_dict, library_content_dict
+from biomni.model.resource_index import CATEGORIES, ResourceIndex, load_or_build_index, resource_name
+from biomni.model.retriever import ToolRetriever
+from biomni.tool.tool_registry import ToolRegistry
+from biomni.utils import read_module2api
+
+QUERIES = [
+    "Find pathogenic variants in BRCA1 and summarize their clinical significance",
+    "Design CRISPR guide RNAs to knock out TP53 in human cells",
+    "Annotate cell types in my single-cell RNA-seq dataset",
+    "Which drugs interact with warfarin?",
+    "Predict the 3D structure of insulin and find binding pockets",
+    "Run a GWAS association for type 2 diabetes risk loci",
+    "Design PCR primers to amplify the GFP coding sequence from a plasmid",
+    "Identify transcription factor binding sites in the promoter of MYC",
+    "Find recent literature on CAR-T therapy for solid tumors",
+    "Perform differential expression analysis between tumor and normal samples",
+    "Find open reading frames in a bacterial genome sequence",
+    "Get protein-protein interactions for EGFR from STRING",
+]
+
+
+def build_catalog() -> dict:
+    """Catalog in the same shape A1._prepare_resources_for_retrieval passes to the retriever."""
+    registry = ToolRegistry(read_module2api())
+    return {
+        "tools": registry.tools,
+        "data_lake": [{"name": k, "description": v} for k, v in data_lake_dict.items()],
+        "libraries": [{"name": k, "description": v} for k, v in library_content_dict.items()],
+    }
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BM25 index retrieval vs prompt-based retrieval.")
+    parser.add_argument(
+        "--top-k", type=int, default=default_config.retriever_top_k, help="Shortlist size per category."
+    )
+    parser.add_argument("--llm", action="store_true", help="Also run prompt-based retrieval and compute recall.")
+    parser.add_argument("--repeat", type=int, default=20, help="Index query repetitions for latency stats.")
+    args = parser.parse_args()
+
+    resources = build_catalog()
+    sizes = {category: len(resources[category]) for category in CATEGORIES}
+    print(f"Catalog: {sizes}")
+
+    retriever = ToolRetriever()
+    with tempfile.TemporaryDirectory() as index_dir:
+        start = time.perf_counter()
+        index = load_or_build_index(resources, index_dir)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ResourceIndex(index.path)
+        load_s = time.perf_counter() - start
+        print(f"Index build: {build_s * 1000:.1f} ms, mmap load: {load_s * 1000:.2f} ms")
+
+        index_latencies = []
+        shortlists = {}
+        for query in QUERIES:
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                shortlists[query] = retriever.index_based_retrieval(
+                    query, resources, top_k=args.top_k, index_dir=index_dir
+                )
+                index_latencies.append(time.perf_counter() - start)
+        print(
+            f"Index retrieval: p50 {statistics.median(index_latencies) * 1000:.2f} ms, "
+            f"p95 {percentile(index_latencies, 0.95) * 1000:.2f} ms over {len(index_latencies)} queries"
+        )
+
+    if not args.llm:
+        return
+
+    from biomni.llm import get_llm
+
+    llm = get_llm(model=default_config.llm, temperature=0.0, config=default_config)
+    prompt_latencies = []
+    recalls = {category: [] for category in CATEGORIES}
+    for query in QUERIES:
+        start = time.perf_counter()
+        reference = retriever.prompt_based_retrieval(query, resources, llm=llm)
+        prompt_latencies.append(time.perf_counter() - start)
+
+        for category in CATEGORIES:
+            expected = {resource_name(r) for r in reference[category]}
+            if not expected:
+                continue
+            found = {resource_name(r) for r in shortlists[query][category]}
+            recalls[category].append(len(expected & found) / len(expected))
+
+    print(
+        f"Prompt retrieval: p50 {statistics.median(prompt_latencies):.2f} s, "
+        f"p95 {percentile(prompt_latencies, 0.95):.2f} s over {len(prompt_latencies)} queries"
+    )
+    for category in CATEGORIES:
+        if recalls[category]:
+            print(f"Recall@{args.top_k} vs LLM selection [{category}]: {statistics.mean(recalls[category]):.2%}")
+
+
+if __name__ == "__main__":
+    main()
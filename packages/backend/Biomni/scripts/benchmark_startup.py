@@ -0,0 +1,147 @@
+"""Benchmark agent cold-start costs: import time per module and tool schema loading.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` so that the numbers
+are cold-start costs and do not depend on the order of measurement. For every module the
+total import time and the heaviest third-party packages it pulls in are reported. Then the
+tool schema index is timed (rebuild from the description modules vs. precompiled index),
+and with --agent a full A1 construction with the data lake check disabled.
+
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --modules biomni.tool.genomics biomni.tool.database --top 8
+    python scripts/benchmark_startup.py --agent
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from biomni.tool.tool_index import TOOL_MODULES
+
+CORE_MODULES = [
+    "biomni.config",
+    "biomni.llm",
+    "biomni.utils",
+    "biomni.execution",
+    "biomni.model.retriever",
+    "biomni.agent.a1",
+]
+
+
+def measure_import(module: str) -> tuple[float | None, dict[str, float], str]:
+    """Import ``module`` in a fresh interpreter and parse ``-X importtime``.
+
+    Returns:
+        Total import time in ms (None on failure), self time in ms per top-level package, error text
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    self_by_package: dict[str, float] = defaultdict(float)
+    total_us = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [part.strip() for part in line[len("import time:") :].split("|")]
+        if len(parts) != 3 or not parts[0].isdigit():
+            continue
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        self_by_package[name.strip().split(".")[0]] += self_us / 1000
+        if name.strip() == module:
+            total_us = cumulative_us
+
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"
+        return None, dict(self_by_package), error
+    return (total_us / 1000 if total_us is not None else None), dict(self_by_package), ""
+
+
+def time_tool_index(repeat: int) -> None:
+    from biomni.tool import tool_index
+
+    start = time.perf_counter()
+    tool_index.build_module2api()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, "tool_index.pkl")
+        tool_index.load_module2api(index_path)  # writes the index
+
+        load_ms = []
+        for _ in range(repeat):
+            tool_index._loaded.clear()  # force a disk read
+            start = time.perf_counter()
+            tool_index.load_module2api(index_path)
+            load_ms.append((time.perf_counter() - start) * 1000)
+
+        memo_ms = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tool_index.load_module2api(index_path)
+            memo_ms.append((time.perf_counter() - start) * 1000)
+
+    print("\nTool schemas (read_module2api)")
+    print(f"  import description modules : {build_ms:8.1f} ms (first import in this process)")
+    print(f"  precompiled index from disk: {min(load_ms):8.1f} ms")
+    print(f"  precompiled index in memory: {min(memo_ms):8.1f} ms")
+
+
+def time_agent() -> None:
+    from biomni.config import default_config
+
+    default_config.data_lake_check = "off"
+    start = time.perf_counter()
+    from biomni.agent import A1
+
+    import_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    A1()
+    first_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    A1()
+    second_ms = (time.perf_counter() - start) * 1000
+
+    print("\nAgent construction (data lake check off)")
+    print(f"  import biomni.agent        : {import_ms:8.1f} ms")
+    print(f"  first A1()                 : {first_ms:8.1f} ms")
+    print(f"  second A1()                : {second_ms:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time per module and agent startup.")
+    parser.add_argument("--modules", nargs="*", help="Modules to measure (default: core and all tool modules).")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest packages to list per module.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions for the tool index timings.")
+    parser.add_argument("--agent", action="store_true", help="Also time A1 construction (needs LLM settings).")
+    args = parser.parse_args()
+
+    modules = args.modules or CORE_MODULES + [f"biomni.tool.{field}" for field in TOOL_MODULES]
+
+    print(f"{'module':<36} {'import ms':>10}  heaviest packages (self ms)")
+    print("-" * 100)
+    for module in modules:
+        total_ms, self_by_package, error = measure_import(module)
+        if total_ms is None:
+            print(f"{module:<36} {'failed':>10}  {error[:60]}")
+            continue
+        heaviest = sorted(
+            ((name, ms) for name, ms in self_by_package.items() if name not in ("biomni", "builtins")),
+            key=lambda item: -item[1],
+        )[: args.top]
+        listed = ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest)
+        print(f"{module:<36} {total_ms:10.1f}  {listed}")
+
+    time_tool_index(args.repeat)
+    if args.agent:
+        time_agent()
+
+
+if __name__ == "__main__":
+    main()
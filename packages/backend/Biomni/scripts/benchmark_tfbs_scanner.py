@@ -0,0 +1,101 @@
+"""Benchmark batch PSSM scanning (tfbs_scanner) against one Biopython search per matrix and sequence.
+
+Random count matrices (lengths 6-20, 20 sites per column, like JASPAR profiles) are scanned, on both
+strands at a relative score threshold, over two inputs:
+
+- a promoter set: many 1 kb sequences
+- one long sequence (a chromosome arm), chunked and, with more than one CPU, scored in a process pool
+
+The previous approach, ``Bio.motifs`` ``pssm.search`` once per matrix and sequence, is timed on the
+same inputs (with the same pseudocounts) and its sites are checked against the batch results. No
+JASPAR access is needed.
+
+    python scripts/benchmark_tfbs_scanner.py
+    python scripts/benchmark_tfbs_scanner.py --motifs 200 --promoters 2000 --long-mb 20
+"""
+
+import argparse
+import time
+
+import numpy as np
+from Bio import motifs
+from Bio.motifs import jaspar
+from Bio.Seq import Seq
+from biomni.tool.tfbs_scanner import motif_from_counts, scan_sequences
+
+
+def random_counts(rng: np.random.Generator, length: int, sites: int = 20) -> dict:
+    """Counts of ``sites`` sites drawn from a random, fairly specific base distribution per position."""
+    probabilities = rng.dirichlet([0.3] * 4, size=length)
+    counts = np.array([rng.multinomial(sites, p) for p in probabilities])
+    return {base: counts[:, i].tolist() for i, base in enumerate("ACGT")}
+
+
+def biopython_scan(sequences: dict[str, str], counts: list[dict], threshold: float) -> set:
+    """Sites found by ``pssm.search`` for every matrix and sequence: (sequence, matrix, start, strand)."""
+    sites = set()
+    for index, motif_counts in enumerate(counts):
+        motif = motifs.Motif(alphabet="ACGT", counts=motif_counts)
+        motif.pseudocounts = jaspar.calculate_pseudocounts(motif)
+        pssm = motif.pssm
+        cutoff = pssm.min + threshold * (pssm.max - pssm.min)
+        for sequence_id, sequence in sequences.items():
+            for position, _ in pssm.search(Seq(sequence), threshold=cutoff):
+                start = position if position >= 0 else position + len(sequence)
+                sites.add((sequence_id, index, int(start), "+" if position >= 0 else "-"))
+    return sites
+
+
+def run(label: str, sequences: dict[str, str], counts: list[dict], threshold: float, workers: int | None) -> None:
+    bases = sum(len(sequence) for sequence in sequences.values())
+    scan_motifs = [motif_from_counts(f"MA{i:04d}.1", f"TF{i}", c) for i, c in enumerate(counts)]
+
+    start = time.perf_counter()
+    expected = biopython_scan(sequences, counts, threshold)
+    previous = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sites = scan_sequences(sequences, scan_motifs, threshold=threshold, workers=workers)
+    batch = time.perf_counter() - start
+
+    found = set(
+        zip(
+            sites["sequence_id"],
+            sites["matrix_id"].str[2:6].astype(int),
+            sites["start"].tolist(),
+            sites["strand"],
+            strict=True,
+        )
+    )
+    # Only sites scoring within float32 rounding of the cutoff may differ
+    assert len(found ^ expected) <= 1e-4 * max(len(expected), 1), (len(found - expected), len(expected - found))
+
+    work = bases * len(counts) / 1e6
+    print(f"{label + ', Biopython per matrix':<44} {previous:9.2f} {work / previous:14.1f} {len(expected):9d}")
+    print(f"{label + ', batch scanner':<44} {batch:9.2f} {work / batch:14.1f} {len(sites):9d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch PSSM scanning against per-matrix Biopython.")
+    parser.add_argument("--motifs", type=int, default=50)
+    parser.add_argument("--promoters", type=int, default=500, help="Number of 1 kb promoter sequences.")
+    parser.add_argument("--long-mb", type=float, default=5.0, help="Length of the long sequence.")
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--workers", type=int, default=None, help="Pool size (default: the number of CPUs).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    counts = [random_counts(rng, int(length)) for length in rng.integers(6, 21, size=args.motifs)]
+    promoters = {f"promoter{i}": "".join(rng.choice(list("ACGT"), size=1000)) for i in range(args.promoters)}
+    long_sequence = {"chr": "".join(rng.choice(list("ACGT"), size=int(args.long_mb * 1e6)))}
+
+    print(f"{args.motifs} matrices, relative score threshold {args.threshold}\n")
+    print(f"{'case':<44} {'seconds':>9} {'Mb x matrix/s':>14} {'sites':>9}")
+    print("-" * 79)
+    run(f"{args.promoters} x 1 kb", promoters, counts, args.threshold, args.workers)
+    run(f"{args.long_mb:g} Mb", long_sequence, counts, args.threshold, args.workers)
+
+
+if __name__ == "__main__":
+    main()
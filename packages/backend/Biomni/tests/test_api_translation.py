@@ -0,0 +1,54 @@
+"""Tests for the prompt -> API call translation cache."""
+
+import pytest
+from biomni.tool.api_translation import TranslationCache
+
+SYSTEM_PROMPT = "Translate the request into a call of this API: {...}"
+MODEL = "claude-sonnet-4-5"
+
+
+@pytest.fixture
+def cache():
+    return TranslationCache(max_entries=16, ttl_seconds=60)
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        ("PDB entries with resolution < 2.0 from human", "PDB entries with resolution > 2.0 from human"),
+        ("PDB entries with resolution <= 2.0", "PDB entries with resolution >= 2.0"),
+        ("variants in BRCA1 and TP53", "variants in BRCA1 or TP53"),
+        ("structures with ligands", "structures without ligands"),
+        ("trials not recruiting", "trials recruiting"),
+        ("interactions from TP53 to MDM2", "interactions from MDM2 to TP53"),
+        ("Trp53 expression", "TRP53 expression"),
+    ],
+)
+def test_prompts_with_different_meaning_do_not_share_an_entry(cache, first, second):
+    cache.set(first, SYSTEM_PROMPT, MODEL, {"data": {"full_url": first}})
+
+    assert cache.make_key(first, SYSTEM_PROMPT, MODEL) != cache.make_key(second, SYSTEM_PROMPT, MODEL)
+    assert cache.get(second, SYSTEM_PROMPT, MODEL) is None
+    assert cache.get(first, SYSTEM_PROMPT, MODEL) == {"data": {"full_url": first}}
+
+
+def test_whitespace_is_folded(cache):
+    cache.set("variants in  BRCA1\n", SYSTEM_PROMPT, MODEL, {"data": 1})
+
+    assert cache.get(" variants in BRCA1", SYSTEM_PROMPT, MODEL) == {"data": 1}
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_entries_are_scoped_to_model_and_system_prompt(cache):
+    cache.set("variants in BRCA1", SYSTEM_PROMPT, MODEL, {"data": 1})
+
+    assert cache.get("variants in BRCA1", SYSTEM_PROMPT + " v2", MODEL) is None
+    assert cache.get("variants in BRCA1", SYSTEM_PROMPT, "gpt-4o") is None
+
+
+def test_expired_entries_are_dropped():
+    cache = TranslationCache(max_entries=16, ttl_seconds=0)
+    cache.set("variants in BRCA1", SYSTEM_PROMPT, MODEL, {"data": 1})
+
+    assert cache.get("variants in BRCA1", SYSTEM_PROMPT, MODEL) is None
+    assert cache.get_stats()["entries"] == 0
@@ -0,0 +1,205 @@
+"""The compiled DDInter store answers like the pickled dictionaries and difflib lookups it replaced."""
+
+import random
+from collections import defaultdict
+from difflib import get_close_matches
+
+import pandas as pd
+import pytest
+from biomni.tool import ddinter_store
+from biomni.tool.ddinter_store import CSV_FILES, DDInterStore, compile_store, get_ddinter_store, standardize_name
+
+LEVELS = ["Major", "Moderate", "Minor", "Unknown"]
+SYLLABLES = ["ab", "cil", "dro", "fen", "gli", "lor", "mab", "met", "nib", "pra", "tin", "vir", "xa", "zol"]
+
+
+def random_drugs(rng, count):
+    names = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize())
+    names = sorted(names)
+    # Salt forms share the standardized name of their base drug
+    names += [f"{name} {rng.choice(['Sodium', 'Hydrochloride', 'Calcium'])}" for name in names[:10]]
+    return [(f"DDInter{i}", name) for i, name in enumerate(names)]
+
+
+@pytest.fixture(scope="module")
+def data_lake(tmp_path_factory):
+    rng = random.Random(0)
+    drugs = random_drugs(rng, 150)
+    lake = tmp_path_factory.mktemp("data_lake")
+    frames = {}
+    for csv_file in rng.sample(CSV_FILES, 5):
+        rows = []
+        for _ in range(rng.randint(100, 400)):
+            (id_a, name_a), (id_b, name_b) = rng.choice(drugs), rng.choice(drugs)
+            rows.append([id_a, name_a, id_b, name_b, rng.choice(LEVELS + [None])])
+        frames[csv_file] = pd.DataFrame(rows, columns=["DDInterID_A", "Drug_A", "DDInterID_B", "Drug_B", "Level"])
+        frames[csv_file].to_csv(lake / csv_file, index=False)
+    return lake, frames, drugs
+
+
+@pytest.fixture(scope="module")
+def reference(data_lake):
+    """Drug registry, interaction matrix and name mapping as the previous pickled dictionaries held them."""
+    _, frames, _ = data_lake
+    drug_info = {}
+    matrix = defaultdict(lambda: defaultdict(list))
+    for csv_file in CSV_FILES:
+        if csv_file not in frames:
+            continue
+        category = csv_file.replace("ddinter_", "").replace(".csv", "")
+        for _, row in frames[csv_file].iterrows():
+            for drug_id, name, partner in [
+                (row["DDInterID_A"], row["Drug_A"], row["DDInterID_B"]),
+                (row["DDInterID_B"], row["Drug_B"], row["DDInterID_A"]),
+            ]:
+                info = drug_info.setdefault(
+                    drug_id,
+                    {
+                        "name": name,
+                        "standardized_name": standardize_name(name),
+                        "categories": [],
+                        "interactions": set(),
+                    },
+                )
+                if category not in info["categories"]:
+                    info["categories"].append(category)
+                info["interactions"].add(partner)
+            interaction = {
+                "level": "Unknown" if pd.isna(row["Level"]) else row["Level"],
+                "category": category,
+                "drug_a_id": row["DDInterID_A"],
+                "drug_b_id": row["DDInterID_B"],
+                "drug_a_name": row["Drug_A"],
+                "drug_b_name": row["Drug_B"],
+            }
+            std_a, std_b = standardize_name(row["Drug_A"]), standardize_name(row["Drug_B"])
+            matrix[std_a][std_b].append(interaction)
+            matrix[std_b][std_a].append(interaction)
+    name_mapping = {}
+    for drug_id, info in drug_info.items():
+        name_mapping[info["name"].lower()] = drug_id
+        name_mapping[info["standardized_name"]] = drug_id
+    return drug_info, matrix, name_mapping
+
+
+@pytest.fixture(scope="module")
+def store(data_lake):
+    return DDInterStore(compile_store(str(data_lake[0])))
+
+
+def misspell(rng, name):
+    name = list(name)
+    for _ in range(rng.randint(1, 2)):
+        position = rng.randrange(len(name))
+        edit = rng.choice(["substitute", "delete", "insert"])
+        if edit == "substitute":
+            name[position] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        elif edit == "delete" and len(name) > 3:
+            del name[position]
+        else:
+            name.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+    return "".join(name)
+
+
+def test_names_resolve_like_get_close_matches(store, reference, data_lake):
+    _, _, name_mapping = reference
+    rng = random.Random(1)
+    names = [name for _, name in data_lake[2]]
+    queries = names + [misspell(rng, rng.choice(names)) for _ in range(300)] + ["", "x", "unknowndrugname"]
+
+    for query in queries:
+        matches = get_close_matches(query.lower(), name_mapping.keys(), n=1, cutoff=0.8)
+        expected = query.lower() if query.lower() in name_mapping else (matches[0] if matches else None)
+        assert store.resolve(query) == expected, query
+
+
+def test_drug_registry_matches(store, reference):
+    drug_info, _, name_mapping = reference
+
+    assert store.drug_ids == list(drug_info)
+    for name, drug_id in name_mapping.items():
+        drug = store.drug(name)
+        assert store.drug_ids[drug] == drug_id
+        assert store.drug_names[drug] == drug_info[drug_id]["name"]
+        assert sorted(store.categories(drug)) == sorted(drug_info[drug_id]["categories"])
+        assert store.drug_degrees[drug] == len(drug_info[drug_id]["interactions"])
+
+
+def test_interactions_match_the_matrix(store, reference):
+    drug_info, matrix, name_mapping = reference
+    rng = random.Random(2)
+    names = list(name_mapping)
+    categories = [
+        category
+        for category in ddinter_store.CATEGORIES
+        if any(category in info["categories"] for info in drug_info.values())
+    ]
+
+    for _ in range(400):
+        name_a, name_b = rng.choice(names), rng.choice(names)
+        severity_levels = rng.choice([None, ["Major"], ["Moderate", "Minor"]])
+        interaction_types = rng.choice([None, rng.sample(categories, 2)])
+        # Interactions are keyed by the standardized name of the drug a lookup name maps to
+        std_a, std_b = (drug_info[name_mapping[name]]["standardized_name"] for name in (name_a, name_b))
+        expected = [
+            interaction
+            for interaction in matrix[std_a].get(std_b, [])
+            if (not severity_levels or interaction["level"] in severity_levels)
+            and (not interaction_types or interaction["category"] in interaction_types)
+        ]
+
+        assert store.interactions(name_a, name_b, severity_levels, interaction_types) == expected
+
+
+@pytest.mark.parametrize("therapeutic_class", [None, "anti", "blood"])
+def test_alternatives_match_the_drug_loop(store, reference, therapeutic_class):
+    drug_info, matrix, name_mapping = reference
+    rng = random.Random(3)
+    names = list(name_mapping)
+
+    for _ in range(20):
+        target = rng.choice(names)
+        contraindicated = list(dict.fromkeys(rng.sample(names, 3)))
+        target_id = name_mapping[target]
+        std_contraindicated = [drug_info[name_mapping[name]]["standardized_name"] for name in contraindicated]
+        expected = []
+        for drug_id, info in drug_info.items():
+            if drug_id == target_id:
+                continue
+            if therapeutic_class:
+                if not any(therapeutic_class in category for category in info["categories"]):
+                    continue
+            elif not set(info["categories"]) & set(drug_info[target_id]["categories"]):
+                continue
+            interactions = [i for std in std_contraindicated for i in matrix[info["standardized_name"]].get(std, [])]
+            if any(interaction["level"] == "Major" for interaction in interactions):
+                continue
+            expected.append(
+                {
+                    "name": info["name"],
+                    "categories": sorted(info["categories"]),
+                    "interaction_count": len(interactions),
+                    "total_interactions": len(info["interactions"]),
+                }
+            )
+
+        alternatives = store.alternatives(target, contraindicated, therapeutic_class)
+
+        assert [
+            {**alternative, "categories": sorted(alternative["categories"])} for alternative in alternatives
+        ] == expected
+
+
+def test_compiled_store_is_reused_per_data_lake(data_lake, tmp_path):
+    lake = str(data_lake[0])
+
+    first = get_ddinter_store(lake, store_dir=str(tmp_path))
+    ddinter_store._shared_stores.clear()
+    reloaded = get_ddinter_store(lake, store_dir=str(tmp_path))
+
+    assert first is not reloaded
+    assert reloaded.drug_ids == first.drug_ids
+    assert (reloaded.partners == first.partners).all()
+    assert get_ddinter_store(lake, store_dir=str(tmp_path)) is reloaded
@@ -0,0 +1,111 @@
+"""The eigendecomposition REML engine agrees with a direct dense REML on small seeded data."""
+
+import numpy as np
+import pytest
+from biomni.tool import gblup
+from biomni.tool.gblup import EigenLMM, genomic_relationship_matrix
+from scipy import optimize
+
+LOG_DELTA_RANGE = gblup.LOG_DELTA_GRID[0], gblup.LOG_DELTA_GRID[-1]
+
+
+def simulate(seed, n=100, markers=300, traits=2):
+    rng = np.random.default_rng(seed)
+    genotypes = rng.binomial(2, rng.uniform(0.1, 0.9, markers), size=(n, markers)).astype(np.int8)
+    G = genomic_relationship_matrix(genotypes)
+    genetic = rng.multivariate_normal(np.zeros(n), G + 1e-6 * np.eye(n), size=traits).T
+    covariates = rng.normal(size=(n, 2))
+    phenotypes = 1.0 + covariates @ rng.normal(size=(2, traits)) + genetic + rng.normal(scale=0.8, size=(n, traits))
+    return genotypes, G, covariates, phenotypes
+
+
+def dense_reml(G, y, X, var_g, var_e):
+    """Restricted log-likelihood of ``y`` at ``(var_g, var_e)`` with ``V`` formed and inverted directly."""
+    n, p = X.shape
+    V_inv = np.linalg.inv(var_g * G + var_e * np.eye(n))
+    xvx = X.T @ V_inv @ X
+    P = V_inv - V_inv @ X @ np.linalg.solve(xvx, X.T @ V_inv)
+    return -0.5 * (
+        np.linalg.slogdet(var_g * G + var_e * np.eye(n))[1]
+        + np.linalg.slogdet(xvx)[1]
+        - np.linalg.slogdet(X.T @ X)[1]
+        + y @ P @ y
+        + (n - p) * np.log(2 * np.pi)
+    )
+
+
+def test_relationship_matrix_matches_centered_product(tmp_path, monkeypatch):
+    genotypes = simulate(0)[0]
+    centered = genotypes - genotypes.mean(axis=0)
+    np.save(tmp_path / "genotypes.npy", genotypes)
+    monkeypatch.setattr(gblup, "SYMMETRIZE_BLOCK", 7)
+
+    G = genomic_relationship_matrix(str(tmp_path / "genotypes.npy"), chunk_markers=64)
+
+    np.testing.assert_allclose(G, centered @ centered.T / genotypes.shape[1], atol=1e-12)
+    heterozygous = (genotypes == 1) - (genotypes == 1).mean(axis=0)
+    np.testing.assert_allclose(
+        genomic_relationship_matrix(genotypes, dominance=True, chunk_markers=50),
+        heterozygous @ heterozygous.T / genotypes.shape[1],
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fit_is_the_dense_reml_maximum(seed):
+    _, G, covariates, phenotypes = simulate(seed)
+    X = np.column_stack([np.ones(len(G)), covariates])
+
+    fits = EigenLMM(G.copy()).fit(phenotypes, covariates)
+
+    for t, fit in enumerate(fits):
+        y = phenotypes[:, t]
+        assert fit.log_likelihood == pytest.approx(dense_reml(G, y, X, fit.var_g, fit.var_e), abs=1e-6)
+        # Search var_g and delta = var_e / var_g, with delta limited to the engine's search range
+        best = optimize.minimize(
+            lambda x, y=y: -dense_reml(G, y, X, np.exp(x[0]), np.exp(x[0] + np.clip(x[1], *LOG_DELTA_RANGE))),
+            [np.log(fit.var_g) + 0.5, np.log(fit.var_e / fit.var_g) + 0.5],
+            method="Nelder-Mead",
+            options={"xatol": 1e-8, "fatol": 1e-10},
+        )
+        assert fit.log_likelihood >= -best.fun - 1e-6
+
+        # GLS fixed effects and BLUP breeding values at the estimate
+        V = fit.var_g * G + fit.var_e * np.eye(len(G))
+        beta = np.linalg.solve(X.T @ np.linalg.solve(V, X), X.T @ np.linalg.solve(V, y))
+        np.testing.assert_allclose(fit.beta, beta, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(fit.fixed_values, X @ beta, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(fit.breeding_values, fit.var_g * G @ np.linalg.solve(V, y - X @ beta), atol=1e-6)
+        assert fit.heritability == pytest.approx(fit.var_g / (fit.var_g + fit.var_e))
+
+
+def test_traits_fitted_together_match_single_trait_fits():
+    _, G, covariates, phenotypes = simulate(4, traits=3)
+    engine = EigenLMM(G.copy())
+
+    together = engine.fit(phenotypes, covariates)
+
+    for t, fit in enumerate(together):
+        (alone,) = engine.fit(phenotypes[:, t], covariates)
+        # Equal up to the tolerance of the delta search
+        assert fit.log_likelihood == pytest.approx(alone.log_likelihood, abs=1e-8)
+        assert fit.heritability == pytest.approx(alone.heritability, rel=1e-4)
+        np.testing.assert_allclose(fit.breeding_values, alone.breeding_values, rtol=1e-4, atol=1e-8)
+
+
+def test_dependent_covariates_are_dropped():
+    _, G, covariates, phenotypes = simulate(5, traits=1)
+    engine = EigenLMM(G.copy())
+
+    (fit,) = engine.fit(phenotypes, np.column_stack([np.ones(len(G)), covariates, covariates[:, 0] * 2]))
+    (reference,) = engine.fit(phenotypes, covariates)
+
+    assert len(fit.beta) == 3
+    assert fit.log_likelihood == pytest.approx(reference.log_likelihood)
+
+
+def test_fixed_effects_must_leave_residual_degrees_of_freedom():
+    _, G, _, phenotypes = simulate(6, n=8, traits=1)
+
+    with pytest.raises(ValueError, match="degrees of freedom"):
+        EigenLMM(G.copy()).fit(phenotypes, np.random.default_rng(0).normal(size=(8, 7)))
@@ -0,0 +1,87 @@
+"""The vectorized ORF scanner returns the ORFs of the codon-by-codon scan it replaced."""
+
+import random
+
+import pytest
+from Bio.Seq import Seq
+from biomni.tool.orf_scanner import ORF, find_orfs, iter_fasta_orfs
+
+
+def scan_orfs(sequence, min_length, search_reverse=False, filter_subsets=False):
+    """Previous ``annotate_open_reading_frames`` loop."""
+
+    def find_orfs_in_frame(seq_str, frame, strand):
+        orfs = []
+        offset = frame - 1
+        frame_seq = seq_str[offset:]
+        start_positions = []
+        for i in range(0, len(frame_seq) - 2, 3):
+            codon = frame_seq[i : i + 3]
+            if codon == "ATG":
+                start_positions.append(i)
+            elif codon in ["TAA", "TAG", "TGA"]:
+                while start_positions and start_positions[0] < i:
+                    start_pos = start_positions.pop(0)
+                    orf_seq = frame_seq[start_pos : i + 3]
+                    if len(orf_seq) >= min_length:
+                        orig_start, orig_end = start_pos + offset, i + offset + 3
+                        if strand == "-":
+                            orig_start, orig_end = len(seq_str) - orig_end, len(seq_str) - (start_pos + offset)
+                        aa_seq = str(Seq(orf_seq).translate(to_stop=True))
+                        orfs.append(
+                            ORF(orf_seq, aa_seq, orig_start, orig_end, strand, frame if strand == "+" else -frame)
+                        )
+        return orfs
+
+    all_orfs = []
+    for frame in range(1, 4):
+        all_orfs.extend(find_orfs_in_frame(sequence, frame, "+"))
+    if search_reverse:
+        rev_comp = str(Seq(sequence).reverse_complement())
+        for frame in range(1, 4):
+            all_orfs.extend(find_orfs_in_frame(rev_comp, frame, "-"))
+    if filter_subsets:
+        all_orfs.sort(key=lambda x: len(x.sequence), reverse=True)
+        filtered_orfs = []
+        for orf in all_orfs:
+            if not any(
+                orf.strand == larger.strand and orf.start >= larger.start and orf.end <= larger.end
+                for larger in filtered_orfs
+            ):
+                filtered_orfs.append(orf)
+        all_orfs = filtered_orfs
+    all_orfs.sort(key=lambda x: len(x.sequence), reverse=True)
+    return all_orfs
+
+
+def random_sequence(rng, length):
+    # ATG and stop codons are enriched so that short sequences hold nested and overlapping ORFs
+    pieces = rng.choices(["A", "C", "G", "T", "ATG", "TAA", "TAG", "TGA", "N", "R", "Y"], k=length)
+    weights = {"N": 0.05, "R": 0.05, "Y": 0.05}
+    return "".join(piece for piece in pieces if rng.random() >= weights.get(piece, 0))
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("search_reverse", [False, True])
+@pytest.mark.parametrize("filter_subsets", [False, True])
+def test_scanner_matches_codon_scan(seed, search_reverse, filter_subsets):
+    rng = random.Random(seed)
+    sequence = random_sequence(rng, rng.randint(0, 600))
+    min_length = rng.choice([0, 6, 30, 90])
+
+    orfs = find_orfs(sequence, min_length, search_reverse=search_reverse, filter_subsets=filter_subsets)
+
+    assert orfs == scan_orfs(sequence, min_length, search_reverse, filter_subsets)
+
+
+def test_fasta_records_are_scanned_one_by_one(tmp_path):
+    rng = random.Random(1)
+    records = {f"record{i}": random_sequence(rng, 300) for i in range(3)}
+    fasta = tmp_path / "records.fa"
+    fasta.write_text("".join(f">{name}\n{sequence.lower()}\n" for name, sequence in records.items()))
+
+    streamed = list(iter_fasta_orfs(str(fasta), 30, search_reverse=True))
+
+    assert [(name, length) for name, length, _ in streamed] == [(name, len(seq)) for name, seq in records.items()]
+    for (_, _, orfs), sequence in zip(streamed, records.values(), strict=True):
+        assert orfs == [orf._replace(sequence="") for orf in scan_orfs(sequence, 30, search_reverse=True)]
@@ -0,0 +1,78 @@
+"""The primer seed index finds exactly the hits of the window-by-window scan it replaced."""
+
+import random
+
+import pytest
+from biomni.tool.primer_index import SequenceIndex, get_sequence_index, reverse_complement
+
+
+def scan_alignments(long_seq, short_seq, max_mismatches=1):
+    """Previous ``align_sequences`` loop: every window of the target on both strands."""
+    alignments = []
+    for seq_to_align, strand in [(short_seq, "+"), (reverse_complement(short_seq), "-")]:
+        for i in range(len(long_seq) - len(seq_to_align) + 1):
+            window = long_seq[i : i + len(seq_to_align)]
+            mismatches = [
+                (j, seq_to_align[j], window[j]) for j in range(len(seq_to_align)) if window[j] != seq_to_align[j]
+            ]
+            if len(mismatches) <= max_mismatches:
+                alignments.append({"position": i, "strand": strand, "mismatches": mismatches})
+    return alignments
+
+
+def random_target(rng, length):
+    target = [rng.choice("ACGT") for _ in range(length)]
+    # A run of N and a repeated segment
+    start, run = rng.randrange(length - 20), rng.randint(1, 20)
+    target[start : start + run] = "N" * run
+    position = rng.randrange(length - 30)
+    target[position : position + 30] = target[:30]
+    return "".join(target)
+
+
+def primers_for(rng, target):
+    primers = []
+    for _ in range(6):
+        length = rng.randint(8, 25)
+        start = rng.randrange(len(target) - length)
+        primer = list(target[start : start + length])
+        for _ in range(rng.randint(0, 2)):
+            primer[rng.randrange(length)] = rng.choice("ACGT")
+        primer = "".join(primer)
+        primers.append(reverse_complement(primer) if rng.random() < 0.5 else primer)
+    primers += [
+        "".join(rng.choice("ACGT") for _ in range(rng.randint(4, 7))),  # too short for a seed
+        "ACGTNACGTACGT",  # ambiguous base
+        "",
+        "A" * (len(target) + 1),  # longer than the target
+    ]
+    return primers
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_index_matches_window_scan(seed):
+    rng = random.Random(seed)
+    target = random_target(rng, rng.randint(60, 400))
+    primers = primers_for(rng, target)
+
+    hits = SequenceIndex(target).find(primers, max_mismatches=1)
+
+    assert hits == [scan_alignments(target, primer) for primer in primers]
+    assert any(hits[:6])
+
+
+def test_more_mismatches_use_shorter_seeds():
+    rng = random.Random(7)
+    target = random_target(rng, 300)
+    primers = primers_for(rng, target)
+
+    hits = SequenceIndex(target).find(primers, max_mismatches=2)
+
+    assert hits == [scan_alignments(target, primer, max_mismatches=2) for primer in primers]
+
+
+def test_indexes_are_shared_per_sequence():
+    target = random_target(random.Random(3), 200)
+
+    assert get_sequence_index(target) is get_sequence_index(str(target))
+    assert get_sequence_index(target) is not get_sequence_index(target + "A")
@@ -0,0 +1,235 @@
+"""
+Biomni 에이전트 풀
+여러 개의 A1 워커를 미리 만들어 두고 세션 단위로 임대(lease)하여 동시 요청을 처리
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class PoolFullError(Exception):
+    """대기열이 가득 차서 더 이상 요청을 받을 수 없을 때 발생"""
+
+
+@dataclass
+class AgentWorker:
+    """풀에서 관리하는 A1 워커"""
+    worker_id: int
+    agent: Any
+    last_session_id: Optional[str] = None
+    runs: int = 0
+
+
+@dataclass
+class PoolTicket:
+    """워커 임대 대기표"""
+    session_id: str
+    future: asyncio.Future
+    enqueued_at: datetime = field(default_factory=datetime.now)
+
+
+class AgentPool:
+    """
+    A1 워커 풀
+
+    - size 개수만큼 워커를 생성하고, 각 워커는 전용 스레드에서 agent.go를 실행
+    - 같은 세션은 직전에 사용한 워커를 우선 배정 (REPL 상태 재사용)
+    - 모든 워커가 사용 중이면 대기열에 등록하고, 대기열이 max_queue를 넘으면 PoolFullError
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_queue: int = 8):
+        """
+        Args:
+            factory: 새 A1 인스턴스를 만드는 동기 함수 (모든 워커가 같은 고정 설정을 사용)
+            size: 최대 워커 수
+            max_queue: 최대 대기 요청 수
+        """
+        self._factory = factory
+        self.size = max(1, size)
+        self.max_queue = max(0, max_queue)
+        self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="biomni-agent")
+
+        self._workers: List[AgentWorker] = []
+        self._idle: List[AgentWorker] = []
+        self._leases: Dict[int, str] = {}
+        self._waiters: Deque[PoolTicket] = deque()
+        self._pending_creations = 0
+
+        self.leases_total = 0
+        self.rejected_total = 0
+
+    # ------------------------------------------------------------------
+    # 상태 조회
+    # ------------------------------------------------------------------
+    @property
+    def queue_depth(self) -> int:
+        """현재 대기 중인 요청 수"""
+        return sum(1 for t in self._waiters if not t.future.done())
+
+    def has_capacity(self) -> bool:
+        """새 요청을 즉시 처리하거나 대기열에 넣을 수 있는지 확인"""
+        if self._idle or len(self._workers) + self._pending_creations < self.size:
+            return True
+        return self.queue_depth < self.max_queue
+
+    def position(self, ticket: PoolTicket) -> int:
+        """대기열 내 순번 (1부터 시작, 대기 중이 아니면 0)"""
+        pos = 0
+        for waiting in self._waiters:
+            if waiting.future.done():
+                continue
+            pos += 1
+            if waiting is ticket:
+                return pos
+        return 0
+
+    def get_stats(self) -> dict:
+        """풀 통계"""
+        return {
+            "size": self.size,
+            "workers": len(self._workers),
+            "idle": len(self._idle),
+            "busy": len(self._leases),
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "leases_total": self.leases_total,
+            "rejected_total": self.rejected_total,
+        }
+
+    # ------------------------------------------------------------------
+    # 워커 생성
+    # ------------------------------------------------------------------
+    async def _create_worker(self) -> AgentWorker:
+        """전용 스레드에서 A1을 생성 (생성자가 수십 초 걸릴 수 있음)"""
+        self._pending_creations += 1
+        try:
+            loop = asyncio.get_running_loop()
+            agent = await loop.run_in_executor(self.executor, self._factory)
+        finally:
+            self._pending_creations -= 1
+        worker = AgentWorker(worker_id=len(self._workers), agent=agent)
+        self._workers.append(worker)
+        print(f"[AgentPool] Worker #{worker.worker_id} ready ({len(self._workers)}/{self.size})")
+        return worker
+
+    async def warm_up(self) -> None:
+        """풀 크기만큼 워커를 미리 생성"""
+        missing = self.size - len(self._workers) - self._pending_creations
+        if missing <= 0:
+            return
+        workers = await asyncio.gather(*[self._create_worker() for _ in range(missing)])
+        for worker in workers:
+            self._release_to_waiters_or_idle(worker)
+
+    # ------------------------------------------------------------------
+    # 임대 / 반납
+    # ------------------------------------------------------------------
+    def enqueue(self, session_id: str) -> PoolTicket:
+        """
+        워커 임대 요청 등록
+
+        유휴 워커가 있으면 즉시 배정된 대기표를 반환하고,
+        없으면 대기열에 등록한다.
+
+        Raises:
+            PoolFullError: 대기열이 가득 찬 경우
+        """
+        loop = asyncio.get_running_loop()
+        ticket = PoolTicket(session_id=session_id, future=loop.create_future())
+
+        worker = self._pick_idle(session_id)
+        if worker is not None:
+            self._assign(ticket, worker)
+            return ticket
+
+        if self.queue_depth >= self.max_queue and len(self._workers) + self._pending_creations >= self.size:
+            self.rejected_total += 1
+            raise PoolFullError(f"Agent queue is full ({self.max_queue} requests waiting)")
+
+        self._waiters.append(ticket)
+        return ticket
+
+    async def acquire(self, ticket: PoolTicket) -> AgentWorker:
+        """
+        대기표에 워커가 배정될 때까지 대기
+
+        아직 생성되지 않은 워커 슬롯이 있으면 직접 생성해서 사용한다.
+        """
+        if not ticket.future.done() and len(self._workers) + self._pending_creations < self.size:
+            worker = await self._create_worker()
+            # 생성하는 동안 다른 워커가 먼저 배정되었다면 새 워커는 다음 대기자에게 넘긴다
+            if ticket.future.done():
+                self._release_to_waiters_or_idle(worker)
+            else:
+                self._remove_waiter(ticket)
+                self._assign(ticket, worker)
+        return await asyncio.shield(ticket.future)
+
+    def release(self, worker: AgentWorker) -> None:
+        """워커 반납"""
+        self._leases.pop(worker.worker_id, None)
+        self._release_to_waiters_or_idle(worker)
+
+    def cancel(self, ticket: PoolTicket) -> None:
+        """
+        대기 취소 (클라이언트 연결 종료 등)
+        이미 워커가 배정된 경우에는 반납한다.
+        """
+        self._remove_waiter(ticket)
+        if ticket.future.done() and not ticket.future.cancelled() and ticket.future.exception() is None:
+            worker = ticket.future.result()
+            if self._leases.get(worker.worker_id) == ticket.session_id:
+                self.release(worker)
+        elif not ticket.future.done():
+            ticket.future.cancel()
+
+    def run(self, func: Callable, *args):
+        """풀 전용 스레드풀에서 동기 함수 실행 (워커당 스레드 1개)"""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.executor, func, *args)
+
+    def shutdown(self) -> None:
+        """스레드풀 종료"""
+        for ticket in self._waiters:
+            if not ticket.future.done():
+                ticket.future.cancel()
+        self._waiters.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # 내부 헬퍼
+    # ------------------------------------------------------------------
+    def _pick_idle(self, session_id: str) -> Optional[AgentWorker]:
+        """같은 세션이 마지막으로 사용한 워커를 우선 선택"""
+        if not self._idle:
+            return None
+        for i, worker in enumerate(self._idle):
+            if worker.last_session_id == session_id:
+                return self._idle.pop(i)
+        return self._idle.pop(0)
+
+    def _assign(self, ticket: PoolTicket, worker: AgentWorker) -> None:
+        worker.last_session_id = ticket.session_id
+        worker.runs += 1
+        self._leases[worker.worker_id] = ticket.session_id
+        self.leases_total += 1
+        ticket.future.set_result(worker)
+
+    def _remove_waiter(self, ticket: PoolTicket) -> None:
+        try:
+            self._waiters.remove(ticket)
+        except ValueError:
+            pass
+
+    def _release_to_waiters_or_idle(self, worker: AgentWorker) -> None:
+        while self._waiters:
+            ticket = self._waiters.popleft()
+            if ticket.future.done():
+                continue
+            self._assign(ticket, worker)
+            return
+        self._idle.append(worker)
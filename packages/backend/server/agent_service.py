@@ -3,99 +3,125 @@ Biomni Agent 서비스
 Biomni AI 에이전트를 래핑하고 세션을 관리
 """
 
-from typing import Dict, AsyncGenerator
+from typing import AsyncGenerator, List, Optional
 import uuid
 from datetime import datetime
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import os
+import re
+import threading
+
+from agent_pool import AgentPool, PoolFullError
+from session_store import create_session_store
 
 # Biomni 임포트 시도
 try:
     from biomni.agent import A1
-    from biomni.config import default_config
+    from biomni.config import BiomniConfig, default_config
+    from biomni.execution import release_session as release_execution_session
+    from biomni.http_client import get_http_client
+    from biomni.llm import get_llm_pool_stats
+    from biomni.response_cache import get_response_cache
+    from biomni.tool.api_translation import get_schema_stats, get_translation_cache
     BIOMNI_AVAILABLE = True
 except ImportError:
     print("Warning: Biomni not installed. Agent features will be disabled.")
     BIOMNI_AVAILABLE = False
 
 
+# 요청의 config로 지정할 수 있지만 풀 워커 생성 시 고정되는 설정 (풀 설정과 다르면 요청을 거절)
+POOLED_CONFIG_FIELDS = ("llm", "timeout_seconds", "use_tool_retriever")
+
+# 에이전트 계획 체크리스트 줄 (예: "1. [✓] 첫 번째 단계")
+PLAN_LINE_RE = re.compile(r"^\s*\d+\.\s*\[[ ✓✗xX]?\]")
+
+
 class BiomniAgentService:
     """Biomni AI 에이전트 서비스"""
     
+    # 대기 중인 요청에 순번 이벤트를 다시 보내는 주기 (초)
+    QUEUE_POLL_SECONDS = 2.0
+
     def __init__(self):
         """에이전트 서비스 초기화"""
-        self.sessions: Dict[str, dict] = {}
-        self.agent = None
-        self.executor = ThreadPoolExecutor(max_workers=1)
-    
-    def _get_agent(self, config=None):
+        self.store = create_session_store(on_evict=self._on_session_evicted)
+        self.agent_config = self._resolve_agent_config() if BIOMNI_AVAILABLE else None
+        pool_size = int(os.getenv("BIOMNI_AGENT_POOL_SIZE", "2"))
+        max_queue = int(os.getenv("BIOMNI_AGENT_MAX_QUEUE", "8"))
+        self.pool = AgentPool(self._create_agent, size=pool_size, max_queue=max_queue)
+
+    def _resolve_agent_config(self) -> "BiomniConfig":
+        """
+        풀의 모든 워커가 공유하는 고정 설정 (서버 시작 시 한 번 결정)
+
+        BiomniConfig()는 생성 시점의 BIOMNI_* 환경 변수(.env 포함)를 읽는다.
+        데이터베이스 도구는 default_config의 llm/source를 사용하므로, 워커가 생기기 전에
+        여기서 한 번만 반영하고 이후에는 전역 설정을 바꾸지 않는다.
+        """
+        config = BiomniConfig()
+        if not os.getenv("BIOMNI_TIMEOUT_SECONDS"):
+            config.timeout_seconds = 1200
+        if not config.source:
+            env_source = os.getenv("LLM_SOURCE")
+            if env_source:
+                config.source = env_source
+            elif config.llm and config.llm.startswith("gpt-"):
+                config.source = "OpenAI"
+
+        # OpenAI 모델 사용 시 API Key 확인 (유연한 폴백: env → default_config.api_key)
+        if config.source == "OpenAI":
+            config.api_key = os.getenv("OPENAI_API_KEY") or config.api_key
+            # 강제 예외 대신 경고만 출력하고 진행 (get_llm에서도 env를 재확인)
+            if not config.api_key:
+                print(
+                    "[WARN] OPENAI_API_KEY가 감지되지 않았습니다. .env 또는 환경 변수 설정을 확인하세요."
+                )
+
+        for field in ("llm", "source", "timeout_seconds", "use_tool_retriever", "path"):
+            setattr(default_config, field, getattr(config, field))
+
+        print(f"Agent pool config: LLM {config.llm} ({config.source}), data path {config.path}, "
+              f"tool retriever {config.use_tool_retriever}, timeout {config.timeout_seconds}s")
+        return config
+
+    def _config_mismatch(self, config) -> List[str]:
+        """요청 config 중 풀의 고정 설정과 다르게 지정된 항목"""
+        if config is None or self.agent_config is None:
+            return []
+        mismatched = []
+        for field in POOLED_CONFIG_FIELDS:
+            requested = getattr(config, field, None)
+            if requested is not None and requested != getattr(self.agent_config, field):
+                mismatched.append(f"{field}={getattr(self.agent_config, field)}")
+        return mismatched
+
+    def _create_agent(self):
         """
-        Biomni 에이전트 인스턴스 가져오기
-        싱글톤 패턴으로 하나의 에이전트만 사용
+        Biomni 에이전트 인스턴스 생성
+        AgentPool이 워커를 만들 때 전용 스레드에서 호출 (전역 설정은 읽기만 한다)
         """
         if not BIOMNI_AVAILABLE:
             raise Exception("Biomni is not installed")
-        
-        if self.agent is None:
-            llm = config.llm if config and hasattr(config, "llm") else "gpt-5-mini"
-            data_path = "./data"
-            use_tool_retriever = config.use_tool_retriever if config and hasattr(config, 'use_tool_retriever') else True
-            timeout_seconds = config.timeout_seconds if config and hasattr(config, 'timeout_seconds') else 1200
-
-            resolved_source = None
-            if config and hasattr(config, "source") and config.source:
-                resolved_source = config.source
-            else:
-                env_source = os.getenv("LLM_SOURCE")
-                if env_source:
-                    resolved_source = env_source
-                elif llm and llm.startswith("gpt-"):
-                    resolved_source = "OpenAI"
 
-            # OpenAI 모델 사용 시 API Key 확인 (유연한 폴백: config.api_key → env → default_config.api_key)
-            resolved_api_key = None
-            if config and hasattr(config, "api_key") and config.api_key:
-                resolved_api_key = config.api_key
-            elif resolved_source == "OpenAI":
-                resolved_api_key = os.getenv("OPENAI_API_KEY") or getattr(default_config, "api_key", None)
-                # 강제 예외 대신 경고만 출력하고 진행 (get_llm에서도 env를 재확인)
-                if not resolved_api_key:
-                    print(
-                        "[WARN] OPENAI_API_KEY가 감지되지 않았습니다. .env 또는 환경 변수 설정을 확인하세요."
-                    )
-            
-            print(f"Initializing Biomni agent with LLM: {llm}")
-            print(f"Data path: {data_path}")
-            print(f"Use tool retriever: {use_tool_retriever}")
-            print(f"Timeout: {timeout_seconds}s")
-            
-            # IMPORTANT: Configure default_config for ALL operations (agent + database queries)
-            # According to Biomni docs, direct A1() params only affect agent reasoning
-            default_config.llm = llm
-            default_config.source = resolved_source
-            default_config.timeout_seconds = timeout_seconds
-            default_config.use_tool_retriever = use_tool_retriever
-            default_config.path = data_path
-            
-            print("✅ default_config updated for consistent OpenAI/Gemini usage")
-            
-            # Biomni A1 에이전트 초기화
-            # default_config를 사용하므로 파라미터 없이 초기화
-            agent_kwargs = {}
-            if resolved_api_key:
-                agent_kwargs["api_key"] = resolved_api_key
-            self.agent = A1(**agent_kwargs)
-            
-            # 에이전트 설정 (self_critic 모드)
-            self.agent.configure(
-                self_critic=False,          # 자기 비평 모드
-                test_time_scale_round=0     # 테스트 타임 스케일링 라운드 수
-            )
-            
-            print("✅ Biomni agent initialized successfully")
+        config = self.agent_config
+        agent = A1(
+            path=config.path,
+            llm=config.llm,
+            source=config.source,
+            use_tool_retriever=config.use_tool_retriever,
+            timeout_seconds=config.timeout_seconds,
+            api_key=config.api_key,
+        )
+        
+        # 에이전트 설정 (self_critic 모드)
+        agent.configure(
+            self_critic=False,          # 자기 비평 모드
+            test_time_scale_round=0     # 테스트 타임 스케일링 라운드 수
+        )
+        
+        print("✅ Biomni agent initialized successfully")
         
-        return self.agent
+        return agent
     
     def create_session(self) -> str:
         """
@@ -104,25 +130,47 @@ class BiomniAgentService:
         Returns:
             str: 생성된 세션 ID
         """
+        # 만료된 세션 정리
+        self.store.evict_expired()
+        
         session_id = str(uuid.uuid4())
-        self.sessions[session_id] = {
-            "messages": [],
-            "created_at": datetime.now()
-        }
+        self.store.create(session_id)
         print(f"Session created: {session_id}")
         return session_id
     
-    def get_session(self, session_id: str) -> dict:
+    def get_session(
+        self,
+        session_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        include_log: bool = False
+    ) -> Optional[dict]:
         """
         세션 조회
         
         Args:
             session_id: 세션 ID
+            offset: 첫 메시지 인덱스
+            limit: 최대 메시지 수 (None이면 전체)
+            include_log: assistant 메시지의 full_log 포함 여부
             
         Returns:
-            dict: 세션 데이터
+            dict: 세션 데이터 (없으면 None)
         """
-        return self.sessions.get(session_id)
+        return self.store.get_session(session_id, offset=offset, limit=limit, include_log=include_log)
+    
+    def get_message_log(self, session_id: str, index: int) -> Optional[str]:
+        """
+        메시지의 전체 실행 로그(full_log) 조회
+        
+        Args:
+            session_id: 세션 ID
+            index: 메시지 인덱스
+            
+        Returns:
+            str: 전체 로그 (없으면 None)
+        """
+        return self.store.get_full_log(session_id, index)
     
     def delete_session(self, session_id: str) -> bool:
         """
@@ -134,12 +182,17 @@ class BiomniAgentService:
         Returns:
             bool: 삭제 성공 여부
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        if self.store.delete(session_id):
+            self._on_session_evicted(session_id)
             print(f"Session deleted: {session_id}")
             return True
         return False
     
+    def _on_session_evicted(self, session_id: str) -> None:
+        """세션이 삭제/만료되면 세션 전용 코드 실행 워커 정리"""
+        if BIOMNI_AVAILABLE:
+            release_execution_session(session_id)
+    
     async def stream_response(
         self,
         session_id: str,
@@ -157,46 +210,122 @@ class BiomniAgentService:
         Yields:
             dict: 스트리밍 청크
         """
-        # 세션 확인
-        if session_id not in self.sessions:
+        # 풀 워커는 하나의 고정 설정으로 만들어지므로, 다른 모델 설정을 요청하면 거절
+        mismatched = self._config_mismatch(config)
+        if mismatched:
+            yield {
+                "type": "error",
+                "content": f"이 서버의 에이전트는 고정된 설정으로 실행됩니다: {', '.join(mismatched)}",
+                "timestamp": datetime.now().isoformat()
+            }
+            return
+
+        # 세션 확인 + 실행이 끝날 때까지 TTL/LRU 제거 대상에서 제외 (finally에서 해제)
+        if not self.store.pin(session_id):
             yield {
                 "type": "error",
                 "content": "Session not found",
                 "timestamp": datetime.now().isoformat()
             }
             return
-        
+
         # 사용자 메시지 저장
-        self.sessions[session_id]["messages"].append({
+        self.store.append_message(session_id, {
             "role": "user",
             "content": message,
             "timestamp": datetime.now()
         })
         
+        # 에이전트 풀에 임대 요청 (대기열이 가득 차면 즉시 거절)
         try:
-            # 에이전트 가져오기
-            agent = self._get_agent(config)
+            ticket = self.pool.enqueue(session_id)
+        except PoolFullError as e:
+            self.store.unpin(session_id)
+            print(f"[Session {session_id}] Rejected: {e}")
+            yield {
+                "type": "error",
+                "content": "현재 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                "timestamp": datetime.now().isoformat()
+            }
+            return
+        
+        worker = None
+        run_future = None
+        cancel_event = threading.Event()
+        try:
+            # 워커 배정 대기 (대기 중에는 순번 이벤트 전송)
+            acquire_task = asyncio.ensure_future(self.pool.acquire(ticket))
+            last_position = None
+            while not acquire_task.done():
+                position = self.pool.position(ticket)
+                if position and position != last_position:
+                    last_position = position
+                    yield {
+                        "type": "queue",
+                        "content": f"대기 중입니다... (대기 순번: {position})",
+                        "position": position,
+                        "timestamp": datetime.now().isoformat()
+                    }
+                await asyncio.wait({acquire_task}, timeout=self.QUEUE_POLL_SECONDS)
+            worker = acquire_task.result()
+            agent = worker.agent
             
             # 시작 메시지
-            print(f"[Session {session_id}] Starting Biomni agent for message: {message[:100]}...")
+            print(f"[Session {session_id}] Starting Biomni agent #{worker.worker_id} for message: {message[:100]}...")
             yield {
                 "type": "start",
                 "content": "Biomni agent 실행 중... 유전자 분석을 시작합니다.",
                 "timestamp": datetime.now().isoformat()
             }
             
-            # agent.go()는 동기 함수이므로 ThreadPoolExecutor에서 실행
-            print(f"[Session {session_id}] Executing agent.go()...")
-            loop = asyncio.get_event_loop()
-            log, final_result = await loop.run_in_executor(
-                self.executor,
-                agent.go,
-                message
+            # agent.go_stream()을 풀 전용 스레드에서 실행하고, 각 단계를 asyncio 큐로 전달받아 즉시 전송
+            print(f"[Session {session_id}] Executing agent.go_stream()...")
+            stream_tokens = getattr(config, "stream_tokens", None) if config else None
+            if stream_tokens is None:
+                stream_tokens = os.getenv("BIOMNI_STREAM_TOKENS", "false").lower() == "true"
+            queue: asyncio.Queue = asyncio.Queue()
+            run_future = self.pool.run(
+                self._run_agent_stream,
+                agent,
+                message,
+                session_id,
+                stream_tokens,
+                asyncio.get_running_loop(),
+                queue,
+                cancel_event
             )
             
+            log = []
+            usage = {}
+            final_result = None
+            last_plan = ""
+            while True:
+                kind, payload = await queue.get()
+                if kind == "done":
+                    break
+                if kind == "error":
+                    raise payload
+                
+                if payload.get("type") == "final":
+                    final_result = payload.get("content")
+                    log = payload.get("log", [])
+                    usage = payload.get("usage") or {}
+                    continue
+                
+                for chunk in self._step_to_chunks(payload, last_plan):
+                    if chunk["type"] == "plan":
+                        last_plan = chunk["content"]
+                    yield chunk
+            
             print(f"[Session {session_id}] Agent execution completed")
             print(f"[Session {session_id}] Log entries: {len(log)}")
             print(f"[Session {session_id}] Result length: {len(final_result) if final_result else 0}")
+            if usage:
+                print(
+                    f"[Session {session_id}] Tokens: input={usage.get('input_tokens', 0)} "
+                    f"cached={usage.get('cached_tokens', 0)} output={usage.get('output_tokens', 0)} "
+                    f"(cache hit {usage.get('cache_hit_ratio', 0.0):.0%})"
+                )
             
             # 결과 검증
             if not final_result or len(final_result.strip()) == 0:
@@ -209,77 +338,9 @@ class BiomniAgentService:
                 }
                 return
             
-            # 로그에서 '생각', '계획' 추출 (휴리스틱)
-            try:
-                full_log_text = "\n".join([str(entry) for entry in log])
-                # 기본 인덱스 찾기
-                idx_thought = full_log_text.find("생각")
-                # '생각 및 계획' 케이스 포함
-                if idx_thought == -1:
-                    idx_thought = full_log_text.find("생각 및 계획")
-                idx_plan = full_log_text.find("계획")
-                # 종료 후보들
-                end_markers = [
-                    "진행 상황 업데이트",
-                    "</solution>",
-                    "<solution>",
-                    "당뇨",
-                    "최종",
-                    "Ai Message",
-                ]
-                def find_next(start_idx: int) -> int:
-                    cands = [full_log_text.find(m, start_idx + 1) for m in end_markers]
-                    cands = [c for c in cands if c != -1]
-                    return min(cands) if cands else -1
-                thinking_text = ""
-                plan_text = ""
-                if idx_thought != -1 and (idx_plan == -1 or idx_thought < idx_plan):
-                    end_idx = idx_plan if idx_plan != -1 else find_next(idx_thought)
-                    end_idx = end_idx if end_idx != -1 else idx_thought + 1200
-                    thinking_text = full_log_text[idx_thought:end_idx].strip()
-                if idx_plan != -1:
-                    end_idx = find_next(idx_plan)
-                    end_idx = end_idx if end_idx != -1 else idx_plan + 2000
-                    plan_text = full_log_text[idx_plan:end_idx].strip()
-                # 헤더 줄 제거 (처음 줄에 '생각'/'계획' 단어만 있을 때)
-                def clean_section(s: str) -> str:
-                    lines = s.splitlines()
-                    if lines and ("생각" in lines[0] or "계획" in lines[0]):
-                        return "\n".join(lines[1:]).strip()
-                    return s.strip()
-                thinking_text = clean_section(thinking_text)
-                plan_text = clean_section(plan_text)
-            except Exception as _:
-                thinking_text = ""
-                plan_text = ""
-            
-            # 필요한 정보만 순서대로 전송: 생각 -> 계획 -> 최종 결과
-            if thinking_text:
-                yield {
-                    "type": "thinking",
-                    "content": thinking_text,
-                    "timestamp": datetime.now().isoformat()
-                }
-            if plan_text:
-                yield {
-                    "type": "plan",
-                    "content": plan_text,
-                    "timestamp": datetime.now().isoformat()
-                }
-            
             # 최종 결과 전송 (연구결과)
             print(f"[Session {session_id}] Sending final result to client")
-            # <solution>...</solution> 내부만 추출하여 보고서 본문으로 전달
-            def extract_solution(text: str) -> str:
-                try:
-                    start = text.find("<solution>")
-                    end = text.find("</solution>")
-                    if start != -1 and end != -1 and end > start:
-                        return text[start + len("<solution>"):end].strip()
-                    return text.strip()
-                except Exception:
-                    return text.strip()
-            report_only = extract_solution(final_result)
+            report_only = self._extract_solution(final_result)
             yield {
                 "type": "result",
                 "content": report_only,
@@ -288,12 +349,17 @@ class BiomniAgentService:
             
             # 결과를 세션에 저장
             full_log = "\n".join([str(entry) for entry in log])
-            self.sessions[session_id]["messages"].append({
-                "role": "assistant",
-                "content": report_only,
-                "full_log": full_log,
-                "timestamp": datetime.now()
-            })
+            try:
+                self.store.append_message(session_id, {
+                    "role": "assistant",
+                    "content": report_only,
+                    "full_log": full_log,
+                    "usage": {k: v for k, v in usage.items() if k != "steps"},
+                    "timestamp": datetime.now()
+                })
+            except KeyError:
+                # 실행 중에 사용자가 세션을 삭제한 경우: 결과는 이미 전송했으므로 저장만 생략
+                print(f"[Session {session_id}] Session deleted during run; result not stored")
             
             print(f"[Session {session_id}] Research completed successfully")
             
@@ -314,8 +380,141 @@ class BiomniAgentService:
                 "content": f"에이전트 실행 중 오류가 발생했습니다: {error_msg}",
                 "timestamp": datetime.now().isoformat()
             }
+        finally:
+            # 워커 반납 (대기 중 연결이 끊긴 경우에는 대기 취소)
+            if worker is None:
+                self.pool.cancel(ticket)
+            elif run_future is not None and not run_future.done():
+                # 실행 도중 연결이 끊긴 경우 다음 단계에서 실행을 멈추고, 스레드가 끝난 뒤에 반납
+                cancel_event.set()
+                run_future.add_done_callback(lambda _f, w=worker: self.pool.release(w))
+            else:
+                self.pool.release(worker)
+            self.store.unpin(session_id)
+    
+    @staticmethod
+    def _run_agent_stream(agent, message, session_id, stream_tokens, loop, queue, cancel_event):
+        """
+        워커 스레드에서 agent.go_stream()을 실행하고 각 이벤트를 이벤트 루프의 큐로 전달
+        
+        큐에는 ("event", dict), ("error", Exception), ("done", None) 튜플이 들어간다.
+        """
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 경우
+                pass
+        
+        try:
+            stream = agent.go_stream(message, session_id=session_id, stream_tokens=stream_tokens)
+            for event in stream:
+                emit(("event", event))
+                if cancel_event.is_set():
+                    print(f"[Session {session_id}] Client disconnected, stopping agent")
+                    stream.close()
+                    break
+        except Exception as e:
+            emit(("error", e))
+            return
+        emit(("done", None))
+    
+    @classmethod
+    def _step_to_chunks(cls, event: dict, last_plan: str) -> List[dict]:
+        """
+        go_stream() 이벤트를 SSE 청크(status/token/thinking/plan/code/observation)로 변환
+        """
+        timestamp = datetime.now().isoformat()
+        event_type = event.get("type")
+        content = event.get("content") or ""
+        
+        if event_type == "retrieval":
+            return [{"type": "status", "content": content, "timestamp": timestamp}]
+        if event_type == "token":
+            return [{"type": "token", "content": content, "timestamp": timestamp}]
+        if event_type == "observation":
+            observation = re.sub(r"</?observation>", "", content).strip()
+            return [{"type": "observation", "content": observation, "step": event.get("step"), "timestamp": timestamp}]
+        if event_type not in ("execute", "solution", "message"):
+            return []
+        
+        chunks = []
+        thinking = cls._extract_thinking(content)
+        if thinking:
+            chunks.append({"type": "thinking", "content": thinking, "step": event.get("step"), "timestamp": timestamp})
+        plan = cls._extract_plan(content)
+        if plan and plan != last_plan:
+            chunks.append({"type": "plan", "content": plan, "step": event.get("step"), "timestamp": timestamp})
+        if event_type == "execute":
+            code_match = re.search(r"<execute>(.*?)</execute>", content, re.DOTALL)
+            if code_match:
+                chunks.append({
+                    "type": "code",
+                    "content": code_match.group(1).strip(),
+                    "step": event.get("step"),
+                    "timestamp": timestamp
+                })
+        return chunks
+    
+    @staticmethod
+    def _extract_thinking(text: str) -> str:
+        """<execute>/<solution> 태그 이전의 추론 텍스트 (체크리스트 줄 제외)"""
+        text = re.sub(r"</?think>", "", text)
+        cut = len(text)
+        for tag in ("<execute>", "<solution>"):
+            idx = text.find(tag)
+            if idx != -1:
+                cut = min(cut, idx)
+        lines = [line for line in text[:cut].splitlines() if not PLAN_LINE_RE.match(line)]
+        return "\n".join(lines).strip()
+    
+    @staticmethod
+    def _extract_plan(text: str) -> str:
+        """'1. [ ] 단계' 형식의 체크리스트 줄만 추출"""
+        return "\n".join(line.strip() for line in text.splitlines() if PLAN_LINE_RE.match(line))
+    
+    @staticmethod
+    def _extract_solution(text: str) -> str:
+        """<solution>...</solution> 내부만 추출하여 보고서 본문으로 사용"""
+        start = text.find("<solution>")
+        end = text.find("</solution>")
+        if start != -1 and end != -1 and end > start:
+            return text[start + len("<solution>"):end].strip()
+        return text.strip()
+    
+    def has_capacity(self) -> bool:
+        """새 요청을 받을 수 있는지 확인 (대기열 포함)"""
+        return self.pool.has_capacity()
+    
+    def get_pool_stats(self) -> dict:
+        """에이전트 풀 통계 조회"""
+        return self.pool.get_stats()
+    
+    def get_http_stats(self) -> dict:
+        """외부 API 호스트별 요청/재시도/지연 시간 통계 조회"""
+        if not BIOMNI_AVAILABLE:
+            return {}
+        return get_http_client().get_stats()
+    
+    def get_response_cache_stats(self) -> dict:
+        """DB 조회 응답 캐시의 적중률/크기 통계 조회"""
+        if not BIOMNI_AVAILABLE:
+            return {}
+        return get_response_cache().get_stats()
+    
+    def get_llm_client_stats(self) -> dict:
+        """get_llm 클라이언트 풀 통계 (재사용 횟수, 클라이언트 수)"""
+        if not BIOMNI_AVAILABLE:
+            return {}
+        return get_llm_pool_stats()
+    
+    def get_translation_stats(self) -> dict:
+        """자연어 → API 호출 변환 캐시 통계 (적중 시 LLM 호출 1회 절약)"""
+        if not BIOMNI_AVAILABLE:
+            return {}
+        return {"translations": get_translation_cache().get_stats(), "schemas": get_schema_stats()}
     
     def get_session_count(self) -> int:
         """활성 세션 개수 조회"""
-        return len(self.sessions)
+        return self.store.count()
 
@@ -0,0 +1,302 @@
+"""
+블록체인 제출 워커
+연구 결과 저장 트랜잭션을 백그라운드에서 묶어서(batch) 전송하고, 결과는 작업(job) 상태로 조회
+"""
+
+import asyncio
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+FINAL_STATUSES = ("confirmed", "failed")
+
+
+@dataclass
+class SubmissionJob:
+    """블록체인 저장 작업 (queued → submitted → confirmed | failed)"""
+    job_id: str
+    session_id: str
+    researcher_address: str
+    result_data: str
+    status: str = "queued"
+    nonce: Optional[int] = None
+    transaction_hash: Optional[str] = None
+    research_id: Optional[int] = None
+    block_number: Optional[int] = None
+    gas_used: Optional[int] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    version: int = 0
+
+    @property
+    def is_final(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 딕셔너리 (결과 본문은 제외)"""
+        data = asdict(self)
+        data.pop("result_data")
+        return data
+
+
+class BlockchainSubmitter:
+    """
+    백그라운드 블록체인 제출 워커
+
+    - 전송은 단일 스레드에서 순서대로 처리하고 nonce를 로컬에서 증가시켜 동시 제출 시 충돌 방지
+    - 대기 중인 작업을 batch_size만큼 모아 가스 가격 조회를 한 번만 수행
+    - 영수증 대기는 별도 스레드 풀에서 처리하므로 다음 트랜잭션 전송을 막지 않음
+    - 상태가 바뀔 때마다 이벤트 루프의 대기자(wait_for_update)를 깨움
+
+    service는 BlockchainService와 같은 메서드(is_configured, get_pending_nonce, build_store_transaction,
+    send_raw_transaction, wait_for_receipt, w3.eth.gas_price)를 가진 객체면 되므로
+    Hardhat 로컬 노드나 테스트용 가짜 체인으로 교체할 수 있다.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        batch_size: int = 8,
+        batch_wait_seconds: float = 0.2,
+        receipt_workers: int = 4,
+        receipt_timeout: float = 120,
+        max_jobs: int = 1000
+    ):
+        """
+        Args:
+            service: 트랜잭션 생성/전송을 담당하는 블록체인 서비스
+            batch_size: 한 번에 묶어서 전송할 최대 작업 수
+            batch_wait_seconds: 첫 작업 이후 추가 작업을 기다리는 시간
+            receipt_workers: 영수증 대기용 스레드 수
+            receipt_timeout: 영수증 최대 대기 시간 (초)
+            max_jobs: 메모리에 보관할 최대 작업 수 (완료된 오래된 작업부터 삭제)
+        """
+        self.service = service
+        self.batch_size = max(1, batch_size)
+        self.batch_wait_seconds = max(0.0, batch_wait_seconds)
+        self.receipt_timeout = receipt_timeout
+        self.max_jobs = max(1, max_jobs)
+
+        self._queue: "queue.Queue[Optional[SubmissionJob]]" = queue.Queue()
+        self._jobs: "OrderedDict[str, SubmissionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._receipts = ThreadPoolExecutor(max_workers=max(1, receipt_workers), thread_name_prefix="blockchain-receipt")
+        self._thread: Optional[threading.Thread] = None
+        self._next_nonce: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._events: Dict[str, asyncio.Event] = {}
+        self._closed = False
+
+        self.stats = {
+            "submitted": 0,
+            "confirmed": 0,
+            "failed": 0,
+            "batches": 0,
+            "nonce_resyncs": 0,
+        }
+
+    def submit(self, researcher_address: str, result_data: str, session_id: str) -> SubmissionJob:
+        """
+        저장 작업 등록 (즉시 반환)
+
+        Returns:
+            SubmissionJob: 등록된 작업 (상태는 get_job으로 조회)
+        """
+        if self._closed:
+            raise RuntimeError("Blockchain submitter is shut down")
+
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+        job = SubmissionJob(
+            job_id=str(uuid.uuid4()),
+            session_id=session_id,
+            researcher_address=researcher_address,
+            result_data=result_data
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim_jobs_locked()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="blockchain-sender", daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[SubmissionJob]:
+        """작업 조회"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs_for_session(self, session_id: str) -> List[SubmissionJob]:
+        """세션의 작업 목록 (등록 순)"""
+        with self._lock:
+            return [job for job in self._jobs.values() if job.session_id == session_id]
+
+    async def wait_for_update(self, job_id: str, seen_version: int, timeout: float = 15) -> Optional[SubmissionJob]:
+        """
+        작업 상태가 seen_version 이후로 바뀔 때까지 대기
+
+        Returns:
+            Optional[SubmissionJob]: 작업 (없으면 None, 시간 초과 시 변경 없는 작업 그대로)
+        """
+        self._loop = asyncio.get_running_loop()
+        job = self.get_job(job_id)
+        if job is None or job.version != seen_version or job.is_final:
+            return job
+
+        event = self._events.get(job_id)
+        if event is None:
+            event = self._events[job_id] = asyncio.Event()
+        # 이벤트를 만든 뒤 다시 확인 (그 사이에 바뀐 상태를 놓치지 않도록)
+        if job.version == seen_version:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.get_job(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """제출 통계"""
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if not job.is_final)
+            return {
+                **self.stats,
+                "pending": pending,
+                "queued": self._queue.qsize(),
+                "tracked_jobs": len(self._jobs),
+                "next_nonce": self._next_nonce,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """워커 종료 (대기 중인 작업은 전송하지 않음)"""
+        self._closed = True
+        self._queue.put(None)
+        if wait and self._thread is not None:
+            self._thread.join(timeout=5)
+        self._receipts.shutdown(wait=wait)
+
+    def _run(self):
+        """전송 스레드: 작업을 묶어서 nonce 순서대로 전송"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            deadline = time.monotonic() + self.batch_wait_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    job = self._queue.get(timeout=max(0.0, remaining)) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._queue.put(None)
+                    break
+                batch.append(job)
+
+            self.stats["batches"] += 1
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: List[SubmissionJob]):
+        if not self.service.is_configured():
+            for job in batch:
+                self._fail(job, "Blockchain service not properly configured")
+            return
+
+        try:
+            gas_price = self.service.w3.eth.gas_price
+        except Exception as e:
+            print(f"Gas price lookup failed: {e}, using node default per transaction")
+            gas_price = None
+
+        for job in batch:
+            self._send_one(job, gas_price)
+
+    def _send_one(self, job: SubmissionJob, gas_price: Optional[int]):
+        for attempt in range(2):
+            try:
+                if self._next_nonce is None:
+                    self._next_nonce = self.service.get_pending_nonce()
+                nonce = self._next_nonce
+                raw_tx = self.service.build_store_transaction(
+                    job.researcher_address,
+                    job.result_data,
+                    job.session_id,
+                    nonce,
+                    gas_price
+                )
+                tx_hash = self.service.send_raw_transaction(raw_tx)
+            except Exception as e:
+                # nonce가 어긋난 경우(다른 프로세스가 같은 계정 사용 등) 체인 기준으로 한 번 다시 맞춤
+                if attempt == 0 and _is_nonce_error(e):
+                    self._next_nonce = None
+                    self.stats["nonce_resyncs"] += 1
+                    continue
+                self._fail(job, f"Blockchain storage failed: {e}")
+                return
+
+            self._next_nonce = nonce + 1
+            self.stats["submitted"] += 1
+            self._update(job, status="submitted", nonce=nonce, transaction_hash=tx_hash)
+            self._receipts.submit(self._await_receipt, job)
+            return
+
+    def _await_receipt(self, job: SubmissionJob):
+        try:
+            result = self.service.wait_for_receipt(job.transaction_hash, timeout=self.receipt_timeout)
+        except Exception as e:
+            self._fail(job, f"Blockchain storage failed: {e}")
+            return
+        self.stats["confirmed"] += 1
+        self._update(
+            job,
+            status="confirmed",
+            research_id=result.get("research_id"),
+            block_number=result.get("block_number"),
+            gas_used=result.get("gas_used")
+        )
+        print(f"Blockchain storage confirmed - TX: {job.transaction_hash}")
+
+    def _fail(self, job: SubmissionJob, error: str):
+        print(error)
+        self.stats["failed"] += 1
+        self._update(job, status="failed", error=error)
+
+    def _update(self, job: SubmissionJob, **changes):
+        with self._lock:
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.updated_at = time.time()
+            job.version += 1
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._notify, job.job_id)
+
+    def _notify(self, job_id: str):
+        """이벤트 루프 스레드에서 실행: 현재 대기자를 깨우고 이벤트 제거 (다음 대기자가 새로 생성)"""
+        event = self._events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def _trim_jobs_locked(self):
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if job.is_final]:
+            if len(self._jobs) <= self.max_jobs:
+                break
+            del self._jobs[job_id]
+            self._events.pop(job_id, None)
+
+
+def _is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return "nonce" in message or "replacement transaction underpriced" in message
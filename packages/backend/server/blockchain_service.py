@@ -7,7 +7,7 @@ from web3 import Web3
 from eth_account import Account
 import json
 import os
-from typing import Dict
+from typing import Dict, Optional
 
 
 class BlockchainService:
@@ -116,24 +116,36 @@ class BlockchainService:
             }
         ]
     
-    async def store_research(
+    def is_configured(self) -> bool:
+        """트랜잭션 전송 가능 여부 (컨트랙트 주소와 서버 계정이 설정되어 있는지)"""
+        return self.contract is not None and self.account is not None
+    
+    def get_pending_nonce(self) -> int:
+        """서버 계정의 다음 nonce (대기 중인 트랜잭션 포함)"""
+        return self.w3.eth.get_transaction_count(self.account.address, "pending")
+    
+    def build_store_transaction(
         self,
         researcher_address: str,
         result_data: str,
-        session_id: str
-    ) -> Dict:
+        session_id: str,
+        nonce: int,
+        gas_price: Optional[int] = None
+    ) -> bytes:
         """
-        연구 결과를 블록체인에 저장
+        storeResearch 트랜잭션을 만들고 서명
         
         Args:
             researcher_address: 연구자 지갑 주소
             result_data: 연구 결과 데이터
             session_id: 세션 ID
+            nonce: 사용할 nonce (호출하는 쪽에서 관리)
+            gas_price: 가스 가격 (None이면 체인에서 조회)
             
         Returns:
-            Dict: 트랜잭션 결과
+            bytes: 서명된 raw 트랜잭션
         """
-        if not self.contract or not self.account:
+        if not self.is_configured():
             raise Exception("Blockchain service not properly configured")
         
         # 주소를 체크섬 형식으로 변환
@@ -166,21 +178,35 @@ class BlockchainService:
             session_id
         ).build_transaction({
             'from': self.account.address,
-            'nonce': self.w3.eth.get_transaction_count(self.account.address),
+            'nonce': nonce,
             'gas': gas_limit,
-            'gasPrice': self.w3.eth.gas_price
+            'gasPrice': gas_price if gas_price is not None else self.w3.eth.gas_price
         })
         
         # 트랜잭션 서명
         signed_tx = self.w3.eth.account.sign_transaction(tx, self.account.key)
-        
-        # 트랜잭션 전송
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        
+        return signed_tx.rawTransaction
+    
+    def send_raw_transaction(self, raw_tx: bytes) -> str:
+        """서명된 트랜잭션 전송 후 트랜잭션 해시 반환"""
+        tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
         print(f"Transaction sent: {tx_hash.hex()}")
+        return tx_hash.hex()
+    
+    def wait_for_receipt(self, tx_hash: str, timeout: float = 120) -> Dict:
+        """
+        트랜잭션 영수증 대기 후 결과 반환
         
-        # 트랜잭션 영수증 대기
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        Args:
+            tx_hash: 트랜잭션 해시
+            timeout: 최대 대기 시간 (초)
+            
+        Returns:
+            Dict: 트랜잭션 결과 (transaction_hash, research_id, gas_used, block_number)
+        """
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        if receipt.get('status') == 0:
+            raise Exception(f"Transaction reverted: {tx_hash}")
         
         # 이벤트에서 research_id 추출
         logs = self.contract.events.ResearchStored().process_receipt(receipt)
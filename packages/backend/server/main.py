@@ -3,7 +3,7 @@ Gene Analysis Backend - FastAPI Server
 Biomni AI 에이전트를 활용한 유전자 분석 백엔드 서버
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from sse_starlette.sse import EventSourceResponse
 from dotenv import load_dotenv
@@ -20,6 +20,7 @@ from models import (
 )
 from agent_service import BiomniAgentService
 from blockchain_service import BlockchainService
+from blockchain_queue import BlockchainSubmitter
 
 # 환경 변수 로드 (.env 파일을 여러 위치에서 탐색)
 base_dir = Path(__file__).resolve().parent
@@ -60,9 +61,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 서비스 초기화
-agent_service = BiomniAgentService()
-blockchain_service = BlockchainService()
+# 서비스는 서버 시작 시 생성 (모듈 import만으로는 세션 저장소, 에이전트 풀, 블록체인 연결을 만들지 않음)
+# 실행 워커/forkserver가 이 모듈을 다시 import해도 부작용이 없어야 한다 (biomni.execution 참고)
+agent_service: BiomniAgentService = None
+blockchain_service: BlockchainService = None
+blockchain_submitter: BlockchainSubmitter = None
+
+
+@app.on_event("startup")
+async def init_services():
+    """서비스 초기화"""
+    global agent_service, blockchain_service, blockchain_submitter
+    agent_service = BiomniAgentService()
+    blockchain_service = BlockchainService()
+    blockchain_submitter = BlockchainSubmitter(
+        blockchain_service,
+        batch_size=int(os.getenv("BLOCKCHAIN_BATCH_SIZE", "8")),
+        batch_wait_seconds=float(os.getenv("BLOCKCHAIN_BATCH_WAIT_SECONDS", "0.2")),
+        receipt_timeout=float(os.getenv("BLOCKCHAIN_RECEIPT_TIMEOUT", "120"))
+    )
+
+
+@app.on_event("startup")
+async def warm_up_agents():
+    """서버 시작 시 에이전트 워커 미리 생성 (BIOMNI_AGENT_PREWARM=true 인 경우)"""
+    if os.getenv("BIOMNI_AGENT_PREWARM", "false").lower() == "true":
+        try:
+            await agent_service.pool.warm_up()
+        except Exception as e:
+            print(f"Agent pool warm-up failed: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_agents():
+    """서버 종료 시 에이전트 풀, 세션 저장소 및 블록체인 제출 워커 정리"""
+    agent_service.pool.shutdown()
+    agent_service.store.close()
+    blockchain_submitter.shutdown()
 
 
 @app.get("/")
@@ -85,7 +120,17 @@ async def send_message(request: ChatRequest):
         
     Returns:
         EventSourceResponse: SSE 스트리밍 응답
+        
+    Raises:
+        HTTPException: 에이전트 대기열이 가득 찬 경우 (429)
     """
+    # 백프레셔: 워커와 대기열이 모두 찬 경우 스트림을 열지 않고 즉시 거절
+    if not agent_service.has_capacity():
+        raise HTTPException(
+            status_code=429,
+            detail="Agent queue is full. Please retry later.",
+            headers={"Retry-After": "30"}
+        )
     
     async def event_generator():
         """SSE 이벤트 생성기"""
@@ -128,38 +173,13 @@ async def send_message(request: ChatRequest):
                 }
                 return
             
-            # 블록체인에 저장 중 알림
-            print("Starting blockchain storage...")
-            yield {
-                "event": "storing",
-                "data": json.dumps({
-                    "status": "storing_to_blockchain",
-                    "message": "연구 결과를 블록체인에 저장하는 중...",
-                    "timestamp": datetime.now().isoformat()
-                })
-            }
-            
-            # 블록체인에 저장
+            # 블록체인 저장 작업 등록 (전송과 영수증 대기는 백그라운드 워커가 처리)
             try:
-                blockchain_result = await blockchain_service.store_research(
+                job = blockchain_submitter.submit(
                     researcher_address=request.user_address,
                     result_data=result_text,
                     session_id=request.session_id
                 )
-                
-                print(f"Blockchain storage successful - TX: {blockchain_result['transaction_hash']}")
-                
-                # 블록체인 결과 전송: 해시만 필수 전달
-                yield {
-                    "event": "blockchain",
-                    "data": json.dumps({
-                        "transaction_hash": blockchain_result.get("transaction_hash"),
-                        "research_id": blockchain_result.get("research_id"),
-                        "block_number": blockchain_result.get("block_number"),
-                        "gas_used": blockchain_result.get("gas_used"),
-                    })
-                }
-                
             except Exception as e:
                 error_msg = f"Blockchain storage failed: {str(e)}"
                 print(error_msg)
@@ -171,12 +191,32 @@ async def send_message(request: ChatRequest):
                         "timestamp": datetime.now().isoformat()
                     })
                 }
+                yield {
+                    "event": "done",
+                    "data": json.dumps({
+                        "status": "completed_without_blockchain",
+                        "timestamp": datetime.now().isoformat()
+                    })
+                }
+                return
             
-            # 완료 이벤트
+            print(f"Blockchain storage queued - Job: {job.job_id}")
+            yield {
+                "event": "storing",
+                "data": json.dumps({
+                    "status": "storing_to_blockchain",
+                    "message": "연구 결과를 블록체인에 저장하는 중...",
+                    "job_id": job.job_id,
+                    "timestamp": datetime.now().isoformat()
+                })
+            }
+            
+            # 완료 이벤트 (트랜잭션 결과는 /api/blockchain/jobs/{job_id} 또는 /events 에서 전달)
             yield {
                 "event": "done",
                 "data": json.dumps({
                     "status": "completed",
+                    "job_id": job.job_id,
                     "timestamp": datetime.now().isoformat()
                 })
             }
@@ -212,20 +252,28 @@ async def create_session():
 
 
 @app.get("/api/chat/sessions/{session_id}")
-async def get_session(session_id: str):
+async def get_session(
+    session_id: str,
+    offset: int = Query(default=0, ge=0, description="첫 메시지 인덱스"),
+    limit: int = Query(default=50, ge=1, le=500, description="최대 메시지 수"),
+    include_log: bool = Query(default=False, description="assistant 메시지의 전체 실행 로그 포함 여부")
+):
     """
-    세션 조회
+    세션 조회 (메시지 페이지네이션)
     
     Args:
         session_id: 세션 ID
+        offset: 첫 메시지 인덱스
+        limit: 최대 메시지 수
+        include_log: 전체 실행 로그(full_log) 포함 여부
         
     Returns:
-        dict: 세션 데이터
+        dict: 세션 데이터 (total_messages, offset, limit, messages)
         
     Raises:
         HTTPException: 세션을 찾을 수 없는 경우
     """
-    session = agent_service.get_session(session_id)
+    session = agent_service.get_session(session_id, offset=offset, limit=limit, include_log=include_log)
     
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -233,6 +281,29 @@ async def get_session(session_id: str):
     return session
 
 
+@app.get("/api/chat/sessions/{session_id}/messages/{index}/log")
+async def get_message_log(session_id: str, index: int):
+    """
+    메시지의 전체 실행 로그 조회
+    
+    Args:
+        session_id: 세션 ID
+        index: 메시지 인덱스
+        
+    Returns:
+        dict: 전체 실행 로그
+        
+    Raises:
+        HTTPException: 세션/메시지/로그를 찾을 수 없는 경우
+    """
+    full_log = agent_service.get_message_log(session_id, index)
+    
+    if full_log is None:
+        raise HTTPException(status_code=404, detail="Log not found")
+    
+    return {"session_id": session_id, "index": index, "full_log": full_log}
+
+
 @app.delete("/api/chat/sessions/{session_id}")
 async def delete_session(session_id: str):
     """
@@ -252,6 +323,78 @@ async def delete_session(session_id: str):
     return {"status": "deleted", "session_id": session_id}
 
 
+@app.get("/api/blockchain/jobs/{job_id}")
+async def get_blockchain_job(job_id: str):
+    """
+    블록체인 저장 작업 상태 조회
+    
+    Args:
+        job_id: 작업 ID (send 스트림의 storing/done 이벤트에 포함)
+        
+    Returns:
+        dict: 작업 상태 (queued, submitted, confirmed, failed)와 트랜잭션 정보
+    """
+    job = blockchain_submitter.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/api/blockchain/jobs/{job_id}/events")
+async def stream_blockchain_job(job_id: str):
+    """
+    블록체인 저장 작업 상태를 SSE로 스트리밍 (확정 또는 실패 시 종료)
+    
+    Args:
+        job_id: 작업 ID
+        
+    Returns:
+        EventSourceResponse: status, blockchain, blockchain_error 이벤트
+    """
+    if blockchain_submitter.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_generator():
+        seen_version = -1
+        while True:
+            job = await blockchain_submitter.wait_for_update(job_id, seen_version)
+            if job is None:
+                return
+            if job.version == seen_version:
+                # 변경 없이 시간 초과: 연결 유지를 위한 ping은 sse-starlette가 처리
+                continue
+            seen_version = job.version
+            
+            if job.status == "confirmed":
+                yield {
+                    "event": "blockchain",
+                    "data": json.dumps({
+                        "job_id": job.job_id,
+                        "transaction_hash": job.transaction_hash,
+                        "research_id": job.research_id,
+                        "block_number": job.block_number,
+                        "gas_used": job.gas_used,
+                    })
+                }
+                return
+            if job.status == "failed":
+                yield {
+                    "event": "blockchain_error",
+                    "data": json.dumps({
+                        "job_id": job.job_id,
+                        "error": job.error,
+                        "timestamp": datetime.now().isoformat()
+                    })
+                }
+                return
+            yield {
+                "event": "status",
+                "data": json.dumps(job.to_dict())
+            }
+    
+    return EventSourceResponse(event_generator())
+
+
 @app.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     """
@@ -277,7 +420,13 @@ async def get_stats():
     """
     return {
         "active_sessions": agent_service.get_session_count(),
+        "agent_pool": agent_service.get_pool_stats(),
+        "llm_clients": agent_service.get_llm_client_stats(),
+        "external_apis": agent_service.get_http_stats(),
+        "response_cache": agent_service.get_response_cache_stats(),
+        "api_translation_cache": agent_service.get_translation_stats(),
         "blockchain_connected": blockchain_service.is_connected(),
+        "blockchain_submitter": blockchain_submitter.get_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -16,10 +16,11 @@ class ChatMessage(BaseModel):
 
 
 class AgentConfig(BaseModel):
-    """Biomni 에이전트 설정"""
-    llm: str = Field(default="gpt-5-mini", description="사용할 LLM 모델")
-    timeout_seconds: int = Field(default=1200, description="타임아웃 시간 (초)")
-    use_tool_retriever: bool = Field(default=True, description="도구 검색 사용 여부")
+    """Biomni 에이전트 설정 (llm/timeout_seconds/use_tool_retriever는 서버의 풀 설정과 같을 때만 허용)"""
+    llm: Optional[str] = Field(default=None, description="사용할 LLM 모델 (미지정 시 서버 설정 BIOMNI_LLM)")
+    timeout_seconds: Optional[int] = Field(default=None, description="타임아웃 시간 (초, 미지정 시 서버 설정)")
+    use_tool_retriever: Optional[bool] = Field(default=None, description="도구 검색 사용 여부 (미지정 시 서버 설정)")
+    stream_tokens: Optional[bool] = Field(default=None, description="LLM 토큰 단위 스트리밍 여부 (미지정 시 BIOMNI_STREAM_TOKENS)")
 
 
 class ChatRequest(BaseModel):
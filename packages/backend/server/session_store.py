@@ -0,0 +1,511 @@
+"""
+채팅 세션 저장소
+메모리(LRU) 또는 SQLite 백엔드에 세션과 메시지를 저장하고, TTL이 지난 세션을 정리
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# SQLite 저장소가 last_access를 DB에 다시 쓰는 최소 간격 (초, 그 사이의 접근은 메모리 LRU에만 기록)
+ACCESS_WRITE_SECONDS = 60.0
+
+
+def compress_log(full_log: str) -> bytes:
+    """full_log 문자열을 zlib으로 압축"""
+    return zlib.compress(full_log.encode("utf-8"), 6)
+
+
+def decompress_log(data: Optional[bytes]) -> Optional[str]:
+    """압축된 full_log 복원"""
+    if data is None:
+        return None
+    return zlib.decompress(data).decode("utf-8")
+
+
+class SessionStore(ABC):
+    """
+    세션 저장소 인터페이스
+
+    메시지는 추가만 가능(append-only)하며, 조회 시 offset/limit으로 페이지 단위로 읽는다.
+    assistant 메시지의 full_log는 압축 저장되고 include_log=True이거나 get_full_log()로 요청할 때만 읽는다.
+    pin()으로 고정된 세션(에이전트 실행 중인 세션)은 TTL/LRU로 제거되지 않는다.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, on_evict: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            ttl_seconds: 마지막 접근 후 세션이 유지되는 시간 (None이면 만료 없음)
+            on_evict: 세션이 만료/LRU로 제거될 때 호출되는 콜백 (session_id)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._pins: Dict[str, int] = {}
+        self._pin_lock = threading.Lock()
+
+    @abstractmethod
+    def create(self, session_id: str) -> dict:
+        ...
+
+    @abstractmethod
+    def exists(self, session_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def append_message(self, session_id: str, message: dict) -> int:
+        """메시지 추가 후 메시지 인덱스 반환"""
+
+    @abstractmethod
+    def get_session(
+        self, session_id: str, offset: int = 0, limit: Optional[int] = None, include_log: bool = False
+    ) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def get_full_log(self, session_id: str, index: int) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def evict_expired(self) -> int:
+        """TTL이 지난 세션 제거 후 제거한 개수 반환"""
+
+    def pin(self, session_id: str) -> bool:
+        """
+        세션을 제거 대상에서 제외 (unpin()과 쌍으로 호출)
+
+        고정한 뒤 존재 여부를 확인하므로, True를 반환하면 unpin() 전까지 TTL/LRU로 제거되지 않는다.
+
+        Returns:
+            bool: 세션이 존재하면 True (없으면 고정하지 않음)
+        """
+        with self._pin_lock:
+            self._pins[session_id] = self._pins.get(session_id, 0) + 1
+        if self.exists(session_id):
+            return True
+        self.unpin(session_id)
+        return False
+
+    def unpin(self, session_id: str) -> None:
+        with self._pin_lock:
+            remaining = self._pins.get(session_id, 0) - 1
+            if remaining > 0:
+                self._pins[session_id] = remaining
+            else:
+                self._pins.pop(session_id, None)
+
+    def is_pinned(self, session_id: str) -> bool:
+        with self._pin_lock:
+            return session_id in self._pins
+
+    def close(self) -> None:  # noqa: B027 - 닫을 자원이 없는 저장소는 재정의하지 않는다
+        pass
+
+    def _notify_evicted(self, session_ids: List[str]) -> None:
+        if self.on_evict is None:
+            return
+        for session_id in session_ids:
+            try:
+                self.on_evict(session_id)
+            except Exception as e:
+                print(f"[SessionStore] Evict callback failed for {session_id}: {e}")
+
+    @staticmethod
+    def _public_message(index: int, message: dict, include_log: bool) -> dict:
+        """저장된 메시지를 API 응답 형식으로 변환"""
+        public = {key: value for key, value in message.items() if key != "full_log"}
+        public["index"] = index
+        public["has_full_log"] = message.get("full_log") is not None
+        if include_log:
+            public["full_log"] = decompress_log(message.get("full_log"))
+        return public
+
+
+class MemorySessionStore(SessionStore):
+    """메모리 세션 저장소 (최대 세션 수를 넘으면 가장 오래 사용하지 않은 세션부터 제거)"""
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: Optional[float] = None, on_evict=None):
+        super().__init__(ttl_seconds, on_evict)
+        self.max_sessions = max(1, max_sessions)
+        self._sessions: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, session_id: str) -> dict:
+        now = datetime.now()
+        with self._lock:
+            self._sessions[session_id] = {"created_at": now, "last_access": time.time(), "messages": []}
+            evicted = []
+            excess = len(self._sessions) - self.max_sessions
+            if excess > 0:
+                # 가장 오래 사용하지 않은 순서로, 실행 중인(고정된) 세션은 건너뛴다
+                for sid in self._sessions:
+                    if len(evicted) == excess:
+                        break
+                    if not self.is_pinned(sid):
+                        evicted.append(sid)
+                for sid in evicted:
+                    del self._sessions[sid]
+        self._notify_evicted(evicted)
+        return {"session_id": session_id, "created_at": now}
+
+    def exists(self, session_id: str) -> bool:
+        return self._touch(session_id) is not None
+
+    def append_message(self, session_id: str, message: dict) -> int:
+        session = self._touch(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        stored = dict(message)
+        if stored.get("full_log") is not None:
+            stored["full_log"] = compress_log(stored["full_log"])
+        with self._lock:
+            session["messages"].append(stored)
+            return len(session["messages"]) - 1
+
+    def get_session(self, session_id, offset=0, limit=None, include_log=False):
+        session = self._touch(session_id)
+        if session is None:
+            return None
+        messages = session["messages"]
+        end = len(messages) if limit is None else offset + limit
+        return {
+            "session_id": session_id,
+            "created_at": session["created_at"],
+            "total_messages": len(messages),
+            "offset": offset,
+            "limit": limit,
+            "messages": [
+                self._public_message(i, messages[i], include_log) for i in range(offset, min(end, len(messages)))
+            ],
+        }
+
+    def get_full_log(self, session_id, index):
+        session = self._touch(session_id)
+        if session is None or not 0 <= index < len(session["messages"]):
+            return None
+        return decompress_log(session["messages"][index].get("full_log"))
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def count(self):
+        return len(self._sessions)
+
+    def evict_expired(self):
+        if not self.ttl_seconds:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                sid
+                for sid, session in self._sessions.items()
+                if session["last_access"] < cutoff and not self.is_pinned(sid)
+            ]
+            for sid in expired:
+                del self._sessions[sid]
+        self._notify_evicted(expired)
+        return len(expired)
+
+    def _touch(self, session_id: str) -> Optional[dict]:
+        """세션 조회 + 최근 사용 갱신 (만료된 세션은 제거)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if (
+                self.ttl_seconds
+                and session["last_access"] < time.time() - self.ttl_seconds
+                and not self.is_pinned(session_id)
+            ):
+                del self._sessions[session_id]
+                expired = True
+            else:
+                session["last_access"] = time.time()
+                self._sessions.move_to_end(session_id)
+                expired = False
+        if expired:
+            self._notify_evicted([session_id])
+            return None
+        return session
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite 세션 저장소
+
+    메시지는 INSERT만 수행하고, 조회는 커서로 필요한 페이지만 읽는다.
+    서버를 재시작해도 세션이 유지된다.
+
+    최근 사용한 세션의 메타데이터(created_at, last_access)는 최대 cache_size개까지 메모리 LRU에 두고,
+    last_access는 ACCESS_WRITE_SECONDS마다 한 번만 DB에 기록한다.
+    세션 수가 max_sessions를 넘으면 가장 오래 사용하지 않은 세션부터 제거한다.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: Optional[float] = None,
+        on_evict=None,
+        max_sessions: Optional[int] = None,
+        cache_size: int = 256,
+    ):
+        super().__init__(ttl_seconds, on_evict)
+        self.db_path = db_path
+        self.max_sessions = max(1, max_sessions) if max_sessions else None
+        self.cache_size = max(1, cache_size)
+        # session_id -> [created_at, last_access, DB에 기록된 last_access]
+        self._recent: "OrderedDict[str, list]" = OrderedDict()
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS messages (
+                    session_id TEXT NOT NULL REFERENCES sessions(session_id) ON DELETE CASCADE,
+                    idx INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    extra TEXT,
+                    full_log BLOB,
+                    PRIMARY KEY (session_id, idx)
+                );
+                CREATE INDEX IF NOT EXISTS idx_sessions_last_access ON sessions (last_access);
+                """
+            )
+            self._conn.commit()
+
+    def create(self, session_id):
+        now = datetime.now()
+        access = time.time()
+        evicted = []
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, created_at, last_access) VALUES (?, ?, ?)",
+                (session_id, now.isoformat(), access),
+            )
+            self._remember(session_id, [now.isoformat(), access, access])
+            if self.max_sessions is not None:
+                excess = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+                if excess > 0:
+                    self._flush_access()
+                    rows = self._conn.execute(
+                        "SELECT session_id FROM sessions ORDER BY last_access LIMIT ?",
+                        (excess + len(self._pins) + 1,),
+                    )
+                    evicted = [row[0] for row in rows if row[0] != session_id and not self.is_pinned(row[0])][
+                        :excess
+                    ]
+                    self._delete_rows(evicted)
+            self._conn.commit()
+        self._notify_evicted(evicted)
+        return {"session_id": session_id, "created_at": now}
+
+    def exists(self, session_id):
+        return self._touch(session_id) is not None
+
+    def append_message(self, session_id, message):
+        if self._touch(session_id) is None:
+            raise KeyError(session_id)
+        extra = {k: v for k, v in message.items() if k not in ("role", "content", "timestamp", "full_log")}
+        timestamp = message.get("timestamp") or datetime.now()
+        full_log = message.get("full_log")
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(MAX(idx) + 1, 0) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            index = row[0]
+            self._conn.execute(
+                "INSERT INTO messages (session_id, idx, role, content, timestamp, extra, full_log) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session_id,
+                    index,
+                    message["role"],
+                    message["content"],
+                    timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp),
+                    json.dumps(extra, default=str) if extra else None,
+                    compress_log(full_log) if full_log is not None else None,
+                ),
+            )
+            self._conn.commit()
+        return index
+
+    def get_session(self, session_id, offset=0, limit=None, include_log=False):
+        created_at = self._touch(session_id)
+        if created_at is None:
+            return None
+        log_column = "full_log" if include_log else "full_log IS NOT NULL"
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            cursor = self._conn.execute(
+                f"SELECT idx, role, content, timestamp, extra, {log_column} FROM messages "
+                "WHERE session_id = ? ORDER BY idx LIMIT ? OFFSET ?",
+                (session_id, -1 if limit is None else limit, offset),
+            )
+            messages = []
+            for idx, role, content, timestamp, extra, log_value in cursor:
+                message = {
+                    "index": idx,
+                    "role": role,
+                    "content": content,
+                    "timestamp": datetime.fromisoformat(timestamp),
+                }
+                if extra:
+                    message.update(json.loads(extra))
+                if include_log:
+                    message["has_full_log"] = log_value is not None
+                    message["full_log"] = decompress_log(log_value)
+                else:
+                    message["has_full_log"] = bool(log_value)
+                messages.append(message)
+        return {
+            "session_id": session_id,
+            "created_at": datetime.fromisoformat(created_at),
+            "total_messages": total,
+            "offset": offset,
+            "limit": limit,
+            "messages": messages,
+        }
+
+    def get_full_log(self, session_id, index):
+        if self._touch(session_id) is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT full_log FROM messages WHERE session_id = ? AND idx = ?", (session_id, index)
+            ).fetchone()
+        return decompress_log(row[0]) if row else None
+
+    def delete(self, session_id):
+        with self._lock:
+            self._recent.pop(session_id, None)
+            cursor = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def evict_expired(self):
+        if not self.ttl_seconds:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            self._flush_access()
+            expired = [
+                row[0]
+                for row in self._conn.execute("SELECT session_id FROM sessions WHERE last_access < ?", (cutoff,))
+                if not self.is_pinned(row[0])
+            ]
+            self._delete_rows(expired)
+            self._conn.commit()
+        self._notify_evicted(expired)
+        return len(expired)
+
+    def close(self):
+        with self._lock:
+            self._flush_access()
+            self._conn.commit()
+            self._conn.close()
+
+    def _touch(self, session_id: str) -> Optional[str]:
+        """세션 접근 시간 갱신 후 created_at 반환 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._recent.get(session_id)
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT created_at, last_access FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = [row[0], row[1], row[1]]
+            if self.ttl_seconds and entry[1] < now - self.ttl_seconds and not self.is_pinned(session_id):
+                self._recent.pop(session_id, None)
+                self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self._conn.commit()
+                expired = True
+            else:
+                entry[1] = now
+                if now - entry[2] >= ACCESS_WRITE_SECONDS:
+                    self._conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id))
+                    self._conn.commit()
+                    entry[2] = now
+                self._remember(session_id, entry)
+                expired = False
+        if expired:
+            self._notify_evicted([session_id])
+            return None
+        return entry[0]
+
+    def _remember(self, session_id: str, entry: list) -> None:
+        """메타데이터 LRU 갱신 (넘치는 항목은 기록되지 않은 last_access를 DB에 쓰고 제거)"""
+        self._recent[session_id] = entry
+        self._recent.move_to_end(session_id)
+        while len(self._recent) > self.cache_size:
+            sid, (_, last_access, written) = self._recent.popitem(last=False)
+            if last_access > written:
+                self._conn.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (last_access, sid))
+
+    def _flush_access(self) -> None:
+        """메모리에만 있는 last_access를 DB에 기록 (만료/LRU 판단 전에 호출, 커밋은 호출자가 수행)"""
+        pending = [(entry[1], sid) for sid, entry in self._recent.items() if entry[1] > entry[2]]
+        if pending:
+            self._conn.executemany("UPDATE sessions SET last_access = ? WHERE session_id = ?", pending)
+            for _, sid in pending:
+                self._recent[sid][2] = self._recent[sid][1]
+
+    def _delete_rows(self, session_ids: List[str]) -> None:
+        for sid in session_ids:
+            self._recent.pop(sid, None)
+        self._conn.executemany("DELETE FROM sessions WHERE session_id = ?", [(sid,) for sid in session_ids])
+
+
+def create_session_store(on_evict: Optional[Callable[[str], None]] = None) -> SessionStore:
+    """
+    환경 변수 설정에 따라 세션 저장소 생성
+
+    - BIOMNI_SESSION_STORE: memory (기본값) 또는 sqlite
+    - BIOMNI_SESSION_DB: SQLite 파일 경로 (기본값 ./data/sessions.db)
+    - BIOMNI_SESSION_TTL_HOURS: 마지막 접근 후 세션 유지 시간 (0이면 만료 없음)
+    - BIOMNI_SESSION_MAX: 최대 세션 수 (넘으면 가장 오래 사용하지 않은 세션부터 제거)
+    """
+    backend = os.getenv("BIOMNI_SESSION_STORE", "memory").lower()
+    ttl_hours = float(os.getenv("BIOMNI_SESSION_TTL_HOURS", "24"))
+    ttl_seconds = ttl_hours * 3600 if ttl_hours > 0 else None
+    max_sessions = int(os.getenv("BIOMNI_SESSION_MAX", "1000"))
+
+    if backend == "sqlite":
+        db_path = os.getenv("BIOMNI_SESSION_DB", "./data/sessions.db")
+        print(f"[SessionStore] Using SQLite session store: {db_path}")
+        return SQLiteSessionStore(db_path, ttl_seconds=ttl_seconds, on_evict=on_evict, max_sessions=max_sessions)
+
+    return MemorySessionStore(max_sessions=max_sessions, ttl_seconds=ttl_seconds, on_evict=on_evict)
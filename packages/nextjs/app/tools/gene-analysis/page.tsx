@@ -14,13 +14,25 @@ import { Button } from "~~/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "~~/components/ui/card";
 import { Collapsible, CollapsibleContent, CollapsibleTrigger } from "~~/components/ui/collapsible";
 import { ScrollArea } from "~~/components/ui/scroll-area";
+import { Switch } from "~~/components/ui/switch";
 import { Textarea } from "~~/components/ui/textarea";
 
+type MessageType = "log" | "result" | "blockchain" | "error" | "status" | "stream" | "step";
+
+interface StepDetails {
+  step?: number;
+  thinking?: string;
+  plan?: string;
+  code?: string;
+  observation?: string;
+}
+
 interface Message {
   role: "user" | "assistant" | "system";
   content: string;
   timestamp: Date;
-  type?: "log" | "result" | "blockchain" | "error";
+  type?: MessageType;
+  details?: StepDetails;
   blockchainData?: {
     transaction_hash: string;
     research_id: number;
@@ -29,8 +41,64 @@ interface Message {
   };
 }
 
+interface StreamChunk {
+  type: string;
+  content: string;
+  timestamp: string;
+  step?: number;
+}
+
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || "http://localhost:8000";
 
+// 서버는 에이전트 단계마다 여러 청크(queue/start/status/token/thinking/plan/code/observation)를 보낸다.
+// 청크마다 말풍선을 만들지 않고 현재 assistant 메시지에 합친다.
+const applyChunk = (prev: Message[], chunk: StreamChunk): Message[] => {
+  const last = prev[prev.length - 1];
+  const timestamp = new Date(chunk.timestamp);
+
+  switch (chunk.type) {
+    case "queue":
+    case "start":
+    case "status": {
+      // 대기 순번, 시작, 도구 선택 같은 진행 상태는 한 줄로 유지 (이전 상태를 교체)
+      const status: Message = { role: "assistant", content: chunk.content, timestamp, type: "status" };
+      return last?.type === "status" ? [...prev.slice(0, -1), status] : [...prev, status];
+    }
+    case "token":
+      // 토큰은 진행 중인 미리보기 메시지에 이어 붙임
+      return last?.type === "stream"
+        ? [...prev.slice(0, -1), { ...last, content: last.content + chunk.content }]
+        : [...prev, { role: "assistant", content: chunk.content, timestamp, type: "stream" }];
+    case "thinking":
+    case "plan":
+    case "code":
+    case "observation": {
+      // 단계가 완성되면 토큰 미리보기는 단계 카드로 대체
+      const base = last?.type === "stream" ? prev.slice(0, -1) : prev;
+      const current = base[base.length - 1];
+      const field = chunk.type as "thinking" | "plan" | "code" | "observation";
+      // 관찰 결과는 직전 코드 단계에, 나머지는 같은 단계 번호의 카드에 합침
+      const merge =
+        current?.type === "step" &&
+        (field === "observation"
+          ? !!current.details?.code && !current.details?.observation
+          : current.details?.step === chunk.step && !current.details?.[field]);
+      if (merge) {
+        return [...base.slice(0, -1), { ...current, details: { ...current.details, [field]: chunk.content } }];
+      }
+      return [
+        ...base,
+        { role: "assistant", content: "", timestamp, type: "step", details: { step: chunk.step, [field]: chunk.content } },
+      ];
+    }
+    default: {
+      // result/error 등은 새 메시지로 추가 (토큰 미리보기는 최종 메시지로 대체)
+      const base = last?.type === "stream" ? prev.slice(0, -1) : prev;
+      return [...base, { role: "assistant", content: chunk.content, timestamp, type: chunk.type as MessageType }];
+    }
+  }
+};
+
 export default function GeneAnalysisPage() {
   const { address, isConnected } = useAccount();
   const [sessionId, setSessionId] = useState<string>("");
@@ -40,6 +108,7 @@ export default function GeneAnalysisPage() {
   const [isConnecting, setIsConnecting] = useState(false);
   const [sessionError, setSessionError] = useState<string>("");
   const [expandedLogs, setExpandedLogs] = useState<{ [key: number]: boolean }>({});
+  const [streamTokens, setStreamTokens] = useState(false);
   const scrollRef = useRef<HTMLDivElement>(null);
 
   // 세션 생성
@@ -91,6 +160,41 @@ export default function GeneAnalysisPage() {
     }
   }, [isConnected, sessionId, createSession]);
 
+  // 블록체인 저장 결과 구독 (트랜잭션은 응답 완료 후 백그라운드에서 전송됨)
+  const watchBlockchainJob = (jobId: string) => {
+    const eventSource = new EventSource(`${API_BASE_URL}/api/blockchain/jobs/${jobId}/events`);
+
+    eventSource.addEventListener("blockchain", event => {
+      const blockchainMessage: Message = {
+        role: "system",
+        content: "블록체인에 연구 결과가 저장되었습니다",
+        timestamp: new Date(),
+        type: "blockchain",
+        blockchainData: JSON.parse((event as MessageEvent).data),
+      };
+      setMessages(prev => [...prev, blockchainMessage]);
+      toast.success("연구 결과가 블록체인에 저장되었습니다");
+      eventSource.close();
+    });
+
+    eventSource.addEventListener("blockchain_error", event => {
+      const parsed = JSON.parse((event as MessageEvent).data);
+      const errorMessage: Message = {
+        role: "system",
+        content: parsed.error || "블록체인 저장에 실패했습니다",
+        timestamp: new Date(),
+        type: "error",
+      };
+      setMessages(prev => [...prev, errorMessage]);
+      toast.error(parsed.error || "블록체인 저장에 실패했습니다");
+      eventSource.close();
+    });
+
+    eventSource.onerror = () => {
+      eventSource.close();
+    };
+  };
+
   // 메시지 전송
   const sendMessage = async () => {
     if (!inputMessage.trim() || !sessionId || !address) {
@@ -117,6 +221,7 @@ export default function GeneAnalysisPage() {
           session_id: sessionId,
           message: inputMessage,
           user_address: address,
+          config: { stream_tokens: streamTokens },
         }),
       });
 
@@ -163,22 +268,9 @@ export default function GeneAnalysisPage() {
             console.log(`[SSE] Event received: ${eventType}`, parsed);
 
             if (eventType === "message") {
-              const assistantMessage: Message = {
-                role: "assistant",
-                content: parsed.content,
-                timestamp: new Date(parsed.timestamp),
-                type: parsed.type,
-              };
-              console.log(`[SSE] Adding message - type: ${parsed.type}, content length: ${parsed.content?.length}`);
-              setMessages(prev => [...prev, assistantMessage]);
+              setMessages(prev => applyChunk(prev, parsed));
             } else if (eventType === "thinking" || eventType === "plan") {
-              const assistantMessage: Message = {
-                role: "assistant",
-                content: parsed.content,
-                timestamp: new Date(parsed.timestamp),
-                type: eventType as any,
-              };
-              setMessages(prev => [...prev, assistantMessage]);
+              setMessages(prev => applyChunk(prev, { ...parsed, type: eventType }));
               // } else if (eventType === "storing") {
               //   const systemMessage: Message = {
               //     role: "system",
@@ -198,6 +290,9 @@ export default function GeneAnalysisPage() {
               toast.success("연구 결과가 블록체인에 저장되었습니다");
             } else if (eventType === "done") {
               setIsLoading(false);
+              if (parsed.job_id) {
+                watchBlockchainJob(parsed.job_id);
+              }
             } else if (eventType === "error" || eventType === "blockchain_error") {
               const errorMessage: Message = {
                 role: "system",
@@ -342,7 +437,11 @@ export default function GeneAnalysisPage() {
                                       ? "bg-primary/10 border border-primary/30 p-4"
                                       : message.type === "log"
                                         ? "bg-muted/50 border border-muted"
-                                        : "bg-muted p-3"
+                                        : message.type === "step"
+                                          ? "bg-muted/50 border border-muted p-3"
+                                          : message.type === "status"
+                                            ? "px-3 py-1"
+                                            : "bg-muted p-3"
                             }`}
                           >
                             {message.type === "blockchain" && message.blockchainData ? (
@@ -422,6 +521,49 @@ export default function GeneAnalysisPage() {
                                   </CollapsibleContent>
                                 </div>
                               </Collapsible>
+                            ) : message.type === "step" && message.details ? (
+                              <div className="space-y-2 text-sm">
+                                <span className="text-xs font-medium text-muted-foreground">
+                                  단계 #{message.details.step}
+                                </span>
+                                {message.details.thinking && (
+                                  <p className="whitespace-pre-wrap">{message.details.thinking}</p>
+                                )}
+                                {message.details.plan && (
+                                  <div className="prose prose-sm max-w-none">
+                                    <ReactMarkdown remarkPlugins={[remarkGfm]}>{message.details.plan}</ReactMarkdown>
+                                  </div>
+                                )}
+                                {message.details.code && (
+                                  <pre className="bg-background/50 p-3 rounded text-xs font-mono overflow-x-auto">
+                                    <code>{message.details.code}</code>
+                                  </pre>
+                                )}
+                                {message.details.observation && (
+                                  <Collapsible
+                                    open={expandedLogs[index]}
+                                    onOpenChange={open => setExpandedLogs(prev => ({ ...prev, [index]: open }))}
+                                  >
+                                    <CollapsibleTrigger className="flex items-center justify-between w-full hover:bg-muted/50 p-2 rounded transition-colors">
+                                      <span className="text-xs font-medium text-muted-foreground">실행 결과</span>
+                                      {expandedLogs[index] ? (
+                                        <ChevronUp className="h-3 w-3 text-muted-foreground" />
+                                      ) : (
+                                        <ChevronDown className="h-3 w-3 text-muted-foreground" />
+                                      )}
+                                    </CollapsibleTrigger>
+                                    <CollapsibleContent className="mt-2">
+                                      <pre className="bg-background/50 p-3 rounded text-xs font-mono whitespace-pre-wrap break-words">
+                                        {message.details.observation}
+                                      </pre>
+                                    </CollapsibleContent>
+                                  </Collapsible>
+                                )}
+                              </div>
+                            ) : message.type === "status" ? (
+                              <p className="text-xs text-muted-foreground italic">{message.content}</p>
+                            ) : message.type === "stream" ? (
+                              <p className="text-sm whitespace-pre-wrap text-muted-foreground">{message.content}</p>
                             ) : (
                               <>
                                 <p className="text-sm whitespace-pre-wrap">{message.content}</p>
@@ -474,6 +616,10 @@ export default function GeneAnalysisPage() {
                         {isLoading ? <Loader2 className="h-4 w-4 animate-spin" /> : <Send className="h-4 w-4" />}
                       </Button>
                     </div>
+                    <label className="mt-2 flex items-center gap-2 text-xs text-muted-foreground">
+                      <Switch checked={streamTokens} onCheckedChange={setStreamTokens} disabled={isLoading} />
+                      응답 생성 과정을 토큰 단위로 실시간 표시
+                    </label>
                   </div>
                 </>
               )}